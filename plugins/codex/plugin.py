@@ -4,17 +4,16 @@ Codex Plugin - OpenAI Codex CLI integration.
 This plugin provides Codex CLI integration for AI-assisted code analysis.
 It handles:
 - Command processing (/codex, /codex:resume, /codex:help)
-- Subprocess execution of codex CLI
+- Subprocess execution of codex CLI (streamed, stoppable)
 - Progress updates via Telegram
 """
 
-import asyncio
 import logging
 import re
 import shlex
 import subprocess
 from pathlib import Path
-from typing import List
+from typing import Any, Callable, List, Optional, Tuple
 
 from telegram import Update
 from telegram.ext import CommandHandler, ContextTypes
@@ -24,6 +23,14 @@ from src.plugins.base import BasePlugin, PluginCapabilities, PluginMetadata
 logger = logging.getLogger(__name__)
 
 
+class CodexStopped(Exception):
+    """Raised when a Codex run is stopped by the user."""
+
+    def __init__(self, output: str):
+        super().__init__("Codex run stopped by user")
+        self.output = output
+
+
 class CodexPlugin(BasePlugin):
     """
     Codex CLI integration plugin.
@@ -236,27 +243,45 @@ Directory: <code>~/Research/vault</code>
 
         # Send status message
         from src.bot.handlers import edit_message_sync, send_message_sync
+        from src.bot.handlers.streaming import (
+            ThrottledMessageEditor,
+            tail_for_display,
+        )
+        from src.bot.keyboard_utils import KeyboardUtils
+        from src.services.streaming_subprocess import (
+            StreamOutput,
+            register_stream,
+            unregister_stream,
+        )
 
         model_display = model.replace("gpt-5-codex", "5-codex").replace("gpt-5", "5")
         cwd_display = cwd.replace(str(Path.home()), "~")
 
-        status_text = (
+        header = (
             f"<b>🔍 Codex</b> · {model_display} · {effort} reasoning\n"
             f"<i>{self._escape_html(clean_prompt[:60])}...</i>\n\n"
+        )
+        status_text = (
+            f"{header}"
             f"⏳ {'Resuming session' if resume else 'Running'}...\n"
             f"📂 {cwd_display}\n"
             f"🔒 {sandbox}"
         )
 
+        stream_id = register_stream()
+        stop_markup = KeyboardUtils().create_stream_stop_keyboard(stream_id).to_dict()
+
         result = send_message_sync(
             chat_id=message.chat_id,
             text=status_text,
             parse_mode="HTML",
             reply_to=message.message_id,
+            reply_markup=stop_markup,
         )
 
         if not result:
             logger.error("Failed to send status message")
+            unregister_stream(stream_id)
             return
 
         status_msg_id = result.get("message_id")
@@ -292,21 +317,35 @@ Directory: <code>~/Research/vault</code>
             f"Executing codex: {cmd if isinstance(cmd, str) else ' '.join(cmd)}"
         )
 
-        # Run in background thread
+        editor = ThrottledMessageEditor(
+            message.chat_id, status_msg_id, reply_markup=stop_markup
+        )
+        output = StreamOutput()
+
+        async def show_progress(_chunk: str) -> None:
+            if editor.due():
+                tail = tail_for_display(output.tail())
+                await editor.update(f"{header}<pre>{self._escape_html(tail)}</pre>")
+
         try:
-            output = await asyncio.to_thread(
-                self._run_subprocess, cmd, cwd, self._timeout
+            text, log_path = await self._run_subprocess(
+                cmd,
+                cwd,
+                self._timeout,
+                on_output=show_progress,
+                stream_id=stream_id,
+                output=output,
             )
 
             # Format output
-            formatted = self._format_output(output)
+            formatted = self._format_output(text)
 
             # Split if too long
             from src.bot.handlers import split_message
 
             chunks = split_message(formatted, max_length=4000)
 
-            # Edit status message with first chunk
+            # Edit status message with first chunk (drops the stop button)
             edit_message_sync(
                 chat_id=message.chat_id,
                 message_id=status_msg_id,
@@ -323,6 +362,17 @@ Directory: <code>~/Research/vault</code>
                     reply_to=message.message_id,
                 )
 
+            if log_path:
+                omitted = output.total_chars - len(text)
+                send_message_sync(
+                    chat_id=message.chat_id,
+                    text=(
+                        f"<i>… {omitted} earlier characters omitted. "
+                        f"Full output: <code>{self._escape_html(log_path)}</code></i>"
+                    ),
+                    parse_mode="HTML",
+                )
+
             # Add resume hint
             hint_text = (
                 "\n\n💡 <i>Continue this session: "
@@ -334,6 +384,17 @@ Directory: <code>~/Research/vault</code>
                 parse_mode="HTML",
             )
 
+        except CodexStopped as e:
+            tail = tail_for_display(e.output)
+            stopped_text = f"{header}⏹️ <b>Stopped</b>"
+            if tail.strip():
+                stopped_text += f"\n\n<pre>{self._escape_html(tail)}</pre>"
+            edit_message_sync(
+                chat_id=message.chat_id,
+                message_id=status_msg_id,
+                text=stopped_text,
+                parse_mode="HTML",
+            )
         except subprocess.TimeoutExpired:
             error_text = (
                 f"<b>⏱️ Timeout</b>\n\n"
@@ -354,6 +415,9 @@ Directory: <code>~/Research/vault</code>
                 text=error_text,
                 parse_mode="HTML",
             )
+        finally:
+            unregister_stream(stream_id)
+            output.close()
 
     def _parse_flags(self, prompt: str) -> dict:
         """Parse inline flags from prompt.
@@ -411,22 +475,47 @@ Directory: <code>~/Research/vault</code>
             "prompt": clean_prompt,
         }
 
-    def _run_subprocess(self, cmd: str, cwd: str, timeout: int) -> str:
-        """Run subprocess and return output."""
-        result = subprocess.run(
+    async def _run_subprocess(
+        self,
+        cmd: str,
+        cwd: str,
+        timeout: int,
+        on_output: Optional[Callable[[str], Any]] = None,
+        stream_id: Optional[str] = None,
+        output: Optional[Any] = None,
+    ) -> Tuple[str, Optional[str]]:
+        """Run the codex shell command, streaming stdout into ``on_output``.
+
+        Returns:
+            (stdout, log_path). Past the in-memory buffer stdout is only the
+            tail, and log_path is the kept file with the full output.
+
+        Raises:
+            subprocess.TimeoutExpired: The run exceeded ``timeout``.
+            CodexStopped: The run was stopped via its stop button.
+            RuntimeError: Codex exited with a non-zero status.
+        """
+        from src.services.streaming_subprocess import stream_subprocess
+
+        result = await stream_subprocess(
             cmd,
-            shell=True,
             cwd=cwd,
-            capture_output=True,
-            text=True,
             timeout=timeout,
+            on_output=on_output,
+            stream_id=stream_id,
+            output=output,
         )
-
+        stdout = result.output.tail()
+        if result.timed_out:
+            raise subprocess.TimeoutExpired(cmd, timeout, output=stdout)
+        if result.stopped:
+            raise CodexStopped(stdout)
         if result.returncode != 0:
-            error = result.stderr or result.stdout or "Unknown error"
+            error = result.stderr or stdout or "Unknown error"
             raise RuntimeError(f"Codex failed (exit {result.returncode}): {error}")
 
-        return result.stdout
+        log_path = result.output.keep_log() if result.output.truncated else None
+        return stdout, str(log_path) if log_path else None
 
     def _format_output(self, output: str) -> str:
         """Format codex output for Telegram."""
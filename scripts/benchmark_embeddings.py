@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""Throughput and latency of the embedding runtime at batch sizes 1-32.
+
+For each batch size the runtime is started with ``max_batch_size`` set to it,
+then as many concurrent clients as the batch size submit synthetic JPEG photos
+one at a time (closed loop), so the batcher can fill every forward pass.
+Reports images/s, p50/p95 request latency, and the mean batch actually
+formed.
+
+The model loads once per batch size in the worker process; the first batch
+is a warm-up and is not measured. Use ``--backend hash`` to measure the
+batching and worker-process overhead alone, without torch.
+
+Usage:
+    python scripts/benchmark_embeddings.py
+    python scripts/benchmark_embeddings.py --quantization int8 --images 256
+    python scripts/benchmark_embeddings.py --backend hash --batch-sizes 1,8,32
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from dataclasses import dataclass
+from io import BytesIO
+from typing import List, Optional, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.embedding_runtime import (  # noqa: E402
+    EmbeddingRuntime,
+    EmbeddingRuntimeConfig,
+)
+
+DEFAULT_BATCH_SIZES = (1, 2, 4, 8, 16, 32)
+
+
+@dataclass
+class BenchmarkResult:
+    batch_size: int
+    images: int
+    seconds: float
+    latencies: List[float]
+    batches: int
+
+    @property
+    def images_per_second(self) -> float:
+        return self.images / self.seconds if self.seconds else 0.0
+
+    @property
+    def p50_ms(self) -> float:
+        return percentile(self.latencies, 50) * 1000
+
+    @property
+    def p95_ms(self) -> float:
+        return percentile(self.latencies, 95) * 1000
+
+    @property
+    def mean_batch(self) -> float:
+        return self.images / self.batches if self.batches else 0.0
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))  # ceil
+    return ordered[int(rank) - 1]
+
+
+def synthetic_images(count: int, size: int = 640) -> List[bytes]:
+    """Distinct photo-sized JPEGs (gradients, so each encodes differently)."""
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng(0)
+    images = []
+    for _ in range(count):
+        base = rng.integers(0, 256, size=3)
+        ramp = np.linspace(0, 255, size, dtype=np.float32)
+        pixels = (base + ramp[:, None, None] * rng.random(3)) % 256
+        pixels = np.broadcast_to(pixels, (size, size, 3)).astype(np.uint8)
+        buffer = BytesIO()
+        Image.fromarray(pixels).save(buffer, format="JPEG", quality=85)
+        images.append(buffer.getvalue())
+    return images
+
+
+async def run_batch_size(
+    config: EmbeddingRuntimeConfig,
+    batch_size: int,
+    images: List[bytes],
+    max_wait: float,
+    use_process: bool = True,
+) -> BenchmarkResult:
+    runtime = EmbeddingRuntime(
+        config, max_batch_size=batch_size, max_wait=max_wait, use_process=use_process
+    )
+    try:
+        await runtime.start()
+        await runtime.embed_images(images[:batch_size])  # warm-up
+        runtime.batch_count = runtime.item_count = 0
+
+        queue = list(images)
+        latencies: List[float] = []
+
+        async def client() -> None:
+            while queue:
+                image = queue.pop()
+                started = time.perf_counter()
+                await runtime.embed_image(image)
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(batch_size)))
+        elapsed = time.perf_counter() - started
+        return BenchmarkResult(
+            batch_size=batch_size,
+            images=len(latencies),
+            seconds=elapsed,
+            latencies=latencies,
+            batches=runtime.batch_count,
+        )
+    finally:
+        await runtime.close()
+
+
+def _print_table(results: List[BenchmarkResult]) -> None:
+    print(
+        f"{'batch':>5}  {'images/s':>9}  {'p50 ms':>8}  {'p95 ms':>8}  {'mean batch':>10}"
+    )
+    for r in results:
+        print(
+            f"{r.batch_size:>5}  {r.images_per_second:>9.1f}  {r.p50_ms:>8.1f}  "
+            f"{r.p95_ms:>8.1f}  {r.mean_batch:>10.1f}"
+        )
+
+
+async def main_async(args: argparse.Namespace) -> List[BenchmarkResult]:
+    config = EmbeddingRuntimeConfig(
+        model_name=args.model,
+        backend=args.backend,
+        quantization=args.quantization,
+        torch_threads=args.threads,
+    )
+    images = synthetic_images(args.images)
+    print(
+        f"{args.model} backend={args.backend} "
+        f"quantization={args.quantization or 'none'} images={len(images)}"
+    )
+    results = []
+    for batch_size in args.batch_sizes:
+        results.append(
+            await run_batch_size(
+                config,
+                batch_size,
+                images,
+                max_wait=args.max_wait,
+                use_process=not args.in_thread,
+            )
+        )
+    _print_table(results)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--model", default=os.getenv("EMBEDDING_MODEL", "clip-ViT-B-32")
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["sentence-transformers", "hash"],
+        default="sentence-transformers",
+    )
+    parser.add_argument("--quantization", choices=["int8", "onnx"], default=None)
+    parser.add_argument(
+        "--batch-sizes",
+        type=lambda v: [int(x) for x in v.split(",")],
+        default=list(DEFAULT_BATCH_SIZES),
+        help="comma-separated (default: 1,2,4,8,16,32)",
+    )
+    parser.add_argument("--images", type=int, default=128, help="images per run")
+    parser.add_argument("--max-wait", type=float, default=0.01, help="batch window (s)")
+    parser.add_argument("--threads", type=int, default=None, help="torch threads")
+    parser.add_argument(
+        "--in-thread",
+        action="store_true",
+        help="run the model in a thread, not a worker process",
+    )
+    args = parser.parse_args(argv)
+    asyncio.run(main_async(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for the i18n catalog.
+
+Measures ``t()`` throughput over every key in the project locales (plain,
+interpolated and pluralized lookups, plus locale fallback) and the memory
+the compiled catalog takes per locale. A nested-dict walk with
+``str.format_map`` — how ``t()`` resolved keys before the catalog was
+compiled — is timed alongside for comparison.
+
+Usage:
+    python scripts/benchmark_i18n.py
+    python scripts/benchmark_i18n.py --rounds 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core import i18n  # noqa: E402
+
+Call = Tuple[str, Optional[str], Optional[int], Dict[str, Any]]
+
+
+def _nested_lookup(key: str, locale: Optional[str], count: Optional[int], **kwargs):
+    """Reference implementation: walk nested dicts and format on every call."""
+    locale = i18n.normalize_locale(locale)
+    if count is not None:
+        kwargs = {**kwargs, "count": count, "n": count}
+    for loc in dict.fromkeys([locale, i18n.DEFAULT_LOCALE]):
+        data = i18n._translations.get(loc)
+        if data is None:
+            continue
+        candidates = [key]
+        if count is not None:
+            candidates = [f"{key}.{i18n._plural_form(count, loc)}", f"{key}.other", key]
+        for candidate in candidates:
+            node: Any = data
+            for part in candidate.split("."):
+                node = node.get(part) if isinstance(node, dict) else None
+            if node is not None and not isinstance(node, (dict, list)):
+                template = str(node)
+                if not kwargs:
+                    return template
+                try:
+                    return template.format_map(kwargs)
+                except (KeyError, ValueError, IndexError):
+                    return template
+    return key
+
+
+def _build_workload() -> Dict[str, List[Call]]:
+    """Lookups covering every key of the default locale."""
+    catalog = i18n._fallback_chains[i18n.DEFAULT_LOCALE][0]
+    kwargs = {"name": "Alex", "error": "timeout", "path": "/tmp/x"}
+    keys = sorted(catalog.strings)
+    plural_keys = sorted(catalog.plurals) or keys[:10]
+    return {
+        "plain (en)": [(k, "en", None, {}) for k in keys],
+        "interpolated (ru)": [(k, "ru", None, kwargs) for k in keys],
+        "plural (ru)": [(k, "ru", n, {}) for k in plural_keys for n in (1, 3, 5, 21)],
+        "fallback (xx)": [(k, "xx-YY", None, {}) for k in keys],
+    }
+
+
+def _throughput(fn: Callable[..., str], calls: List[Call], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for key, locale, count, kwargs in calls:
+            fn(key, locale, count, **kwargs)
+    elapsed = time.perf_counter() - start
+    return len(calls) * rounds / elapsed
+
+
+def _catalog_memory() -> Dict[str, int]:
+    """Bytes allocated while compiling each locale's catalog."""
+    sizes = {}
+    for locale, data in sorted(i18n._translations.items()):
+        tracemalloc.start()
+        catalog = i18n._LocaleCatalog(locale, data)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        sizes[locale] = current
+        del catalog
+    return sizes
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=10, help="passes per workload")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    i18n.load_translations()
+    load_ms = (time.perf_counter() - start) * 1000
+    print(f"Loaded + compiled {sorted(i18n.SUPPORTED_LOCALES)} in {load_ms:.1f} ms\n")
+
+    print(f"{'workload':<20} {'calls':>7} {'catalog/s':>12} {'nested/s':>12} {'x':>6}")
+    for name, calls in _build_workload().items():
+        compiled = _throughput(i18n.t, calls, args.rounds)
+        nested = _throughput(_nested_lookup, calls, args.rounds)
+        print(
+            f"{name:<20} {len(calls):>7} {compiled:>12,.0f} {nested:>12,.0f} "
+            f"{compiled / nested:>6.1f}"
+        )
+
+    print("\nCompiled catalog memory per locale:")
+    for locale, size in _catalog_memory().items():
+        catalog = i18n._fallback_chains[locale][0]
+        print(
+            f"  {locale}: {size / 1024:8.1f} KiB  "
+            f"({len(catalog.strings)} strings, {len(catalog.plurals)} plural keys)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Import-time budget for the bot process and CLI scripts.
+
+Imports each entry point in a fresh interpreter under ``python -X importtime``
+and reports its cumulative import time, the packages that cost the most, and
+whether any heavy optional dependency (litellm, torch, PIL, telethon, ...)
+was imported eagerly. Those dependencies are bound through
+``src.utils.lazy_import`` and must only load on first use.
+
+With ``--check`` the run fails if an entry point exceeds its budget (the
+median of ``--runs`` cold imports) or imports a deferred dependency.
+
+Measured on the dev box (median of 5, LITELLM_LOCAL_MODEL_COST_MAP=True):
+src.main 3840 ms before lazy imports (litellm alone 2690 ms), ~1100 ms after.
+
+Usage:
+    python scripts/benchmark_import_time.py
+    python scripts/benchmark_import_time.py --check --runs 5
+    python scripts/benchmark_import_time.py --target src.main --top 25
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Entry point -> budget in ms for a cold import (generous: CI boxes vary)
+BUDGETS_MS: Dict[str, float] = {
+    "src.main": 2000.0,
+    "scripts.doctor": 400.0,
+    "scripts.proactive_tasks.task_runner": 400.0,
+    "src.preflight.checks": 300.0,
+}
+
+# Must not be imported by any entry point; each loads on first use
+DEFERRED_MODULES = (
+    "litellm",
+    "openai",
+    "torch",
+    "sentence_transformers",
+    "PIL",
+    "telethon",
+    "aiohttp",
+)
+
+
+@dataclass
+class ImportProfile:
+    """Parsed ``-X importtime`` output of one cold import."""
+
+    target: str
+    total_us: int = 0
+    self_us: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total_ms(self) -> float:
+        return self.total_us / 1000
+
+    @property
+    def modules(self) -> List[str]:
+        return list(self.self_us)
+
+    def by_package(self) -> Dict[str, int]:
+        """Self time summed per top-level package (µs)."""
+        totals: Dict[str, int] = defaultdict(int)
+        for module, self_us in self.self_us.items():
+            totals[module.split(".")[0]] += self_us
+        return dict(totals)
+
+    def deferred_loaded(self) -> List[str]:
+        loaded = {module.split(".")[0] for module in self.self_us}
+        return [name for name in DEFERRED_MODULES if name in loaded]
+
+
+def parse_importtime(target: str, output: str) -> ImportProfile:
+    """Parse the stderr of ``python -X importtime -c 'import target'``."""
+    profile = ImportProfile(target=target)
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        except ValueError:
+            continue
+        module = name.strip()
+        profile.self_us[module] = int(self_us)
+        if module == target:
+            profile.total_us = int(cumulative_us)
+    return profile
+
+
+def measure(target: str) -> ImportProfile:
+    """Import ``target`` in a fresh interpreter and profile it."""
+    env = {**os.environ, "LITELLM_LOCAL_MODEL_COST_MAP": "True"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=str(PROJECT_ROOT),
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {target} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(target, result.stderr)
+
+
+def _report(profiles: List[ImportProfile], budget: Optional[float], top: int) -> None:
+    profile = profiles[-1]
+    median_ms = statistics.median(p.total_ms for p in profiles)
+    budget_text = f" / budget {budget:.0f} ms" if budget else ""
+    print(
+        f"{profile.target}: {median_ms:.0f} ms{budget_text} "
+        f"({len(profile.modules)} modules)"
+    )
+    packages = sorted(profile.by_package().items(), key=lambda kv: -kv[1])
+    for package, self_us in packages[:top]:
+        print(f"    {self_us / 1000:8.1f} ms  {package}")
+    deferred = profile.deferred_loaded()
+    if deferred:
+        print(f"    imported eagerly: {', '.join(deferred)}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--target", action="append", help="module to profile (default: all)"
+    )
+    parser.add_argument("--runs", type=int, default=3, help="cold imports each")
+    parser.add_argument("--top", type=int, default=10, help="packages listed")
+    parser.add_argument(
+        "--check", action="store_true", help="exit 1 on budget or lazy-import breach"
+    )
+    args = parser.parse_args(argv)
+
+    failures = []
+    for target in args.target or list(BUDGETS_MS):
+        profiles = [measure(target) for _ in range(max(1, args.runs))]
+        budget = BUDGETS_MS.get(target)
+        _report(profiles, budget, args.top)
+
+        median_ms = statistics.median(p.total_ms for p in profiles)
+        if budget and median_ms > budget:
+            failures.append(f"{target} took {median_ms:.0f} ms (budget {budget:.0f})")
+        deferred = profiles[-1].deferred_loaded()
+        if deferred:
+            failures.append(f"{target} imported {', '.join(deferred)} eagerly")
+
+    if failures:
+        print("\nImport budget exceeded:" if args.check else "\nWarnings:")
+        for failure in failures:
+            print(f"  - {failure}")
+    return 1 if args.check and failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
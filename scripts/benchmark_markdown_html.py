@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Benchmark markdown -> Telegram HTML conversion on real notes.
+
+Builds a corpus from the Obsidian vault (``paths.vault_path``, falling back
+to the repo's own docs when the vault is not mounted) and times
+``markdown_to_telegram_html_chunks`` against the previous pipeline: regex
+substitutions with placeholder swaps, then a second regex pass in
+``split_message_html_safe`` to cut the result into messages. Every chunk
+produced is checked with ``validate_telegram_html``.
+
+Usage:
+    python scripts/benchmark_markdown_html.py
+    python scripts/benchmark_markdown_html.py --vault ~/Research/vault --limit 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, List
+from urllib.parse import quote
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.config import get_config_value, get_path  # noqa: E402
+from src.utils.formatting import (  # noqa: E402
+    _parse_table_text,
+    _reformat_code_block,
+    escape_html,
+    format_frontmatter_summary,
+    markdown_to_telegram_html_chunks,
+    parse_frontmatter,
+    render_compact_table,
+    split_message_html_safe,
+    validate_telegram_html,
+)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _legacy_markdown_to_html(text: str) -> str:
+    """Reference implementation: the regex/placeholder converter."""
+    frontmatter, body = parse_frontmatter(text)
+    summary = format_frontmatter_summary(frontmatter) if frontmatter else ""
+    placeholder = f"CODEBLOCK{uuid.uuid4().hex[:8]}"
+    text = escape_html(body)
+    code_blocks: List[str] = []
+
+    def save(block: str) -> str:
+        code_blocks.append(block)
+        return f"{placeholder}{len(code_blocks) - 1}{placeholder}"
+
+    text = re.sub(
+        r"```(?:\w+)?\n?(.*?)```", lambda m: save(m.group(1)), text, flags=re.DOTALL
+    )
+
+    def convert_table(match: re.Match) -> str:
+        parsed = _parse_table_text(match.group(0))
+        return save(render_compact_table(*parsed) if parsed else match.group(0))
+
+    text = re.sub(r"(?:^\|.+\|$\n?)+", convert_table, text, flags=re.MULTILINE)
+    text = re.sub(r"`([^`]+)`", r"<code>\1</code>", text)
+    text = re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", text)
+    text = re.sub(r"__(.+?)__", r"<b>\1</b>", text)
+    text = re.sub(r"(?<![a-zA-Z0-9])\*([^*]+)\*(?![a-zA-Z0-9])", r"<i>\1</i>", text)
+    text = re.sub(r"(?<![a-zA-Z0-9])_([^_]+)_(?![a-zA-Z0-9])", r"<i>\1</i>", text)
+    text = re.sub(r"^#{1,6}\s+(.+)$", r"<b>\1</b>", text, flags=re.MULTILINE)
+    text = re.sub(r"\[([^\]]+)\]\(([^)]+)\)", r'<a href="\2">\1</a>', text)
+    bot_username = get_config_value("bot.bot_username", "toolbuildingape_bot")
+
+    def format_wikilink(match: re.Match) -> str:
+        name = match.group(1).lstrip("@")
+        link = f"https://t.me/{bot_username}?start=note_{quote(name, safe='')}"
+        return f'<a href="{link}">\U0001f4c4 {name}</a>'
+
+    text = re.sub(r"\[\[([^\]]+)\]\]", format_wikilink, text)
+    for i, block in enumerate(code_blocks):
+        block = _reformat_code_block(block)
+        text = text.replace(f"{placeholder}{i}{placeholder}", f"<pre>{block}</pre>")
+    return f"{summary}\n\n{text}" if summary else text
+
+
+def _legacy_chunks(text: str, max_size: int) -> List[str]:
+    return split_message_html_safe(_legacy_markdown_to_html(text), max_size)
+
+
+def _load_corpus(vault: Path, limit: int) -> List[str]:
+    paths = sorted(vault.rglob("*.md")) if vault.is_dir() else []
+    source = vault
+    if not paths:
+        paths = sorted(
+            p for p in REPO_ROOT.rglob("*.md") if "node_modules" not in p.parts
+        )
+        source = REPO_ROOT
+    notes = []
+    for path in paths[:limit]:
+        try:
+            notes.append(path.read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError):
+            continue
+    print(f"Corpus: {len(notes)} notes from {source}")
+    return notes
+
+
+def _run(
+    convert: Callable[[str, int], List[str]], notes: List[str], max_size: int
+) -> tuple:
+    chunks = invalid = 0
+    start = time.perf_counter()
+    for note in notes:
+        for chunk in convert(note, max_size):
+            chunks += 1
+            if len(chunk) > max_size or not validate_telegram_html(chunk)[0]:
+                invalid += 1
+    return time.perf_counter() - start, chunks, invalid
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vault", default=get_path("vault_path"))
+    parser.add_argument("--limit", type=int, default=2000, help="max notes")
+    parser.add_argument("--max-size", type=int, default=3800)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    notes = _load_corpus(Path(args.vault).expanduser(), args.limit)
+    total_chars = sum(len(note) for note in notes)
+    print(f"{total_chars / 1024:.0f} KiB of markdown, chunk size {args.max_size}\n")
+
+    print(f"{'converter':<22} {'ms':>9} {'MiB/s':>7} {'chunks':>7} {'bad':>5}")
+    for name, convert in (
+        ("tokenizer (chunks)", markdown_to_telegram_html_chunks),
+        ("regex + re-split", _legacy_chunks),
+    ):
+        best = min(
+            (_run(convert, notes, args.max_size) for _ in range(args.rounds)),
+            key=lambda result: result[0],
+        )
+        elapsed, chunks, invalid = best
+        print(
+            f"{name:<22} {elapsed * 1000:>9.1f} "
+            f"{total_chars / elapsed / 2**20:>7.2f} {chunks:>7} {invalid:>5}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
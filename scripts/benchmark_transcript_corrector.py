@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Benchmark transcript correction on 1-hour transcripts.
+
+Builds synthetic Russian/English transcripts of roughly an hour of speech
+(~150 words per minute) sprinkled with correction terms and fillers, and
+times the automaton-based ``TranscriptCorrector`` against the previous
+approach: one alternation regex over all terms plus a second regex pass
+for fillers. Vocabulary size is varied by padding the real corrections
+map with synthetic terms.
+
+Usage:
+    python scripts/benchmark_transcript_corrector.py
+    python scripts/benchmark_transcript_corrector.py --minutes 120 --sizes 66 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.services.transcript_corrector import (  # noqa: E402
+    DEFAULT_CORRECTIONS_FILE,
+    TranscriptCorrector,
+)
+
+WORDS_PER_MINUTE = 150
+FILLER_SAMPLES = ["эээ", "ну,", "типа", "um", "uh", "you know", "так сказать"]
+PLAIN_WORDS = (
+    "я думаю что надо сделать это сегодня потом посмотрим как работает "
+    "the workflow should run after lunch and then we check the results"
+).split()
+
+# The regex engine this benchmark compares against (pre-automaton)
+LEGACY_FILLERS = [
+    r"\bum\b",
+    r"\buh\b",
+    r"\blike\b(?=\s+(?:I|you|he|she|it|we|they|so|um|uh))",
+    r"\byou know\b",
+    r"\bI mean\b",
+    r"\bso\b(?=\s*,)",
+    r"\bactually\b(?=\s*,)",
+    r"\bbasically\b(?=\s*,)",
+    r"\bэээ+\b",
+    r"\bммм+\b",
+    r"\bаааа+\b",
+    r"\bну\b(?=\s*,)",
+    r"\bвот\b(?=\s*,)",
+    r"\bзначит\b(?=\s*,)",
+    r"\bкороче\b(?=\s*,)",
+    r"\bтипа\b",
+    r"\bкак бы\b",
+    r"\bтак сказать\b",
+]
+
+
+class LegacyRegexCorrector:
+    def __init__(self, corrections: Dict[str, str]):
+        self.corrections = corrections
+        terms = sorted(corrections, key=len, reverse=True)
+        word_char = r"a-zA-Z0-9а-яА-ЯёЁ"
+        self.pattern = re.compile(
+            rf"(?<![{word_char}])({'|'.join(map(re.escape, terms))})(?![{word_char}])",
+            re.IGNORECASE,
+        )
+        self.filler_pattern = re.compile("|".join(LEGACY_FILLERS), re.IGNORECASE)
+
+    def correct_text(self, text: str) -> str:
+        result = self.pattern.sub(
+            lambda m: self.corrections.get(m.group(1).lower(), m.group(1)), text
+        )
+        result = self.filler_pattern.sub("", result)
+        result = re.sub(r"\s+", " ", result)
+        result = re.sub(r"\s+,", ",", result)
+        result = re.sub(r",\s*,", ",", result)
+        return result.strip()
+
+
+def _vocabulary(size: int) -> Dict[str, str]:
+    real = json.loads(DEFAULT_CORRECTIONS_FILE.read_text(encoding="utf-8"))
+    vocab = dict(real)
+    rng = random.Random(size)
+    letters = "абвгдежзиклмнопрстуфхцшщэюя"
+    while len(vocab) < size:
+        term = "".join(rng.choice(letters) for _ in range(rng.randint(5, 12)))
+        vocab[term] = term.capitalize()
+    return vocab
+
+
+def _transcript(minutes: int, vocab: List[str]) -> str:
+    rng = random.Random(minutes)
+    words = []
+    for _ in range(minutes * WORDS_PER_MINUTE):
+        roll = rng.random()
+        if roll < 0.03:
+            words.append(rng.choice(vocab))
+        elif roll < 0.06:
+            words.append(rng.choice(FILLER_SAMPLES))
+        else:
+            words.append(rng.choice(PLAIN_WORDS))
+    return " ".join(words)
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=int, default=60)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[66, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'vocab':>6} {'chars':>8} {'build ms':>9} {'regex build':>12} "
+        f"{'automaton ms':>13} {'regex ms':>9} {'same':>5}"
+    )
+    for size in args.sizes:
+        vocab = _vocabulary(size)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "corrections.json"
+            path.write_text(json.dumps(vocab, ensure_ascii=False), encoding="utf-8")
+
+            start = time.perf_counter()
+            corrector = TranscriptCorrector(corrections_file=path)
+            build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        legacy = LegacyRegexCorrector(corrector.corrections)
+        regex_build_ms = (time.perf_counter() - start) * 1000
+
+        text = _transcript(args.minutes, list(corrector.corrections))
+        automaton_ms = _best_of(
+            lambda: corrector.correct_text(text, level="full"), args.repeat
+        )
+        regex_ms = _best_of(lambda: legacy.correct_text(text), args.repeat)
+        same = corrector.correct_text(text, level="full") == legacy.correct_text(text)
+        print(
+            f"{len(corrector.corrections):>6} {len(text):>8} {build_ms:>9.1f} "
+            f"{regex_build_ms:>12.1f} {automaton_ms:>13.1f} {regex_ms:>9.1f} "
+            f"{'yes' if same else 'NO':>5}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,10 @@
 #!/usr/bin/env python3
 """
 Comprehensive Weekly Health Report with Graphs
-Queries health.db directly for maximum data availability
+Reads the daily rollups in health.db (see health_rollup.py), refreshed
+incrementally at the start of each run
 """
 
-import sqlite3
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -13,15 +13,16 @@ matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
 import numpy as np
 
-DB_PATH = Path.home() / "data" / "health.db"
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from scripts import health_rollup  # noqa: E402
+
+DB_PATH = health_rollup.DB_PATH
 OUTPUT_DIR = Path.home() / "Research" / "vault" / "health_reports"
 OUTPUT_DIR.mkdir(exist_ok=True)
 
 def get_connection():
-    """Connect to health database"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Connect to health database with up-to-date rollups"""
+    return health_rollup.connect(DB_PATH)
 
 def create_graph(title, dates, values, ylabel, filename, color='#4A90E2'):
     """Create and save a graph"""
@@ -59,64 +60,24 @@ def create_graph(title, dates, values, ylabel, filename, color='#4A90E2'):
 
     return str(output_path)
 
-def query_daily_metric(record_type, days=7, aggregation='AVG'):
-    """Query daily aggregated metric"""
-    conn = get_connection()
-
-    query = f"""
-    SELECT
-        DATE(start_date) as date,
-        {aggregation}(value) as value
-    FROM health_records
-    WHERE record_type = ?
-    AND start_date >= date('now', '-{days} days')
-    GROUP BY DATE(start_date)
-    ORDER BY date ASC
-    """
-
-    cursor = conn.execute(query, (record_type,))
-    rows = cursor.fetchall()
-
-    dates = [row['date'] for row in rows]
-    values = [float(row['value']) for row in rows if row['value']]
-
-    conn.close()
+def query_daily_metric(conn, record_type, days=7, aggregation='AVG'):
+    """Query daily aggregated metric from the rollup"""
+    rows = health_rollup.daily_values(conn, record_type, days=days, aggregation=aggregation)
+    dates = [day for day, value in rows if value]
+    values = [float(value) for day, value in rows if value]
     return dates, values
 
-def query_sleep_data(days=7):
+def query_sleep_data(conn, days=7):
     """Query sleep duration by date"""
-    conn = get_connection()
-
-    query = """
-    SELECT
-        DATE(start_date) as date,
-        SUM((julianday(end_date) - julianday(start_date)) * 24) as hours
-    FROM health_records
-    WHERE record_type = 'HKCategoryTypeIdentifierSleepAnalysis'
-    AND value = 2  -- Deep sleep or core sleep
-    AND start_date >= date('now', '-{} days')
-    GROUP BY DATE(start_date)
-    ORDER BY date ASC
-    """.format(days)
-
-    cursor = conn.execute(query)
-    rows = cursor.fetchall()
-
-    dates = [row['date'] for row in rows]
-    hours = [float(row['hours']) for row in rows if row['hours']]
-
-    conn.close()
+    # Stage 2 only (deep or core sleep)
+    rows = health_rollup.daily_sleep_hours(conn, stages=[2], days=days)
+    dates = [day for day, hours in rows]
+    hours = [float(hours) for day, hours in rows]
     return dates, hours
 
-def get_latest_data_timestamp():
+def get_latest_data_timestamp(conn):
     """Get the most recent data timestamp in database"""
-    conn = get_connection()
-    cursor = conn.execute("""
-        SELECT MAX(start_date) as latest FROM health_records
-    """)
-    row = cursor.fetchone()
-    conn.close()
-    return row['latest'] if row else None
+    return health_rollup.latest_record_timestamp(conn)
 
 def generate_report():
     """Generate comprehensive health report"""
@@ -124,8 +85,9 @@ def generate_report():
     print("📊 COMPREHENSIVE WEEKLY HEALTH REPORT")
     print("=" * 70)
 
+    conn = get_connection()
     report_date = datetime.now().strftime("%Y-%m-%d")
-    latest_data = get_latest_data_timestamp()
+    latest_data = get_latest_data_timestamp(conn)
 
     print(f"\n📅 Report Generated: {report_date}")
     print(f"📊 Latest Data Available: {latest_data}")
@@ -148,7 +110,7 @@ def generate_report():
 
     # 1. HRV Trend
     print("\n📊 [1/7] Heart Rate Variability...")
-    dates, values = query_daily_metric('HKQuantityTypeIdentifierHeartRateVariabilitySDNN', days=14)
+    dates, values = query_daily_metric(conn, 'HKQuantityTypeIdentifierHeartRateVariabilitySDNN', days=14)
     if values:
         graph = create_graph(
             "Heart Rate Variability (14 Days)",
@@ -164,7 +126,7 @@ def generate_report():
 
     # 2. Resting Heart Rate
     print("📊 [2/7] Resting Heart Rate...")
-    dates, values = query_daily_metric('HKQuantityTypeIdentifierRestingHeartRate', days=14)
+    dates, values = query_daily_metric(conn, 'HKQuantityTypeIdentifierRestingHeartRate', days=14)
     if values:
         graph = create_graph(
             "Resting Heart Rate (14 Days)",
@@ -180,7 +142,7 @@ def generate_report():
 
     # 3. Daily Steps
     print("📊 [3/7] Daily Steps...")
-    dates, values = query_daily_metric('HKQuantityTypeIdentifierStepCount', days=14, aggregation='SUM')
+    dates, values = query_daily_metric(conn, 'HKQuantityTypeIdentifierStepCount', days=14, aggregation='SUM')
     if values:
         graph = create_graph(
             "Daily Steps (14 Days)",
@@ -196,7 +158,7 @@ def generate_report():
 
     # 4. Active Calories
     print("📊 [4/7] Active Calories...")
-    dates, values = query_daily_metric('HKQuantityTypeIdentifierActiveEnergyBurned', days=14, aggregation='SUM')
+    dates, values = query_daily_metric(conn, 'HKQuantityTypeIdentifierActiveEnergyBurned', days=14, aggregation='SUM')
     if values:
         graph = create_graph(
             "Active Calories Burned (14 Days)",
@@ -212,7 +174,7 @@ def generate_report():
 
     # 5. Exercise Minutes
     print("📊 [5/7] Exercise Minutes...")
-    dates, values = query_daily_metric('HKQuantityTypeIdentifierAppleExerciseTime', days=14, aggregation='SUM')
+    dates, values = query_daily_metric(conn, 'HKQuantityTypeIdentifierAppleExerciseTime', days=14, aggregation='SUM')
     if values:
         graph = create_graph(
             "Exercise Minutes (14 Days)",
@@ -228,7 +190,7 @@ def generate_report():
 
     # 6. Distance Walked/Run
     print("📊 [6/7] Distance...")
-    dates, values = query_daily_metric('HKQuantityTypeIdentifierDistanceWalkingRunning', days=14, aggregation='SUM')
+    dates, values = query_daily_metric(conn, 'HKQuantityTypeIdentifierDistanceWalkingRunning', days=14, aggregation='SUM')
     if values:
         # Convert meters to km
         values_km = [v / 1000 for v in values]
@@ -246,7 +208,7 @@ def generate_report():
 
     # 7. Heart Rate (Average Daily)
     print("📊 [7/7] Average Heart Rate...")
-    dates, values = query_daily_metric('HKQuantityTypeIdentifierHeartRate', days=14)
+    dates, values = query_daily_metric(conn, 'HKQuantityTypeIdentifierHeartRate', days=14)
     if values:
         graph = create_graph(
             "Average Heart Rate (14 Days)",
@@ -260,6 +222,8 @@ def generate_report():
             stats.append(f"💓 Avg Heart Rate: {np.mean(values):.0f} bpm")
             print(f"   ✓ Avg: {np.mean(values):.0f} bpm")
 
+    conn.close()
+
     # Summary
     print("\n" + "=" * 70)
     print("📋 SUMMARY")
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 """
 Generate 7 health status graphs from Apple Health database
+All metrics are read from the daily rollups (see health_rollup.py) in one query
 """
 
-import sqlite3
+import sys
 from pathlib import Path
 from datetime import datetime, timedelta
 import matplotlib
@@ -12,15 +13,48 @@ import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import numpy as np
 
-DB_PATH = Path.home() / "data" / "health.db"
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from scripts import health_rollup  # noqa: E402
+
+DB_PATH = health_rollup.DB_PATH
 OUTPUT_DIR = Path.home() / "Research" / "vault" / "health_reports"
 OUTPUT_DIR.mkdir(exist_ok=True, parents=True)
 
+# (record_type, daily value, title, ylabel, filename, color, target, stat line)
+GRAPHS = [
+    ('HKQuantityTypeIdentifierHeartRateVariabilitySDNN',
+     lambda d: round(d.value_avg, 1),
+     "💓 Heart Rate Variability (HRV) - 7 Day Trend", "HRV (ms)", "1_hrv_trend.png",
+     '#E74C3C', 60, "📈 HRV Avg: {:.1f} ms"),
+    ('HKCategoryTypeIdentifierSleepAnalysis',
+     lambda d: round(d.value_sum / 60.0, 1),
+     "😴 Sleep Duration - 7 Day Trend", "Hours", "2_sleep_duration.png",
+     '#9B59B6', 8, "😴 Sleep Avg: {:.1f} hours"),
+    ('HKQuantityTypeIdentifierRestingHeartRate',
+     lambda d: round(d.value_avg, 0),
+     "❤️ Resting Heart Rate - 7 Day Trend", "BPM", "3_resting_hr.png",
+     '#E67E22', 60, "❤️ Resting HR Avg: {:.0f} bpm"),
+    ('HKQuantityTypeIdentifierStepCount',
+     lambda d: int(d.value_sum),
+     "🚶 Daily Steps - 7 Day Trend", "Steps", "4_daily_steps.png",
+     '#3498DB', 10000, "🚶 Steps Avg: {:,.0f}"),
+    ('HKQuantityTypeIdentifierOxygenSaturation',
+     lambda d: round(d.value_avg * 100, 1),
+     "🫁 Blood Oxygen Saturation - 7 Day Trend", "SpO2 (%)", "5_blood_oxygen.png",
+     '#1ABC9C', 95, "🫁 Blood O2 Avg: {:.1f}%"),
+    ('HKQuantityTypeIdentifierAppleExerciseTime',
+     lambda d: int(d.value_sum),
+     "🏃 Exercise Minutes - 7 Day Trend", "Minutes", "6_exercise_minutes.png",
+     '#16A085', 30, "🏃 Exercise Avg: {:.0f} min/day"),
+    ('HKQuantityTypeIdentifierActiveEnergyBurned',
+     lambda d: int(d.value_sum),
+     "🔥 Active Calories Burned - 7 Day Trend", "Calories (kcal)", "7_active_calories.png",
+     '#F39C12', 500, "🔥 Active Calories Avg: {:.0f} kcal"),
+]
+
 def get_connection():
-    """Connect to health database"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Connect to health database with up-to-date rollups"""
+    return health_rollup.connect(DB_PATH)
 
 def create_graph(title, dates, values, ylabel, filename, color='#4A90E2', target_line=None):
     """Create a matplotlib graph and save it."""
@@ -92,180 +126,25 @@ def main():
 
     print(f"📅 Period: {dates[0]} to {dates[-1]}\n")
 
-    # ==== GRAPH 1: HRV (Heart Rate Variability) ====
-    print("📊 1/7: HRV Trend...")
-    cursor = conn.execute("""
-        SELECT DATE(SUBSTR(start_date, 1, 10)) as date, AVG(value) as avg_hrv
-        FROM health_records
-        WHERE record_type = 'HKQuantityTypeIdentifierHeartRateVariabilitySDNN'
-        AND DATE(SUBSTR(start_date, 1, 10)) >= ?
-        AND DATE(SUBSTR(start_date, 1, 10)) <= ?
-        GROUP BY DATE(SUBSTR(start_date, 1, 10))
-        ORDER BY date
-    """, (dates[0], dates[-1]))
-
-    hrv_data = {row['date']: round(row['avg_hrv'], 1) if row['avg_hrv'] else None for row in cursor.fetchall()}
-    hrv_values = [hrv_data.get(d) for d in dates]
-
-    if any(v for v in hrv_values):
-        graph = create_graph(
-            "💓 Heart Rate Variability (HRV) - 7 Day Trend",
-            dates, hrv_values, "HRV (ms)", "1_hrv_trend.png", color='#E74C3C', target_line=60
-        )
-        if graph:
-            graphs.append(graph)
-            avg_hrv = np.mean([v for v in hrv_values if v])
-            stats.append(f"📈 HRV Avg: {avg_hrv:.1f} ms")
-
-    # ==== GRAPH 2: Sleep Duration ====
-    print("📊 2/7: Sleep Duration...")
-    cursor = conn.execute("""
-        SELECT DATE(SUBSTR(start_date, 1, 10)) as date, SUM(value) / 60.0 as hours
-        FROM health_records
-        WHERE record_type = 'HKCategoryTypeIdentifierSleepAnalysis'
-        AND DATE(SUBSTR(start_date, 1, 10)) >= ?
-        AND DATE(SUBSTR(start_date, 1, 10)) <= ?
-        GROUP BY DATE(SUBSTR(start_date, 1, 10))
-        ORDER BY date
-    """, (dates[0], dates[-1]))
-
-    sleep_data = {row['date']: round(row['hours'], 1) if row['hours'] else None for row in cursor.fetchall()}
-    sleep_values = [sleep_data.get(d) for d in dates]
-
-    if any(v for v in sleep_values):
-        graph = create_graph(
-            "😴 Sleep Duration - 7 Day Trend",
-            dates, sleep_values, "Hours", "2_sleep_duration.png", color='#9B59B6', target_line=8
-        )
-        if graph:
-            graphs.append(graph)
-            avg_sleep = np.mean([v for v in sleep_values if v])
-            stats.append(f"😴 Sleep Avg: {avg_sleep:.1f} hours")
-
-    # ==== GRAPH 3: Resting Heart Rate ====
-    print("📊 3/7: Resting Heart Rate...")
-    cursor = conn.execute("""
-        SELECT DATE(SUBSTR(start_date, 1, 10)) as date, AVG(value) as avg_rhr
-        FROM health_records
-        WHERE record_type = 'HKQuantityTypeIdentifierRestingHeartRate'
-        AND DATE(SUBSTR(start_date, 1, 10)) >= ?
-        AND DATE(SUBSTR(start_date, 1, 10)) <= ?
-        GROUP BY DATE(SUBSTR(start_date, 1, 10))
-        ORDER BY date
-    """, (dates[0], dates[-1]))
-
-    rhr_data = {row['date']: round(row['avg_rhr'], 0) if row['avg_rhr'] else None for row in cursor.fetchall()}
-    rhr_values = [rhr_data.get(d) for d in dates]
-
-    if any(v for v in rhr_values):
-        graph = create_graph(
-            "❤️ Resting Heart Rate - 7 Day Trend",
-            dates, rhr_values, "BPM", "3_resting_hr.png", color='#E67E22', target_line=60
-        )
-        if graph:
-            graphs.append(graph)
-            avg_rhr = np.mean([v for v in rhr_values if v])
-            stats.append(f"❤️ Resting HR Avg: {avg_rhr:.0f} bpm")
-
-    # ==== GRAPH 4: Daily Steps ====
-    print("📊 4/7: Daily Steps...")
-    cursor = conn.execute("""
-        SELECT DATE(SUBSTR(start_date, 1, 10)) as date, SUM(value) as total_steps
-        FROM health_records
-        WHERE record_type = 'HKQuantityTypeIdentifierStepCount'
-        AND DATE(SUBSTR(start_date, 1, 10)) >= ?
-        AND DATE(SUBSTR(start_date, 1, 10)) <= ?
-        GROUP BY DATE(SUBSTR(start_date, 1, 10))
-        ORDER BY date
-    """, (dates[0], dates[-1]))
-
-    steps_data = {row['date']: int(row['total_steps']) for row in cursor.fetchall()}
-    steps_values = [steps_data.get(d) for d in dates]
-
-    if any(v for v in steps_values):
-        graph = create_graph(
-            "🚶 Daily Steps - 7 Day Trend",
-            dates, steps_values, "Steps", "4_daily_steps.png", color='#3498DB', target_line=10000
-        )
-        if graph:
-            graphs.append(graph)
-            avg_steps = np.mean([v for v in steps_values if v])
-            stats.append(f"🚶 Steps Avg: {avg_steps:,.0f}")
-
-    # ==== GRAPH 5: Blood Oxygen ====
-    print("📊 5/7: Blood Oxygen...")
-    cursor = conn.execute("""
-        SELECT DATE(SUBSTR(start_date, 1, 10)) as date, AVG(value * 100) as avg_spo2
-        FROM health_records
-        WHERE record_type = 'HKQuantityTypeIdentifierOxygenSaturation'
-        AND DATE(SUBSTR(start_date, 1, 10)) >= ?
-        AND DATE(SUBSTR(start_date, 1, 10)) <= ?
-        GROUP BY DATE(SUBSTR(start_date, 1, 10))
-        ORDER BY date
-    """, (dates[0], dates[-1]))
-
-    spo2_data = {row['date']: round(row['avg_spo2'], 1) if row['avg_spo2'] else None for row in cursor.fetchall()}
-    spo2_values = [spo2_data.get(d) for d in dates]
-
-    if any(v for v in spo2_values):
-        graph = create_graph(
-            "🫁 Blood Oxygen Saturation - 7 Day Trend",
-            dates, spo2_values, "SpO2 (%)", "5_blood_oxygen.png", color='#1ABC9C', target_line=95
-        )
-        if graph:
-            graphs.append(graph)
-            avg_spo2 = np.mean([v for v in spo2_values if v])
-            stats.append(f"🫁 Blood O2 Avg: {avg_spo2:.1f}%")
-
-    # ==== GRAPH 6: Exercise Minutes ====
-    print("📊 6/7: Exercise Minutes...")
-    cursor = conn.execute("""
-        SELECT DATE(SUBSTR(start_date, 1, 10)) as date, SUM(value) as total_mins
-        FROM health_records
-        WHERE record_type = 'HKQuantityTypeIdentifierAppleExerciseTime'
-        AND DATE(SUBSTR(start_date, 1, 10)) >= ?
-        AND DATE(SUBSTR(start_date, 1, 10)) <= ?
-        GROUP BY DATE(SUBSTR(start_date, 1, 10))
-        ORDER BY date
-    """, (dates[0], dates[-1]))
-
-    exercise_data = {row['date']: int(row['total_mins']) for row in cursor.fetchall()}
-    exercise_values = [exercise_data.get(d) for d in dates]
-
-    if any(v for v in exercise_values):
-        graph = create_graph(
-            "🏃 Exercise Minutes - 7 Day Trend",
-            dates, exercise_values, "Minutes", "6_exercise_minutes.png", color='#16A085', target_line=30
-        )
-        if graph:
-            graphs.append(graph)
-            avg_exercise = np.mean([v for v in exercise_values if v])
-            stats.append(f"🏃 Exercise Avg: {avg_exercise:.0f} min/day")
-
-    # ==== GRAPH 7: Active Calories ====
-    print("📊 7/7: Active Calories...")
-    cursor = conn.execute("""
-        SELECT DATE(SUBSTR(start_date, 1, 10)) as date, SUM(value) as total_cals
-        FROM health_records
-        WHERE record_type = 'HKQuantityTypeIdentifierActiveEnergyBurned'
-        AND DATE(SUBSTR(start_date, 1, 10)) >= ?
-        AND DATE(SUBSTR(start_date, 1, 10)) <= ?
-        GROUP BY DATE(SUBSTR(start_date, 1, 10))
-        ORDER BY date
-    """, (dates[0], dates[-1]))
-
-    cal_data = {row['date']: int(row['total_cals']) for row in cursor.fetchall()}
-    cal_values = [cal_data.get(d) for d in dates]
-
-    if any(v for v in cal_values):
-        graph = create_graph(
-            "🔥 Active Calories Burned - 7 Day Trend",
-            dates, cal_values, "Calories (kcal)", "7_active_calories.png", color='#F39C12', target_line=500
-        )
-        if graph:
-            graphs.append(graph)
-            avg_cals = np.mean([v for v in cal_values if v])
-            stats.append(f"🔥 Active Calories Avg: {avg_cals:.0f} kcal")
+    # One rollup query for every metric
+    series = health_rollup.load_daily_metrics(
+        conn, [spec[0] for spec in GRAPHS], dates[0], dates[-1]
+    )
+
+    for i, (record_type, daily_value, title, ylabel, filename, color, target, stat) in enumerate(GRAPHS, 1):
+        print(f"📊 {i}/{len(GRAPHS)}: {title}...")
+        values = []
+        for d in dates:
+            agg = series[record_type].get(d)
+            values.append(daily_value(agg) if agg and agg.value_sum else None)
+
+        if any(v for v in values):
+            graph = create_graph(
+                title, dates, values, ylabel, filename, color=color, target_line=target
+            )
+            if graph:
+                graphs.append(graph)
+                stats.append(stat.format(np.mean([v for v in values if v])))
 
     conn.close()
 
@@ -2,24 +2,27 @@
 """
 Migration script to generate embeddings for existing images in the database.
 
-This script will:
-1. Find all images without embeddings that have accessible files
-2. Generate embeddings using the EmbeddingService
-3. Store embeddings in both the main database and vector database
-4. Provide progress reporting and error handling
+Runs an EmbeddingBackfill (src/services/embedding_backfill.py):
+1. Streams images without embeddings in id order (keyset pagination)
+2. Decodes and resizes image files in a process pool
+3. Embeds each page in one batch with the embedding runtime
+4. Commits each page's embeddings with a persisted cursor, so an
+   interrupted run resumes where it stopped (--reset starts over)
+5. Reports throughput and ETA after every page
 
 Usage:
     python scripts/generate_missing_embeddings.py --help
-    python scripts/generate_missing_embeddings.py --all
-    python scripts/generate_missing_embeddings.py --user-id 123456789
-    python scripts/generate_missing_embeddings.py --batch-size 5 --dry-run
+    python scripts/generate_missing_embeddings.py generate --all-users
+    python scripts/generate_missing_embeddings.py generate --user-id 123456789
+    python scripts/generate_missing_embeddings.py generate --all-users --batch-size 32 --workers 8
+    python scripts/generate_missing_embeddings.py generate --all-users --dry-run
 """
 
 import asyncio
 import logging
 import sys
 from pathlib import Path
-from typing import List, Optional
+from typing import Optional
 
 import typer
 from dotenv import load_dotenv
@@ -32,8 +35,7 @@ sys.path.insert(0, str(project_root))
 from src.core.database import get_db_session, init_database
 from src.models.image import Image
 from src.models.chat import Chat
-from src.services.embedding_service import get_embedding_service
-from src.core.vector_db import get_vector_db
+from src.services.embedding_backfill import BackfillProgress, EmbeddingBackfill
 
 # Set up logging
 logging.basicConfig(
@@ -45,48 +47,6 @@ logger = logging.getLogger(__name__)
 app = typer.Typer(help="Generate embeddings for existing images in the database")
 
 
-async def get_images_without_embeddings(user_id: Optional[int] = None) -> List[Image]:
-    """Get all images without embeddings that have accessible files"""
-    
-    async with get_db_session() as session:
-        # Base query for images without embeddings
-        query = select(Image).where(
-            Image.embedding.is_(None),
-            Image.processing_status == "completed"
-        )
-        
-        # Filter by user if specified
-        if user_id:
-            query = query.join(Image.chat).where(Chat.user_id == user_id)
-        
-        # Order by creation date (oldest first)
-        query = query.order_by(Image.created_at)
-        
-        result = await session.execute(query)
-        images = result.scalars().all()
-        
-        # Filter for images with accessible files
-        accessible_images = []
-        for image in images:
-            file_path = None
-            
-            # Check compressed_path first, then original_path
-            if hasattr(image, 'compressed_path') and image.compressed_path:
-                file_path = Path(image.compressed_path)
-            elif hasattr(image, 'original_path') and image.original_path:
-                file_path = Path(image.original_path)
-            elif hasattr(image, 'file_path') and image.file_path:
-                file_path = Path(image.file_path)
-            
-            if file_path and file_path.exists():
-                accessible_images.append(image)
-                logger.debug(f"Found accessible image: {image.id} at {file_path}")
-            else:
-                logger.warning(f"Image {image.id} has no accessible file path")
-        
-        return accessible_images
-
-
 async def get_embedding_statistics(user_id: Optional[int] = None) -> dict:
     """Get statistics about embeddings in the database"""
     
@@ -125,88 +85,13 @@ async def get_embedding_statistics(user_id: Optional[int] = None) -> dict:
         }
 
 
-async def process_images_batch(
-    images: List[Image], 
-    embedding_service, 
-    vector_db,
-    dry_run: bool = False
-) -> dict:
-    """Process a batch of images to generate embeddings"""
-    
-    results = {
-        "processed": 0,
-        "failed": 0,
-        "skipped": 0,
-        "errors": []
-    }
-    
-    for image in images:
-        try:
-            logger.info(f"Processing image {image.id} (file_id: {image.file_id})")
-            
-            # Find accessible file path
-            file_path = None
-            if hasattr(image, 'compressed_path') and image.compressed_path:
-                file_path = Path(image.compressed_path)
-            elif hasattr(image, 'original_path') and image.original_path:
-                file_path = Path(image.original_path)
-            elif hasattr(image, 'file_path') and image.file_path:
-                file_path = Path(image.file_path)
-            
-            if not file_path or not file_path.exists():
-                logger.warning(f"No accessible file for image {image.id}")
-                results["skipped"] += 1
-                continue
-            
-            if dry_run:
-                logger.info(f"DRY RUN: Would process {file_path}")
-                results["processed"] += 1
-                continue
-            
-            # Read image data
-            with open(file_path, 'rb') as f:
-                image_data = f.read()
-            
-            # Generate embedding
-            embedding_bytes = await embedding_service.generate_embedding(image_data)
-            
-            if not embedding_bytes:
-                logger.error(f"Failed to generate embedding for image {image.id}")
-                results["failed"] += 1
-                results["errors"].append(f"Image {image.id}: Embedding generation failed")
-                continue
-            
-            # Update database record
-            async with get_db_session() as session:
-                # Refresh the image object in this session
-                await session.refresh(image)
-                
-                # Update with embedding
-                image.embedding = embedding_bytes
-                image.embedding_model = embedding_service.model_name
-                
-                await session.commit()
-                
-                # Store in vector database
-                success = await vector_db.store_embedding(image.id, embedding_bytes)
-                if not success:
-                    logger.warning(f"Failed to store embedding in vector database for image {image.id}")
-            
-            logger.info(f"Successfully generated embedding for image {image.id}")
-            results["processed"] += 1
-            
-        except Exception as e:
-            logger.error(f"Error processing image {image.id}: {e}")
-            results["failed"] += 1
-            results["errors"].append(f"Image {image.id}: {str(e)}")
-    
-    return results
-
-
 @app.command()
 def generate(
     user_id: Optional[int] = typer.Option(None, help="Process images for specific user ID only"),
-    batch_size: int = typer.Option(10, help="Number of images to process in each batch"),
+    batch_size: Optional[int] = typer.Option(None, help="Images per page / model batch (default: limits.embedding_backfill_page_size)"),
+    workers: Optional[int] = typer.Option(None, help="Image decoding processes (default: limits.embedding_backfill_workers)"),
+    limit: Optional[int] = typer.Option(None, help="Stop after this many images (the next run continues)"),
+    reset: bool = typer.Option(False, help="Ignore the saved cursor and start from the first image"),
     dry_run: bool = typer.Option(False, help="Show what would be processed without making changes"),
     all_users: bool = typer.Option(False, help="Process images for all users"),
     env_file: str = typer.Option(".env.local", help="Environment file to load")
@@ -250,12 +135,10 @@ def generate(
             await init_database()
             typer.echo("✅ Database initialized")
             
-            # Get services
-            embedding_service = get_embedding_service()
-            vector_db = get_vector_db()
-            
+            scope_user_id = user_id if not all_users else None
+
             # Get statistics
-            stats = await get_embedding_statistics(user_id if not all_users else None)
+            stats = await get_embedding_statistics(scope_user_id)
             
             typer.echo(f"\n📊 Embedding Statistics:")
             if user_id:
@@ -270,66 +153,54 @@ def generate(
             if stats['without_embeddings'] == 0:
                 typer.echo("✅ All images already have embeddings!")
                 return
-            
-            # Get images without embeddings
-            typer.echo(f"\n🔍 Finding images without embeddings...")
-            images_to_process = await get_images_without_embeddings(user_id if not all_users else None)
-            
-            typer.echo(f"📋 Found {len(images_to_process)} images with accessible files to process")
-            
-            if len(images_to_process) == 0:
-                typer.echo("✅ No images need processing!")
-                return
-            
+
+            def report(progress: BackfillProgress):
+                typer.echo(f"   🔄 {progress.summary()}")
+
+            backfill = EmbeddingBackfill(
+                user_id=scope_user_id,
+                page_size=batch_size,
+                decode_workers=workers,
+                limit=limit,
+                on_progress=report,
+            )
+
             if dry_run:
+                cursor = 0 if reset else await backfill.load_cursor()
+                pending = await backfill.count_candidates(cursor)
                 typer.echo(f"\n🧪 DRY RUN MODE - No changes will be made")
-            
-            # Process in batches
-            total_results = {
-                "processed": 0,
-                "failed": 0,
-                "skipped": 0,
-                "errors": []
-            }
-            
-            for i in range(0, len(images_to_process), batch_size):
-                batch = images_to_process[i:i + batch_size]
-                batch_num = i // batch_size + 1
-                total_batches = (len(images_to_process) + batch_size - 1) // batch_size
-                
-                typer.echo(f"\n🔄 Processing batch {batch_num}/{total_batches} ({len(batch)} images)...")
-                
-                batch_results = await process_images_batch(
-                    batch, embedding_service, vector_db, dry_run
-                )
-                
-                # Aggregate results
-                for key in ['processed', 'failed', 'skipped']:
-                    total_results[key] += batch_results[key]
-                total_results['errors'].extend(batch_results['errors'])
-                
-                typer.echo(f"   ✅ Processed: {batch_results['processed']}")
-                typer.echo(f"   ❌ Failed: {batch_results['failed']}")
-                typer.echo(f"   ⏭️  Skipped: {batch_results['skipped']}")
-            
+                if cursor:
+                    typer.echo(f"   Saved cursor: resuming after image {cursor}")
+                typer.echo(f"   Would process {pending} images in pages of {backfill.page_size}")
+                return
+
+            typer.echo(f"\n🔄 Backfilling embeddings ({backfill.decode_workers} decode workers, pages of {backfill.page_size})...")
+            progress = await backfill.run(reset=reset)
+
+            if progress.resumed_from:
+                typer.echo(f"   ⏩ Resumed after image {progress.resumed_from}")
+
             # Final summary
             typer.echo(f"\n📈 Final Results:")
-            typer.echo(f"   ✅ Successfully processed: {total_results['processed']}")
-            typer.echo(f"   ❌ Failed: {total_results['failed']}")
-            typer.echo(f"   ⏭️  Skipped: {total_results['skipped']}")
+            typer.echo(f"   ✅ Successfully processed: {progress.embedded}")
+            typer.echo(f"   ❌ Failed: {progress.failed}")
+            typer.echo(f"   ⏭️  Skipped: {progress.skipped}")
+            typer.echo(f"   ⏱️  {progress.elapsed:.1f}s ({progress.images_per_second:.1f} images/s)")
             
-            if total_results['errors']:
+            if progress.errors:
                 typer.echo(f"\n❌ Errors encountered:")
-                for error in total_results['errors'][:10]:  # Show first 10 errors
+                for error in progress.errors[:10]:  # Show first 10 errors
                     typer.echo(f"   • {error}")
-                if len(total_results['errors']) > 10:
-                    typer.echo(f"   ... and {len(total_results['errors']) - 10} more errors")
+                if len(progress.errors) > 10:
+                    typer.echo(f"   ... and {len(progress.errors) - 10} more errors")
             
-            if not dry_run and total_results['processed'] > 0:
+            if progress.embedded > 0:
                 # Get updated statistics
-                updated_stats = await get_embedding_statistics(user_id if not all_users else None)
+                updated_stats = await get_embedding_statistics(scope_user_id)
                 typer.echo(f"\n📊 Updated Coverage: {updated_stats['coverage_percentage']:.1f}%")
                 typer.echo("✅ Embedding generation completed!")
+            elif progress.no_model:
+                typer.echo("⚠️  Nothing embedded: no embedding model loaded (install torch and sentence-transformers)")
             
         except Exception as e:
             typer.echo(f"❌ Error: {e}")
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Health Rollup - incremental per-day aggregates over health.db.
+
+The health reports only need one value per metric per day, but computing it
+with GROUP BY DATE(start_date) scans every raw record. This module keeps two
+small rollup tables inside health.db instead:
+
+- health_daily_metrics: count, sum, min, max and total duration per
+  (record_type, day)
+- health_daily_sleep: count and duration per (day, sleep stage value)
+
+A watermark (the highest health_records.id already rolled up) makes each
+refresh incremental: only (record_type, day) pairs touched by newer rows are
+recomputed, via the (record_type, start_date) index, in the same transaction
+that advances the watermark. Re-imported days are recomputed in full, so
+replaced records never double count. If the raw table shrinks below the
+watermark (re-created database), the rollups are rebuilt from scratch.
+
+Days are the local calendar date of start_date (its first 10 characters),
+matching how Apple Health exports timestamps.
+
+Usage:
+    python scripts/health_rollup.py            # incremental refresh
+    python scripts/health_rollup.py --rebuild  # recompute everything
+"""
+
+import argparse
+import sqlite3
+import sys
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DB_PATH = Path.home() / "data" / "health.db"
+
+SLEEP_RECORD_TYPE = "HKCategoryTypeIdentifierSleepAnalysis"
+
+# Timestamps look like "2026-02-06 23:29:00 +0100"; julianday() needs the
+# offset dropped, which is safe since start and end share it
+_DURATION_HOURS = (
+    "(julianday(substr(r.end_date, 1, 19)) "
+    "- julianday(substr(r.start_date, 1, 19))) * 24"
+)
+
+_SCHEMA = [
+    """
+    CREATE INDEX IF NOT EXISTS idx_health_records_type_start
+    ON health_records (record_type, start_date)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS health_daily_metrics (
+        record_type TEXT NOT NULL,
+        day TEXT NOT NULL,
+        sample_count INTEGER NOT NULL,
+        value_sum REAL,
+        value_min REAL,
+        value_max REAL,
+        duration_hours REAL,
+        PRIMARY KEY (record_type, day)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS health_daily_sleep (
+        day TEXT NOT NULL,
+        stage INTEGER NOT NULL,
+        sample_count INTEGER NOT NULL,
+        duration_hours REAL,
+        PRIMARY KEY (day, stage)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS health_rollup_state (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )
+    """,
+]
+
+# Raw rows for the affected (record_type, day) pairs, found by index range
+_AFFECTED_ROWS = """
+    FROM _rollup_affected a
+    JOIN health_records r
+      ON r.record_type = a.record_type
+     AND r.start_date >= a.day
+     AND r.start_date < date(a.day, '+1 day')
+"""
+
+
+@dataclass
+class DailyAggregate:
+    """One metric's rollup for one day."""
+
+    day: str
+    sample_count: int
+    value_sum: Optional[float]
+    value_min: Optional[float]
+    value_max: Optional[float]
+    duration_hours: Optional[float]
+
+    @property
+    def value_avg(self) -> Optional[float]:
+        if self.value_sum is None or not self.sample_count:
+            return None
+        return self.value_sum / self.sample_count
+
+    def value(self, aggregation: str = "avg") -> Optional[float]:
+        """Aggregate by name: avg, sum, min, max, count or duration."""
+        return {
+            "avg": self.value_avg,
+            "sum": self.value_sum,
+            "min": self.value_min,
+            "max": self.value_max,
+            "count": self.sample_count,
+            "duration": self.duration_hours,
+        }[aggregation.lower()]
+
+
+def connect(db_path: Path = None, refresh: bool = True) -> sqlite3.Connection:
+    """Open health.db and bring the rollups up to date.
+
+    Reports should open one connection with this and pass it to every query.
+    """
+    conn = sqlite3.connect(db_path or DB_PATH)
+    conn.row_factory = sqlite3.Row
+    if refresh:
+        refresh_rollups(conn)
+    return conn
+
+
+def _get_state(conn: sqlite3.Connection, key: str) -> Optional[str]:
+    row = conn.execute(
+        "SELECT value FROM health_rollup_state WHERE key = ?", (key,)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def _set_state(conn: sqlite3.Connection, key: str, value) -> None:
+    conn.execute(
+        "INSERT INTO health_rollup_state (key, value) VALUES (?, ?) "
+        "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+        (key, None if value is None else str(value)),
+    )
+
+
+def refresh_rollups(conn: sqlite3.Connection, rebuild: bool = False) -> int:
+    """Roll up health_records added since the watermark.
+
+    Returns the number of (record_type, day) pairs recomputed.
+    """
+    with conn:
+        for statement in _SCHEMA:
+            conn.execute(statement)
+
+        watermark = int(_get_state(conn, "last_record_id") or 0)
+        max_id = conn.execute("SELECT MAX(id) FROM health_records").fetchone()[0] or 0
+        if rebuild or max_id < watermark:
+            conn.execute("DELETE FROM health_daily_metrics")
+            conn.execute("DELETE FROM health_daily_sleep")
+            watermark = 0
+        if max_id == watermark:
+            return 0
+
+        conn.execute("DROP TABLE IF EXISTS temp._rollup_affected")
+        conn.execute(
+            """
+            CREATE TEMP TABLE _rollup_affected AS
+            SELECT DISTINCT record_type, substr(start_date, 1, 10) AS day
+            FROM health_records
+            WHERE id > ? AND id <= ? AND start_date IS NOT NULL
+            """,
+            (watermark, max_id),
+        )
+        affected = conn.execute("SELECT count(*) FROM _rollup_affected").fetchone()[0]
+
+        conn.execute("""
+            DELETE FROM health_daily_metrics
+            WHERE (record_type, day) IN (SELECT record_type, day FROM _rollup_affected)
+            """)
+        conn.execute(f"""
+            INSERT INTO health_daily_metrics
+            SELECT a.record_type, a.day, count(*), sum(r.value), min(r.value),
+                   max(r.value), sum({_DURATION_HOURS})
+            {_AFFECTED_ROWS}
+            GROUP BY a.record_type, a.day
+            """)
+
+        conn.execute(
+            """
+            DELETE FROM health_daily_sleep
+            WHERE day IN (
+                SELECT day FROM _rollup_affected WHERE record_type = ?
+            )
+            """,
+            (SLEEP_RECORD_TYPE,),
+        )
+        conn.execute(
+            f"""
+            INSERT INTO health_daily_sleep
+            SELECT a.day, CAST(r.value AS INTEGER), count(*),
+                   sum({_DURATION_HOURS})
+            {_AFFECTED_ROWS}
+            WHERE a.record_type = ? AND r.value IS NOT NULL
+            GROUP BY a.day, CAST(r.value AS INTEGER)
+            """,
+            (SLEEP_RECORD_TYPE,),
+        )
+
+        latest = conn.execute(
+            "SELECT MAX(start_date) FROM health_records WHERE id > ?", (watermark,)
+        ).fetchone()[0]
+        previous = _get_state(conn, "latest_start_date") if watermark else None
+        if previous is None or (latest is not None and latest > previous):
+            _set_state(conn, "latest_start_date", latest)
+        _set_state(conn, "last_record_id", max_id)
+        conn.execute("DROP TABLE temp._rollup_affected")
+
+    return affected
+
+
+def _day_range(days: int, end: date = None) -> Tuple[str, str]:
+    """First and last day of a window of ``days`` days ending on ``end``."""
+    end = end or date.today()
+    return (end - timedelta(days=days - 1)).isoformat(), end.isoformat()
+
+
+def load_daily_metrics(
+    conn: sqlite3.Connection,
+    record_types: Iterable[str],
+    start_day: str,
+    end_day: str,
+) -> Dict[str, Dict[str, DailyAggregate]]:
+    """Rollups for several metrics in one query: {record_type: {day: agg}}."""
+    record_types = list(record_types)
+    series: Dict[str, Dict[str, DailyAggregate]] = {t: {} for t in record_types}
+    if not record_types:
+        return series
+    placeholders = ", ".join("?" * len(record_types))
+    rows = conn.execute(
+        f"""
+        SELECT record_type, day, sample_count, value_sum, value_min, value_max,
+               duration_hours
+        FROM health_daily_metrics
+        WHERE record_type IN ({placeholders}) AND day BETWEEN ? AND ?
+        ORDER BY record_type, day
+        """,
+        (*record_types, start_day, end_day),
+    )
+    for row in rows:
+        series[row[0]][row[1]] = DailyAggregate(*tuple(row)[1:])
+    return series
+
+
+def daily_values(
+    conn: sqlite3.Connection,
+    record_type: str,
+    days: int = 7,
+    aggregation: str = "avg",
+    end: date = None,
+) -> List[Tuple[str, float]]:
+    """(day, value) pairs for one metric over the last ``days`` days."""
+    start_day, end_day = _day_range(days, end)
+    series = load_daily_metrics(conn, [record_type], start_day, end_day)
+    return [
+        (day, value)
+        for day, agg in series[record_type].items()
+        if (value := agg.value(aggregation)) is not None
+    ]
+
+
+def daily_sleep_hours(
+    conn: sqlite3.Connection,
+    stages: Optional[Iterable[int]] = None,
+    days: int = 7,
+    end: date = None,
+) -> List[Tuple[str, float]]:
+    """(day, hours) pairs of sleep in the given stages (all if None)."""
+    start_day, end_day = _day_range(days, end)
+    query = (
+        "SELECT day, sum(duration_hours) FROM health_daily_sleep "
+        "WHERE day BETWEEN ? AND ?"
+    )
+    params: list = [start_day, end_day]
+    if stages is not None:
+        stages = list(stages)
+        query += f" AND stage IN ({', '.join('?' * len(stages))})"
+        params.extend(stages)
+    query += " GROUP BY day ORDER BY day"
+    return [(day, hours) for day, hours in conn.execute(query, params) if hours]
+
+
+def latest_record_timestamp(conn: sqlite3.Connection) -> Optional[str]:
+    """start_date of the newest record, tracked during refresh."""
+    return _get_state(conn, "latest_start_date")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", type=Path, default=DB_PATH)
+    parser.add_argument("--rebuild", action="store_true", help="recompute all rollups")
+    args = parser.parse_args()
+
+    if not args.db.exists():
+        print(f"Health database not found: {args.db}")
+        return 1
+    conn = connect(args.db, refresh=False)
+    try:
+        updated = refresh_rollups(conn, rebuild=args.rebuild)
+    finally:
+        conn.close()
+    print(f"Rolled up {updated} metric-day(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Proactive Task Daemon
+
+Runs registered proactive tasks concurrently instead of one launchd job per
+task. Each task runs in its own ``task_runner run <task_id>`` process, so
+tasks that block on subprocesses do not hold each other up and a budget can
+be enforced per task.
+
+Registry keys (task_registry.yaml):
+    settings.max_parallel_tasks   tasks running at once (default 2)
+    tasks.<id>.depends_on         task ids that must succeed first
+    tasks.<id>.budget.timeout_seconds
+                                  wall-clock limit; the process is killed
+    tasks.<id>.budget.cpu_seconds CPU-time limit (RLIMIT_CPU) for the task
+                                  process and each process it starts
+    tasks.<id>.schedule.also      further daily {hour, minute} runs
+
+In daemon mode each due batch runs in the background while the schedule
+keeps advancing from the previous wake time, so a slow batch never makes
+the daemon skip slots that fall while it runs. A task still running when
+its next slot comes up is not started twice.
+
+Every run is recorded in the task ledger (task_run_logs) with its start and
+end time and how long it waited for a free slot, under a ledger task of
+type ``proactive:<task_id>``.
+
+Usage:
+    python -m scripts.proactive_tasks.task_daemon run ai-coding-tools-research architecture-review
+    python -m scripts.proactive_tasks.task_daemon daemon
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import resource
+import signal
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.proactive_tasks.task_runner import load_registry  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PARALLEL = 2
+TERMINATE_GRACE_SECONDS = 5.0
+
+
+@dataclass
+class TaskBudget:
+    """Resource limits for one task run (None means unlimited)."""
+
+    timeout_seconds: Optional[float] = None
+    cpu_seconds: Optional[int] = None
+
+    @classmethod
+    def from_config(cls, task_config: Dict[str, Any]) -> "TaskBudget":
+        budget = task_config.get("budget") or {}
+        return cls(
+            timeout_seconds=budget.get("timeout_seconds"),
+            cpu_seconds=budget.get("cpu_seconds"),
+        )
+
+
+@dataclass
+class TaskRun:
+    """Outcome and timings of one task run."""
+
+    task_id: str
+    status: str = "error"  # success / error / timeout (TaskRunStatus values)
+    message: str = ""
+    ready_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    skipped: bool = False
+
+    @property
+    def success(self) -> bool:
+        return self.status == "success"
+
+    @property
+    def queue_wait_seconds(self) -> Optional[float]:
+        if self.ready_at is None or self.started_at is None:
+            return None
+        return (self.started_at - self.ready_at).total_seconds()
+
+    @property
+    def duration_seconds(self) -> Optional[float]:
+        if self.started_at is None or self.completed_at is None:
+            return None
+        return (self.completed_at - self.started_at).total_seconds()
+
+
+# (task_id, budget) -> (status, message)
+TaskExecutor = Callable[[str, TaskBudget], Awaitable[tuple]]
+
+
+def _cpu_limiter(cpu_seconds: Optional[int]) -> Optional[Callable[[], None]]:
+    if not cpu_seconds:
+        return None
+
+    def apply_limit() -> None:
+        # SIGXCPU at the soft limit, SIGKILL shortly after
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 5))
+
+    return apply_limit
+
+
+async def _stop_process_group(process: asyncio.subprocess.Process) -> None:
+    """SIGTERM the task's process group, SIGKILL whatever outlives the grace."""
+    _signal_group(process, signal.SIGTERM)
+    try:
+        await asyncio.wait_for(process.wait(), TERMINATE_GRACE_SECONDS)
+    except asyncio.TimeoutError:
+        pass
+    # Children the task started may outlive it; kill the whole group
+    _signal_group(process, signal.SIGKILL)
+    await process.wait()
+
+
+def _signal_group(process: asyncio.subprocess.Process, sig: int) -> None:
+    try:
+        os.killpg(process.pid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def run_process(cmd: List[str], budget: TaskBudget) -> tuple:
+    """Run a command under ``budget``. Returns (status, message).
+
+    The command gets its own session, so on timeout or cancellation the
+    processes it started are stopped along with it.
+    """
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        cwd=str(PROJECT_ROOT),
+        preexec_fn=_cpu_limiter(budget.cpu_seconds),
+        start_new_session=True,
+    )
+    try:
+        returncode = await asyncio.wait_for(
+            process.wait(), timeout=budget.timeout_seconds
+        )
+    except asyncio.TimeoutError:
+        await _stop_process_group(process)
+        return "timeout", f"exceeded {budget.timeout_seconds}s time budget"
+    except asyncio.CancelledError:
+        await _stop_process_group(process)
+        raise
+
+    if returncode == 0:
+        return "success", "completed"
+    if budget.cpu_seconds and returncode in (-24, -9):  # SIGXCPU / SIGKILL
+        return "timeout", f"exceeded {budget.cpu_seconds}s CPU budget"
+    return "error", f"exited with code {returncode}"
+
+
+async def run_task_process(task_id: str, budget: TaskBudget) -> tuple:
+    """Run one registered task in its own task_runner process."""
+    cmd = [sys.executable, "-m", "scripts.proactive_tasks.task_runner", "run"]
+    return await run_process(cmd + [task_id], budget)
+
+
+def resolve_dependencies(
+    task_ids: List[str],
+    tasks: Dict[str, Any],
+    include_dependencies: bool = True,
+) -> Dict[str, List[str]]:
+    """Map each task to run onto the dependencies it must wait for.
+
+    With ``include_dependencies`` the dependencies themselves are added to
+    the run; otherwise dependencies outside ``task_ids`` are ignored (they
+    run on their own schedule).
+
+    Raises:
+        ValueError: For unknown tasks or dependency cycles.
+    """
+    graph: Dict[str, List[str]] = {}
+    pending = list(task_ids)
+    while pending:
+        task_id = pending.pop()
+        if task_id in graph:
+            continue
+        if task_id not in tasks:
+            raise ValueError(f"Unknown task: {task_id}")
+        depends_on = list(tasks[task_id].get("depends_on") or [])
+        if include_dependencies:
+            pending.extend(depends_on)
+        graph[task_id] = depends_on
+
+    if not include_dependencies:
+        graph = {t: [d for d in deps if d in graph] for t, deps in graph.items()}
+    for deps in graph.values():
+        for dep in deps:
+            if dep not in tasks:
+                raise ValueError(f"Unknown dependency: {dep}")
+
+    # Depth-first cycle check
+    state: Dict[str, int] = {}
+
+    def visit(task_id: str, path: List[str]) -> None:
+        if state.get(task_id) == 2:
+            return
+        if state.get(task_id) == 1:
+            raise ValueError(f"Dependency cycle: {' -> '.join(path + [task_id])}")
+        state[task_id] = 1
+        for dep in graph[task_id]:
+            visit(dep, path + [task_id])
+        state[task_id] = 2
+
+    for task_id in graph:
+        visit(task_id, [])
+    return graph
+
+
+async def record_run(run: TaskRun, task_config: Dict[str, Any]) -> None:
+    """Write a finished run to the task ledger."""
+    from src.services.task_ledger_service import get_task_ledger_service
+
+    chat_id = (task_config.get("telegram") or {}).get("chat_id") or (
+        task_config.get("config") or {}
+    ).get("chat_id", 0)
+    ledger = get_task_ledger_service()
+    try:
+        task = await ledger.ensure_task(chat_id, f"proactive:{run.task_id}")
+        await ledger.log_run(
+            task.id,
+            run.status,
+            result_summary=run.message if run.success else None,
+            error_message=None if run.success else run.message,
+            started_at=run.started_at,
+            completed_at=run.completed_at,
+            queue_wait_seconds=run.queue_wait_seconds,
+        )
+    except Exception as e:
+        logger.error(f"Failed to record run of {run.task_id} in ledger: {e}")
+
+
+async def run_tasks(
+    task_ids: List[str],
+    registry: Dict[str, Any],
+    max_parallel: Optional[int] = None,
+    include_dependencies: bool = True,
+    executor: TaskExecutor = run_task_process,
+    recorder: Optional[Callable[[TaskRun, Dict[str, Any]], Awaitable[None]]] = None,
+) -> Dict[str, TaskRun]:
+    """Run tasks concurrently, honouring dependencies and budgets.
+
+    A task starts once all its dependencies have succeeded and a slot is
+    free; if a dependency fails the task is skipped. Returns one TaskRun
+    per task.
+    """
+    tasks = registry.get("tasks", {})
+    graph = resolve_dependencies(task_ids, tasks, include_dependencies)
+    if max_parallel is None:
+        max_parallel = registry.get("settings", {}).get(
+            "max_parallel_tasks", DEFAULT_MAX_PARALLEL
+        )
+    slots = asyncio.Semaphore(max(1, max_parallel))
+    done: Dict[str, asyncio.Future] = {
+        task_id: asyncio.get_running_loop().create_future() for task_id in graph
+    }
+    runs: Dict[str, TaskRun] = {}
+
+    async def run_one(task_id: str) -> None:
+        run = runs[task_id] = TaskRun(task_id=task_id)
+        try:
+            failed = [dep for dep in graph[task_id] if not await done[dep]]
+            if failed:
+                run.skipped = True
+                run.message = f"skipped: dependency failed ({', '.join(failed)})"
+                logger.warning(f"Task {task_id} {run.message}")
+                return
+
+            task_config = tasks[task_id]
+            if not task_config.get("enabled", True):
+                run.skipped = True
+                run.message = "skipped: disabled in registry"
+                return
+
+            run.ready_at = datetime.now(timezone.utc)
+            async with slots:
+                run.started_at = datetime.now(timezone.utc)
+                logger.info(
+                    f"Starting {task_id} (waited {run.queue_wait_seconds:.1f}s)"
+                )
+                try:
+                    run.status, run.message = await executor(
+                        task_id, TaskBudget.from_config(task_config)
+                    )
+                except Exception as e:
+                    run.status, run.message = "error", str(e)
+                run.completed_at = datetime.now(timezone.utc)
+
+            logger.info(
+                f"Task {task_id} {run.status} in {run.duration_seconds:.1f}s: "
+                f"{run.message}"
+            )
+            if recorder is not None:
+                await recorder(run, task_config)
+        finally:
+            done[task_id].set_result(run.success)
+
+    await asyncio.gather(*(run_one(task_id) for task_id in graph))
+    return runs
+
+
+def next_run_time(schedule: Dict[str, Any], after: datetime) -> datetime:
+    """Next daily occurrence of ``schedule`` after ``after``.
+
+    The schedule's hour/minute is one daily time; each entry of its
+    optional ``also`` list is another.
+    """
+    times = [schedule, *(schedule.get("also") or [])]
+    candidates = []
+    for time_of_day in times:
+        at = after.replace(
+            hour=time_of_day.get("hour", 0),
+            minute=time_of_day.get("minute", 0),
+            second=0,
+            microsecond=0,
+        )
+        if at <= after:
+            at += timedelta(days=1)
+        candidates.append(at)
+    return min(candidates)
+
+
+def next_batch(
+    tasks: Dict[str, Any], after: datetime
+) -> Optional[tuple[datetime, List[str]]]:
+    """Earliest scheduled time after ``after`` and the tasks due then."""
+    upcoming = {
+        task_id: next_run_time(config["schedule"], after)
+        for task_id, config in tasks.items()
+        if config.get("enabled", True) and config.get("schedule")
+    }
+    if not upcoming:
+        return None
+    wake_at = min(upcoming.values())
+    return wake_at, sorted(t for t, at in upcoming.items() if at == wake_at)
+
+
+async def run_daemon(registry: Dict[str, Any]) -> None:
+    """Sleep until the next scheduled task(s), start them together, repeat."""
+    from src.core.database import init_database
+
+    await init_database()
+    tasks = registry.get("tasks", {})
+    batches: Dict[asyncio.Task, List[str]] = {}
+
+    after = datetime.now()
+    while True:
+        batch = next_batch(tasks, after)
+        if batch is None:
+            logger.warning("No enabled scheduled tasks, daemon exiting")
+            return
+
+        wake_at, due = batch
+        logger.info(f"Next run at {wake_at:%Y-%m-%d %H:%M}: {', '.join(due)}")
+        await asyncio.sleep(max(0.0, (wake_at - datetime.now()).total_seconds()))
+        # Advance from the slot, not the clock, so no slot is ever skipped
+        after = wake_at
+
+        busy = {t for running in batches.values() for t in running}
+        for task_id in sorted(busy.intersection(due)):
+            logger.warning(f"Task {task_id} is still running, skipping this slot")
+        due = [t for t in due if t not in busy]
+        if not due:
+            continue
+
+        runner = asyncio.create_task(
+            run_tasks(due, registry, include_dependencies=False, recorder=record_run)
+        )
+        batches[runner] = due
+        runner.add_done_callback(lambda done: batches.pop(done, None))
+
+
+async def _run_once(task_ids: List[str], registry: Dict[str, Any]) -> int:
+    from src.core.database import init_database
+
+    await init_database()
+    runs = await run_tasks(task_ids, registry, recorder=record_run)
+    for run in runs.values():
+        timing = (
+            f"{run.duration_seconds:.1f}s, waited {run.queue_wait_seconds:.1f}s"
+            if run.started_at
+            else "not started"
+        )
+        print(f"  {run.task_id}: {run.status} ({timing}) {run.message}")
+    return 0 if all(run.success for run in runs.values()) else 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    parser = argparse.ArgumentParser(
+        description="Proactive Task Daemon - run tasks concurrently with budgets"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser(
+        "run", help="Run tasks (and their dependencies) now"
+    )
+    run_parser.add_argument("task_ids", nargs="+", help="Task identifiers")
+    subparsers.add_parser("daemon", help="Run tasks on their registry schedule")
+
+    args = parser.parse_args(argv)
+    registry = load_registry()
+
+    try:
+        if args.command == "run":
+            return asyncio.run(_run_once(args.task_ids, registry))
+        asyncio.run(run_daemon(registry))
+        return 0
+    except KeyboardInterrupt:
+        return 0
+    except Exception as e:
+        logger.exception(f"Task daemon failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -112,8 +112,9 @@ def list_tasks(registry: Dict[str, Any]) -> None:
         schedule = task_config.get("schedule", {})
 
         status = "[enabled]" if enabled else "[disabled]"
-        schedule_str = (
-            f"{schedule.get('hour', '?'):02d}:{schedule.get('minute', '?'):02d}"
+        schedule_str = ", ".join(
+            f"{at.get('hour', '?'):02d}:{at.get('minute', '?'):02d}"
+            for at in [schedule, *(schedule.get("also") or [])]
         )
 
         print(f"\n  {task_id} {status}")
@@ -694,23 +694,31 @@ modification date: [[{today_str}]]
         files.append(markdown_path)
         outputs["markdown_path"] = str(markdown_path)
 
-        # Step 2: Enrich with images
-        self._enrich_with_images(markdown_path, images_dir)
+        # Summary is read before image enrichment rewrites the note
+        summary = self._generate_summary(markdown_path, topic)
+
+        # Steps 2-4 run side by side. Images and PDF stay in order since the
+        # PDF embeds the images; the subprocess-based steps run in threads.
+        async def render_pdf() -> bool:
+            # Step 2: Enrich with images
+            await asyncio.to_thread(self._enrich_with_images, markdown_path, images_dir)
+            # Step 3: Generate PDF
+            return await asyncio.to_thread(self._generate_pdf, markdown_path, pdf_path)
+
+        pdf_ok, _, _ = await asyncio.gather(
+            render_pdf(),
+            # Step 4: Link to daily page
+            asyncio.to_thread(self._link_to_daily_page, markdown_path, topic),
+            self._send_telegram_message(summary),
+        )
 
-        # Step 3: Generate PDF
-        if self._generate_pdf(markdown_path, pdf_path):
+        if pdf_ok:
             files.append(pdf_path)
             outputs["pdf_path"] = str(pdf_path)
         else:
             errors.append("PDF generation failed (non-fatal)")
 
-        # Step 4: Link to daily page
-        self._link_to_daily_page(markdown_path, topic)
-
-        # Step 5: Send via Telegram
-        summary = self._generate_summary(markdown_path, topic)
-        await self._send_telegram_message(summary)
-
+        # Step 5: Send the PDF via Telegram
         if pdf_path.exists():
             await self._send_telegram_document(
                 pdf_path,
@@ -8,6 +8,7 @@ and extract specific patterns for feature development.
 
 import argparse
 import json
+import re
 import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -46,6 +47,40 @@ class ConversationQuery:
 
         return [dict(row) for row in results]
 
+    def search_transcripts(
+        self, query: str, chat_id: Optional[int] = None, limit: int = 20
+    ) -> List[dict]:
+        """Full-text search over archived transcripts (FTS5, BM25-ranked).
+
+        Uses the conversation_archive_fts index maintained by the bot; each
+        word is quoted so FTS5 syntax in the query is treated as text.
+        """
+        match = " ".join(f'"{word}"' for word in re.findall(r"\w+", query))
+        if not match:
+            return []
+        cursor = self.conn.cursor()
+        sql = """
+            SELECT
+                chat_id,
+                session_id,
+                archive,
+                role,
+                archived_at,
+                snippet(conversation_archive_fts, 0, '[', ']', '...', 16) AS snippet,
+                bm25(conversation_archive_fts) AS score
+            FROM conversation_archive_fts
+            WHERE conversation_archive_fts MATCH ?
+        """
+        params: list = [match]
+        if chat_id is not None:
+            sql += " AND chat_id = ?"
+            params.append(chat_id)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+        results = cursor.execute(sql, params).fetchall()
+
+        return [dict(row) for row in results]
+
     def get_sessions_by_date_range(self, start_date: str, end_date: str) -> List[dict]:
         """Get sessions within a date range."""
         cursor = self.conn.cursor()
@@ -230,6 +265,14 @@ def main():
     search_parser.add_argument("keyword", help="Keyword to search for")
     search_parser.add_argument("--limit", type=int, default=20, help="Max results")
 
+    # Transcript full-text search
+    transcripts_parser = subparsers.add_parser(
+        "transcripts", help="Full-text search archived transcripts"
+    )
+    transcripts_parser.add_argument("query", help="Words to search for")
+    transcripts_parser.add_argument("--chat-id", type=int, help="Telegram chat ID")
+    transcripts_parser.add_argument("--limit", type=int, default=20, help="Max results")
+
     # Date range command
     date_parser = subparsers.add_parser("date-range", help="Get sessions by date range")
     date_parser.add_argument("start", help="Start date (YYYY-MM-DD)")
@@ -268,6 +311,15 @@ def main():
                 print(f"   Prompt: {r['last_prompt'][:100]}...")
                 print()
 
+        elif args.command == "transcripts":
+            results = query.search_transcripts(args.query, args.chat_id, args.limit)
+            print(f"\n🔍 Found {len(results)} turns matching '{args.query}':\n")
+            for i, r in enumerate(results, 1):
+                print(f"{i}. [{r['archived_at']}] chat {r['chat_id']} ({r['role']})")
+                print(f"   Archive: {r['archive']}")
+                print(f"   {r['snippet']}")
+                print()
+
         elif args.command == "date-range":
             results = query.get_sessions_by_date_range(args.start, args.end)
             print(f"\n📅 Found {len(results)} sessions between {args.start} and {args.end}:\n")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""CLI entry point for restoring a database backup.
+
+Rebuilds the database at any backup point by applying incremental backups
+on top of their full snapshot.
+
+Usage:
+    python scripts/restore_db_backup.py --list [--backup-dir DIR]
+    python scripts/restore_db_backup.py --target restored.db [--point NAME]
+    python scripts/restore_db_backup.py --target restored.db --at 20250101_120000
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Ensure project root is on sys.path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.services.database_backup_service import (  # noqa: E402
+    list_backup_points,
+    restore,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Restore the bot SQLite database")
+    parser.add_argument(
+        "--backup-dir",
+        type=Path,
+        default=project_root / "data" / "backups",
+        help="Backup directory (default: data/backups/)",
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="List available backup points"
+    )
+    parser.add_argument("--target", type=Path, help="Database file to write")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--point", help="Backup file name to restore")
+    group.add_argument(
+        "--at",
+        help="Restore the latest backup at or before YYYYMMDD_HHMMSS",
+    )
+    args = parser.parse_args()
+
+    if args.list:
+        for when, path in list_backup_points(args.backup_dir):
+            print(f"{when.isoformat(sep=' ')}  {path.name}")
+        return
+
+    if args.target is None:
+        parser.error("--target is required unless --list is given")
+
+    point = args.point
+    if args.at:
+        point = datetime.strptime(args.at, "%Y%m%d_%H%M%S")
+
+    result = restore(args.backup_dir, args.target, point=point)
+    if result is None:
+        print("Restore failed", file=sys.stderr)
+        sys.exit(1)
+    print(f"Restored: {result}")
+
+
+if __name__ == "__main__":
+    main()
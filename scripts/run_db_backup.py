@@ -3,6 +3,7 @@
 
 Usage:
     python scripts/run_db_backup.py [--backup-dir DIR] [--keep N]
+    python scripts/run_db_backup.py --incremental [--full-every N]
 
 Intended to be called from launchd or cron.
 """
@@ -30,11 +31,27 @@ def main() -> None:
         "--keep",
         type=int,
         default=7,
-        help="Number of backups to retain (default: 7)",
+        help="Number of full backups to retain (default: 7)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Store only pages changed since the previous backup",
+    )
+    parser.add_argument(
+        "--full-every",
+        type=int,
+        default=24,
+        help="Take a new full snapshot after N incrementals (default: 24)",
     )
     args = parser.parse_args()
 
-    result = run_backup(backup_dir=args.backup_dir, keep=args.keep)
+    result = run_backup(
+        backup_dir=args.backup_dir,
+        keep=args.keep,
+        incremental=args.incremental,
+        full_every=args.full_every,
+    )
     if result is None:
         print("Backup failed", file=sys.stderr)
         sys.exit(1)
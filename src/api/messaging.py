@@ -2,7 +2,7 @@ import hmac
 import logging
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
 from pydantic import BaseModel
 from sqlalchemy import select
 
@@ -127,6 +127,18 @@ class AdminContactResponse(BaseModel):
         from_attributes = True
 
 
+class SearchHitResponse(BaseModel):
+    source: str
+    chat_id: int
+    snippet: str
+    rank: float
+    timestamp: Optional[str] = None
+    role: Optional[str] = None
+    message_id: Optional[int] = None
+    session_id: Optional[str] = None
+    archive: Optional[str] = None
+
+
 @router.post(
     "/send", response_model=SendMessageResponse, dependencies=[Depends(verify_api_key)]
 )
@@ -274,3 +286,26 @@ async def toggle_contact_active(contact_id: int) -> AdminContactResponse:
 
         logger.info(f"Toggled contact {contact.name} active={contact.active}")
         return AdminContactResponse.model_validate(contact)
+
+
+@router.get(
+    "/search",
+    response_model=List[SearchHitResponse],
+    dependencies=[Depends(verify_api_key)],
+)
+async def search_conversations_endpoint(
+    q: str = Query(..., min_length=1, max_length=500),
+    chat_id: Optional[int] = None,
+    source: Optional[str] = Query(None, pattern="^(messages|archives)$"),
+    limit: int = Query(20, ge=1, le=100),
+) -> List[SearchHitResponse]:
+    """Full-text search over persisted messages and archived Claude sessions."""
+    from ..services.conversation_search import ALL_SOURCES, search_conversations
+
+    hits = await search_conversations(
+        q,
+        chat_id=chat_id,
+        sources=(source,) if source else ALL_SOURCES,
+        limit=limit,
+    )
+    return [SearchHitResponse(**hit.to_dict()) for hit in hits]
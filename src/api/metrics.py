@@ -18,6 +18,8 @@ from prometheus_client import (
     Histogram,
     generate_latest,
 )
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +62,69 @@ BOT_UPTIME = Gauge(
     registry=REGISTRY,
 )
 
+
+class _BackupStatusCollector(Collector):
+    """Backup metrics read from backup_status.json at scrape time.
+
+    Backups run from cron in a separate process, so their metrics are
+    persisted by database_backup_service and exported from here.
+    """
+
+    def describe(self):
+        # Nothing to describe up front; avoids reading the file on register
+        return []
+
+    def collect(self):
+        from ..services.database_backup_service import read_backup_status
+
+        status = read_backup_status()
+        runs = CounterMetricFamily(
+            "db_backups",
+            "Database backups by kind (full/incremental) and status",
+            labels=["kind", "status"],
+        )
+        for key, count in status.get("counts", {}).items():
+            kind, _, outcome = key.partition(":")
+            runs.add_metric([kind, outcome], count)
+        yield runs
+
+        last_success = status.get("last_success", {})
+        gauges = {
+            "duration_seconds": GaugeMetricFamily(
+                "db_backup_last_duration_seconds",
+                "Duration of the most recent successful backup in seconds",
+                labels=["kind"],
+            ),
+            "size_bytes": GaugeMetricFamily(
+                "db_backup_last_size_bytes",
+                "Compressed size of the most recent backup in bytes",
+                labels=["kind"],
+            ),
+            "throughput": GaugeMetricFamily(
+                "db_backup_last_throughput_bytes_per_second",
+                "Source bytes processed per second by the most recent backup",
+                labels=["kind"],
+            ),
+            "finished_at": GaugeMetricFamily(
+                "db_backup_last_success_timestamp_seconds",
+                "Unix time the most recent successful backup finished",
+                labels=["kind"],
+            ),
+        }
+        for kind, run in last_success.items():
+            duration = run.get("duration_seconds", 0.0)
+            gauges["duration_seconds"].add_metric([kind], duration)
+            gauges["size_bytes"].add_metric([kind], run.get("size_bytes", 0))
+            if duration > 0:
+                gauges["throughput"].add_metric(
+                    [kind], run.get("source_bytes", 0) / duration
+                )
+            gauges["finished_at"].add_metric([kind], run.get("finished_at", 0.0))
+        yield from gauges.values()
+
+
+REGISTRY.register(_BackupStatusCollector())
+
 _start_time = time.monotonic()
 
 
@@ -362,6 +362,11 @@ class TelegramBot:
 
         self.application.add_handler(CommandHandler("memory", memory_command))
 
+        # Search — full-text search over chat history and Claude archives
+        from .handlers.search_commands import search_command
+
+        self.application.add_handler(CommandHandler("search", search_command))
+
         # Language selection
         from .handlers.language_commands import language_command
 
@@ -691,6 +696,7 @@ class TelegramBot:
             BotCommand("meta", "Claude prompt in bot project dir"),
             BotCommand("research", "Deep web research with Claude"),
             BotCommand("tasks", "List Claude Code background tasks"),
+            BotCommand("search", "Search chat history and Claude sessions"),
             BotCommand("opencode", "Send prompt to OpenCode agent"),
             # Collect
             BotCommand("collect", "Batch collect items for processing"),
@@ -1,8 +1,11 @@
 import hashlib
 import json
 import logging
+import re
 import time
-from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -23,27 +26,94 @@ def get_db_session():
 class CallbackDataManager:
     """Manages callback data to stay within Telegram's 64-byte limit.
 
-    Callback data is stored in memory for fast access and persisted to SQLite
-    so that inline keyboard buttons survive bot restarts.
+    Callback data is persisted to SQLite so that inline keyboard buttons
+    survive bot restarts. Memory holds a bounded LRU of recently used
+    entries; ids that are not in memory are looked up on demand with
+    ``hydrate()`` instead of loading the whole table at startup.
     """
 
     # Persisted TTL: 7 days (buttons should work for at least a week)
     PERSISTED_TTL = 7 * 24 * 3600  # 604800 seconds
 
-    def __init__(self):
-        # In-memory storage for file_id mappings
+    # Rows per INSERT ... ON CONFLICT / DELETE statement
+    WRITE_BATCH_SIZE = 500
+
+    # Callback prefixes whose second segment is a short id from this manager
+    # (cb:{id} generic callbacks, legacy reanalyze:{id}:...); other callbacks
+    # such as stream:stop:{id} are never looked up
+    HYDRATE_PREFIXES = frozenset({"cb", "reanalyze"})
+
+    # File ids are shortened to this many hex chars of their SHA-256 digest.
+    # The collision check only sees memory, not ids that exist only in the
+    # database, so ids are long enough (64 bits) that a clash with a
+    # persisted button is negligible rather than merely unlikely
+    FILE_ID_HASH_CHARS = 16
+
+    # Short ids: hex chars from a SHA-256 digest (8 for rows written by
+    # older versions, 12 for generic data, 16 for file ids) plus a
+    # collision counter, or a hash prefix plus a timestamp remainder
+    SHORT_ID_RE = re.compile(r"[0-9a-f]{7,20}")
+
+    def __init__(self, max_entries: int = 10000, warm_entries: int = 1000):
+        self.max_entries = max_entries
+        self.warm_entries = warm_entries
+
+        # In-memory storage for file_id mappings. Timestamps are kept in
+        # access order (least recently used first) for LRU eviction.
         self._file_id_cache: Dict[str, str] = {}
         self._reverse_cache: Dict[str, str] = {}
-        self._cache_timestamps: Dict[str, float] = {}
+        self._cache_timestamps: "OrderedDict[str, float]" = OrderedDict()
         self._max_cache_age = self.PERSISTED_TTL  # 7 days
 
         # Generic data storage for arbitrary callback data (paths, etc.)
         self._data_cache: Dict[str, Dict] = {}
-        self._data_timestamps: Dict[str, float] = {}
+        self._data_timestamps: "OrderedDict[str, float]" = OrderedDict()
 
         # Pending writes queue: list of (data_type, short_id, payload)
         # Flushed periodically or on demand to avoid sync/async mismatch
         self._pending_writes: List[Tuple[str, str, str]] = []
+        # short_ids used since the last flush (accessed_at refresh)
+        self._touched: Set[str] = set()
+        # short_ids expired in memory, deleted from the database on cleanup
+        self._expired: Set[str] = set()
+
+    def _is_expired(self, timestamp: Optional[float]) -> bool:
+        return timestamp is not None and time.time() - timestamp > self._max_cache_age
+
+    def _touch(self, timestamps: "OrderedDict[str, float]", short_id: str) -> None:
+        timestamps[short_id] = time.time()
+        timestamps.move_to_end(short_id)
+        self._touched.add(short_id)
+
+    def _remember_file_id(self, short_id: str, file_id: str) -> None:
+        self._file_id_cache[short_id] = file_id
+        self._reverse_cache[file_id] = short_id
+        self._touch(self._cache_timestamps, short_id)
+        # Evict least recently used mappings; they stay in the database
+        while len(self._cache_timestamps) > self.max_entries:
+            old_id, _ = self._cache_timestamps.popitem(last=False)
+            old_file_id = self._file_id_cache.pop(old_id, None)
+            if old_file_id is not None:
+                self._reverse_cache.pop(old_file_id, None)
+
+    def _remember_generic(self, short_id: str, data: Dict) -> None:
+        self._data_cache[short_id] = data
+        self._touch(self._data_timestamps, short_id)
+        while len(self._data_timestamps) > self.max_entries:
+            old_id, _ = self._data_timestamps.popitem(last=False)
+            self._data_cache.pop(old_id, None)
+
+    def _forget_file_id(self, short_id: str) -> None:
+        file_id = self._file_id_cache.pop(short_id, None)
+        if file_id:
+            self._reverse_cache.pop(file_id, None)
+        self._cache_timestamps.pop(short_id, None)
+        self._expired.add(short_id)
+
+    def _forget_generic(self, short_id: str) -> None:
+        self._data_cache.pop(short_id, None)
+        self._data_timestamps.pop(short_id, None)
+        self._expired.add(short_id)
 
     def get_short_file_id(self, file_id: str) -> str:
         """Get a short identifier for a file_id"""
@@ -51,13 +121,12 @@ class CallbackDataManager:
         if file_id in self._reverse_cache:
             short_id = self._reverse_cache[file_id]
             # Update timestamp
-            self._cache_timestamps[short_id] = time.time()
+            self._touch(self._cache_timestamps, short_id)
             return short_id
 
         # Create a short hash of the file_id
-        # Use first 8 characters of SHA-256 hash for uniqueness
         hash_obj = hashlib.sha256(file_id.encode())
-        short_id = hash_obj.hexdigest()[:8]
+        short_id = hash_obj.hexdigest()[: self.FILE_ID_HASH_CHARS]
 
         # Handle potential collisions by appending a counter
         counter = 0
@@ -65,15 +134,13 @@ class CallbackDataManager:
         while short_id in self._file_id_cache:
             counter += 1
             short_id = f"{original_short_id}{counter}"
-            if len(short_id) > 12:  # Keep it reasonably short
+            if len(short_id) > 20:  # short_id column is String(20)
                 # If we have too many collisions, use timestamp
-                short_id = f"{original_short_id[:6]}{int(time.time()) % 1000}"
+                short_id = f"{original_short_id[:14]}{int(time.time()) % 1000}"
                 break
 
         # Store the mapping
-        self._file_id_cache[short_id] = file_id
-        self._reverse_cache[file_id] = short_id
-        self._cache_timestamps[short_id] = time.time()
+        self._remember_file_id(short_id, file_id)
 
         # Queue DB write
         self._pending_writes.append(("file_id", short_id, file_id))
@@ -82,13 +149,19 @@ class CallbackDataManager:
         return short_id
 
     def get_file_id(self, short_id: str) -> Optional[str]:
-        """Get the original file_id from a short identifier"""
-        self._cleanup_expired_cache()
+        """Get the original file_id from a short identifier.
+
+        Only memory is consulted; ``hydrate()`` loads ids evicted from (or
+        never loaded into) memory beforehand.
+        """
+        if self._is_expired(self._cache_timestamps.get(short_id)):
+            self._forget_file_id(short_id)
+            logger.info(f"Callback data entry {short_id} expired")
 
         file_id = self._file_id_cache.get(short_id)
         if file_id:
             # Update timestamp on access
-            self._cache_timestamps[short_id] = time.time()
+            self._touch(self._cache_timestamps, short_id)
             logger.debug(f"Retrieved file_id for short_id {short_id}")
         else:
             logger.warning(f"No file_id found for short_id {short_id}")
@@ -141,8 +214,7 @@ class CallbackDataManager:
 
         # Store the data
         full_data = {"action": action, **data}
-        self._data_cache[short_id] = full_data
-        self._data_timestamps[short_id] = time.time()
+        self._remember_generic(short_id, full_data)
 
         # Queue DB write (serialize the full data as JSON)
         self._pending_writes.append(("generic", short_id, json.dumps(full_data)))
@@ -153,12 +225,13 @@ class CallbackDataManager:
         return callback_data
 
     def get_generic_data(self, short_id: str) -> Optional[Dict]:
-        """Retrieve generic callback data by short ID."""
-        self._cleanup_generic_cache()
+        """Retrieve generic callback data by short ID (memory only, see get_file_id)."""
+        if self._is_expired(self._data_timestamps.get(short_id)):
+            self._forget_generic(short_id)
 
         data = self._data_cache.get(short_id)
         if data:
-            self._data_timestamps[short_id] = time.time()
+            self._touch(self._data_timestamps, short_id)
             logger.debug(f"Retrieved generic data for {short_id}: {data}")
         else:
             logger.warning(f"No data found for short_id: {short_id}")
@@ -166,15 +239,11 @@ class CallbackDataManager:
 
     def _cleanup_generic_cache(self):
         """Remove expired entries from generic data cache."""
-        current_time = time.time()
         expired_keys = [
-            key
-            for key, ts in self._data_timestamps.items()
-            if current_time - ts > self._max_cache_age
+            key for key, ts in self._data_timestamps.items() if self._is_expired(ts)
         ]
         for key in expired_keys:
-            self._data_cache.pop(key, None)
-            self._data_timestamps.pop(key, None)
+            self._forget_generic(key)
         if expired_keys:
             logger.info(
                 f"Cleaned up {len(expired_keys)} expired generic callback entries"
@@ -227,18 +296,11 @@ class CallbackDataManager:
 
     def _cleanup_expired_cache(self):
         """Remove expired entries from cache"""
-        current_time = time.time()
-        expired_keys = []
-
-        for short_id, timestamp in self._cache_timestamps.items():
-            if current_time - timestamp > self._max_cache_age:
-                expired_keys.append(short_id)
-
+        expired_keys = [
+            key for key, ts in self._cache_timestamps.items() if self._is_expired(ts)
+        ]
         for key in expired_keys:
-            file_id = self._file_id_cache.pop(key, None)
-            if file_id:
-                self._reverse_cache.pop(file_id, None)
-            self._cache_timestamps.pop(key, None)
+            self._forget_file_id(key)
 
         if expired_keys:
             logger.info(f"Cleaned up {len(expired_keys)} expired callback data entries")
@@ -254,129 +316,227 @@ class CallbackDataManager:
     # Database persistence methods
     # =========================================================================
 
+    def _pending_payload(self, short_id: str) -> Optional[Tuple[str, str]]:
+        for data_type, pending_id, payload in reversed(self._pending_writes):
+            if pending_id == short_id:
+                return data_type, payload
+        return None
+
+    def _cache_row(self, short_id: str, data_type: str, payload: str) -> bool:
+        if data_type == "file_id":
+            self._remember_file_id(short_id, payload)
+            return True
+        if data_type == "generic":
+            try:
+                self._remember_generic(short_id, json.loads(payload))
+                return True
+            except json.JSONDecodeError:
+                logger.warning(f"Failed to parse generic callback data for {short_id}")
+        return False
+
+    def _ttl_cutoff(self) -> datetime:
+        return datetime.now(timezone.utc) - timedelta(seconds=self.PERSISTED_TTL)
+
+    async def _backfill_accessed_at(self, session) -> None:
+        """Give rows written before accessed_at was maintained a TTL anchor."""
+        from sqlalchemy import update
+
+        from src.models.callback_data import CallbackData
+
+        await session.execute(
+            update(CallbackData)
+            .where(CallbackData.accessed_at.is_(None))
+            .values(accessed_at=CallbackData.created_at)
+        )
+
     async def load_from_db(self) -> None:
-        """Load persisted callback data from SQLite into memory caches.
+        """Warm the memory cache with the most recently used persisted entries.
 
-        Called once on startup to hydrate caches so that inline keyboard
-        buttons created before a restart still work.
+        Called once on startup. Only ``warm_entries`` rows are read, so
+        startup cost does not grow with the table; older buttons are loaded
+        on demand by ``hydrate()``.
         """
+        from sqlalchemy import select
+
         from src.models.callback_data import CallbackData
 
         try:
             async with get_db_session() as session:
-                from sqlalchemy import select
-
-                result = await session.execute(select(CallbackData))
-                rows = result.scalars().all()
-
-                file_id_count = 0
-                generic_count = 0
-                now = time.time()
-
-                for row in rows:
-                    # Skip entries older than the persisted TTL
-                    if row.created_at:
-                        age = now - row.created_at.timestamp()
-                        if age > self.PERSISTED_TTL:
-                            continue
-
-                    if row.data_type == "file_id":
-                        self._file_id_cache[row.short_id] = row.payload
-                        self._reverse_cache[row.payload] = row.short_id
-                        self._cache_timestamps[row.short_id] = now
-                        file_id_count += 1
-                    elif row.data_type == "generic":
-                        try:
-                            self._data_cache[row.short_id] = json.loads(row.payload)
-                            self._data_timestamps[row.short_id] = now
-                            generic_count += 1
-                        except json.JSONDecodeError:
-                            logger.warning(
-                                "Failed to parse generic callback"
-                                f" data for {row.short_id}"
-                            )
-
-                logger.info(
-                    f"Loaded {file_id_count} file_id and {generic_count} generic "
-                    f"callback entries from database"
+                await self._backfill_accessed_at(session)
+                result = await session.execute(
+                    select(
+                        CallbackData.short_id,
+                        CallbackData.data_type,
+                        CallbackData.payload,
+                    )
+                    .where(CallbackData.accessed_at >= self._ttl_cutoff())
+                    .order_by(CallbackData.accessed_at.desc())
+                    .limit(self.warm_entries)
                 )
+                rows = result.all()
+
+            # Oldest first, so the most recent end up most recently used
+            loaded = sum(self._cache_row(*row) for row in reversed(rows))
+            self._touched.clear()
+            logger.info(f"Warmed {loaded} callback entries from database")
         except Exception as e:
             logger.error(f"Failed to load callback data from database: {e}")
 
+    async def hydrate(self, callback_data: str) -> bool:
+        """Load the short id referenced by ``callback_data`` if not in memory.
+
+        Handles both the ``cb:{short_id}`` generic format and the legacy
+        ``reanalyze:{short_id}:...`` format. Callbacks with other prefixes,
+        or whose second segment is not shaped like a short id, are not
+        looked up. Returns True if the entry is now in memory.
+        """
+        parts = callback_data.split(":")
+        if (
+            len(parts) < 2
+            or parts[0] not in self.HYDRATE_PREFIXES
+            or not self.SHORT_ID_RE.fullmatch(parts[1])
+        ):
+            return False
+        short_id = parts[1]
+        if short_id in self._file_id_cache or short_id in self._data_cache:
+            return True
+
+        # Evicted before its write was flushed
+        pending = self._pending_payload(short_id)
+        if pending is not None:
+            return self._cache_row(short_id, *pending)
+
+        from sqlalchemy import select
+
+        from src.models.callback_data import CallbackData
+
+        try:
+            async with get_db_session() as session:
+                result = await session.execute(
+                    select(CallbackData.data_type, CallbackData.payload).where(
+                        CallbackData.short_id == short_id,
+                        CallbackData.accessed_at >= self._ttl_cutoff(),
+                    )
+                )
+                row = result.first()
+        except Exception as e:
+            logger.error(f"Failed to look up callback data {short_id}: {e}")
+            return False
+
+        if row is None:
+            return False
+        logger.debug(f"Hydrated callback data {short_id} from database")
+        return self._cache_row(short_id, *row)
+
     async def flush_pending_writes(self) -> None:
-        """Flush all pending writes to the database.
+        """Flush pending writes and access times to the database.
 
-        Uses upsert semantics: if a short_id already exists, update the payload.
+        Writes are batched into ``INSERT ... ON CONFLICT DO UPDATE``
+        statements: if a short_id already exists, its payload is updated.
         """
-        if not self._pending_writes:
+        if not self._pending_writes and not self._touched:
             return
 
+        from sqlalchemy import bindparam, update
+        from sqlalchemy.dialects.sqlite import insert
+
         from src.models.callback_data import CallbackData
 
-        # Take a snapshot and clear the queue
+        # Take a snapshot and clear the queue; the last write per id wins
         writes = self._pending_writes[:]
+        touched = self._touched
         self._pending_writes.clear()
+        self._touched = set()
+
+        now = datetime.now(timezone.utc)
+        latest = {
+            short_id: {
+                "short_id": short_id,
+                "data_type": data_type,
+                "payload": payload,
+                "accessed_at": now,
+            }
+            for data_type, short_id, payload in writes
+        }
+        touched_only = [
+            {"sid": short_id, "ts": now}
+            for short_id in touched
+            if short_id not in latest
+        ]
+        rows = list(latest.values())
 
         try:
             async with get_db_session() as session:
-                from sqlalchemy import select
-
-                for data_type, short_id, payload in writes:
-                    # Check if row already exists
-                    result = await session.execute(
-                        select(CallbackData).where(CallbackData.short_id == short_id)
+                for i in range(0, len(rows), self.WRITE_BATCH_SIZE):
+                    stmt = insert(CallbackData).values(
+                        rows[i : i + self.WRITE_BATCH_SIZE]
                     )
-                    existing = result.scalar_one_or_none()
-
-                    if existing:
-                        existing.payload = payload
-                        existing.data_type = data_type
-                    else:
-                        session.add(
-                            CallbackData(
-                                short_id=short_id,
-                                data_type=data_type,
-                                payload=payload,
-                            )
+                    await session.execute(
+                        stmt.on_conflict_do_update(
+                            index_elements=[CallbackData.short_id],
+                            set_={
+                                "data_type": stmt.excluded.data_type,
+                                "payload": stmt.excluded.payload,
+                                "accessed_at": stmt.excluded.accessed_at,
+                            },
                         )
+                    )
+                if touched_only:
+                    table = CallbackData.__table__
+                    await session.execute(
+                        update(table)
+                        .where(table.c.short_id == bindparam("sid"))
+                        .values(accessed_at=bindparam("ts")),
+                        touched_only,
+                    )
 
                 await session.commit()
-                logger.debug(f"Flushed {len(writes)} callback data writes to database")
+                logger.debug(
+                    f"Flushed {len(rows)} callback data writes and "
+                    f"{len(touched_only)} access updates to database"
+                )
         except Exception as e:
             logger.error(f"Failed to flush callback data to database: {e}")
             # Put failed writes back on the queue for retry
-            self._pending_writes.extend(writes)
+            self._pending_writes[:0] = writes
+            self._touched |= touched
 
     async def cleanup_expired_from_db(self) -> None:
-        """Remove expired entries from the database.
+        """Expire stale entries in memory and delete them from the database.
 
-        Deletes rows whose short_id is no longer in the in-memory cache
-        (i.e., they were expired by _cleanup_expired_cache).
+        Rows expired in memory are deleted by id; any other row not used
+        within the TTL is purged through the ``accessed_at`` index.
         """
+        from sqlalchemy import delete
+
         from src.models.callback_data import CallbackData
 
-        try:
-            async with get_db_session() as session:
-                from sqlalchemy import select
+        self._cleanup_expired_cache()
+        self._cleanup_generic_cache()
 
-                result = await session.execute(select(CallbackData))
-                rows = result.scalars().all()
+        expired = list(self._expired)
+        self._expired.clear()
 
+        try:
+            async with get_db_session() as session:
                 removed = 0
-                now = time.time()
-                for row in rows:
-                    # Remove if expired from in-memory cache or older than TTL
-                    in_file_cache = row.short_id in self._file_id_cache
-                    in_data_cache = row.short_id in self._data_cache
-
-                    is_expired = False
-                    if row.created_at:
-                        age = now - row.created_at.timestamp()
-                        is_expired = age > self.PERSISTED_TTL
+                for i in range(0, len(expired), self.WRITE_BATCH_SIZE):
+                    result = await session.execute(
+                        delete(CallbackData).where(
+                            CallbackData.short_id.in_(
+                                expired[i : i + self.WRITE_BATCH_SIZE]
+                            )
+                        )
+                    )
+                    removed += result.rowcount or 0
 
-                    if (not in_file_cache and not in_data_cache) or is_expired:
-                        await session.delete(row)
-                        removed += 1
+                await self._backfill_accessed_at(session)
+                result = await session.execute(
+                    delete(CallbackData).where(
+                        CallbackData.accessed_at < self._ttl_cutoff()
+                    )
+                )
+                removed += result.rowcount or 0
 
                 await session.commit()
                 if removed:
@@ -385,6 +545,7 @@ class CallbackDataManager:
                     )
         except Exception as e:
             logger.error(f"Failed to cleanup expired callback data from database: {e}")
+            self._expired.update(expired)
 
 
 # Global instance
@@ -395,5 +556,10 @@ def get_callback_data_manager() -> CallbackDataManager:
     """Get the global callback data manager instance"""
     global _callback_data_manager
     if _callback_data_manager is None:
-        _callback_data_manager = CallbackDataManager()
+        from src.core.config import get_limit
+
+        _callback_data_manager = CallbackDataManager(
+            max_entries=get_limit("callback_data_cache_size", 10000),
+            warm_entries=get_limit("callback_data_warm_entries", 1000),
+        )
     return _callback_data_manager
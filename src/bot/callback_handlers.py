@@ -154,7 +154,8 @@ async def handle_callback_query(
     keyboard_utils = get_keyboard_utils()
     locale = get_user_locale_from_update(update)
 
-    # Try new callback data format first
+    # Load the referenced short id if it is not in memory, then parse
+    await callback_manager.hydrate(query.data)
     action, file_id, params = callback_manager.parse_callback_data(query.data)
 
     # If file_id is None, fall back to old format for compatibility
@@ -184,6 +185,8 @@ async def handle_callback_query(
             await handle_claude_callback(
                 query, user.id, chat.id, params, context, locale=locale, update=update
             )
+        elif action == "stream":
+            await handle_stream_callback(query, params)
         elif action == "settings":
             await handle_settings_callback(query, user.id, params, locale=locale)
         elif action == "note":
@@ -595,6 +598,7 @@ async def handle_reanalyze_callback(query, file_id, params) -> None:
                     mode_used=new_mode,
                     preset_used=new_preset,
                     processing_status="completed",
+                    embedding_model=analysis.get("embedding_model"),
                 )
                 session.add(image_record)
                 await session.commit()
@@ -1277,6 +1281,24 @@ async def handle_image_route_callback(query, params) -> None:
         await query.message.reply_text("Error routing image.")
 
 
+async def handle_stream_callback(query, params) -> None:
+    """Handle stop buttons of streamed CLI runs (stream:stop:<stream_id>)."""
+    from ..services.streaming_subprocess import request_stop
+
+    if len(params) < 2 or params[0] != "stop":
+        return
+
+    if request_stop(params[1]):
+        logger.info(f"Stop requested for stream {params[1]}")
+    else:
+        logger.info(f"Stop pressed for finished stream {params[1]}")
+
+    try:
+        await query.edit_message_reply_markup(reply_markup=None)
+    except Exception as e:
+        logger.debug(f"Could not edit message markup: {e}")
+
+
 async def handle_claude_callback(
     query,
     user_id: int,
@@ -1936,7 +1958,7 @@ async def handle_note_callback(query, params) -> None:
     """Handle note viewing callbacks from inline buttons."""
     from pathlib import Path
 
-    from .handlers.formatting import markdown_to_telegram_html, split_message
+    from .handlers.formatting import markdown_to_telegram_html_chunks
 
     if not params:
         await query.message.reply_text("Invalid note action.")
@@ -1985,15 +2007,13 @@ async def handle_note_callback(query, params) -> None:
         try:
             content = note_path.read_text(encoding="utf-8")
 
-            # Convert to Telegram HTML
-            formatted = markdown_to_telegram_html(content)
-
             # Get note title from filename
             note_name = note_path.stem
 
+            # Convert to Telegram HTML, already split into sendable chunks
             max_length = 4000
-            if len(formatted) > max_length:
-                chunks = split_message(formatted, max_length)
+            chunks = markdown_to_telegram_html_chunks(content, max_length)
+            if len(chunks) > 1:
 
                 await query.message.reply_text(
                     f"<b>{note_name}</b>\n\n{chunks[0]}\n\n<i>... continued ...</i>",
@@ -2007,7 +2027,7 @@ async def handle_note_callback(query, params) -> None:
                     await query.message.reply_text(chunk + suffix, parse_mode="HTML")
             else:
                 await query.message.reply_text(
-                    f"<b>{note_name}</b>\n\n{formatted}",
+                    f"<b>{note_name}</b>\n\n{chunks[0]}",
                     parse_mode="HTML",
                 )
 
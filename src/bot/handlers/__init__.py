@@ -72,6 +72,7 @@ from .core_commands import (
 from .formatting import (
     escape_html,
     markdown_to_telegram_html,
+    markdown_to_telegram_html_chunks,
     split_message,
     split_message_html_safe,
     strip_telegram_html,
@@ -158,6 +159,7 @@ __all__ = [
     # Formatting
     "escape_html",
     "markdown_to_telegram_html",
+    "markdown_to_telegram_html_chunks",
     "split_message",
     "split_message_html_safe",
     "strip_telegram_html",
@@ -16,7 +16,6 @@ Contains:
 import asyncio
 import logging
 import os
-import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import TYPE_CHECKING, List, Optional
@@ -44,8 +43,9 @@ from .base import (
 from .formatting import (
     escape_html,
     markdown_to_telegram_html,
-    split_message_html_safe,
+    markdown_to_telegram_html_chunks,
 )
+from .streaming import ThrottledMessageEditor, tail_for_display
 
 logger = logging.getLogger(__name__)
 
@@ -899,8 +899,9 @@ async def execute_claude_prompt(
 
     accumulated_text = ""
     current_tool = ""
-    last_update_time = 0
-    update_interval = 1.0
+    editor = ThrottledMessageEditor(
+        chat.id, status_msg_id, reply_markup=processing_keyboard.to_dict()
+    )
     new_session_id = None
     session_announced = False
     work_stats = None
@@ -984,15 +985,8 @@ async def execute_claude_prompt(
                 continue
 
             # Throttle message updates
-            current_time = time.time()
-            if current_time - last_update_time >= update_interval:
-                display_text = (
-                    accumulated_text[-3200:]
-                    if len(accumulated_text) > 3200
-                    else accumulated_text
-                )
-                if len(accumulated_text) > 3200:
-                    display_text = "...\n" + display_text
+            if editor.due():
+                display_text = tail_for_display(accumulated_text)
 
                 # Transform vault paths for display
                 display_text = _transform_vault_paths_in_text(display_text)
@@ -1010,22 +1004,10 @@ async def execute_claude_prompt(
                         + markdown_to_telegram_html(display_text)
                         + tool_status
                     )
-                    result = await asyncio.to_thread(
-                        edit_message_sync,
-                        chat_id=chat.id,
-                        message_id=status_msg_id,
-                        text=full_text,
-                        parse_mode="HTML",
-                        reply_markup=processing_keyboard.to_dict(),
-                    )
-                    last_update_time = current_time
-                    if result is None:
-                        logger.warning(
-                            f"Edit returned None for msg {status_msg_id} "
-                            f"(text_len={len(full_text)})"
-                        )
                 except Exception as e:
                     logger.warning(f"Failed to update message: {e}")
+                else:
+                    await editor.update(full_text)
 
         # Final update - delete status message and send response in new message
         session_info = (
@@ -1148,7 +1130,8 @@ async def execute_claude_prompt(
 
         # Transform vault paths to relative paths before display
         transformed_text = _transform_vault_paths_in_text(accumulated_text)
-        full_html = markdown_to_telegram_html(transformed_text)
+        chunks = markdown_to_telegram_html_chunks(transformed_text, max_chunk_size)
+        full_html = "".join(chunks)
 
         # Add work summary if available
         work_summary = (
@@ -1196,7 +1179,6 @@ async def execute_claude_prompt(
                 if result:
                     status_msg_id = result.get("message_id")
             else:
-                chunks = split_message_html_safe(full_html, max_chunk_size)
                 for i, chunk in enumerate(chunks, 1):
                     is_last = i == len(chunks)
                     if is_last:
@@ -1230,8 +1212,6 @@ async def execute_claude_prompt(
                 if result:
                     status_msg_id = result.get("message_id")
             else:
-                chunks = split_message_html_safe(full_html, max_chunk_size)
-
                 result = send_message_sync(
                     chat_id=chat.id,
                     text=prompt_header
@@ -1284,34 +1264,15 @@ async def execute_claude_prompt(
             except Exception as e:
                 logger.warning(f"Voice synthesis failed (non-critical): {e}")
 
-        # React with 👍 to indicate completion
-        import requests
+        # React with 👍 to indicate completion (queued, never blocks)
+        completed = [m for m in (reply_to_msg_id, status_msg_id) if m]
+        if completed:
+            from ...services.chat_action_service import get_chat_action_service
 
-        bot_token = os.environ.get("TELEGRAM_BOT_TOKEN", "")
-        if bot_token:
-            url = f"https://api.telegram.org/bot{bot_token}/setMessageReaction"
-            if reply_to_msg_id:
-                try:
-                    payload = {
-                        "chat_id": chat.id,
-                        "message_id": reply_to_msg_id,
-                        "reaction": [{"type": "emoji", "emoji": "👍"}],
-                    }
-                    requests.post(url, json=payload, timeout=5)
-                except Exception:
-                    pass
-            if status_msg_id:
-                try:
-                    payload = {
-                        "chat_id": chat.id,
-                        "message_id": status_msg_id,
-                        "reaction": [{"type": "emoji", "emoji": "👍"}],
-                    }
-                    response = requests.post(url, json=payload, timeout=5)
-                    if response.json().get("ok"):
-                        logger.info("Added 👍 completion reactions")
-                except Exception as e:
-                    logger.debug(f"Could not add completion reaction: {e}")
+            try:
+                get_chat_action_service().react(chat.id, completed, "👍")
+            except Exception as e:
+                logger.debug(f"Could not queue completion reaction: {e}")
 
         # Track response for reply context
         if new_session_id:
@@ -1323,6 +1284,9 @@ async def execute_claude_prompt(
                 prompt=prompt,
                 response_text=accumulated_text[:1000],
             )
+            await service.record_response_message(
+                chat_id=chat.id, message_id=status_msg_id, session_id=new_session_id
+            )
             logger.debug(
                 f"Tracked Claude response for reply context: msg={status_msg_id}"
             )
@@ -1469,8 +1433,9 @@ async def forward_voice_to_claude(
 
     accumulated_text = ""
     current_tool = ""
-    last_update_time = 0
-    update_interval = 1.0
+    editor = ThrottledMessageEditor(
+        chat_id, status_msg_id, reply_markup=processing_keyboard.to_dict()
+    )
     new_session_id = None
     work_stats = None
 
@@ -1493,21 +1458,7 @@ async def forward_voice_to_claude(
 
             if msg_type == "tool":
                 current_tool = content
-                now = time.time()
-                if now - last_update_time >= update_interval:
-                    result = await asyncio.to_thread(
-                        edit_message_sync,
-                        chat_id=chat_id,
-                        message_id=status_msg_id,
-                        text=f"{status_text}\n\n<i>Using: {current_tool}</i>",
-                        parse_mode="HTML",
-                        reply_markup=processing_keyboard.to_dict(),
-                    )
-                    last_update_time = now
-                    if result is None:
-                        logger.warning(
-                            f"Voice forward edit returned None for msg {status_msg_id}"
-                        )
+                await editor.update(f"{status_text}\n\n<i>Using: {current_tool}</i>")
 
             elif msg_type == "text":
                 accumulated_text += content
@@ -1536,7 +1487,8 @@ async def forward_voice_to_claude(
         prompt_header = f"<b>🎤 {t('claude.voice_header')}</b>\n\n"
 
         transformed_text = _transform_vault_paths_in_text(accumulated_text)
-        full_html = markdown_to_telegram_html(transformed_text)
+        chunks = markdown_to_telegram_html_chunks(transformed_text, max_chunk_size)
+        full_html = "".join(chunks)
 
         work_summary = (
             _format_work_summary(work_stats, locale=locale) if work_stats else ""
@@ -1583,7 +1535,6 @@ async def forward_voice_to_claude(
                 if result:
                     status_msg_id = result.get("message_id")
             else:
-                chunks = split_message_html_safe(full_html, max_chunk_size)
                 for i, chunk in enumerate(chunks, 1):
                     is_last = i == len(chunks)
                     if is_last:
@@ -1617,8 +1568,6 @@ async def forward_voice_to_claude(
                 if result:
                     status_msg_id = result.get("message_id")
             else:
-                chunks = split_message_html_safe(full_html, max_chunk_size)
-
                 result = send_message_sync(
                     chat_id=chat_id,
                     text=prompt_header
@@ -1679,6 +1628,9 @@ async def forward_voice_to_claude(
                 prompt=prompt,
                 response_text=accumulated_text[:1000],
             )
+            await service.record_response_message(
+                chat_id=chat_id, message_id=status_msg_id, session_id=new_session_id
+            )
             logger.debug(f"Tracked voice forward response: msg={status_msg_id}")
 
     except Exception as e:
@@ -17,6 +17,7 @@ from src.utils.formatting import (  # noqa: F401
     escape_html,
     format_frontmatter_summary,
     markdown_to_telegram_html,
+    markdown_to_telegram_html_chunks,
     parse_frontmatter,
     render_compact_table,
     split_message,
@@ -19,7 +19,7 @@ from ...core.config import get_settings
 from ...core.error_messages import sanitize_error
 from ...core.i18n import get_user_locale_from_update, t
 from ...utils.error_reporting import handle_errors
-from .formatting import markdown_to_telegram_html, split_message
+from .formatting import markdown_to_telegram_html_chunks
 
 logger = logging.getLogger(__name__)
 
@@ -140,11 +140,9 @@ async def view_note_command(
         with open(note_file, "r", encoding="utf-8") as f:
             content = f.read()
 
-        formatted_content = markdown_to_telegram_html(content)
-
         max_length = 4000
-        if len(formatted_content) > max_length:
-            chunks = split_message(formatted_content, max_length)
+        chunks = markdown_to_telegram_html_chunks(content, max_length)
+        if len(chunks) > 1:
 
             if update.message:
                 continued = t("note.continued_below", locale)
@@ -171,7 +169,7 @@ async def view_note_command(
         else:
             if update.message:
                 await update.message.reply_text(
-                    f"📄 <b>{note_name}</b>\n\n{formatted_content}",
+                    f"📄 <b>{note_name}</b>\n\n{chunks[0]}",
                     parse_mode="HTML",
                 )
 
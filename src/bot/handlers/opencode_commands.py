@@ -17,9 +17,15 @@ from telegram.ext import ContextTypes
 from ...core.authorization import AuthTier, require_tier
 from ...core.i18n import get_user_locale_from_update, t
 from ...services.opencode_service import get_opencode_service
+from ...services.streaming_subprocess import (
+    StreamOutput,
+    register_stream,
+    unregister_stream,
+)
 from ...utils.error_reporting import handle_errors
-from .base import send_message_sync
+from .base import edit_message_sync, send_message_sync
 from .formatting import escape_html
+from .streaming import ThrottledMessageEditor, tail_for_display
 
 logger = logging.getLogger(__name__)
 
@@ -119,15 +125,75 @@ async def _execute_opencode(
         else t("opencode.new_session", locale)
     )
 
-    send_message_sync(
+    from ..keyboard_utils import KeyboardUtils
+
+    stream_id = register_stream()
+    stop_keyboard = KeyboardUtils().create_stream_stop_keyboard(stream_id, locale)
+    header = f"<b>🔧 OpenCode</b>\n\n<i>{escape_html(prompt_preview)}</i>\n\n"
+
+    status = send_message_sync(
         chat.id,
-        f"<b>🔧 OpenCode</b>\n\n"
-        f"<i>{escape_html(prompt_preview)}</i>\n\n"
-        f"⏳ {session_status}",
+        f"{header}⏳ {session_status}",
         parse_mode="HTML",
+        reply_markup=stop_keyboard.to_dict(),
+    )
+    status_msg_id = status.get("message_id") if status else None
+    editor = (
+        ThrottledMessageEditor(
+            chat.id, status_msg_id, reply_markup=stop_keyboard.to_dict()
+        )
+        if status_msg_id
+        else None
     )
+    output = StreamOutput()
+
+    async def show_progress(_chunk: str) -> None:
+        if editor and editor.due():
+            await editor.update(
+                f"{header}<pre>{escape_html(tail_for_display(output.tail()))}</pre>"
+            )
+
+    try:
+        result = await service.stream_opencode_query(
+            chat.id,
+            prompt,
+            on_output=show_progress,
+            stream_id=stream_id,
+            output=output,
+        )
+    finally:
+        unregister_stream(stream_id)
+
+    if status_msg_id:
+        # Final status without the stop button
+        state = (
+            f"⏹️ {t('messages.claude_stopped_by_user', locale)}"
+            if result.get("stopped")
+            else ("✅" if result["success"] else "❌")
+        )
+        edit_message_sync(
+            chat_id=chat.id,
+            message_id=status_msg_id,
+            text=f"{header}{state}",
+            parse_mode="HTML",
+        )
+
+    if not result["success"]:
+        response = f"OpenCode error: {result.get('error') or 'Unknown error'}"
+    else:
+        response = result["output"]
 
-    response = await service.run_opencode_query(chat.id, prompt)
+    if result.get("truncated"):
+        send_message_sync(
+            chat.id,
+            t(
+                "opencode.output_truncated",
+                locale,
+                omitted=result["omitted_chars"],
+                path=escape_html(result["log_path"] or ""),
+            ),
+            parse_mode="HTML",
+        )
 
     if response:
         # Split long responses
@@ -51,7 +51,7 @@ async def forward_poll_to_claude(
     """
     from ...services.claude_code_service import get_claude_code_service
     from ..handlers.base import send_message_sync
-    from ..handlers.formatting import markdown_to_telegram_html, split_message
+    from ..handlers.formatting import markdown_to_telegram_html_chunks
 
     service = get_claude_code_service()
 
@@ -142,8 +142,7 @@ async def forward_poll_to_claude(
 
         # Send Claude's response to the chat
         if result_text.strip():
-            formatted = markdown_to_telegram_html(result_text)
-            for chunk in split_message(formatted):
+            for chunk in markdown_to_telegram_html_chunks(result_text):
                 send_message_sync(chat_id, chunk, parse_mode="HTML")
 
             # Delete status message
@@ -195,17 +194,17 @@ async def handle_poll_answer(
         logger.warning(f"Poll answer {poll_id} has no option_ids")
         return
 
-    # Get poll context from bot_data
-    if "poll_context" not in context.bot_data:
-        logger.warning(f"No poll_context in bot_data for poll {poll_id}")
-        return
+    # Get poll context (bot_data, or the durable registry after a restart)
+    from ...services.poll_scheduler import (
+        forget_scheduled_poll,
+        get_scheduled_poll_context,
+    )
 
-    if poll_id not in context.bot_data["poll_context"]:
+    poll_ctx = await get_scheduled_poll_context(context, poll_id)
+    if poll_ctx is None:
         logger.warning(f"Poll {poll_id} not found in poll_context")
         return
 
-    poll_ctx = context.bot_data["poll_context"][poll_id]
-
     # Extract poll details
     question = poll_ctx.get("question")
     options = poll_ctx.get("options", [])
@@ -255,6 +254,7 @@ async def handle_poll_answer(
             poll_type=poll_type,
             poll_category=poll_category,
             context_metadata=context_metadata,
+            template_id=template_id,
         )
 
         logger.info(f"Saved poll response: {response.id}")
@@ -264,6 +264,7 @@ async def handle_poll_answer(
 
         lifecycle_tracker = get_poll_lifecycle_tracker()
         lifecycle_tracker.record_answered(poll_id)
+        await forget_scheduled_poll(context, poll_id)
 
         # Track poll response in reply context
         from ...services.reply_context import get_reply_context_service
@@ -303,9 +304,6 @@ async def handle_poll_answer(
                 name="claude_poll_forward",
             )
 
-        # Clean up context
-        del context.bot_data["poll_context"][poll_id]
-
     except Exception as e:
         logger.error(f"Error saving poll response: {e}", exc_info=True)
 
@@ -425,19 +423,22 @@ async def _send_poll_now(
             )
 
         # Store poll context
-        if "poll_context" not in context.bot_data:
-            context.bot_data["poll_context"] = {}
-
-        context.bot_data["poll_context"][poll_message.poll.id] = {
-            "question": poll_template["question"],
-            "options": poll_template["options"],
-            "poll_type": poll_template["type"],
-            "poll_category": poll_template.get("category"),
-            "template_id": poll_template["id"],
-            "chat_id": chat_id,
-            "message_id": poll_message.message_id,
-            "origin": origin_info,
-        }
+        from ...services.poll_scheduler import track_scheduled_poll
+
+        await track_scheduled_poll(
+            context,
+            poll_message.poll.id,
+            {
+                "question": poll_template["question"],
+                "options": poll_template["options"],
+                "poll_type": poll_template["type"],
+                "poll_category": poll_template.get("category"),
+                "template_id": poll_template["id"],
+                "chat_id": chat_id,
+                "message_id": poll_message.message_id,
+                "origin": origin_info,
+            },
+        )
 
         # Register in lifecycle tracker for TTL and backpressure tracking
         from ...services.poll_lifecycle import get_poll_lifecycle_tracker
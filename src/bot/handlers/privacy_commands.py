@@ -32,6 +32,8 @@ from ...models.tracker import CheckIn, Tracker
 from ...models.user import User
 from ...models.user_settings import UserSettings
 from ...models.voice_settings import VoiceSettings
+from ...services.conversation_archive import delete_archives
+from ...services.conversation_search import delete_archived_conversations
 from ...utils.audit_log import audit_log
 from ...utils.error_reporting import handle_errors
 
@@ -440,6 +442,15 @@ async def _execute_data_deletion(query, user_id: int, locale: str = "en") -> Non
                 )
                 deleted_counts["collect_sessions"] = result.rowcount
 
+            # Delete indexed conversation archives
+            if chat_ids:
+                try:
+                    deleted_counts["archived_conversations"] = (
+                        await delete_archived_conversations(session, chat_ids)
+                    )
+                except Exception:
+                    pass  # search index not created (no FTS5)
+
             # Delete images and their files (batched to limit memory)
             _DELETE_BATCH = 500
             while True:
@@ -492,8 +503,12 @@ async def _execute_data_deletion(query, user_id: int, locale: str = "en") -> Non
 
             await session.commit()
 
-        # Clear in-memory caches
-        _clear_user_caches(user_id, chat_ids)
+        # Delete archive files, or the next backfill would re-index them
+        for chat_id in chat_ids:
+            delete_archives(chat_id)
+
+        # Clear in-memory caches and spilled reply contexts
+        deleted_counts["reply_contexts"] = _clear_user_caches(user_id, chat_ids)
 
         logger.info(f"Data deletion completed for user {user_id}: {deleted_counts}")
 
@@ -524,18 +539,18 @@ def _delete_image_files(image) -> None:
                 logger.warning(f"Failed to delete image file {path}: {e}")
 
 
-def _clear_user_caches(user_id: int, chat_ids: list) -> None:
-    """Clear in-memory caches for a deleted user."""
+def _clear_user_caches(user_id: int, chat_ids: list) -> int:
+    """Clear in-memory caches for a deleted user.
+
+    Returns the number of reply contexts deleted from the spill tier.
+    """
+    spilled = 0
     try:
         from ...services.reply_context import get_reply_context_service
 
         reply_ctx = get_reply_context_service()
         if reply_ctx:
-            # Remove any cached contexts for the user's chats
-            for chat_id in chat_ids:
-                keys_to_remove = [k for k in reply_ctx._cache if str(chat_id) in str(k)]
-                for key in keys_to_remove:
-                    del reply_ctx._cache[key]
+            spilled = reply_ctx.forget_user(user_id, chat_ids)
     except Exception as e:
         logger.warning(f"Cache cleanup error: {e}")
 
@@ -546,3 +561,5 @@ def _clear_user_caches(user_id: int, chat_ids: list) -> None:
             _admin_cache.pop(chat_id, None)
     except Exception as e:
         logger.warning(f"Admin cache cleanup error: {e}")
+
+    return spilled
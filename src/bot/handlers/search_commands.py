@@ -0,0 +1,63 @@
+"""
+Search commands.
+
+Contains:
+- /search <query> — Full-text search over this chat's messages and archived
+  Claude sessions, ranked by BM25 with highlighted snippets
+"""
+
+import logging
+
+from telegram import Update
+from telegram.ext import ContextTypes
+
+from ...core.authorization import AuthTier, require_tier
+from ...core.i18n import get_user_locale_from_update, t
+from ...services.conversation_search import (
+    SOURCE_ARCHIVES,
+    SearchHit,
+    search_conversations,
+)
+from ...utils.error_reporting import handle_errors
+from .formatting import escape_html
+
+logger = logging.getLogger(__name__)
+
+SEARCH_RESULT_LIMIT = 10
+
+
+def _format_hit(index: int, hit: SearchHit) -> str:
+    """One result line: source icon, date, role and highlighted snippet."""
+    icon = "🗂" if hit.source == SOURCE_ARCHIVES else "💬"
+    date = (hit.timestamp or "")[:10]
+    meta = " · ".join(part for part in (date, hit.role) if part)
+    return f"{index}. {icon} <i>{escape_html(meta)}</i>\n{hit.snippet}"
+
+
+@require_tier(AuthTier.USER)
+@handle_errors("search_command")
+async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /search <query> — search this chat's conversation history."""
+    chat = update.effective_chat
+    if not chat or not update.message:
+        return
+
+    locale = get_user_locale_from_update(update)
+    query = " ".join(context.args or []).strip()
+    if not query:
+        await update.message.reply_text(
+            t("search.usage", locale).strip(), parse_mode="HTML"
+        )
+        return
+
+    hits = await search_conversations(query, chat_id=chat.id, limit=SEARCH_RESULT_LIMIT)
+    if not hits:
+        await update.message.reply_text(
+            t("search.no_results", locale, query=escape_html(query)),
+            parse_mode="HTML",
+        )
+        return
+
+    lines = [t("search.results_title", locale, query=escape_html(query))]
+    lines.extend(_format_hit(i, hit) for i, hit in enumerate(hits, 1))
+    await update.message.reply_text("\n\n".join(lines), parse_mode="HTML")
@@ -0,0 +1,91 @@
+"""
+Throttled status-message updates for streamed agent output.
+
+Claude, OpenCode and Codex all show work in progress by repeatedly editing
+one status message. Telegram rate-limits edits, so updates are sent at most
+once per interval (the latest text wins) and only the tail of long output
+is displayed.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from .base import edit_message_sync
+
+logger = logging.getLogger(__name__)
+
+STREAM_UPDATE_INTERVAL = 1.0
+STREAM_DISPLAY_CHARS = 3200
+
+
+def tail_for_display(text: str, limit: int = STREAM_DISPLAY_CHARS) -> str:
+    """Last ``limit`` characters of text, marked with a leading ellipsis."""
+    if len(text) > limit:
+        return "...\n" + text[-limit:]
+    return text
+
+
+class ThrottledMessageEditor:
+    """Edits a status message at most once per ``interval`` seconds."""
+
+    def __init__(
+        self,
+        chat_id: int,
+        message_id: int,
+        interval: float = STREAM_UPDATE_INTERVAL,
+        reply_markup: Optional[dict] = None,
+        parse_mode: str = "HTML",
+    ):
+        self.chat_id = chat_id
+        self.message_id = message_id
+        self.interval = interval
+        self.reply_markup = reply_markup
+        self.parse_mode = parse_mode
+        self._last_update = 0.0
+        self._last_text: Optional[str] = None
+        self._pending: Optional[str] = None
+
+    def due(self) -> bool:
+        """Whether an edit would be sent now (lets callers skip rendering)."""
+        return time.time() - self._last_update >= self.interval
+
+    async def update(self, text: str, force: bool = False) -> bool:
+        """Edit the message now if due, else remember text for ``flush()``."""
+        if not force and not self.due():
+            self._pending = text
+            return False
+        return await self._edit(text)
+
+    async def flush(self) -> bool:
+        """Send the last text held back by throttling, if any."""
+        if self._pending is None:
+            return False
+        return await self._edit(self._pending)
+
+    async def _edit(self, text: str) -> bool:
+        self._pending = None
+        if text == self._last_text:
+            return False  # Telegram rejects edits that change nothing
+        try:
+            result = await asyncio.to_thread(
+                edit_message_sync,
+                chat_id=self.chat_id,
+                message_id=self.message_id,
+                text=text,
+                parse_mode=self.parse_mode,
+                reply_markup=self.reply_markup,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to update message: {e}")
+            return False
+        self._last_update = time.time()
+        self._last_text = text
+        if result is None:
+            logger.warning(
+                f"Edit returned None for msg {self.message_id} "
+                f"(text_len={len(text)})"
+            )
+            return False
+        return True
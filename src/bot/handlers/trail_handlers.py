@@ -217,7 +217,7 @@ async def _send_trail_poll(
     )
 
     # Register in persistent service (NOT in bot_data which is lost on restart)
-    trail_service.register_poll(
+    await trail_service.register_poll(
         poll_id=poll_message.poll.id,
         trail_path=trail["path"],
         field=poll_data["field"],
@@ -257,7 +257,7 @@ async def handle_trail_poll_answer(
     trail_service = get_trail_review_service()
 
     # Check persistent trail poll registry first
-    poll_info = trail_service.get_poll_info(poll_id)
+    poll_info = await trail_service.get_poll_info(poll_id)
 
     # Fall back to bot_data for backward compatibility
     if not poll_info:
@@ -267,13 +267,15 @@ async def handle_trail_poll_answer(
 
     if not poll_info:
         # Not a trail poll - delegate to general poll handler
-        if (
-            "poll_context" in context.bot_data
-            and poll_id in context.bot_data["poll_context"]
-        ):
+        from ...services.poll_scheduler import (
+            forget_scheduled_poll,
+            get_scheduled_poll_context,
+        )
+
+        poll_ctx = await get_scheduled_poll_context(context, poll_id)
+        if poll_ctx is not None:
             from ...services.polling_service import get_polling_service
 
-            poll_ctx = context.bot_data["poll_context"][poll_id]
             user = update.poll_answer.user
             selected_option_id = option_ids[0]
             poll_options = poll_ctx.get("options", [])
@@ -304,7 +306,7 @@ async def handle_trail_poll_answer(
                 logger.info(
                     f"Saved general poll response via trail handler: {response.id}"
                 )
-                del context.bot_data["poll_context"][poll_id]
+                await forget_scheduled_poll(context, poll_id)
             except Exception as e:
                 logger.error(f"Error saving general poll response: {e}", exc_info=True)
         else:
@@ -318,12 +320,12 @@ async def handle_trail_poll_answer(
     # Get selected answer text
     if chat_id not in trail_service._poll_states:
         logger.warning(f"No poll state for chat {chat_id} (may have expired)")
-        trail_service.unregister_poll(poll_id)
+        await trail_service.unregister_poll(poll_id)
         return
 
     if trail_path not in trail_service._poll_states[chat_id]:
         logger.warning(f"No poll state for trail {trail_path}")
-        trail_service.unregister_poll(poll_id)
+        await trail_service.unregister_poll(poll_id)
         return
 
     state = trail_service._poll_states[chat_id][trail_path]
@@ -347,7 +349,7 @@ async def handle_trail_poll_answer(
     )
 
     # Clean up this poll from registry
-    trail_service.unregister_poll(poll_id)
+    await trail_service.unregister_poll(poll_id)
     context.bot_data.get("trail_polls", {}).pop(poll_id, None)
 
     if is_complete:
@@ -562,6 +562,20 @@ class KeyboardUtils:
         ]
         return InlineKeyboardMarkup(buttons)
 
+    def create_stream_stop_keyboard(
+        self, stream_id: str, locale: Optional[str] = None
+    ) -> InlineKeyboardMarkup:
+        """Create the stop button shown while streamed CLI output runs."""
+        buttons = [
+            [
+                InlineKeyboardButton(
+                    t("inline.stream.stop", locale),
+                    callback_data=f"stream:stop:{stream_id}",
+                )
+            ]
+        ]
+        return InlineKeyboardMarkup(buttons)
+
     def create_claude_complete_keyboard(
         self,
         has_session: bool = True,
@@ -6,7 +6,6 @@ import re
 import traceback
 from typing import List, Optional, Tuple
 
-import litellm
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Message, Update
 from telegram.ext import ContextTypes
 
@@ -25,11 +24,14 @@ from ..services.llm_service import get_llm_service
 from ..services.routing_memory import get_routing_memory
 from ..services.similarity_service import get_similarity_service
 from ..services.voice_service import get_voice_service
+from ..utils.lazy_import import lazy_module
 from ..utils.logging import (
     get_image_logger,
     log_image_processing_error,
 )
 
+litellm = lazy_module("litellm")
+
 # URL regex pattern
 URL_PATTERN = re.compile(
     r"https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+[^\s]*", re.IGNORECASE
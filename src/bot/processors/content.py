@@ -8,6 +8,7 @@ Methods:
 Extracted from combined_processor.py as part of #152.
 """
 
+import asyncio
 import logging
 import os
 import tempfile
@@ -38,7 +39,7 @@ class ContentProcessorMixin:
         # Provided by CombinedMessageProcessor / TextProcessorMixin / MediaProcessorMixin
         reply_service: Any
         _mark_as_read_sync: Any
-        _send_typing_sync: Any
+        _chat_action: Any
         _send_message_sync: Any
         _handle_transcription_routing: Any
 
@@ -66,9 +67,6 @@ class ContentProcessorMixin:
         message_ids = [msg.message_id for msg in combined.messages]
         self._mark_as_read_sync(combined.chat_id, message_ids, "👀")
 
-        # Send typing indicator while processing
-        self._send_typing_sync(combined.chat_id)
-
         # Get bot token for downloading
         bot_token = os.environ.get("TELEGRAM_BOT_TOKEN", "")
         if not bot_token:
@@ -86,201 +84,215 @@ class ContentProcessorMixin:
         transcriptions = []
 
         try:
-            for video_msg in combined.videos:
-                try:
-                    if not video_msg.file_id:
-                        continue
+            # Keep "typing" visible for the whole transcription, not just ~5s
+            async with self._chat_action(combined.chat_id):
+                for video_msg in combined.videos:
+                    try:
+                        if not video_msg.file_id:
+                            continue
 
-                    logger.info(
-                        f"Processing video file_id: {video_msg.file_id[:50]}..."
-                    )
+                        logger.info(
+                            f"Processing video file_id: {video_msg.file_id[:50]}..."
+                        )
 
-                    # Prepare video path (used by both Bot API and Telethon downloads)
-                    video_filename = f"video_{uuid.uuid4().hex[:8]}.mp4"
-                    video_path = temp_dir / video_filename
+                        # Prepare video path (used by both Bot API and Telethon downloads)
+                        video_filename = f"video_{uuid.uuid4().hex[:8]}.mp4"
+                        video_path = temp_dir / video_filename
 
-                    # Check file size first (prevents wasting time on >20MB files)
-                    from ...utils.subprocess_helper import get_telegram_file_info
+                        # Check file size first (prevents wasting time on >20MB files)
+                        from ...utils.subprocess_helper import get_telegram_file_info
 
-                    file_info_result = get_telegram_file_info(
-                        file_id=video_msg.file_id,
-                        bot_token=bot_token,
-                        timeout=30,
-                    )
+                        # Blocking helpers run in threads so the chat action
+                        # keep-alive can fire while they work
+                        file_info_result = await asyncio.to_thread(
+                            get_telegram_file_info,
+                            file_id=video_msg.file_id,
+                            bot_token=bot_token,
+                            timeout=30,
+                        )
 
-                    if file_info_result.success:
-                        try:
-                            import json
-
-                            file_info = json.loads(file_info_result.stdout)
-                            file_size = file_info.get("file_size")
-                            if file_size:
-                                size_mb = file_size / (1024 * 1024)
-                                logger.info(f"Video file size: {size_mb:.2f} MB")
-
-                                if file_size > 20 * 1024 * 1024:  # >20MB
-                                    logger.info(
-                                        f"📥 Video is {size_mb:.2f}MB (>20MB). Using Telethon MTProto downloader..."
-                                    )
-
-                                    # Build Telegram URL from forward context
-                                    forward_url = None
-                                    if (
-                                        video_msg.forward_from_chat_username
-                                        and video_msg.forward_message_id
-                                    ):
-                                        forward_url = f"https://t.me/{video_msg.forward_from_chat_username}/{video_msg.forward_message_id}"
-
-                                    if not forward_url:
-                                        # Cannot download - no public URL
-                                        await message.reply_text(
-                                            f"⚠️ Cannot download this {size_mb:.1f}MB video: forwarded from private chat.\n\n"
-                                            f"To process:\n"
-                                            f"1️⃣ Download it to your device\n"
-                                            f"2️⃣ Send it directly to me (not as forward)"
-                                        )
-                                        continue
-
-                                    # Use Telethon to download large file
-                                    from ...services.telethon_service import (
-                                        get_telethon_service,
-                                    )
-
-                                    # video_path already initialized above
-                                    # Show progress message to user
-                                    await message.reply_text(
-                                        f"📥 Downloading {size_mb:.1f}MB video via Telethon...\n"
-                                        f"⏱️ This may take ~{int(size_mb * 2 / 60)} minutes"
-                                    )
-
-                                    try:
-                                        telethon_service = get_telethon_service()
-                                        telethon_result = (
-                                            await telethon_service.download_from_url(
-                                                url=forward_url,
-                                                output_path=video_path,
-                                                timeout=int(
-                                                    (size_mb * 2) + 120
-                                                ),  # 2s per MB + 2min buffer
-                                            )
+                        if file_info_result.success:
+                            try:
+                                import json
+
+                                file_info = json.loads(file_info_result.stdout)
+                                file_size = file_info.get("file_size")
+                                if file_size:
+                                    size_mb = file_size / (1024 * 1024)
+                                    logger.info(f"Video file size: {size_mb:.2f} MB")
+
+                                    if file_size > 20 * 1024 * 1024:  # >20MB
+                                        logger.info(
+                                            f"📥 Video is {size_mb:.2f}MB (>20MB). Using Telethon MTProto downloader..."
                                         )
 
-                                        if not telethon_result["success"]:
+                                        # Build Telegram URL from forward context
+                                        forward_url = None
+                                        if (
+                                            video_msg.forward_from_chat_username
+                                            and video_msg.forward_message_id
+                                        ):
+                                            forward_url = f"https://t.me/{video_msg.forward_from_chat_username}/{video_msg.forward_message_id}"
+
+                                        if not forward_url:
+                                            # Cannot download - no public URL
                                             await message.reply_text(
-                                                f"❌ Download failed: {telethon_result['error']}"
+                                                f"⚠️ Cannot download this {size_mb:.1f}MB video: forwarded from private chat.\n\n"
+                                                f"To process:\n"
+                                                f"1️⃣ Download it to your device\n"
+                                                f"2️⃣ Send it directly to me (not as forward)"
                                             )
                                             continue
 
-                                        logger.info(
-                                            f"✅ Downloaded {telethon_result['size_mb']:.1f}MB via Telethon"
+                                        # Use Telethon to download large file
+                                        from ...services.telethon_service import (
+                                            get_telethon_service,
                                         )
 
-                                        # Continue with audio extraction (skip Bot API download)
-                                        download_result = type(
-                                            "obj", (object,), {"success": True}
-                                        )()
-
-                                    except Exception as e:
-                                        logger.error(
-                                            f"Telethon download failed: {e}",
-                                            exc_info=True,
-                                        )
+                                        # video_path already initialized above
+                                        # Show progress message to user
                                         await message.reply_text(
-                                            f"❌ Failed to download video: {e}\n\n"
-                                            f"Try downloading manually and sending directly."
+                                            f"📥 Downloading {size_mb:.1f}MB video via Telethon...\n"
+                                            f"⏱️ This may take ~{int(size_mb * 2 / 60)} minutes"
                                         )
-                                        continue
-                        except Exception as e:
-                            logger.warning(f"Could not parse file info: {e}")
-
-                    # Download video via Bot API (only if not already downloaded via Telethon)
-                    # video_path already initialized above
-                    if not video_path.exists():
-                        download_result = download_telegram_file(
-                            file_id=video_msg.file_id,
-                            bot_token=bot_token,
-                            output_path=video_path,
-                            timeout=180,  # Videos can be large
-                        )
-                    else:
-                        # Already downloaded via Telethon
-                        download_result = type("obj", (object,), {"success": True})()
-
-                    if not download_result.success:
-                        logger.error(
-                            f"Failed to download video: {download_result.error}"
-                        )
-                        # Clean up temp file on download failure
-                        video_path.unlink(missing_ok=True)
-                        continue
 
-                    logger.info(f"Downloaded video to: {video_path}")
+                                        try:
+                                            telethon_service = get_telethon_service()
+                                            telethon_result = await telethon_service.download_from_url(
+                                                url=forward_url,
+                                                output_path=video_path,
+                                                timeout=int(
+                                                    (size_mb * 2) + 120
+                                                ),  # 2s per MB + 2min buffer
+                                            )
 
-                    # Validate downloaded video file
-                    from ...services.media_validator import validate_video
+                                            if not telethon_result["success"]:
+                                                await message.reply_text(
+                                                    f"❌ Download failed: {telethon_result['error']}"
+                                                )
+                                                continue
 
-                    video_val = validate_video(video_path, video_path.name)
-                    if not video_val.valid:
-                        logger.warning("Video validation failed: %s", video_val.reason)
-                        video_path.unlink(missing_ok=True)
-                        continue
+                                            logger.info(
+                                                f"✅ Downloaded {telethon_result['size_mb']:.1f}MB via Telethon"
+                                            )
 
-                    # Extract audio from video
-                    audio_path = temp_dir / f"audio_{uuid.uuid4().hex[:8]}.ogg"
+                                            # Continue with audio extraction (skip Bot API download)
+                                            download_result = type(
+                                                "obj", (object,), {"success": True}
+                                            )()
 
-                    extract_result = extract_audio_from_video(
-                        video_path=video_path,
-                        output_path=audio_path,
-                        timeout=120,
-                    )
+                                        except Exception as e:
+                                            logger.error(
+                                                f"Telethon download failed: {e}",
+                                                exc_info=True,
+                                            )
+                                            await message.reply_text(
+                                                f"❌ Failed to download video: {e}\n\n"
+                                                f"Try downloading manually and sending directly."
+                                            )
+                                            continue
+                            except Exception as e:
+                                logger.warning(f"Could not parse file info: {e}")
+
+                        # Download video via Bot API (only if not already downloaded via Telethon)
+                        # video_path already initialized above
+                        if not video_path.exists():
+                            download_result = await asyncio.to_thread(
+                                download_telegram_file,
+                                file_id=video_msg.file_id,
+                                bot_token=bot_token,
+                                output_path=video_path,
+                                timeout=180,  # Videos can be large
+                            )
+                        else:
+                            # Already downloaded via Telethon
+                            download_result = type(
+                                "obj", (object,), {"success": True}
+                            )()
+
+                        if not download_result.success:
+                            logger.error(
+                                f"Failed to download video: {download_result.error}"
+                            )
+                            # Clean up temp file on download failure
+                            video_path.unlink(missing_ok=True)
+                            continue
+
+                        logger.info(f"Downloaded video to: {video_path}")
+
+                        # Validate downloaded video file
+                        from ...services.media_validator import validate_video
+
+                        video_val = validate_video(video_path, video_path.name)
+                        if not video_val.valid:
+                            logger.warning(
+                                "Video validation failed: %s", video_val.reason
+                            )
+                            video_path.unlink(missing_ok=True)
+                            continue
+
+                        # Extract audio from video
+                        audio_path = temp_dir / f"audio_{uuid.uuid4().hex[:8]}.ogg"
+
+                        extract_result = await asyncio.to_thread(
+                            extract_audio_from_video,
+                            video_path=video_path,
+                            output_path=audio_path,
+                            timeout=120,
+                        )
 
-                    # Clean up video file
-                    try:
-                        video_path.unlink()
-                    except Exception:
-                        pass
+                        # Clean up video file
+                        try:
+                            video_path.unlink()
+                        except Exception:
+                            pass
 
-                    if not extract_result.success:
-                        logger.error(f"Failed to extract audio: {extract_result.error}")
-                        # Clean up audio temp file on extract failure
-                        audio_path.unlink(missing_ok=True)
-                        continue
+                        if not extract_result.success:
+                            logger.error(
+                                f"Failed to extract audio: {extract_result.error}"
+                            )
+                            # Clean up audio temp file on extract failure
+                            audio_path.unlink(missing_ok=True)
+                            continue
 
-                    logger.info(f"Extracted audio to: {audio_path}")
+                        logger.info(f"Extracted audio to: {audio_path}")
 
-                    # Determine transcription language
-                    from ...services.keyboard_service import get_whisper_use_locale
+                        # Determine transcription language
+                        from ...services.keyboard_service import get_whisper_use_locale
 
-                    use_user_locale = await get_whisper_use_locale(combined.chat_id)
-                    stt_language = (
-                        get_user_locale(combined.user_id) if use_user_locale else "en"
-                    )
+                        use_user_locale = await get_whisper_use_locale(combined.chat_id)
+                        stt_language = (
+                            get_user_locale(combined.user_id)
+                            if use_user_locale
+                            else "en"
+                        )
 
-                    # Transcribe audio using STT service (with fallback chain)
-                    stt_service = get_stt_service()
-                    stt_result = stt_service.transcribe(
-                        audio_path=audio_path,
-                        model="whisper-large-v3-turbo",
-                        language=stt_language,
-                    )
+                        # Transcribe audio using STT service (with fallback chain)
+                        stt_service = get_stt_service()
+                        stt_result = await asyncio.to_thread(
+                            stt_service.transcribe,
+                            audio_path=audio_path,
+                            model="whisper-large-v3-turbo",
+                            language=stt_language,
+                        )
 
-                    # Clean up audio file
-                    try:
-                        audio_path.unlink()
-                    except Exception:
-                        pass
+                        # Clean up audio file
+                        try:
+                            audio_path.unlink()
+                        except Exception:
+                            pass
 
-                    if stt_result.success and stt_result.text:
-                        transcriptions.append(stt_result.text)
-                        logger.info(
-                            f"Transcribed video via {stt_result.provider} (lang={stt_language}): "
-                            f"{stt_result.text[:100]}..."
-                        )
-                    else:
-                        logger.error(f"Transcription failed: {stt_result.error}")
+                        if stt_result.success and stt_result.text:
+                            transcriptions.append(stt_result.text)
+                            logger.info(
+                                f"Transcribed video via {stt_result.provider} (lang={stt_language}): "
+                                f"{stt_result.text[:100]}..."
+                            )
+                        else:
+                            logger.error(f"Transcription failed: {stt_result.error}")
 
-                except Exception as e:
-                    logger.error(f"Error processing video: {e}", exc_info=True)
+                    except Exception as e:
+                        logger.error(f"Error processing video: {e}", exc_info=True)
         finally:
             # Clean up temp directory and any leftover files
             import shutil
@@ -10,6 +10,7 @@ Methods:
 Extracted from combined_processor.py as part of #152.
 """
 
+import asyncio
 import logging
 import os
 import uuid
@@ -36,7 +37,7 @@ class MediaProcessorMixin:
         # Provided by CombinedMessageProcessor / TextProcessorMixin at runtime
         reply_service: Any
         _mark_as_read_sync: Any
-        _send_typing_sync: Any
+        _chat_action: Any
         _send_message_sync: Any
 
     async def _process_with_images(
@@ -256,9 +257,6 @@ class MediaProcessorMixin:
         message_ids = [msg.message_id for msg in combined.messages]
         self._mark_as_read_sync(combined.chat_id, message_ids, "👀")
 
-        # Send typing indicator while processing
-        self._send_typing_sync(combined.chat_id)
-
         # Get bot token for subprocess download
         bot_token = os.environ.get("TELEGRAM_BOT_TOKEN", "")
         if not bot_token:
@@ -269,74 +267,84 @@ class MediaProcessorMixin:
         # Transcribe all voice messages
         transcriptions = []
 
-        for voice_msg in combined.voices:
-            audio_path = None
-            try:
-                if not voice_msg.file_id:
-                    continue
+        # Keep "typing" visible for the whole transcription, not just ~5s
+        async with self._chat_action(combined.chat_id):
+            for voice_msg in combined.voices:
+                audio_path = None
+                try:
+                    if not voice_msg.file_id:
+                        continue
 
-                logger.info(f"Processing voice file_id: {voice_msg.file_id[:50]}...")
+                    logger.info(
+                        f"Processing voice file_id: {voice_msg.file_id[:50]}..."
+                    )
 
-                # Download voice file using secure subprocess helper
-                import tempfile as tf
+                    # Download voice file using secure subprocess helper
+                    import tempfile as tf
 
-                with tf.NamedTemporaryFile(suffix=".ogg", delete=False) as tmp:
-                    audio_path = Path(tmp.name)
+                    with tf.NamedTemporaryFile(suffix=".ogg", delete=False) as tmp:
+                        audio_path = Path(tmp.name)
 
-                download_result = download_telegram_file(
-                    file_id=voice_msg.file_id,
-                    bot_token=bot_token,
-                    output_path=audio_path,
-                    timeout=90,
-                )
-
-                if not download_result.success:
-                    logger.error(f"Failed to download voice: {download_result.error}")
-                    continue
+                    # Blocking helpers run in threads so the chat action
+                    # keep-alive can fire while they work
+                    download_result = await asyncio.to_thread(
+                        download_telegram_file,
+                        file_id=voice_msg.file_id,
+                        bot_token=bot_token,
+                        output_path=audio_path,
+                        timeout=90,
+                    )
 
-                logger.info(f"Downloaded voice to: {audio_path}")
+                    if not download_result.success:
+                        logger.error(
+                            f"Failed to download voice: {download_result.error}"
+                        )
+                        continue
 
-                # Validate downloaded voice file
-                from ...services.media_validator import validate_voice
+                    logger.info(f"Downloaded voice to: {audio_path}")
 
-                voice_val = validate_voice(audio_path, audio_path.name)
-                if not voice_val.valid:
-                    logger.warning("Voice validation failed: %s", voice_val.reason)
-                    continue
+                    # Validate downloaded voice file
+                    from ...services.media_validator import validate_voice
 
-                # Determine transcription language
-                from ...services.keyboard_service import get_whisper_use_locale
+                    voice_val = validate_voice(audio_path, audio_path.name)
+                    if not voice_val.valid:
+                        logger.warning("Voice validation failed: %s", voice_val.reason)
+                        continue
 
-                use_user_locale = await get_whisper_use_locale(combined.chat_id)
-                stt_language = (
-                    get_user_locale(combined.user_id) if use_user_locale else "en"
-                )
+                    # Determine transcription language
+                    from ...services.keyboard_service import get_whisper_use_locale
 
-                # Transcribe using STT service (with fallback chain)
-                stt_service = get_stt_service()
-                stt_result = stt_service.transcribe(
-                    audio_path=audio_path,
-                    model="whisper-large-v3-turbo",
-                    language=stt_language,
-                )
+                    use_user_locale = await get_whisper_use_locale(combined.chat_id)
+                    stt_language = (
+                        get_user_locale(combined.user_id) if use_user_locale else "en"
+                    )
 
-                if stt_result.success and stt_result.text:
-                    transcriptions.append(stt_result.text)
-                    logger.info(
-                        f"Transcribed via {stt_result.provider} (lang={stt_language}): "
-                        f"{stt_result.text[:100]}..."
+                    # Transcribe using STT service (with fallback chain)
+                    stt_service = get_stt_service()
+                    stt_result = await asyncio.to_thread(
+                        stt_service.transcribe,
+                        audio_path=audio_path,
+                        model="whisper-large-v3-turbo",
+                        language=stt_language,
                     )
-                else:
-                    logger.error(f"Transcription failed: {stt_result.error}")
 
-            except Exception as e:
-                logger.error(f"Error processing voice: {e}", exc_info=True)
-            finally:
-                if audio_path:
-                    try:
-                        audio_path.unlink(missing_ok=True)
-                    except Exception:
-                        pass
+                    if stt_result.success and stt_result.text:
+                        transcriptions.append(stt_result.text)
+                        logger.info(
+                            f"Transcribed via {stt_result.provider} (lang={stt_language}): "
+                            f"{stt_result.text[:100]}..."
+                        )
+                    else:
+                        logger.error(f"Transcription failed: {stt_result.error}")
+
+                except Exception as e:
+                    logger.error(f"Error processing voice: {e}", exc_info=True)
+                finally:
+                    if audio_path:
+                        try:
+                            audio_path.unlink(missing_ok=True)
+                        except Exception:
+                            pass
 
         if not transcriptions:
             self._send_message_sync(
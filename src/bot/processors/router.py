@@ -15,7 +15,7 @@ from typing import Optional
 from ...core.config import get_config_value
 from ...core.error_messages import sanitize_error
 from ...services.message_buffer import CombinedMessage
-from ...services.message_persistence_service import persist_message
+from ...services.message_persistence_service import get_message_persistence_writer
 from ...services.reply_context import (
     MessageType,
     ReplyContext,
@@ -71,19 +71,20 @@ class CombinedMessageProcessor(
             f"reply_to={combined.reply_to_message_id}"
         )
 
-        # Fire-and-forget: persist each incoming message to the database
-        for buf_msg in combined.messages:
-            create_tracked_task(
-                persist_message(
+        # Fire-and-forget: queue each incoming message for batched persistence
+        try:
+            writer = get_message_persistence_writer()
+            for buf_msg in combined.messages:
+                writer.enqueue(
                     telegram_chat_id=combined.chat_id,
                     from_user_id=combined.user_id,
                     message_id=buf_msg.message_id,
                     text=buf_msg.text or buf_msg.caption,
                     message_type=buf_msg.message_type,
                     timestamp=buf_msg.timestamp,
-                ),
-                name=f"persist_msg_{buf_msg.message_id}",
-            )
+                )
+        except Exception as e:
+            logger.warning(f"Failed to queue messages for persistence: {e}")
 
         # Check plugin message processors first (highest priority)
         try:
@@ -243,9 +244,16 @@ class CombinedMessageProcessor(
 
                         async def lookup_session():
                             service = get_claude_code_service()
-                            # Try timestamp correlation first for precise session matching
-                            sid = None
-                            if combined.reply_to_message_date:
+                            # Exact message -> session mapping recorded on send
+                            sid = await service.find_session_by_message(
+                                combined.chat_id, combined.reply_to_message_id
+                            )
+                            if sid:
+                                logger.info(
+                                    f"Restored session_id from message mapping: {sid[:8]}..."
+                                )
+                            # Older messages: fall back to timestamp correlation
+                            if not sid and combined.reply_to_message_date:
                                 sid = await service.find_session_by_timestamp(
                                     combined.chat_id,
                                     combined.reply_to_message_date,
@@ -316,11 +324,7 @@ class CombinedMessageProcessor(
                     session_id=session_id,  # Include restored session_id
                 )
                 # Track it for future replies
-                self.reply_service._cache[
-                    self.reply_service._make_key(
-                        combined.chat_id, combined.reply_to_message_id
-                    )
-                ] = reply_context
+                self.reply_service.store_context(reply_context)
                 logger.debug(
                     f"Created and cached reply context for message {combined.reply_to_message_id}"
                 )
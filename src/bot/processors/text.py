@@ -7,8 +7,8 @@ Methods:
 - _process_claude_command: Legacy /claude command handler
 - _process_contacts: Route contact messages
 - _process_with_polls: Format and route poll messages
-- _mark_as_read_sync: React to messages with emoji (sync)
-- _send_typing_sync: Send typing indicator (sync)
+- _mark_as_read_sync: Queue emoji reactions on messages (non-blocking)
+- _chat_action: Keep a typing/upload indicator alive for a job
 - _send_message_sync: Send message via Telegram API (sync)
 
 Extracted from combined_processor.py as part of #152.
@@ -39,53 +39,37 @@ class TextProcessorMixin:
         message_ids: list,
         emoji: str = "👀",
     ) -> None:
-        """Mark messages as read by reacting with an emoji (sync subprocess version).
+        """Mark messages as read by reacting with an emoji.
+
+        Returns immediately: reactions are coalesced per chat and sent
+        concurrently in the background by the chat action service.
 
         Note: Telegram only allows specific emojis for reactions. Valid ones include:
         👍, 👎, ❤️, 🔥, 👏, 😁, 🤔, 👀, 🎉, 🤩, 😎, 🙏, etc.
         NOT valid: ✅, ✔️, and many other common emojis
         """
-        import requests
+        from ...services.chat_action_service import get_chat_action_service
 
-        bot_token = os.environ.get("TELEGRAM_BOT_TOKEN", "")
-        if not bot_token:
-            return
+        try:
+            get_chat_action_service().react(chat_id, message_ids, emoji)
+        except Exception as e:
+            logger.debug(f"Could not queue {emoji} reaction in {chat_id}: {e}")
 
-        for msg_id in message_ids:
-            try:
-                # Use requests in sync mode to avoid async blocking
-                url = f"https://api.telegram.org/bot{bot_token}/setMessageReaction"
-                payload = {
-                    "chat_id": chat_id,
-                    "message_id": msg_id,
-                    "reaction": [{"type": "emoji", "emoji": emoji}],
-                }
-                response = requests.post(url, json=payload, timeout=5)
-                result = response.json()
-                if result.get("ok"):
-                    logger.info(f"Marked message {msg_id} with {emoji}")
-                else:
-                    logger.warning(
-                        f"Failed to react to {msg_id}: {result.get('description', 'Unknown error')}"
-                    )
-            except Exception as e:
-                logger.debug(f"Could not react to message {msg_id}: {e}")
+    def _chat_action(self, chat_id: int, action: str = "typing"):
+        """Async context manager keeping a chat action alive for a job.
 
-    def _send_typing_sync(self, chat_id: int) -> None:
-        """Send typing indicator (sync version to avoid async blocking)."""
-        import requests
+        Falls back to a no-op context if the service is unavailable, so a
+        cosmetic indicator can never break message processing.
+        """
+        from contextlib import nullcontext
 
-        bot_token = os.environ.get("TELEGRAM_BOT_TOKEN", "")
-        if not bot_token:
-            return
+        from ...services.chat_action_service import get_chat_action_service
 
         try:
-            url = f"https://api.telegram.org/bot{bot_token}/sendChatAction"
-            payload = {"chat_id": chat_id, "action": "typing"}
-            requests.post(url, json=payload, timeout=5)
-            logger.debug(f"Sent typing indicator to {chat_id}")
+            return get_chat_action_service().chat_action(chat_id, action)
         except Exception as e:
-            logger.debug(f"Could not send typing indicator: {e}")
+            logger.debug(f"Chat action unavailable for {chat_id}: {e}")
+            return nullcontext()
 
     def _send_message_sync(
         self,
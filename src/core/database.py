@@ -252,6 +252,79 @@ async def init_database() -> None:
             except Exception:
                 pass  # already exists
 
+    # Migrate: add poll_responses.template_id, copied out of context_metadata
+    async with _engine.begin() as conn:
+        try:
+            await conn.execute(
+                text("ALTER TABLE poll_responses ADD COLUMN template_id VARCHAR")
+            )
+            await conn.execute(
+                text(
+                    "UPDATE poll_responses SET template_id = "
+                    "json_extract(context_metadata, '$.template_id') "
+                    "WHERE json_valid(context_metadata)"
+                )
+            )
+            logger.info("Added template_id column to poll_responses table")
+        except Exception:
+            pass  # already exists
+
+    # Migrate: add task_run_logs.queue_wait_seconds if missing
+    async with _engine.begin() as conn:
+        try:
+            await conn.execute(
+                text("ALTER TABLE task_run_logs ADD COLUMN queue_wait_seconds FLOAT")
+            )
+            logger.info("Added queue_wait_seconds column to task_run_logs table")
+        except Exception:
+            pass  # already exists
+
+    # Migrate: add scheduled_tasks run lease columns if missing
+    for column, column_type in (
+        ("lease_owner", "VARCHAR(64)"),
+        ("lease_expires_at", "DATETIME"),
+    ):
+        async with _engine.begin() as conn:
+            try:
+                await conn.execute(
+                    text(
+                        f"ALTER TABLE scheduled_tasks ADD COLUMN {column} {column_type}"
+                    )
+                )
+                logger.info(f"Added {column} column to scheduled_tasks table")
+            except Exception:
+                pass  # already exists
+
+    # Migrate: composite indexes used by chunked retention purges, reply
+    # session lookups and callback data TTL purges. create_all only adds indexes for newly created tables.
+    async with _engine.begin() as conn:
+        composite_indexes = [
+            ("ix_messages_chat_id_created_at", "messages", "chat_id, created_at"),
+            ("ix_images_chat_id_created_at", "images", "chat_id, created_at"),
+            ("ix_check_ins_user_id_created_at", "check_ins", "user_id, created_at"),
+            (
+                "ix_claude_sessions_chat_active_last_used",
+                "claude_sessions",
+                "chat_id, is_active, last_used",
+            ),
+            ("ix_callback_data_accessed_at", "callback_data", "accessed_at"),
+            (
+                "ix_poll_responses_chat_id_created_at",
+                "poll_responses",
+                "chat_id, created_at",
+            ),
+        ]
+        for index_name, table_name, columns in composite_indexes:
+            try:
+                await conn.execute(
+                    text(
+                        f"CREATE INDEX IF NOT EXISTS {index_name} "
+                        f"ON {table_name} ({columns})"
+                    )
+                )
+            except Exception:
+                pass  # table missing or index already present
+
     # Migrate: copy user_settings rows into context-specific tables (#222)
     await _migrate_split_settings(_engine)
 
@@ -275,6 +348,38 @@ async def init_database() -> None:
                 pass
         logger.debug("Orphan table cleanup complete")
 
+    # Full-text search over messages and archived Claude conversations
+    if "sqlite" in database_url:
+        try:
+            from ..services.conversation_search import initialize_search_index
+
+            if await initialize_search_index(_engine):
+                logger.info("Conversation search index initialized")
+        except Exception as e:
+            logger.warning(
+                f"Conversation search index initialization failed (continuing without search): {e}"
+            )
+
+    # Hourly poll rollup for long-range analytics windows
+    if "sqlite" in database_url:
+        try:
+            from ..services.poll_analytics import initialize_poll_rollup
+
+            await initialize_poll_rollup(_engine)
+        except Exception as e:
+            logger.warning(
+                f"Poll rollup initialization failed (analytics read raw rows): {e}"
+            )
+
+    # Poll embeddings moved from JSON text to packed float32 blobs
+    if "sqlite" in database_url:
+        try:
+            from ..services.poll_embeddings import migrate_json_embeddings
+
+            await migrate_json_embeddings(_engine)
+        except Exception as e:
+            logger.warning(f"Poll embedding migration failed (continuing): {e}")
+
     # Initialize vector database support
     try:
         from ..core.vector_db import get_vector_db
@@ -5,6 +5,14 @@ Provides YAML-based translation loading, dot-notation key lookup with
 fallback chain (requested locale → en → raw key), and per-user locale
 caching backed by the existing LRUCache.
 
+Locale files are compiled once at load time: nested keys are flattened
+into one dict per locale, plural forms are grouped under their parent key,
+each locale gets its fallback chain, and every string is parsed into a
+template so interpolation does not re-parse the format string per call.
+Edit ``_translations`` directly only in tests, then call
+``compile_catalog()``. Locale YAML can be reloaded at runtime with
+``reload_translations_if_changed()`` (polled by ``run_locale_watcher()``).
+
 Usage:
     from src.core.i18n import t, get_user_locale_from_update
 
@@ -12,10 +20,12 @@ Usage:
     text = t("commands.start.welcome", locale, name=user.first_name)
 """
 
+import asyncio
 import glob
 import logging
 from pathlib import Path
-from typing import Any, Dict, Optional, Set
+from string import Formatter
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 import yaml
 
@@ -31,6 +41,116 @@ DEFAULT_LOCALE = "en"
 # Per-user locale cache: user_id -> locale string
 _locale_cache: LRUCache[int, str] = LRUCache(max_size=10000)
 
+PLURAL_CATEGORIES = frozenset({"zero", "one", "two", "few", "many", "other"})
+
+_formatter = Formatter()
+
+
+class _Template:
+    """A translation string parsed once for repeated interpolation.
+
+    Simple ``{name}`` / ``{name:spec}`` / ``{name!r}`` fields are filled
+    directly from the variables. Anything else (attribute or index access,
+    nested specs, positional fields) keeps using ``str.format_map``. As
+    before, a template that cannot be filled is returned unchanged.
+    """
+
+    __slots__ = ("text", "parts", "simple")
+
+    def __init__(self, text: str):
+        self.text = text
+        # (literal, field_name, format_spec, conversion) tuples
+        self.parts: Optional[List[Tuple[str, Optional[str], str, Optional[str]]]]
+        try:
+            self.parts = [
+                (literal, name, spec or "", conversion)
+                for literal, name, spec, conversion in _formatter.parse(text)
+            ]
+        except ValueError:
+            self.parts = None  # malformed braces: never interpolated
+            self.simple = False
+            return
+        self.simple = all(
+            name is None
+            or (
+                name.isidentifier()
+                and "{" not in spec
+                and conversion in (None, "r", "s", "a")
+            )
+            for _, name, spec, conversion in self.parts
+        )
+
+    def render(self, variables: Dict[str, Any]) -> str:
+        if not variables or self.parts is None:
+            return self.text
+        if not self.simple:
+            return _interpolate(self.text, variables)
+        out = []
+        try:
+            for literal, name, spec, conversion in self.parts:
+                out.append(literal)
+                if name is None:
+                    continue
+                value = variables[name]
+                if conversion == "r":
+                    value = repr(value)
+                elif conversion == "s":
+                    value = str(value)
+                elif conversion == "a":
+                    value = ascii(value)
+                out.append(format(value, spec))
+        except (KeyError, ValueError, IndexError):
+            logger.debug(f"Interpolation failed for template: {self.text[:80]}")
+            return self.text
+        return "".join(out)
+
+
+class _LocaleCatalog:
+    """Flattened, precompiled translations for one locale."""
+
+    __slots__ = ("locale", "strings", "plurals", "plural_form")
+
+    def __init__(self, locale: str, data: Dict[str, Any]):
+        self.locale = locale
+        # "commands.start.welcome" -> template
+        self.strings: Dict[str, _Template] = {}
+        # "items" -> {"one": template, "other": template}
+        self.plurals: Dict[str, Dict[str, _Template]] = {}
+        self.plural_form: Callable[[int], str] = _plural_rule(locale)
+        self._flatten(data, "")
+
+    def _flatten(self, node: Dict[str, Any], prefix: str) -> None:
+        forms: Dict[str, _Template] = {}
+        for name, value in node.items():
+            key = f"{prefix}{name}"
+            if isinstance(value, dict):
+                self._flatten(value, f"{key}.")
+            elif value is not None and not isinstance(value, list):
+                template = _Template(str(value))
+                self.strings[key] = template
+                if name in PLURAL_CATEGORIES:
+                    forms[name] = template
+        if forms:
+            self.plurals[prefix[:-1]] = forms
+
+    def lookup(self, key: str, count: Optional[int]) -> Optional[_Template]:
+        """Same resolution order as ``key.<form>`` → ``key.other`` → ``key``."""
+        if count is not None:
+            forms = self.plurals.get(key)
+            if forms is not None:
+                template = forms.get(self.plural_form(count)) or forms.get("other")
+                if template is not None:
+                    return template
+        return self.strings.get(key)
+
+
+# locale -> catalogs to try in order (the locale itself, then DEFAULT_LOCALE)
+_fallback_chains: Dict[str, Tuple[_LocaleCatalog, ...]] = {}
+
+# Locale files behind the current catalog, for hot reload: path -> mtime_ns
+_loaded_dir: Optional[Path] = None
+_source_mtimes: Dict[str, int] = {}
+
 
 def _get_locales_dir() -> Path:
     """Get the locales directory path, trying multiple resolution strategies."""
@@ -46,56 +166,152 @@ def _get_locales_dir() -> Path:
     return source_based
 
 
-def load_translations(locales_dir: Optional[Path] = None) -> None:
-    """Load all locale YAML files from the locales directory.
-
-    Args:
-        locales_dir: Override path for testing. Defaults to project locales/.
-    """
-    if locales_dir is None:
-        locales_dir = _get_locales_dir()
-
-    _translations.clear()
-    SUPPORTED_LOCALES.clear()
-
-    yaml_files = sorted(glob.glob(str(locales_dir / "*.yaml")))
-    for filepath in yaml_files:
+def _scan_locale_files(locales_dir: Path) -> Dict[str, int]:
+    mtimes = {}
+    for filepath in sorted(glob.glob(str(locales_dir / "*.yaml"))):
+        try:
+            mtimes[filepath] = Path(filepath).stat().st_mtime_ns
+        except OSError:
+            continue
+    return mtimes
+
+
+def _read_locale_files(
+    locales_dir: Path,
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, int]]:
+    """Parse every locale YAML file. Touches no module state."""
+    mtimes = _scan_locale_files(locales_dir)
+    loaded: Dict[str, Dict[str, Any]] = {}
+    for filepath in mtimes:
         locale = Path(filepath).stem  # e.g. "en" from "en.yaml"
         try:
             with open(filepath, "r", encoding="utf-8") as f:
                 data = yaml.safe_load(f)
                 if data and isinstance(data, dict):
-                    _translations[locale] = data
-                    SUPPORTED_LOCALES.add(locale)
+                    loaded[locale] = data
                     logger.info(f"Loaded locale: {locale} ({len(data)} top-level keys)")
         except Exception as e:
             logger.error(f"Failed to load locale file {filepath}: {e}")
+    return loaded, mtimes
+
+
+def _install_translations(
+    loaded: Dict[str, Dict[str, Any]], mtimes: Dict[str, int], locales_dir: Path
+) -> None:
+    """Replace the loaded translations and recompile.
+
+    Other modules hold references to ``_translations`` and
+    ``SUPPORTED_LOCALES``, so they are refilled in place; call this from the
+    event loop thread (never from a worker thread) so no handler observes
+    them half-updated.
+    """
+    global _loaded_dir
+
+    _translations.clear()
+    _translations.update(loaded)
+    SUPPORTED_LOCALES.clear()
+    SUPPORTED_LOCALES.update(loaded)
+    compile_catalog()
+
+    _loaded_dir = locales_dir
+    _source_mtimes.clear()
+    _source_mtimes.update(mtimes)
 
     if DEFAULT_LOCALE not in SUPPORTED_LOCALES:
         logger.warning(f"Default locale '{DEFAULT_LOCALE}' not found in {locales_dir}")
 
 
-def _resolve_key(data: Dict[str, Any], key: str) -> Optional[str]:
-    """Resolve a dot-notation key in a nested dict.
+def load_translations(locales_dir: Optional[Path] = None) -> None:
+    """Load all locale YAML files from the locales directory and compile them.
 
     Args:
-        data: Nested translation dict for a locale.
-        key: Dot-separated key like "commands.start.welcome".
+        locales_dir: Override path for testing. Defaults to project locales/.
+    """
+    if locales_dir is None:
+        locales_dir = _get_locales_dir()
+    _install_translations(*_read_locale_files(locales_dir), locales_dir)
+
+
+def compile_catalog() -> None:
+    """Rebuild the compiled catalogs from ``_translations``."""
+    global _fallback_chains
+
+    catalogs = {
+        locale: _LocaleCatalog(locale, data) for locale, data in _translations.items()
+    }
+    default = catalogs.get(DEFAULT_LOCALE)
+    chains = {}
+    for locale, catalog in catalogs.items():
+        chain = [catalog]
+        if default is not None and locale != DEFAULT_LOCALE:
+            chain.append(default)
+        chains[locale] = tuple(chain)
+    # Replaced wholesale so concurrent t() calls see old or new, never partial
+    _fallback_chains = chains
+    _normalized_locales.clear()
+
+
+def reload_translations_if_changed() -> bool:
+    """Reload locale YAML if any file was added, removed or modified.
 
     Returns:
-        The string value, or None if not found.
+        True if translations were reloaded.
     """
-    parts = key.split(".")
-    current = data
-    for part in parts:
-        if isinstance(current, dict) and part in current:
-            current = current[part]
-        else:
-            return None
-    # Only return strings (or things that can be stringified)
-    if current is None:
+    locales_dir = _loaded_dir or _get_locales_dir()
+    changed = _read_locale_files_if_changed(locales_dir, _source_mtimes)
+    if changed is None:
+        return False
+    _install_translations(*changed, locales_dir)
+    return True
+
+
+def _read_locale_files_if_changed(
+    locales_dir: Path, known_mtimes: Dict[str, int]
+) -> Optional[Tuple[Dict[str, Dict[str, Any]], Dict[str, int]]]:
+    if _scan_locale_files(locales_dir) == known_mtimes:
         return None
-    return str(current) if not isinstance(current, (dict, list)) else None
+    logger.info(f"Locale files changed in {locales_dir}, reloading translations")
+    return _read_locale_files(locales_dir)
+
+
+async def run_locale_watcher(interval_seconds: float = 5.0) -> None:
+    """Poll the locale directory and hot-reload translations on change.
+
+    Files are stat-ed and parsed in a worker thread; the new translations
+    are installed back on the event loop.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            locales_dir = _loaded_dir or _get_locales_dir()
+            changed = await asyncio.to_thread(
+                _read_locale_files_if_changed, locales_dir, dict(_source_mtimes)
+            )
+            if changed is not None:
+                _install_translations(*changed, locales_dir)
+        except Exception as e:
+            logger.error(f"Locale reload failed: {e}")
+
+
+def _plural_rule(locale: str) -> Callable[[int], str]:
+    """Return the plural-category function for a locale."""
+    if locale == "ru":
+        return _plural_ru
+    return _plural_en
+
+
+def _plural_ru(n: int) -> str:
+    mod10 = n % 10
+    mod100 = n % 100
+    if mod10 == 1 and mod100 != 11:
+        return "one"
+    if mod10 in (2, 3, 4) and mod100 not in (12, 13, 14):
+        return "few"
+    return "many"
+
+
+def _plural_en(n: int) -> str:
+    return "one" if n == 1 else "other"
 
 
 def _plural_form(n: int, locale: str) -> str:
@@ -104,16 +320,7 @@ def _plural_form(n: int, locale: str) -> str:
     Implements rules for English and Russian.  Other locales fall back
     to the English rule (one / other).
     """
-    if locale == "ru":
-        mod10 = n % 10
-        mod100 = n % 100
-        if mod10 == 1 and mod100 != 11:
-            return "one"
-        if mod10 in (2, 3, 4) and mod100 not in (12, 13, 14):
-            return "few"
-        return "many"
-    # English / default
-    return "one" if n == 1 else "other"
+    return _plural_rule(locale)(n)
 
 
 def t(
@@ -144,34 +351,13 @@ def t(
 
     # If count is provided, add it to interpolation variables
     if count is not None:
-        kwargs = {**kwargs, "count": count, "n": count}
+        kwargs["count"] = count
+        kwargs["n"] = count
 
-    # Build ordered list of keys to try when count is provided
-    if count is not None:
-        form = _plural_form(count, locale)
-        keys_to_try = [f"{key}.{form}", f"{key}.other", key]
-    else:
-        keys_to_try = [key]
-
-    # Try requested locale
-    if locale in _translations:
-        for k in keys_to_try:
-            value = _resolve_key(_translations[locale], k)
-            if value is not None:
-                return _interpolate(value, kwargs)
-
-    # Fallback to default locale
-    if locale != DEFAULT_LOCALE and DEFAULT_LOCALE in _translations:
-        # Re-derive plural form for default locale
-        if count is not None:
-            form_default = _plural_form(count, DEFAULT_LOCALE)
-            fallback_keys = [f"{key}.{form_default}", f"{key}.other", key]
-        else:
-            fallback_keys = [key]
-        for k in fallback_keys:
-            value = _resolve_key(_translations[DEFAULT_LOCALE], k)
-            if value is not None:
-                return _interpolate(value, kwargs)
+    for catalog in _fallback_chains.get(locale, ()):
+        template = catalog.lookup(key, count)
+        if template is not None:
+            return template.render(kwargs)
 
     # Final fallback: return the raw key
     logger.debug(f"Missing translation: key={key}, locale={locale}")
@@ -194,6 +380,10 @@ def _interpolate(template: str, variables: Dict[str, Any]) -> str:
         return template
 
 
+# raw locale string -> normalized code, cleared whenever the catalog changes
+_normalized_locales: Dict[Optional[str], str] = {}
+
+
 def normalize_locale(raw: Optional[str]) -> str:
     """Normalize a locale string to a supported locale code.
 
@@ -212,6 +402,10 @@ def normalize_locale(raw: Optional[str]) -> str:
     if not raw:
         return DEFAULT_LOCALE
 
+    cached = _normalized_locales.get(raw)
+    if cached is not None and SUPPORTED_LOCALES:
+        return cached
+
     # Take just the language part (before hyphen/underscore)
     base = raw.lower().split("-")[0].split("_")[0].strip()
 
@@ -222,10 +416,10 @@ def normalize_locale(raw: Optional[str]) -> str:
     if not SUPPORTED_LOCALES:
         load_translations()
 
-    if base in SUPPORTED_LOCALES:
-        return base
-
-    return DEFAULT_LOCALE
+    normalized = base if base in SUPPORTED_LOCALES else DEFAULT_LOCALE
+    if len(_normalized_locales) < 1000:  # bounded: raw values come from users
+        _normalized_locales[raw] = normalized
+    return normalized
 
 
 def get_user_locale_from_update(update: Any) -> str:
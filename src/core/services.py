@@ -156,16 +156,21 @@ def setup_services() -> None:
     # Reply Context - tracks message context for replies
     def create_reply_context(c):
         from ..services.reply_context import ReplyContextService
+        from .config import get_limit, get_path
 
-        return ReplyContextService()
+        return ReplyContextService(
+            max_cache_size=get_limit("reply_context_cache_size", 1000),
+            spill_path=get_path("reply_context_spill_db") or None,
+        )
 
     container.register("reply_context", create_reply_context)
 
     # Routing Memory - remembers user routing preferences
     def create_routing_memory(c):
-        from ..services.routing_memory import RoutingMemory
+        from ..services.routing_memory import get_routing_memory
 
-        return RoutingMemory()
+        # Shared with callers of get_routing_memory() so both see one model
+        return get_routing_memory()
 
     container.register("routing_memory", create_routing_memory)
 
@@ -187,9 +192,9 @@ def setup_services() -> None:
 
     # Callback Data Manager - manages callback data storage
     def create_callback_manager(c):
-        from ..bot.callback_data_manager import CallbackDataManager
+        from ..bot.callback_data_manager import get_callback_data_manager
 
-        return CallbackDataManager()
+        return get_callback_data_manager()
 
     container.register("callback_manager", create_callback_manager)
 
@@ -312,11 +317,24 @@ def setup_services() -> None:
 
     container.register("task_ledger", create_task_ledger_service)
 
+    # Task Ledger Scheduler - fires ledger tasks when due (min-heap, leases)
+    def create_task_ledger_scheduler(c):
+        from ..services.task_ledger_scheduler import TaskLedgerScheduler
+        from .config import get_timeout
+
+        return TaskLedgerScheduler(
+            lease_seconds=get_timeout("task_ledger_lease_seconds", 600.0),
+            resync_seconds=get_timeout("task_ledger_resync_seconds", 300.0),
+        )
+
+    container.register("task_ledger_scheduler", create_task_ledger_scheduler)
+
     # Telethon Service - Telegram MTProto client
     def create_telethon_service(c):
-        from ..services.telethon_service import TelethonService
+        from ..services.telethon_service import get_telethon_service
 
-        return TelethonService()
+        # Shared instance so the connection/bandwidth caps are global
+        return get_telethon_service()
 
     container.register("telethon", create_telethon_service)
 
@@ -336,6 +354,56 @@ def setup_services() -> None:
 
     container.register("job_queue", create_job_queue_service)
 
+    # Message Persistence Writer - write-behind batching of incoming messages
+    def create_message_persistence_writer(c):
+        from ..services.message_persistence_service import MessagePersistenceWriter
+        from .config import get_limit, get_timeout
+
+        return MessagePersistenceWriter(
+            flush_interval=get_timeout("message_persist_flush_interval", 0.25),
+            max_batch_size=get_limit("message_persist_batch_size", 50),
+            max_queue_size=get_limit("message_persist_queue_size", 5000),
+        )
+
+    container.register("message_persistence", create_message_persistence_writer)
+
+    # Poll Embedding Writer - batched background embedding of poll answers
+    def create_poll_embedding_writer(c):
+        from ..services.poll_embeddings import PollEmbeddingWriter
+        from .config import get_limit, get_timeout
+
+        return PollEmbeddingWriter(
+            flush_interval=get_timeout("poll_embedding_flush_interval", 1.0),
+            max_batch_size=get_limit("poll_embedding_batch_size", 32),
+            max_queue_size=get_limit("poll_embedding_queue_size", 1000),
+        )
+
+    container.register("poll_embeddings", create_poll_embedding_writer)
+
+    # Poll State Store - durable registry of in-flight polls
+    def create_poll_state_store(c):
+        from ..services.poll_state_store import PollStateStore
+        from .config import get_limit, get_timeout
+
+        return PollStateStore(
+            ttl_hours=get_timeout("poll_state_ttl_hours", 48.0),
+            cache_size=get_limit("poll_state_cache_size", 1000),
+        )
+
+    container.register("poll_state", create_poll_state_store)
+
+    # Chat Action Service - coalesced reactions and typing keep-alives
+    def create_chat_action_service(c):
+        from ..services.chat_action_service import ChatActionService
+        from .config import get_limit
+
+        return ChatActionService(
+            max_concurrency=get_limit("chat_action_max_concurrency", 8),
+            max_requests_per_second=get_limit("chat_action_max_rps", 25),
+        )
+
+    container.register("chat_actions", create_chat_action_service)
+
     logger.info("All services registered in container")
 
 
@@ -400,6 +468,11 @@ class Services:
     DESIGN_SKILLS = "design_skills"
     OPENCODE = "opencode"
     TASK_LEDGER = "task_ledger"
+    TASK_LEDGER_SCHEDULER = "task_ledger_scheduler"
     TELETHON = "telethon"
     VOICE_RESPONSE = "voice_response"
     JOB_QUEUE = "job_queue"
+    MESSAGE_PERSISTENCE = "message_persistence"
+    POLL_EMBEDDINGS = "poll_embeddings"
+    POLL_STATE = "poll_state"
+    CHAT_ACTIONS = "chat_actions"
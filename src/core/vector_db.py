@@ -1,19 +1,35 @@
 import logging
 import os
+import re
 import sqlite3
 from pathlib import Path
 from typing import TYPE_CHECKING, List, Optional, Tuple
 
 import aiosqlite
 
+from ..utils.vector_search import cosine_top_k, stack_embeddings, unpack_embedding
+
 if TYPE_CHECKING:
     from ..services.embedding_service import EmbeddingService
 
 logger = logging.getLogger(__name__)
 
+# Declared vector width in the CREATE VIRTUAL TABLE statement
+_VSS_DIMENSION_RE = re.compile(r"embedding\((\d+)\)")
+
 
 class VectorDatabase:
-    """Vector database operations using sqlite-vss"""
+    """Vector database operations using sqlite-vss
+
+    The vss tables are created at startup before the embedding model is
+    loaded, so their width is only a default. The first insert of a vector
+    with another width (e.g. 512 for clip-ViT-B-32) recreates them at that
+    width; the old index belonged to a different model and is dropped, and
+    the embedding backfill re-embeds those images.
+    """
+
+    # Width of freshly created vss tables until the first insert resizes them
+    DEFAULT_VSS_DIMENSION = 384
 
     def __init__(
         self,
@@ -91,22 +107,7 @@ class VectorDatabase:
                     await db.execute("SELECT load_extension(?)", (vss0_file,))
                     logger.info(f"sqlite-vss extension loaded from {vss0_file}")
 
-                    # Create virtual tables for vector operations
-                    # First create the vector table
-                    await db.execute("""
-                        CREATE VIRTUAL TABLE IF NOT EXISTS image_vector_embeddings
-                        USING vector0(
-                            embedding(384)
-                        )
-                    """)
-
-                    # Then create the VSS table for similarity search
-                    await db.execute("""
-                        CREATE VIRTUAL TABLE IF NOT EXISTS image_embeddings
-                        USING vss0(
-                            embedding(384)
-                        )
-                    """)
+                    await self._create_vss_tables(db, self.DEFAULT_VSS_DIMENSION)
 
                     await db.commit()
                     logger.info("Vector database initialized successfully")
@@ -136,6 +137,64 @@ class VectorDatabase:
             )
             return False
 
+    async def _create_vss_tables(
+        self, db: aiosqlite.Connection, dimension: int
+    ) -> None:
+        """Create the vector0 and vss0 tables for ``dimension``-wide vectors."""
+        # First create the vector table
+        await db.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS image_vector_embeddings
+            USING vector0(
+                embedding({int(dimension)})
+            )
+        """)
+
+        # Then create the VSS table for similarity search
+        await db.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS image_embeddings
+            USING vss0(
+                embedding({int(dimension)})
+            )
+        """)
+
+    async def _vss_dimension(self, db: aiosqlite.Connection) -> Optional[int]:
+        """Declared width of image_embeddings, None if unknown."""
+        async with db.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'image_embeddings'"
+        ) as cursor:
+            row = await cursor.fetchone()
+        match = _VSS_DIMENSION_RE.search(row[0] or "") if row else None
+        return int(match.group(1)) if match else None
+
+    async def _ensure_vss_dimension(
+        self, db: aiosqlite.Connection, dimension: int
+    ) -> bool:
+        """Make the vss tables hold ``dimension``-wide vectors.
+
+        Recreates them (dropping the index of the previous model) when the
+        declared width differs. Returns False if they cannot be recreated,
+        in which case the vss index is skipped.
+        """
+        declared = await self._vss_dimension(db)
+        if declared is None or declared == dimension:
+            return True
+        logger.warning(
+            f"Vector index holds {declared}-d vectors, embeddings are "
+            f"{dimension}-d; recreating it"
+        )
+        try:
+            # DELETE first so the DROPs run inside its transaction
+            await db.execute("DELETE FROM embedding_mappings")
+            await db.execute("DROP TABLE IF EXISTS image_embeddings")
+            await db.execute("DROP TABLE IF EXISTS image_vector_embeddings")
+            await self._create_vss_tables(db, dimension)
+            await db.commit()
+            return True
+        except sqlite3.OperationalError as e:
+            await db.rollback()
+            logger.warning(f"Could not resize vector index, skipping it: {e}")
+            return False
+
     async def store_embedding(self, image_id: int, embedding_bytes: bytes) -> bool:
         """Store embedding in vector database"""
         try:
@@ -161,6 +220,14 @@ class VectorDatabase:
                     )
                     return True
 
+                if not await self._ensure_vss_dimension(db, len(embedding_array)):
+                    await db.execute(
+                        "UPDATE images SET embedding = ? WHERE id = ?",
+                        (embedding_bytes, image_id),
+                    )
+                    await db.commit()
+                    return True
+
                 # Insert into vector table
                 cursor = await db.execute(
                     "INSERT INTO image_embeddings(embedding) VALUES (?)",
@@ -191,6 +258,55 @@ class VectorDatabase:
             logger.error(f"Error storing embedding for image {image_id}: {e}")
             return False
 
+    async def store_embeddings(self, items: List[Tuple[int, bytes]]) -> int:
+        """Index many (image_id, embedding_bytes) pairs with one connection.
+
+        Only the vector index tables are written: callers (the embedding
+        backfill) commit images.embedding together with embedding_model
+        themselves. Without sqlite-vss there is nothing to write. Returns
+        the number indexed (0 on error).
+        """
+        rows = []
+        for image_id, embedding_bytes in items:
+            embedding_array = self.embedding_service.bytes_to_array(embedding_bytes)
+            if embedding_array is None:
+                logger.error(f"Invalid embedding bytes for image {image_id}")
+                continue
+            rows.append((image_id, embedding_array))
+        if not rows:
+            return 0
+
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                try:
+                    await db.execute("SELECT 1 FROM image_embeddings LIMIT 1")
+                    vss_available = await self._ensure_vss_dimension(
+                        db, len(rows[0][1])
+                    )
+                except sqlite3.OperationalError:
+                    vss_available = False
+
+                if vss_available:
+                    for image_id, embedding_array in rows:
+                        cursor = await db.execute(
+                            "INSERT INTO image_embeddings(embedding) VALUES (?)",
+                            (embedding_array.tobytes(),),
+                        )
+                        await db.execute(
+                            "INSERT OR REPLACE INTO embedding_mappings (image_id, embedding_id) VALUES (?, ?)",
+                            (image_id, cursor.lastrowid),
+                        )
+                    await db.commit()
+                logger.info(
+                    f"Indexed {len(rows)} embeddings"
+                    f"{'' if vss_available else ' (fallback mode)'}"
+                )
+                return len(rows)
+
+        except Exception as e:
+            logger.error(f"Error indexing {len(rows)} embeddings: {e}")
+            return 0
+
     async def find_similar_images(
         self,
         embedding_bytes: bytes,
@@ -214,6 +330,23 @@ class VectorDatabase:
                 return []
 
             async with aiosqlite.connect(self.db_path) as db:
+                fallback_args = (
+                    db,
+                    embedding_bytes,
+                    user_id,
+                    chat_id,
+                    limit,
+                    similarity_threshold,
+                )
+                declared = await self._vss_dimension(db)
+                if declared is not None and declared != len(embedding_array):
+                    # Index not yet rebuilt for the current model
+                    logger.info(
+                        f"Vector index is {declared}-d, query is "
+                        f"{len(embedding_array)}-d; using fallback search"
+                    )
+                    return await self._fallback_similarity_search(*fallback_args)
+
                 # Try vector similarity search first
                 try:
                     # Use sqlite-vss for efficient similarity search
@@ -262,14 +395,7 @@ class VectorDatabase:
                 except sqlite3.OperationalError:
                     # Fallback to manual similarity calculation
                     logger.info("Using fallback similarity search")
-                    return await self._fallback_similarity_search(
-                        db,
-                        embedding_bytes,
-                        user_id,
-                        chat_id,
-                        limit,
-                        similarity_threshold,
-                    )
+                    return await self._fallback_similarity_search(*fallback_args)
 
         except Exception as e:
             logger.error(f"Error finding similar images: {e}")
@@ -284,7 +410,7 @@ class VectorDatabase:
         limit: int,
         similarity_threshold: float,
     ) -> List[Tuple[int, float]]:
-        """Fallback similarity search using manual cosine similarity calculation"""
+        """Fallback similarity search: cosine top-k over the user's image embeddings"""
 
         # Get all images with embeddings for this user
         query = """
@@ -301,21 +427,21 @@ class VectorDatabase:
             params.append(chat_id)
 
         async with db.execute(query, params) as cursor:
-            rows = await cursor.fetchall()
-
-        # Calculate similarities
-        similarities = []
-        for image_id, embedding_bytes in rows:
-            if embedding_bytes:
-                similarity = self.embedding_service.calculate_cosine_similarity(
-                    query_embedding_bytes, embedding_bytes
-                )
-                if similarity is not None and similarity >= similarity_threshold:
-                    similarities.append((image_id, similarity))
+            rows = list(await cursor.fetchall())
 
-        # Sort by similarity and limit results
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        results = similarities[:limit]
+        # Score every candidate with one matrix-vector product
+        query_vector = unpack_embedding(query_embedding_bytes)
+        if query_vector is None:
+            return []
+        matrix, kept = stack_embeddings(
+            [embedding for _, embedding in rows], dimension=len(query_vector)
+        )
+        results = [
+            (rows[kept[index]][0], similarity)
+            for index, similarity in cosine_top_k(
+                query_vector, matrix, limit, threshold=similarity_threshold
+            )
+        ]
 
         logger.info(f"Found {len(results)} similar images using fallback search")
         return results
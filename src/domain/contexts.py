@@ -31,6 +31,8 @@ BOUNDED_CONTEXTS: Dict[str, Dict] = {
             "src.models.user_settings",
             "src.models.message",
             "src.models.admin_contact",
+            "src.models.tracked_poll",
+            "src.services.poll_state_store",
             "src.utils",
         ],
         "allowed": [],
@@ -53,6 +55,8 @@ BOUNDED_CONTEXTS: Dict[str, Dict] = {
         "modules": [
             "src.services.poll_service",
             "src.services.polling_service",
+            "src.services.poll_embeddings",
+            "src.services.poll_analytics",
             "src.services.poll_lifecycle",
             "src.services.poll_scheduler",
         ],
@@ -82,13 +86,17 @@ BOUNDED_CONTEXTS: Dict[str, Dict] = {
         "modules": [
             "src.services.llm_service",
             "src.services.embedding_service",
+            "src.services.embedding_runtime",
             "src.services.claude_code_service",
             "src.services.claude_subprocess",
             "src.services.opencode_service",
             "src.services.opencode_subprocess",
+            "src.services.streaming_subprocess",
             "src.services.design_skills_service",
+            "src.services.system_prompt_cache",
             "src.services.session_naming",
             "src.services.conversation_archive",
+            "src.services.conversation_search",
             "src.services.routing_memory",
         ],
         "allowed": ["shared"],
@@ -100,6 +108,7 @@ BOUNDED_CONTEXTS: Dict[str, Dict] = {
             "src.services.gallery_service",
             "src.services.collect_service",
             "src.services.similarity_service",
+            "src.services.embedding_backfill",
             "src.services.cache_service",
             "src.services.media_validator",
         ],
@@ -109,6 +118,7 @@ BOUNDED_CONTEXTS: Dict[str, Dict] = {
         "modules": [
             "src.services.message_buffer",
             "src.services.message_persistence_service",
+            "src.services.chat_action_service",
             "src.services.link_service",
         ],
         "allowed": ["shared", "media"],
@@ -124,6 +134,7 @@ BOUNDED_CONTEXTS: Dict[str, Dict] = {
             "src.services.tunnel_monitor_service",
             "src.services.subprocess_sandbox",
             "src.services.task_ledger_service",
+            "src.services.task_ledger_scheduler",
         ],
         "allowed": ["shared"],
     },
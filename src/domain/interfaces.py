@@ -8,7 +8,7 @@ time (constructor injection) with a default fallback for backward
 compatibility.
 """
 
-from typing import Optional, Protocol, runtime_checkable
+from typing import List, Optional, Protocol, runtime_checkable
 
 
 @runtime_checkable
@@ -29,3 +29,15 @@ class EmbeddingProvider(Protocol):
     """Abstraction over embedding generation (lives in the *ai* context)."""
 
     async def generate_embedding(self, data: bytes) -> Optional[bytes]: ...
+
+
+@runtime_checkable
+class TextEmbeddingProvider(Protocol):
+    """Batched text embeddings as packed float32 blobs (lives in the *ai* context).
+
+    Raises EmbeddingFailure when the model call fails.
+    """
+
+    async def generate_text_embeddings_batch(
+        self, texts: List[str]
+    ) -> List[Optional[bytes]]: ...
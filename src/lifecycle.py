@@ -222,7 +222,7 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️ Collect service initialization failed: {e}")
 
-    # Hydrate callback data from database so inline buttons survive restarts
+    # Warm callback data cache; older buttons are looked up on demand
     try:
         from .bot.callback_data_manager import get_callback_data_manager
 
@@ -231,14 +231,19 @@ async def lifespan(app: FastAPI):
         logger.info("✅ Callback data loaded from database")
 
         # Start periodic flush of pending callback data writes (every 60s)
+        # and purge of expired entries (hourly)
         async def _periodic_callback_flush():
             import asyncio
 
+            ticks = 0
             while True:
                 await asyncio.sleep(60)
+                ticks += 1
                 try:
                     mgr = get_callback_data_manager()
                     await mgr.flush_pending_writes()
+                    if ticks % 60 == 0:
+                        await mgr.cleanup_expired_from_db()
                 except Exception as exc:
                     logger.error(f"Periodic callback data flush failed: {exc}")
 
@@ -473,6 +478,12 @@ def _start_background_tasks():
     )
     logger.info("✅ Started periodic stale session cleanup")
 
+    # Hot-reload locale YAML when it changes on disk
+    from .core.i18n import run_locale_watcher
+
+    create_tracked_task(run_locale_watcher(), name="locale_watcher")
+    logger.info("✅ Started locale file watcher")
+
     # Periodic reply context cleanup (every hour)
     async def _run_reply_context_cleanup():
         """Periodically clean up expired reply contexts."""
@@ -485,7 +496,8 @@ def _start_background_tasks():
 
                 service = get_reply_context_service()
                 if service:
-                    removed = service.cleanup_expired()
+                    removed = service.cleanup_expired(purge_spill=False)
+                    await asyncio.to_thread(service.purge_expired_spill)
                     if removed:
                         logger.info(
                             f"Reply context cleanup: removed {removed} expired entries"
@@ -514,6 +526,74 @@ def _start_background_tasks():
         )
         logger.info("✅ Started resource monitor (every %.0f min)", rm_interval)
 
+    # One-shot: add conversation archives written before the search index
+    async def _run_archive_search_backfill():
+        try:
+            from .services.conversation_search import backfill_archive_index
+
+            await backfill_archive_index()
+        except Exception as e:
+            logger.error(f"Conversation archive search backfill error: {e}")
+
+    create_tracked_task(_run_archive_search_backfill(), name="archive_search_backfill")
+    logger.info("✅ Started conversation archive search backfill")
+
+    # One-shot: drop partial Telethon downloads nobody resumed
+    async def _prune_partial_downloads():
+        try:
+            from pathlib import Path
+
+            from .core.config import get_path, get_timeout
+            from .services.telethon_service import (
+                DEFAULT_PARTIAL_DIR,
+                DEFAULT_PARTIAL_TTL_HOURS,
+                prune_partial_downloads,
+            )
+
+            await asyncio.to_thread(
+                prune_partial_downloads,
+                Path(get_path("telethon_partial_dir") or DEFAULT_PARTIAL_DIR),
+                get_timeout("telethon_partial_ttl_hours", DEFAULT_PARTIAL_TTL_HOURS),
+            )
+        except Exception as e:
+            logger.error(f"Partial download prune error: {e}")
+
+    create_tracked_task(_prune_partial_downloads(), name="telethon_partial_prune")
+
+    # Expire unanswered polls from the durable poll registry
+    from .services.poll_state_store import run_periodic_poll_state_purge
+
+    create_tracked_task(
+        run_periodic_poll_state_purge(interval_hours=1.0),
+        name="poll_state_purge",
+    )
+    logger.info("✅ Started poll state purge task")
+
+    # Fire task ledger runs when due (woken by task create/toggle/delete).
+    # Opt-in: idle until something registers a handler for a task type.
+    async def _run_task_ledger_scheduler():
+        try:
+            from .services.task_ledger_scheduler import get_task_ledger_scheduler
+
+            await get_task_ledger_scheduler().run()
+        except Exception as e:
+            logger.error(f"Task ledger scheduler error: {e}")
+
+    create_tracked_task(_run_task_ledger_scheduler(), name="task_ledger_scheduler")
+    logger.info("✅ Started task ledger scheduler")
+
+    # Embed poll answers left without an embedding (drain timeout, no model)
+    async def _run_poll_embedding_backfill():
+        try:
+            from .services.poll_embeddings import get_poll_embedding_writer
+
+            await get_poll_embedding_writer().enqueue_missing()
+        except Exception as e:
+            logger.error(f"Poll embedding backfill error: {e}")
+
+    create_tracked_task(_run_poll_embedding_backfill(), name="poll_embedding_backfill")
+    logger.info("✅ Started poll embedding backfill")
+
 
 async def _shutdown(tunnel_provider, plugin_manager, bot_initialized):
     """Shutdown all subsystems in order."""
@@ -547,6 +627,70 @@ async def _shutdown(tunnel_provider, plugin_manager, bot_initialized):
     except Exception as e:
         logger.error(f"❌ Callback data flush on shutdown failed: {e}")
 
+    # Drain queued message writes (bounded) before tasks are cancelled
+    try:
+        from .services.message_persistence_service import (
+            get_message_persistence_writer,
+        )
+
+        await get_message_persistence_writer().stop(
+            timeout=get_config_value("timeouts.message_persist_drain_timeout", 5.0)
+        )
+        logger.info("✅ Message persistence queue drained")
+    except Exception as e:
+        logger.error(f"❌ Message persistence drain failed: {e}")
+
+    # Embed queued poll answers (bounded); the rest are backfilled at startup
+    try:
+        from .services.poll_embeddings import get_poll_embedding_writer
+
+        await get_poll_embedding_writer().stop(
+            timeout=get_config_value("timeouts.poll_embedding_drain_timeout", 10.0)
+        )
+        logger.info("✅ Poll embedding queue drained")
+    except Exception as e:
+        logger.error(f"❌ Poll embedding drain failed: {e}")
+
+    # Let in-flight task ledger runs finish and write their run logs
+    try:
+        from .services.task_ledger_scheduler import get_task_ledger_scheduler
+
+        await get_task_ledger_scheduler().stop(timeout=5.0)
+    except Exception as e:
+        logger.debug(f"Task ledger scheduler stop skipped: {e}")
+
+    # Stop the embedding model worker process
+    try:
+        from .services.embedding_service import close_embedding_service
+
+        await close_embedding_service()
+    except Exception as e:
+        logger.debug(f"Embedding service close skipped: {e}")
+
+    # Stop typing keep-alives and close the reactions HTTP client
+    try:
+        from .services.chat_action_service import get_chat_action_service
+
+        await get_chat_action_service().close()
+    except Exception as e:
+        logger.debug(f"Chat action service close skipped: {e}")
+
+    # Write out reply contexts still queued for the spill tier
+    try:
+        from .services.reply_context import get_reply_context_service
+
+        await asyncio.to_thread(get_reply_context_service().close)
+    except Exception as e:
+        logger.debug(f"Reply context spill close skipped: {e}")
+
+    # Write out a routing memory export still waiting on its debounce
+    try:
+        from .services.routing_memory import flush_routing_memory
+
+        await flush_routing_memory()
+    except Exception as e:
+        logger.debug(f"Routing memory flush skipped: {e}")
+
     # Cancel all tracked background tasks
     active_count = get_active_task_count()
     if active_count > 0:
@@ -8,10 +8,11 @@ from .accountability_partner import (
 )
 from .accountability_profile import AccountabilityProfile
 from .admin_contact import AdminContact
+from .backfill_cursor import BackfillCursor
 from .base import Base, TimestampMixin
 from .callback_data import CallbackData
 from .chat import Chat
-from .claude_session import ClaudeSession
+from .claude_session import ClaudeMessageSession, ClaudeSession
 from .collect_session import CollectSession
 from .image import Image
 from .keyboard_config import KeyboardConfig
@@ -19,7 +20,9 @@ from .life_weeks_settings import LifeWeeksSettings
 from .message import Message
 from .poll_response import PollResponse, PollTemplate
 from .privacy_settings import PrivacySettings
+from .retention_progress import RetentionProgress
 from .scheduled_task import ContextMode, ScheduledTask, TaskRunLog, TaskRunStatus
+from .tracked_poll import TrackedPoll
 from .tracker import CheckIn, Tracker
 from .user import User
 from .user_settings import UserSettings
@@ -35,10 +38,13 @@ __all__ = [
     "Message",
     "AdminContact",
     "ClaudeSession",
+    "ClaudeMessageSession",
     "CollectSession",
     "KeyboardConfig",
     "PollResponse",
     "PollTemplate",
+    "TrackedPoll",
+    "BackfillCursor",
     "UserSettings",
     "Tracker",
     "CheckIn",
@@ -55,5 +61,6 @@ __all__ = [
     "VoiceSettings",
     "AccountabilityProfile",
     "PrivacySettings",
+    "RetentionProgress",
     "LifeWeeksSettings",
 ]
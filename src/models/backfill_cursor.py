@@ -0,0 +1,28 @@
+"""BackfillCursor model - resume point of an interrupted backfill run."""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class BackfillCursor(Base):
+    """Last committed id and running totals of one backfill scope."""
+
+    __tablename__ = "backfill_cursors"
+
+    name: Mapped[str] = mapped_column(
+        String(100), primary_key=True
+    )  # e.g. 'image_embeddings:all'
+    last_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    embedded: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    failed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    skipped: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<BackfillCursor(name='{self.name}', last_id={self.last_id})>"
@@ -25,8 +25,8 @@ class CallbackData(Base, TimestampMixin):
         Text, nullable=False
     )  # JSON for generic, raw string for file_id
     accessed_at: Mapped[Optional[datetime]] = mapped_column(
-        DateTime(timezone=True), nullable=True
-    )
+        DateTime(timezone=True), nullable=True, index=True
+    )  # TTL anchor: expired rows are purged by this index
 
     def __repr__(self) -> str:
         return f"<CallbackData(short_id='{self.short_id}', type='{self.data_type}')>"
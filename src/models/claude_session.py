@@ -1,7 +1,17 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, TimestampMixin
@@ -11,6 +21,15 @@ class ClaudeSession(Base, TimestampMixin):
     """Claude Code sessions for persistent conversations."""
 
     __tablename__ = "claude_sessions"
+    __table_args__ = (
+        # Active-session and timestamp-correlation lookups per chat
+        Index(
+            "ix_claude_sessions_chat_active_last_used",
+            "chat_id",
+            "is_active",
+            "last_used",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     user_id: Mapped[int] = mapped_column(
@@ -32,3 +51,28 @@ class ClaudeSession(Base, TimestampMixin):
 
     def __repr__(self) -> str:
         return f"<ClaudeSession(id={self.id}, session_id={self.session_id[:8]}..., active={self.is_active})>"
+
+
+class ClaudeMessageSession(Base, TimestampMixin):
+    """Maps a bot response message to the Claude session that produced it.
+
+    Written when a Claude response is sent, so a reply to any earlier response
+    resolves its session with one indexed lookup, even after a restart or
+    reply-context cache eviction.
+    """
+
+    __tablename__ = "claude_message_sessions"
+    __table_args__ = (
+        UniqueConstraint("chat_id", "message_id", name="uq_claude_message_session"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    chat_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    message_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    session_id: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"<ClaudeMessageSession(chat_id={self.chat_id}, "
+            f"message_id={self.message_id}, session_id={self.session_id[:8]}...)>"
+        )
@@ -1,6 +1,6 @@
 from typing import Optional
 
-from sqlalchemy import BLOB, ForeignKey, Integer, String, Text
+from sqlalchemy import BLOB, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, TimestampMixin
@@ -8,6 +8,7 @@ from .base import Base, TimestampMixin
 
 class Image(Base, TimestampMixin):
     __tablename__ = "images"
+    __table_args__ = (Index("ix_images_chat_id_created_at", "chat_id", "created_at"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     chat_id: Mapped[int] = mapped_column(
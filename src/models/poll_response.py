@@ -10,7 +10,17 @@ This model captures:
 
 from datetime import datetime
 
-from sqlalchemy import JSON, Column, DateTime, Float, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+)
 
 from .base import Base
 
@@ -19,6 +29,10 @@ class PollResponse(Base):
     """Store poll responses with rich context for trend analysis."""
 
     __tablename__ = "poll_responses"
+    __table_args__ = (
+        # Per-chat windows: analytics GROUP BYs and the scheduler's daily checks
+        Index("ix_poll_responses_chat_id_created_at", "chat_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -26,6 +40,7 @@ class PollResponse(Base):
     chat_id = Column(Integer, nullable=False, index=True)
     poll_id = Column(String, nullable=False, unique=True, index=True)
     message_id = Column(Integer, nullable=True)
+    template_id = Column(String, nullable=True)  # Source template (YAML or DB id)
 
     # Poll content
     question = Column(Text, nullable=False)
@@ -52,7 +67,9 @@ class PollResponse(Base):
     )  # {current_trail, recent_todos, location, weather, etc}
 
     # Vector embedding for semantic search
-    embedding = Column(Text, nullable=True)  # Stored as JSON array string
+    # [dimension: uint32][float32 * dimension], see src.utils.vector_search;
+    # NULL until the background poll embedding writer has processed the row
+    embedding = Column(LargeBinary, nullable=True)
 
     # Analysis flags
     processed_for_trails = Column(
@@ -79,6 +96,7 @@ class PollResponse(Base):
             "id": self.id,
             "chat_id": self.chat_id,
             "poll_id": self.poll_id,
+            "template_id": self.template_id,
             "question": self.question,
             "options": self.options,
             "selected_option_id": self.selected_option_id,
@@ -0,0 +1,37 @@
+"""Progress checkpoints for chunked data retention runs."""
+
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base, TimestampMixin
+
+
+class RetentionProgress(Base, TimestampMixin):
+    """Checkpoint for one (retention period, table) step of a retention run.
+
+    Rows are written as each chunk commits and cleared when a run finishes,
+    so a run interrupted mid-way resumes with the same cutoff after
+    ``last_id`` instead of starting over.
+    """
+
+    __tablename__ = "retention_progress"
+    __table_args__ = (
+        UniqueConstraint("retention", "table_name", name="uq_retention_progress"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    retention: Mapped[str] = mapped_column(String(50), nullable=False)
+    table_name: Mapped[str] = mapped_column(String(50), nullable=False)
+    cutoff: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    last_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    deleted_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completed: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"<RetentionProgress(retention={self.retention}, "
+            f"table={self.table_name}, last_id={self.last_id}, "
+            f"completed={self.completed})>"
+        )
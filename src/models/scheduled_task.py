@@ -14,6 +14,7 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     Enum,
+    Float,
     ForeignKey,
     Integer,
     String,
@@ -69,6 +70,13 @@ class ScheduledTask(Base, TimestampMixin):
         DateTime(timezone=True), nullable=True
     )
 
+    # Run lease: the worker that claimed the current run and until when, so
+    # a run fires once even when several workers schedule the same ledger
+    lease_owner: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
     # Relationships
     run_logs: Mapped[list["TaskRunLog"]] = relationship(
         "TaskRunLog", back_populates="task", cascade="all, delete-orphan"
@@ -97,6 +105,8 @@ class TaskRunLog(Base):
     completed_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
+    # Time spent waiting for a runner slot after the task became runnable
+    queue_wait_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
 
     status: Mapped[TaskRunStatus] = mapped_column(Enum(TaskRunStatus), nullable=False)
     result_summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -107,6 +117,12 @@ class TaskRunLog(Base):
         "ScheduledTask", back_populates="run_logs"
     )
 
+    @property
+    def duration_seconds(self) -> Optional[float]:
+        if self.completed_at is None:
+            return None
+        return (self.completed_at - self.started_at).total_seconds()
+
     def __repr__(self) -> str:
         return (
             f"<TaskRunLog(id={self.id}, task_id={self.task_id}, "
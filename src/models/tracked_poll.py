@@ -0,0 +1,31 @@
+"""TrackedPoll model - in-flight polls awaiting an answer."""
+
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy import JSON, DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class TrackedPoll(Base):
+    """A sent poll whose answer still has to be matched to its metadata."""
+
+    __tablename__ = "tracked_polls"
+
+    poll_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    kind: Mapped[str] = mapped_column(
+        String(20), nullable=False
+    )  # 'poll', 'scheduled' or 'trail'
+    chat_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    payload: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, index=True
+    )  # TTL anchor: expired rows are purged by this index
+
+    def __repr__(self) -> str:
+        return f"<TrackedPoll(poll_id='{self.poll_id}', kind='{self.kind}')>"
@@ -4,7 +4,15 @@ Tracker models for habit tracking, medication, values, and commitments.
 
 from typing import Optional
 
-from sqlalchemy import BigInteger, Boolean, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base, TimestampMixin
@@ -48,6 +56,9 @@ class CheckIn(Base, TimestampMixin):
     """Record of a check-in for a tracker."""
 
     __tablename__ = "check_ins"
+    __table_args__ = (
+        Index("ix_check_ins_user_id_created_at", "user_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(
@@ -0,0 +1,284 @@
+"""
+Chat action service — coalesced reactions and chat-action keep-alives.
+
+Replaces the blocking one-request-per-message ``requests.post`` calls the
+processors used to make before any real work started:
+
+- react() is synchronous and returns immediately. Wanted reactions are
+  recorded per (chat, message); repeated calls before the chat is flushed
+  collapse to the latest emoji, and reactions already applied are skipped.
+  Each chat's pending reactions are then sent concurrently by one
+  background task, bounded by a global concurrency cap and request rate.
+- chat_action() is an async context manager that keeps a single
+  typing/upload indicator alive per (chat, action) while any job holds it.
+  Telegram clears an action after ~5 seconds, so it is re-sent every few
+  seconds until the last holder exits.
+"""
+
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterable, Optional, Tuple
+
+import httpx
+
+from ..utils.lru_cache import LRUCache
+from ..utils.task_tracker import create_tracked_task
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_API_URL = "https://api.telegram.org/bot{token}/{method}"
+
+# Upper bound on a single 429 back-off so a flood wait never stalls a chat
+MAX_RETRY_AFTER_SECONDS = 5.0
+
+
+@dataclass
+class _KeepAlive:
+    task: asyncio.Task
+    holders: int = 0
+
+
+class ChatActionService:
+    """Async dispatcher for message reactions and chat actions."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        max_requests_per_second: float = 25.0,
+        coalesce_delay: float = 0.05,
+        action_interval: float = 4.0,
+        request_timeout: float = 5.0,
+        applied_cache_size: int = 5000,
+    ):
+        self.max_concurrency = max_concurrency
+        self.coalesce_delay = coalesce_delay
+        self.action_interval = action_interval
+        self.request_timeout = request_timeout
+        self._min_interval = 1.0 / max_requests_per_second
+
+        # chat_id -> {message_id: emoji}, replaced wholesale on each flush
+        self._pending: Dict[int, Dict[int, str]] = {}
+        self._flush_tasks: Dict[int, asyncio.Task] = {}
+        self._applied: LRUCache[Tuple[int, int], str] = LRUCache(
+            max_size=applied_cache_size
+        )
+        self._keepalives: Dict[Tuple[int, str], _KeepAlive] = {}
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._next_slot = 0.0
+
+        # Counters for observability
+        self.sent_count = 0
+        self.failed_count = 0
+        self.coalesced_count = 0
+        self.skipped_count = 0
+
+    # ------------------------------------------------------------------
+    # Reactions
+    # ------------------------------------------------------------------
+
+    def react(self, chat_id: int, message_ids: Iterable[int], emoji: str) -> None:
+        """Queue an emoji reaction on messages. Never blocks.
+
+        Must be called from within a running event loop; outside one the
+        reaction is dropped (reactions are purely cosmetic).
+
+        Note: Telegram only allows specific emojis for reactions. Valid ones
+        include 👍, 👎, ❤️, 🔥, 👏, 😁, 🤔, 👀, 🎉, 🤩, 😎, 🙏; ✅ and ✔️ are not.
+        """
+        if not os.environ.get("TELEGRAM_BOT_TOKEN"):
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            logger.debug(f"No running loop, dropping {emoji} reaction in {chat_id}")
+            return
+
+        pending = self._pending.setdefault(chat_id, {})
+        for message_id in message_ids:
+            if message_id in pending:
+                self.coalesced_count += 1
+            pending[message_id] = emoji
+
+        if chat_id not in self._flush_tasks:
+            self._flush_tasks[chat_id] = create_tracked_task(
+                self._drain_chat(chat_id), name=f"chat_reactions_{chat_id}"
+            )
+
+    async def _drain_chat(self, chat_id: int) -> None:
+        """Send a chat's pending reactions until none are left.
+
+        One drain task per chat keeps reactions on the same message in the
+        order they were requested (👀 is never applied after 👍).
+        """
+        try:
+            while True:
+                await asyncio.sleep(self.coalesce_delay)
+                pending = self._pending.pop(chat_id, None)
+                if not pending:
+                    break
+
+                sends = []
+                for message_id, emoji in pending.items():
+                    if self._applied.get((chat_id, message_id)) == emoji:
+                        self.skipped_count += 1
+                        continue
+                    sends.append(self._send_reaction(chat_id, message_id, emoji))
+                await asyncio.gather(*sends)
+        finally:
+            self._flush_tasks.pop(chat_id, None)
+
+    async def _send_reaction(self, chat_id: int, message_id: int, emoji: str) -> None:
+        result = await self._call(
+            "setMessageReaction",
+            {
+                "chat_id": chat_id,
+                "message_id": message_id,
+                "reaction": [{"type": "emoji", "emoji": emoji}],
+            },
+        )
+        if result and result.get("ok"):
+            self._applied.set((chat_id, message_id), emoji)
+            self.sent_count += 1
+            logger.info(f"Marked message {message_id} with {emoji}")
+        else:
+            self.failed_count += 1
+            description = (result or {}).get("description", "request failed")
+            logger.warning(f"Failed to react to {message_id}: {description}")
+
+    async def flush(self) -> None:
+        """Wait until every queued reaction has been sent."""
+        while self._flush_tasks:
+            await asyncio.gather(
+                *list(self._flush_tasks.values()), return_exceptions=True
+            )
+
+    # ------------------------------------------------------------------
+    # Chat actions
+    # ------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def chat_action(
+        self, chat_id: int, action: str = "typing"
+    ) -> AsyncIterator[None]:
+        """Keep a chat action (typing, upload_photo, ...) visible for a job.
+
+        Nested or concurrent jobs in the same chat share one keep-alive task;
+        it is cancelled when the last of them exits.
+        """
+        if not os.environ.get("TELEGRAM_BOT_TOKEN"):
+            yield
+            return
+
+        key = (chat_id, action)
+        keepalive = self._keepalives.get(key)
+        if keepalive is None:
+            keepalive = _KeepAlive(
+                task=create_tracked_task(
+                    self._keep_action_alive(chat_id, action),
+                    name=f"chat_action_{action}_{chat_id}",
+                )
+            )
+            self._keepalives[key] = keepalive
+        keepalive.holders += 1
+        try:
+            yield
+        finally:
+            keepalive.holders -= 1
+            if keepalive.holders == 0 and self._keepalives.get(key) is keepalive:
+                del self._keepalives[key]
+                keepalive.task.cancel()
+
+    async def _keep_action_alive(self, chat_id: int, action: str) -> None:
+        while True:
+            await self.send_action(chat_id, action)
+            await asyncio.sleep(self.action_interval)
+
+    async def send_action(self, chat_id: int, action: str = "typing") -> bool:
+        """Send a single chat action. Prefer chat_action() for long jobs."""
+        result = await self._call(
+            "sendChatAction", {"chat_id": chat_id, "action": action}
+        )
+        ok = bool(result and result.get("ok"))
+        if ok:
+            logger.debug(f"Sent {action} indicator to {chat_id}")
+        return ok
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.request_timeout)
+        return self._client
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _throttle(self) -> None:
+        """Space request starts to stay under the global rate limit."""
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self._min_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _call(self, method: str, payload: dict) -> Optional[dict]:
+        """POST to the Bot API. Returns the decoded response or None.
+
+        A 429 is retried once after Telegram's (capped) retry_after.
+        """
+        bot_token = os.environ.get("TELEGRAM_BOT_TOKEN", "")
+        if not bot_token:
+            return None
+        url = TELEGRAM_API_URL.format(token=bot_token, method=method)
+
+        async with self._get_semaphore():
+            for attempt in range(2):
+                await self._throttle()
+                try:
+                    response = await self._get_client().post(url, json=payload)
+                    result = response.json()
+                except (httpx.HTTPError, ValueError) as e:
+                    logger.debug(f"Telegram {method} failed for {payload}: {e}")
+                    return None
+
+                if result.get("error_code") == 429 and attempt == 0:
+                    retry_after = (result.get("parameters") or {}).get("retry_after", 1)
+                    await asyncio.sleep(min(retry_after, MAX_RETRY_AFTER_SECONDS))
+                    continue
+                return result
+        return None
+
+    async def close(self) -> None:
+        """Cancel keep-alives and close the HTTP client."""
+        for keepalive in self._keepalives.values():
+            keepalive.task.cancel()
+        self._keepalives.clear()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def get_stats(self) -> dict:
+        return {
+            "sent": self.sent_count,
+            "failed": self.failed_count,
+            "coalesced": self.coalesced_count,
+            "skipped": self.skipped_count,
+            "pending_chats": len(self._pending),
+            "active_actions": len(self._keepalives),
+        }
+
+
+def get_chat_action_service() -> ChatActionService:
+    """Get the global chat action service (delegates to DI container)."""
+    from ..core.services import Services, get_service
+
+    return get_service(Services.CHAT_ACTIONS)
@@ -13,18 +13,22 @@ CLAUDE_QUERY_TIMEOUT_SECONDS = int(os.getenv("CLAUDE_QUERY_TIMEOUT", "300"))
 SESSION_IDLE_TIMEOUT_MINUTES = int(os.getenv("SESSION_IDLE_TIMEOUT_MINUTES", "480"))
 
 from sqlalchemy import select  # noqa: E402
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert  # noqa: E402
 
 from ..core.database import get_db_session  # noqa: E402
 from ..models.admin_contact import AdminContact  # noqa: E402
-from ..models.claude_session import ClaudeSession  # noqa: E402
+from ..models.claude_session import (  # noqa: E402
+    ClaudeMessageSession,
+    ClaudeSession,
+)
 from ..utils.lru_cache import LRUCache  # noqa: E402
 from ..utils.task_tracker import create_tracked_task  # noqa: E402
 
 # Import subprocess-based Claude execution to avoid event loop blocking
 from .claude_subprocess import TimeoutConfig, execute_claude_subprocess  # noqa: E402
 from .conversation_archive import archive_conversation  # noqa: E402
-from .design_skills_service import get_design_system_prompt  # noqa: E402
 from .session_naming import generate_session_name  # noqa: E402
+from .system_prompt_cache import get_system_prompt_cache  # noqa: E402
 
 logger = logging.getLogger(__name__)
 
@@ -160,6 +164,9 @@ class ClaudeCodeService:
         self._timeout_sessions: Dict[int, Dict[str, Any]] = (
             {}
         )  # chat_id -> timeout_info
+        # Content hash of the last system prompt sent per chat, so callers
+        # can tell whether it changed between turns
+        self._system_prompt_hashes: Dict[int, str] = {}
 
     def _kill_stuck_processes(self) -> int:
         """Kill any stuck Claude processes. Returns number of processes killed.
@@ -356,71 +363,16 @@ class ClaudeCodeService:
         # env={**os.environ, "ANTHROPIC_API_KEY": ""} to use subscription
         # instead of API credits. Mutating os.environ here was racy (P0-3).
 
-        # System prompt for Telegram integration context
-        telegram_system_prompt = """You are running inside a Telegram bot. Important capabilities:
-
-FILE SENDING: When you create or reference files (PDF, images, audio, video, documents),
-the bot will automatically detect file paths in your response and send them to the user.
-Just mention the full file path and the file will be delivered. You CAN send files!
-
-Supported formats: .pdf, .png, .jpg, .jpeg, .gif, .mp3, .mp4, .wav, .doc, .docx, .xlsx, .csv, .zip
-
-Example: After creating a PDF, say "Created: /path/to/file.pdf" and it will be sent automatically.
-
-FORMATTING: Your responses are converted to Telegram HTML. Markdown works (bold, italic, code, links).
-Tables are converted to ASCII format for readability.
-
-CRITICAL - Note References: When you mention or reference vault notes in your responses, ALWAYS use the
-full absolute path. The bot automatically converts these paths to clickable Obsidian deep links.
-
-Examples:
-- When creating: "Created note: /Users/server/Research/vault/Folder/Note-Name.md"
-- When referencing: "See /Users/server/Research/vault/Mem0.md for details"
-- When listing: "Updated files: /Users/server/Research/vault/Config.md, /Users/server/Research/vault/Index.md"
-
-The full path will become a clickable link that opens the note in Telegram and Obsidian.
-
-VAULT SEMANTIC SEARCH (supplemental to Grep/Glob):
-Use for discovering related notes, building See Also sections, or exploratory searches.
-NOT a replacement for exact text search (use Grep) or file lookup (use Glob).
-
-Commands:
-- Search: python3 ~/Research/vault/scripts/vault_search.py "query" [--format see-also|wikilinks]
-- Embed new note: python3 ~/Research/vault/scripts/embed_note.py "/path/to/note.md"
-
-WORKFLOW for creating notes:
-1. Write note with Write tool
-2. ALWAYS mention the full path in your response (e.g., "Created: /full/path/to/note.md")
-3. Embed it: python3 ~/Research/vault/scripts/embed_note.py "/path/to/note.md"
-4. Find related: python3 ~/Research/vault/scripts/vault_search.py "note title concepts" -f see-also -n 5 -e "note name"
-5. Append See also section to the note"""
-
-        # Add design skills guidance if available
-        try:
-            design_guidance = get_design_system_prompt()
-            if design_guidance:
-                telegram_system_prompt += "\n\n" + design_guidance
-                logger.debug("Added design skills guidance to system prompt")
-        except Exception as e:
-            logger.warning(f"Failed to load design skills guidance: {e}")
-
-        # Append per-chat memory (highest priority — user prefs win)
-        from .workspace_service import ensure_workspace, get_memory
-
-        ensure_workspace(chat_id)
-        chat_memory = get_memory(chat_id)
-        if chat_memory:
-            telegram_system_prompt += "\n\n# User Memory\n" + chat_memory
-            logger.debug(
-                "Appended per-chat memory to system prompt for chat %s", chat_id
-            )
-
-        # Prepend caller-supplied system prompt (e.g. research mode)
-        if system_prompt_prefix:
-            telegram_system_prompt = (
-                system_prompt_prefix + "\n\n" + telegram_system_prompt
-            )
-            logger.info("Prepended system_prompt_prefix to system prompt")
+        # System prompt: Telegram context + design guidance + per-chat memory,
+        # rebuilt only when one of its input files changes
+        system_prompt = get_system_prompt_cache().get(chat_id, system_prompt_prefix)
+        previous_hash = self._system_prompt_hashes.get(chat_id)
+        self._system_prompt_hashes[chat_id] = system_prompt.content_hash
+        logger.debug(
+            f"System prompt for chat {chat_id}: {system_prompt.content_hash[:12]} "
+            f"({'unchanged' if previous_hash == system_prompt.content_hash else 'changed'})"
+        )
+        telegram_system_prompt = system_prompt.text
 
         # Get default model from environment or use opus
         default_model = os.getenv("CLAUDE_CODE_MODEL", "opus")
@@ -640,6 +592,20 @@ WORKFLOW for creating notes:
             logger.info(f"Archived conversation to {path}")
         except Exception as e:
             logger.error(f"Failed to archive conversation for chat {chat_id}: {e}")
+            return
+
+        try:
+            from .conversation_search import index_archived_conversation
+
+            await index_archived_conversation(
+                chat_id=chat_id,
+                session_id=session_id,
+                archive_path=path,
+                messages=messages,
+                archived_at=f"{datetime.utcnow().isoformat()}Z",
+            )
+        except Exception as e:
+            logger.warning(f"Failed to index archived conversation {path.name}: {e}")
 
     async def get_active_session(self, chat_id: int) -> Optional[str]:
         """Get the active session ID for a chat.
@@ -805,6 +771,55 @@ WORKFLOW for creating notes:
 
         return None
 
+    async def record_response_message(
+        self, chat_id: int, message_id: int, session_id: str
+    ) -> None:
+        """Remember which session produced a bot response message.
+
+        Errors are logged and swallowed: the mapping only speeds up reply
+        resolution, it must never fail the response itself.
+        """
+        try:
+            async with get_db_session() as session:
+                stmt = sqlite_insert(ClaudeMessageSession).values(
+                    chat_id=chat_id,
+                    message_id=message_id,
+                    session_id=session_id,
+                )
+                await session.execute(
+                    stmt.on_conflict_do_update(
+                        index_elements=["chat_id", "message_id"],
+                        set_={"session_id": stmt.excluded.session_id},
+                    )
+                )
+                await session.commit()
+        except Exception as e:
+            logger.warning(
+                f"Failed to record session for message {message_id} "
+                f"in chat {chat_id}: {e}"
+            )
+
+    async def find_session_by_message(
+        self, chat_id: int, message_id: int
+    ) -> Optional[str]:
+        """Look up the session that produced a bot response message.
+
+        Single point lookup on the (chat_id, message_id) unique index; returns
+        None for messages sent before the mapping was recorded.
+        """
+        async with get_db_session() as session:
+            result = await session.execute(
+                select(ClaudeMessageSession.session_id).where(
+                    ClaudeMessageSession.chat_id == chat_id,
+                    ClaudeMessageSession.message_id == message_id,
+                )
+            )
+            return result.scalar_one_or_none()
+
+    def get_system_prompt_hash(self, chat_id: int) -> Optional[str]:
+        """Content hash of the system prompt last used for a chat, if any."""
+        return self._system_prompt_hashes.get(chat_id)
+
     async def end_session(self, chat_id: int) -> bool:
         """End the active session for a chat."""
         session_id = self.active_sessions.pop(chat_id, None)
@@ -4,7 +4,8 @@ Conversation Archive Service
 Archives Claude Code session transcripts to disk as timestamped markdown files.
 Files are saved to data/conversations/<chat_id>/<timestamp>_<session_id>.md
 
-This is append-only: old archives are never overwritten or deleted.
+This is append-only: old archives are never overwritten, and are only
+deleted when the user asks for their data to be deleted.
 """
 
 import logging
@@ -125,6 +126,33 @@ def list_archives(chat_id: int) -> list[Path]:
     return archives
 
 
+def delete_archives(chat_id: int) -> int:
+    """Delete all archived conversations of a chat.
+
+    Args:
+        chat_id: Telegram chat ID
+
+    Returns:
+        Number of archive files deleted
+    """
+    chat_dir = _get_chat_dir(chat_id)
+    if not chat_dir.exists():
+        return 0
+
+    deleted = 0
+    for path in chat_dir.glob("*.md"):
+        try:
+            path.unlink()
+            deleted += 1
+        except OSError as e:
+            logger.warning(f"Failed to delete archive {path}: {e}")
+    try:
+        chat_dir.rmdir()
+    except OSError:
+        pass  # not empty
+    return deleted
+
+
 def get_archive(chat_id: int, filename: str) -> Optional[str]:
     """Read a specific archive file.
 
@@ -0,0 +1,463 @@
+"""
+Conversation Search Service
+
+SQLite FTS5 full-text index over archived Claude transcripts and the
+persisted ``messages`` table, with BM25 ranking and highlighted snippets.
+
+Two indexes live next to the regular tables:
+- messages_fts: external-content index over messages.text/caption. Triggers
+  on the messages table keep it in sync, so every insert path (single
+  persist, batched writer) and every retention purge is covered without
+  touching the writers.
+- conversation_archive_fts: one row per archived turn (user, assistant or
+  tool message). Rows are added by index_archived_conversation() right after
+  conversation_archive writes the markdown file; backfill_archive_index()
+  picks up archives written before the index existed.
+
+conversation_archive_index records which archive files are indexed so the
+backfill and the live path never index the same file twice.
+"""
+
+import asyncio
+import logging
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple, cast
+
+from sqlalchemy import CursorResult, text
+
+from ..core.database import get_db_session
+from ..utils.formatting import escape_html
+from . import conversation_archive
+
+logger = logging.getLogger(__name__)
+
+SOURCE_MESSAGES = "messages"
+SOURCE_ARCHIVES = "archives"
+ALL_SOURCES = (SOURCE_MESSAGES, SOURCE_ARCHIVES)
+
+# Private-use code points mark highlights inside snippet() output; they cannot
+# collide with user text the way "<b>" would, and are swapped for tags after
+# the snippet is HTML-escaped.
+_HIGHLIGHT_OPEN = "\ue000"
+_HIGHLIGHT_CLOSE = "\ue001"
+_SNIPPET_TOKENS = 16
+
+_TOKENIZER = "unicode61 remove_diacritics 2"
+
+_SCHEMA = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+        text, caption,
+        content='messages', content_rowid='id',
+        tokenize='{_TOKENIZER}'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS messages_fts_ai AFTER INSERT ON messages BEGIN
+        INSERT INTO messages_fts(rowid, text, caption)
+        VALUES (new.id, new.text, new.caption);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS messages_fts_ad AFTER DELETE ON messages BEGIN
+        INSERT INTO messages_fts(messages_fts, rowid, text, caption)
+        VALUES ('delete', old.id, old.text, old.caption);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS messages_fts_au
+    AFTER UPDATE OF text, caption ON messages BEGIN
+        INSERT INTO messages_fts(messages_fts, rowid, text, caption)
+        VALUES ('delete', old.id, old.text, old.caption);
+        INSERT INTO messages_fts(rowid, text, caption)
+        VALUES (new.id, new.text, new.caption);
+    END
+    """,
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS conversation_archive_fts USING fts5(
+        content,
+        role UNINDEXED,
+        chat_id UNINDEXED,
+        session_id UNINDEXED,
+        archive UNINDEXED,
+        archived_at UNINDEXED,
+        tokenize='{_TOKENIZER}'
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS conversation_archive_index (
+        archive TEXT PRIMARY KEY,
+        chat_id INTEGER NOT NULL,
+        session_id TEXT,
+        turns INTEGER NOT NULL DEFAULT 0,
+        indexed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+]
+
+# "quoted phrase" | word with optional trailing * for prefix search
+_QUERY_TERM_RE = re.compile(r'"([^"]*)"|(\w+)(\*)?')
+_WORD_RE = re.compile(r"\w+")
+
+# Archive markdown: "## User", optionally followed by "  \n*<timestamp>*"
+_ARCHIVE_SECTION_RE = re.compile(
+    r"^## (User|Assistant|Tool)(?:  \n\*([^*\n]*)\*)?\n\n", re.MULTILINE
+)
+_ARCHIVE_META_RE = re.compile(r"^- \*\*(Session ID|Archived)\*\*: (.*)$", re.MULTILINE)
+
+
+@dataclass
+class SearchHit:
+    """A ranked search result.
+
+    ``snippet`` is HTML-safe: the matched terms are wrapped in ``<b>`` and
+    everything else is escaped, so it can be sent with parse_mode=HTML.
+    ``rank`` is the FTS5 BM25 score (lower is better).
+    """
+
+    source: str
+    chat_id: int
+    snippet: str
+    rank: float
+    timestamp: Optional[str] = None
+    role: Optional[str] = None
+    message_id: Optional[int] = None
+    session_id: Optional[str] = None
+    archive: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "source": self.source,
+            "chat_id": self.chat_id,
+            "snippet": self.snippet,
+            "rank": self.rank,
+            "timestamp": self.timestamp,
+            "role": self.role,
+            "message_id": self.message_id,
+            "session_id": self.session_id,
+            "archive": self.archive,
+        }
+
+
+async def initialize_search_index(engine) -> bool:
+    """Create the FTS5 tables and sync triggers if missing.
+
+    On first creation the messages index is rebuilt from the existing rows.
+    Returns False when the SQLite build lacks FTS5 (search stays disabled).
+    """
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            text(
+                "SELECT 1 FROM sqlite_master "
+                "WHERE type = 'table' AND name = 'messages_fts'"
+            )
+        )
+        existed = result.first() is not None
+        try:
+            for statement in _SCHEMA:
+                await conn.execute(text(statement))
+        except Exception as e:
+            logger.warning(f"FTS5 unavailable, conversation search disabled: {e}")
+            return False
+        if not existed:
+            await conn.execute(
+                text("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')")
+            )
+            logger.info("Built messages_fts index from existing messages")
+    return True
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """Turn free text into a safe FTS5 MATCH expression.
+
+    Every word is quoted, so FTS5 operators and column filters in user input
+    are treated as plain text. ``"exact phrase"`` is kept as a phrase and a
+    trailing ``*`` on a word requests a prefix match. Terms are ANDed.
+    Returns None when the query has no searchable words.
+    """
+    terms = []
+    for match in _QUERY_TERM_RE.finditer(query):
+        phrase, word, star = match.groups()
+        if word:
+            terms.append(f'"{word}"*' if star else f'"{word}"')
+        elif phrase:
+            words = _WORD_RE.findall(phrase)
+            if words:
+                terms.append('"' + " ".join(words) + '"')
+    return " ".join(terms) or None
+
+
+def _snippet_html(snippet: Optional[str]) -> str:
+    return (
+        escape_html(snippet or "")
+        .replace(_HIGHLIGHT_OPEN, "<b>")
+        .replace(_HIGHLIGHT_CLOSE, "</b>")
+    )
+
+
+def _snippet_params() -> dict:
+    return {
+        "open": _HIGHLIGHT_OPEN,
+        "close": _HIGHLIGHT_CLOSE,
+        "ellipsis": "…",
+        "tokens": _SNIPPET_TOKENS,
+    }
+
+
+async def _search_messages(
+    session, match: str, chat_id: Optional[int], limit: int
+) -> List[SearchHit]:
+    chat_filter = "AND c.chat_id = :chat_id" if chat_id is not None else ""
+    result = await session.execute(
+        text(f"""
+            SELECT c.chat_id, m.message_id, m.is_bot_message, m.created_at,
+                   snippet(messages_fts, -1, :open, :close, :ellipsis, :tokens),
+                   bm25(messages_fts) AS score
+            FROM messages_fts
+            JOIN messages m ON m.id = messages_fts.rowid
+            JOIN chats c ON c.id = m.chat_id
+            WHERE messages_fts MATCH :match {chat_filter}
+            ORDER BY score
+            LIMIT :limit
+            """),
+        {"match": match, "chat_id": chat_id, "limit": limit, **_snippet_params()},
+    )
+    return [
+        SearchHit(
+            source=SOURCE_MESSAGES,
+            chat_id=row[0],
+            message_id=row[1],
+            role="assistant" if row[2] else "user",
+            timestamp=str(row[3]) if row[3] is not None else None,
+            snippet=_snippet_html(row[4]),
+            rank=row[5],
+        )
+        for row in result.all()
+    ]
+
+
+async def _search_archives(
+    session, match: str, chat_id: Optional[int], limit: int
+) -> List[SearchHit]:
+    chat_filter = "AND chat_id = :chat_id" if chat_id is not None else ""
+    result = await session.execute(
+        text(f"""
+            SELECT chat_id, role, session_id, archive, archived_at,
+                   snippet(conversation_archive_fts, 0, :open, :close,
+                           :ellipsis, :tokens),
+                   bm25(conversation_archive_fts) AS score
+            FROM conversation_archive_fts
+            WHERE conversation_archive_fts MATCH :match {chat_filter}
+            ORDER BY score
+            LIMIT :limit
+            """),
+        {"match": match, "chat_id": chat_id, "limit": limit, **_snippet_params()},
+    )
+    return [
+        SearchHit(
+            source=SOURCE_ARCHIVES,
+            chat_id=row[0],
+            role=row[1],
+            session_id=row[2],
+            archive=row[3],
+            timestamp=row[4],
+            snippet=_snippet_html(row[5]),
+            rank=row[6],
+        )
+        for row in result.all()
+    ]
+
+
+async def search_conversations(
+    query: str,
+    chat_id: Optional[int] = None,
+    sources: Sequence[str] = ALL_SOURCES,
+    limit: int = 20,
+) -> List[SearchHit]:
+    """Full-text search over persisted messages and archived transcripts.
+
+    Args:
+        query: Free-text query (see build_match_query for the syntax)
+        chat_id: Telegram chat ID to restrict results to; None searches all chats
+        sources: Any of SOURCE_MESSAGES / SOURCE_ARCHIVES
+        limit: Maximum number of hits returned
+
+    Returns:
+        Hits ordered by BM25 rank, best first. Scores from the two indexes
+        are merged as-is; both are BM25 over similar short texts, which is
+        close enough for interleaving.
+    """
+    match = build_match_query(query)
+    if match is None or limit <= 0:
+        return []
+
+    hits: List[SearchHit] = []
+    async with get_db_session() as session:
+        if SOURCE_MESSAGES in sources:
+            hits.extend(await _search_messages(session, match, chat_id, limit))
+        if SOURCE_ARCHIVES in sources:
+            hits.extend(await _search_archives(session, match, chat_id, limit))
+
+    hits.sort(key=lambda hit: hit.rank)
+    return hits[:limit]
+
+
+async def _insert_archive(
+    archive: str,
+    chat_id: int,
+    session_id: Optional[str],
+    archived_at: Optional[str],
+    turns: Iterable[Tuple[str, str]],
+) -> bool:
+    """Index one archive's turns; False if the archive was already indexed."""
+    rows = [
+        {
+            "content": content,
+            "role": role,
+            "chat_id": chat_id,
+            "session_id": session_id,
+            "archive": archive,
+            "archived_at": archived_at,
+        }
+        for role, content in turns
+        if content and content.strip()
+    ]
+    async with get_db_session() as session:
+        claimed = await session.execute(
+            text(
+                "INSERT OR IGNORE INTO conversation_archive_index "
+                "(archive, chat_id, session_id, turns) "
+                "VALUES (:archive, :chat_id, :session_id, :turns)"
+            ),
+            {
+                "archive": archive,
+                "chat_id": chat_id,
+                "session_id": session_id,
+                "turns": len(rows),
+            },
+        )
+        if cast(CursorResult, claimed).rowcount != 1:
+            return False
+        if rows:
+            await session.execute(
+                text(
+                    "INSERT INTO conversation_archive_fts "
+                    "(content, role, chat_id, session_id, archive, archived_at) "
+                    "VALUES (:content, :role, :chat_id, :session_id, :archive, "
+                    ":archived_at)"
+                ),
+                rows,
+            )
+        await session.commit()
+    return True
+
+
+def _archive_key(path: Path) -> str:
+    """Archive identifier: "<chat_id>/<filename>", as used by get_archive()."""
+    return f"{path.parent.name}/{path.name}"
+
+
+async def index_archived_conversation(
+    chat_id: int,
+    session_id: str,
+    archive_path: Path,
+    messages: list[dict],
+    archived_at: Optional[str] = None,
+) -> bool:
+    """Add a freshly written archive to the search index.
+
+    Called right after conversation_archive.archive_conversation() with the
+    same message dicts, so the markdown does not have to be parsed back.
+    """
+    return await _insert_archive(
+        archive=_archive_key(archive_path),
+        chat_id=chat_id,
+        session_id=session_id,
+        archived_at=archived_at,
+        turns=[(m.get("role", "unknown"), m.get("content", "")) for m in messages],
+    )
+
+
+async def delete_archived_conversations(session, chat_ids: Sequence[int]) -> int:
+    """Remove the indexed archive turns of ``chat_ids`` (data deletion).
+
+    Runs on the caller's session so it commits with the rest of the
+    deletion. Returns the number of archives removed from the index.
+    """
+    if not chat_ids:
+        return 0
+    params = {f"c{i}": chat_id for i, chat_id in enumerate(chat_ids)}
+    placeholders = ", ".join(f":{name}" for name in params)
+    await session.execute(
+        text(f"DELETE FROM conversation_archive_fts WHERE chat_id IN ({placeholders})"),
+        params,
+    )
+    result = await session.execute(
+        text(
+            "DELETE FROM conversation_archive_index "
+            f"WHERE chat_id IN ({placeholders})"
+        ),
+        params,
+    )
+    return cast(CursorResult, result).rowcount
+
+
+def parse_archive(content: str) -> Tuple[dict, List[Tuple[str, str]]]:
+    """Parse an archive markdown file into (metadata, [(role, content), ...])."""
+    metadata = {
+        key.lower().replace(" ", "_"): value.strip()
+        for key, value in _ARCHIVE_META_RE.findall(content.split("\n---\n", 1)[0])
+    }
+    sections = list(_ARCHIVE_SECTION_RE.finditer(content))
+    turns = []
+    for index, section in enumerate(sections):
+        end = sections[index + 1].start() if index + 1 < len(sections) else None
+        turns.append((section.group(1).lower(), content[section.end() : end].strip()))
+    return metadata, turns
+
+
+async def backfill_archive_index(base_dir: Optional[Path] = None) -> int:
+    """Index archive files that are not in the index yet.
+
+    Returns the number of archives added.
+    """
+    base_dir = base_dir or conversation_archive.ARCHIVE_BASE_DIR
+    if not base_dir.exists():
+        return 0
+
+    async with get_db_session() as session:
+        result = await session.execute(
+            text("SELECT archive FROM conversation_archive_index")
+        )
+        indexed = {row[0] for row in result.all()}
+
+    added = 0
+    for chat_dir in sorted(base_dir.iterdir()):
+        try:
+            chat_id = int(chat_dir.name)
+        except ValueError:
+            continue
+        for path in sorted(chat_dir.glob("*.md")):
+            key = _archive_key(path)
+            if key in indexed:
+                continue
+            try:
+                content = await asyncio.to_thread(path.read_text, encoding="utf-8")
+            except (OSError, UnicodeDecodeError) as e:
+                logger.warning(f"Skipping unreadable archive {key}: {e}")
+                continue
+            metadata, turns = parse_archive(content)
+            if await _insert_archive(
+                archive=key,
+                chat_id=chat_id,
+                session_id=metadata.get("session_id"),
+                archived_at=metadata.get("archived"),
+                turns=turns,
+            ):
+                added += 1
+
+    if added:
+        logger.info(f"Indexed {added} conversation archives for search")
+    return added
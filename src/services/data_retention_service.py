@@ -2,19 +2,32 @@
 Data retention enforcement service.
 
 Periodically deletes records older than each user's configured retention period.
+
+Users are grouped by retention period so each table is purged with one
+set-based query per group instead of one per user. Deletes run in bounded
+chunks (ordered by primary key, filtered on the indexed ``created_at``), each
+in its own short transaction, with a pause between chunks so the SQLite write
+lock is never held for the whole run. Progress is checkpointed in
+``retention_progress`` so an interrupted run resumes where it stopped.
 """
 
 import asyncio
 import logging
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, select, update
 
 from ..core.database import get_db_session
 from ..models.chat import Chat
+from ..models.image import Image
 from ..models.message import Message
 from ..models.poll_response import PollResponse
 from ..models.privacy_settings import PrivacySettings
+from ..models.retention_progress import RetentionProgress
 from ..models.tracker import CheckIn
 
 logger = logging.getLogger(__name__)
@@ -27,83 +40,315 @@ RETENTION_PERIODS = {
     "forever": None,  # No deletion
 }
 
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_PAUSE_SECONDS = 0.05
 
-async def enforce_data_retention() -> dict:
-    """
-    Delete records older than each user's retention setting.
 
-    Returns dict of {user_id: deleted_count} for users with deletions.
-    """
-    results = {}
+def _select_messages(user_ids: Sequence[int], cutoff: datetime, after_id: int):
+    # Message.chat_id is FK to chats.id (database PK)
+    return (
+        select(Message.id, Chat.user_id)
+        .join(Chat, Chat.id == Message.chat_id)
+        .where(
+            Chat.user_id.in_(user_ids),
+            Message.created_at < cutoff,
+            Message.id > after_id,
+        )
+        .order_by(Message.id)
+    )
 
-    try:
+
+def _select_check_ins(user_ids: Sequence[int], cutoff: datetime, after_id: int):
+    return (
+        select(CheckIn.id, CheckIn.user_id)
+        .where(
+            CheckIn.user_id.in_(user_ids),
+            CheckIn.created_at < cutoff,
+            CheckIn.id > after_id,
+        )
+        .order_by(CheckIn.id)
+    )
+
+
+def _select_poll_responses(user_ids: Sequence[int], cutoff: datetime, after_id: int):
+    # PollResponse.chat_id stores Telegram chat IDs (no FK) -> Chat.chat_id
+    return (
+        select(PollResponse.id, Chat.user_id)
+        .join(Chat, Chat.chat_id == PollResponse.chat_id)
+        .where(
+            Chat.user_id.in_(user_ids),
+            PollResponse.created_at < cutoff,
+            PollResponse.id > after_id,
+        )
+        .order_by(PollResponse.id)
+    )
+
+
+def _select_images(user_ids: Sequence[int], cutoff: datetime, after_id: int):
+    # Image.chat_id is FK to chats.id (database PK)
+    return (
+        select(Image.id, Chat.user_id, Image.original_path, Image.compressed_path)
+        .join(Chat, Chat.id == Image.chat_id)
+        .where(
+            Chat.user_id.in_(user_ids),
+            Image.created_at < cutoff,
+            Image.id > after_id,
+        )
+        .order_by(Image.id)
+    )
+
+
+@dataclass(frozen=True)
+class RetentionTarget:
+    """A table purged by retention: its model and its chunk selector."""
+
+    table_name: str
+    model: Any
+    select_chunk: Callable[[Sequence[int], datetime, int], Any]
+
+
+# Order matters: messages go before images so fewer rows reference purged images
+RETENTION_TARGETS: Tuple[RetentionTarget, ...] = (
+    RetentionTarget("messages", Message, _select_messages),
+    RetentionTarget("check_ins", CheckIn, _select_check_ins),
+    RetentionTarget("poll_responses", PollResponse, _select_poll_responses),
+    RetentionTarget("images", Image, _select_images),
+)
+
+
+class DataRetentionEngine:
+    """Chunked, resumable retention purge across all users."""
+
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        pause_seconds: float = DEFAULT_PAUSE_SECONDS,
+        vector_db: Optional[Any] = None,
+    ):
+        self.chunk_size = chunk_size
+        self.pause_seconds = pause_seconds
+        self._vector_db = vector_db
+
+    @property
+    def vector_db(self):
+        if self._vector_db is None:
+            from ..core.vector_db import get_vector_db
+
+            self._vector_db = get_vector_db()
+        return self._vector_db
+
+    async def _load_groups(self) -> Dict[str, List[int]]:
+        """Group user IDs by their (non-forever) retention setting."""
         async with get_db_session() as session:
-            # Get all users with their retention settings
-            stmt = select(PrivacySettings).where(
-                PrivacySettings.data_retention != "forever"
+            result = await session.execute(
+                select(PrivacySettings.user_id, PrivacySettings.data_retention).where(
+                    PrivacySettings.data_retention != "forever"
+                )
             )
-            result = await session.execute(stmt)
-            settings_list = result.scalars().all()
+            groups: Dict[str, List[int]] = defaultdict(list)
+            for user_id, retention in result.all():
+                if RETENTION_PERIODS.get(retention) is not None:
+                    groups[retention].append(user_id)
+            return dict(groups)
 
-            for settings in settings_list:
-                period = RETENTION_PERIODS.get(settings.data_retention)
-                if period is None:
-                    continue
+    async def _load_progress(self) -> Dict[Tuple[str, str], RetentionProgress]:
+        """Load checkpoints left behind by an interrupted run."""
+        async with get_db_session() as session:
+            result = await session.execute(select(RetentionProgress))
+            return {(p.retention, p.table_name): p for p in result.scalars().all()}
+
+    async def _start_step(
+        self, retention: str, table_name: str, cutoff: datetime
+    ) -> int:
+        """Create the checkpoint row for a step and return its id."""
+        async with get_db_session() as session:
+            progress = RetentionProgress(
+                retention=retention,
+                table_name=table_name,
+                cutoff=cutoff,
+                last_id=0,
+                deleted_count=0,
+                completed=False,
+            )
+            session.add(progress)
+            await session.commit()
+            return progress.id
 
-                cutoff = datetime.utcnow() - period
-                user_id = settings.user_id
-                total_deleted = 0
+    async def _clear_progress(self) -> None:
+        async with get_db_session() as session:
+            await session.execute(delete(RetentionProgress))
+            await session.commit()
 
-                # Subqueries for user's chats - two ID spaces:
-                # Chat.id = database PK (used by Message.chat_id via FK)
-                # Chat.chat_id = Telegram chat ID (used by PollResponse.chat_id)
-                user_db_chat_ids = select(Chat.id).where(Chat.user_id == user_id)
-                user_telegram_chat_ids = select(Chat.chat_id).where(
-                    Chat.user_id == user_id
+    async def _purge_chunk(
+        self,
+        target: RetentionTarget,
+        user_ids: Sequence[int],
+        cutoff: datetime,
+        after_id: int,
+        progress_id: int,
+    ) -> List[Any]:
+        """Delete one chunk in a single short transaction. Returns deleted rows."""
+        async with get_db_session() as session:
+            result = await session.execute(
+                target.select_chunk(user_ids, cutoff, after_id).limit(self.chunk_size)
+            )
+            rows = list(result.all())
+
+            if not rows:
+                await session.execute(
+                    update(RetentionProgress)
+                    .where(RetentionProgress.id == progress_id)
+                    .values(completed=True)
                 )
+                await session.commit()
+                return rows
 
-                # Delete old messages scoped to this user's chats
-                # Message.chat_id is FK to chats.id (database PK)
-                result = await session.execute(
-                    delete(Message).where(
-                        Message.chat_id.in_(user_db_chat_ids),
-                        Message.created_at < cutoff,
-                    )
+            ids = [row[0] for row in rows]
+            if target.model is Image:
+                # Newer messages may still point at an old image
+                await session.execute(
+                    update(Message)
+                    .where(Message.image_id.in_(ids))
+                    .values(image_id=None)
+                )
+            await session.execute(delete(target.model).where(target.model.id.in_(ids)))
+            await session.execute(
+                update(RetentionProgress)
+                .where(RetentionProgress.id == progress_id)
+                .values(
+                    last_id=ids[-1],
+                    deleted_count=RetentionProgress.deleted_count + len(ids),
                 )
-                total_deleted += result.rowcount
+            )
+            await session.commit()
+            return rows
+
+    @staticmethod
+    def _remove_image_files(rows: Sequence[Any]) -> int:
+        """Delete original/compressed files of purged images. Returns count."""
+        removed = 0
+        for row in rows:
+            for path_str in (row[2], row[3]):
+                if not path_str:
+                    continue
+                try:
+                    path = Path(path_str)
+                    if path.is_file():
+                        path.unlink()
+                        removed += 1
+                except OSError as e:
+                    logger.warning(f"Could not remove image file {path_str}: {e}")
+        return removed
+
+    @staticmethod
+    async def _purge_reply_contexts(user_ids: Sequence[int], cutoff: datetime) -> int:
+        """Delete spilled reply contexts of these users older than cutoff."""
+        try:
+            from .reply_context import get_reply_context_service
+
+            service = get_reply_context_service()
+            return await asyncio.to_thread(
+                service.purge_spill_older_than, cutoff, user_ids
+            )
+        except Exception as e:
+            logger.warning(f"Reply context retention purge failed: {e}")
+            return 0
 
-                # Delete old check-ins
-                result = await session.execute(
-                    delete(CheckIn).where(
-                        CheckIn.user_id == user_id,
-                        CheckIn.created_at < cutoff,
+    async def run(self) -> Dict[int, int]:
+        """Run (or resume) a retention pass. Returns {user_id: deleted_count}."""
+        results: Dict[int, int] = defaultdict(int)
+        groups = await self._load_groups()
+        progress = await self._load_progress()
+        if progress:
+            logger.info(
+                f"Data retention: resuming interrupted run ({len(progress)} checkpoints)"
+            )
+
+        images_purged = 0
+        files_removed = 0
+        now = datetime.utcnow()
+
+        for retention, user_ids in groups.items():
+            period = RETENTION_PERIODS[retention]
+            assert period is not None  # filtered in _load_groups
+
+            # Keep one cutoff per group; a resumed group keeps its original cutoff
+            group_checkpoints = [p for (r, _), p in progress.items() if r == retention]
+            cutoff = group_checkpoints[0].cutoff if group_checkpoints else now - period
+
+            for target in RETENTION_TARGETS:
+                checkpoint = progress.get((retention, target.table_name))
+                if checkpoint is not None and checkpoint.completed:
+                    continue
+
+                if checkpoint is not None:
+                    progress_id, after_id = checkpoint.id, checkpoint.last_id
+                else:
+                    progress_id = await self._start_step(
+                        retention, target.table_name, cutoff
                     )
-                )
-                total_deleted += result.rowcount
-
-                # Delete old poll responses scoped to this user's chats
-                # PollResponse.chat_id stores Telegram chat IDs (no FK)
-                result = await session.execute(
-                    delete(PollResponse).where(
-                        PollResponse.chat_id.in_(user_telegram_chat_ids),
-                        PollResponse.created_at < cutoff,
+                    after_id = 0
+
+                while True:
+                    rows = await self._purge_chunk(
+                        target, user_ids, cutoff, after_id, progress_id
                     )
+                    if not rows:
+                        break
+
+                    after_id = rows[-1][0]
+                    for row in rows:
+                        results[row[1]] += 1
+                    if target.model is Image:
+                        images_purged += len(rows)
+                        files_removed += self._remove_image_files(rows)
+
+                    # Let interactive writers in between chunks
+                    await asyncio.sleep(self.pause_seconds)
+
+            # Reply contexts live in their own SQLite file, outside the chunked
+            # targets above; their timestamps are local time
+            local_cutoff = cutoff + (datetime.now() - datetime.utcnow())
+            await self._purge_reply_contexts(user_ids, local_cutoff)
+
+            logger.info(
+                f"Data retention: processed {len(user_ids)} users "
+                f"(retention={retention}, cutoff={cutoff.isoformat()})"
+            )
+
+        if images_purged:
+            try:
+                cleaned = await self.vector_db.cleanup_orphaned_embeddings()
+                logger.info(
+                    f"Data retention: purged {images_purged} images, "
+                    f"removed {files_removed} files, {cleaned} orphaned embeddings"
                 )
-                total_deleted += result.rowcount
+            except Exception as e:
+                logger.warning(f"Embedding cleanup after retention failed: {e}")
 
-                if total_deleted > 0:
-                    results[user_id] = total_deleted
-                    logger.info(
-                        f"Data retention: deleted {total_deleted} records for user {user_id} "
-                        f"(retention={settings.data_retention}, cutoff={cutoff.isoformat()})"
-                    )
+        await self._clear_progress()
 
-            await session.commit()
+        for user_id, count in results.items():
+            logger.info(f"Data retention: deleted {count} records for user {user_id}")
+        return dict(results)
 
+
+async def enforce_data_retention(
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    pause_seconds: float = DEFAULT_PAUSE_SECONDS,
+) -> dict:
+    """
+    Delete records older than each user's retention setting.
+
+    Returns dict of {user_id: deleted_count} for users with deletions.
+    Errors are logged; checkpoints are kept so the next run resumes.
+    """
+    try:
+        engine = DataRetentionEngine(chunk_size=chunk_size, pause_seconds=pause_seconds)
+        return await engine.run()
     except Exception as e:
         logger.error(f"Data retention enforcement failed: {e}", exc_info=True)
-
-    return results
+        return {}
 
 
 async def run_periodic_retention(interval_hours: float = 24.0) -> None:
@@ -1,28 +1,298 @@
 """
 Database backup service.
 
-Provides SQLite backup with gzip compression and rotation of old backups.
-Uses sqlite3.backup() which is safe for WAL-mode databases.
+Provides online SQLite backups with gzip compression, page-delta incremental
+backups between full snapshots, chain-aware rotation and point-in-time restore.
+
+Full snapshots are taken with sqlite3.backup() in steps of ``pages`` pages,
+sleeping ``step_sleep`` seconds between steps so writers are not starved.
+The snapshot is written to a temporary file next to the backups and
+compressed from there in fixed-size chunks, so memory use does not grow
+with the database; the temporary file is removed afterwards.
+
+Incremental backups store only the page images that changed since the
+previous backup in the chain (the same unit SQLite writes to its WAL).
+Raw WAL files are not shipped: the bot relies on SQLite's auto-checkpoint,
+which recycles WAL frames between backup runs. Page deltas are computed
+against per-page hashes kept in ``backup_state.json`` / ``backup_pages.bin``.
+
+Backups usually run from cron (scripts/run_db_backup.py), not in the bot
+process, so each run's outcome is written to ``backup_status.json``; the
+bot's /api/metrics reads it at scrape time (read_backup_status()).
+
+Layout of ``backup_dir``:
+    telegram_agent_<ts>.db.gz              full snapshot
+    telegram_agent_<base_ts>+<ts>.inc.gz   incremental on top of <base_ts>
+    backup_state.json, backup_pages.bin    chain state for the next incremental
+    backup_status.json                     last run and last success per kind,
+                                           run counters
 """
 
 import gzip
+import hashlib
+import json
 import logging
+import re
 import sqlite3
+import struct
+import time
+from dataclasses import asdict, dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+BACKUP_PREFIX = "telegram_agent_"
+FULL_SUFFIX = ".db.gz"
+INCREMENTAL_SUFFIX = ".inc.gz"
+STATE_FILE = "backup_state.json"
+PAGE_HASHES_FILE = "backup_pages.bin"
+STATUS_FILE = "backup_status.json"
+SNAPSHOT_SUFFIX = ".snapshot"
 
-def backup(source_db: Path, backup_dir: Path) -> Optional[Path]:
-    """Create a gzipped backup of a SQLite database.
+# Pages copied per sqlite3.backup() step and pause between steps
+DEFAULT_BACKUP_PAGES = 1024
+DEFAULT_STEP_SLEEP = 0.01
 
-    Uses sqlite3.backup() for a consistent snapshot (safe for WAL mode).
+_STREAM_CHUNK = 1024 * 1024
+_HASH_SIZE = 8
+_PAGE_HEADER = struct.Struct(">I")
+_INCREMENTAL_MAGIC = b"TAINC1\n"
+
+_FULL_RE = re.compile(r"^telegram_agent_(\d{8}_\d{6})\.db\.gz$")
+_INCREMENTAL_RE = re.compile(
+    r"^telegram_agent_(\d{8}_\d{6})\+(\d{8}_\d{6}_\d{6})\.inc\.gz$"
+)
+
+
+@dataclass
+class BackupStats:
+    """Timing and size of one backup run."""
+
+    kind: str  # "full" or "incremental"
+    path: str
+    duration_seconds: float
+    source_bytes: int
+    backup_bytes: int
+    pages_written: int
+
+    @property
+    def throughput_bytes_per_second(self) -> float:
+        if self.duration_seconds <= 0:
+            return 0.0
+        return self.source_bytes / self.duration_seconds
+
+
+# =============================================================================
+# Snapshot helpers
+# =============================================================================
+
+
+def _snapshot(
+    source_db: Path, dest: Path, pages: int, step_sleep: float
+) -> Tuple[int, int]:
+    """Copy the source DB into ``dest`` with a stepped online backup.
+
+    Returns (file size, page size) of the snapshot.
+    """
+    src_conn = sqlite3.connect(str(source_db))
+    dest_conn = sqlite3.connect(str(dest))
+
+    def _progress(status: int, remaining: int, total: int) -> None:
+        # Yield the database to writers between steps
+        if remaining and step_sleep > 0:
+            time.sleep(step_sleep)
+
+    try:
+        src_conn.backup(dest_conn, pages=pages, progress=_progress)
+        page_size = dest_conn.execute("PRAGMA page_size").fetchone()[0]
+        # A WAL-mode source yields a WAL-mode copy; fold it back into one file
+        dest_conn.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        dest_conn.close()
+        src_conn.close()
+    return dest.stat().st_size, page_size
+
+
+def _snapshot_path(backup_dir: Path) -> Path:
+    return backup_dir / f"{BACKUP_PREFIX}{_timestamp()}{SNAPSHOT_SUFFIX}"
+
+
+def _remove_snapshot(path: Path) -> None:
+    for leftover in (path, path.with_name(path.name + "-journal")):
+        leftover.unlink(missing_ok=True)
+
+
+def _iter_pages(path: Path, page_size: int) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        while True:
+            page = f.read(page_size)
+            if not page:
+                return
+            yield page
+
+
+def _page_hashes(path: Path, page_size: int) -> bytes:
+    return b"".join(
+        hashlib.blake2b(page, digest_size=_HASH_SIZE).digest()
+        for page in _iter_pages(path, page_size)
+    )
+
+
+def _iter_file(path: Path) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_STREAM_CHUNK)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _write_gzip_stream(path: Path, chunks: Iterable[bytes], header: bytes = b"") -> int:
+    """Stream chunks into a gzip file via a .partial file. Returns file size."""
+    partial = path.with_name(path.name + ".partial")
+    with gzip.open(partial, "wb") as f_out:
+        if header:
+            f_out.write(header)
+        for chunk in chunks:
+            f_out.write(chunk)
+    partial.replace(path)
+    return path.stat().st_size
+
+
+def _timestamp() -> str:
+    return datetime.now().strftime("%Y%m%d_%H%M%S")
+
+
+def _load_state(backup_dir: Path) -> Optional[Dict]:
+    state_path = backup_dir / STATE_FILE
+    hashes_path = backup_dir / PAGE_HASHES_FILE
+    if not state_path.exists() or not hashes_path.exists():
+        return None
+    try:
+        state = json.loads(state_path.read_text())
+        state["page_hashes"] = hashes_path.read_bytes()
+        return state
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable backup state in %s: %s", backup_dir, e)
+        return None
+
+
+def _save_state(
+    backup_dir: Path,
+    base: str,
+    last: str,
+    chain_length: int,
+    page_size: int,
+    page_hashes: bytes,
+    stats: BackupStats,
+) -> None:
+    hashes_path = backup_dir / PAGE_HASHES_FILE
+    tmp_hashes = hashes_path.with_name(hashes_path.name + ".partial")
+    tmp_hashes.write_bytes(page_hashes)
+    tmp_hashes.replace(hashes_path)
+
+    state = {
+        "base": base,
+        "last": last,
+        "chain_length": chain_length,
+        "page_size": page_size,
+        "last_backup": {
+            **asdict(stats),
+            "throughput_bytes_per_second": stats.throughput_bytes_per_second,
+        },
+    }
+    state_path = backup_dir / STATE_FILE
+    tmp_state = state_path.with_name(state_path.name + ".partial")
+    tmp_state.write_text(json.dumps(state, indent=2))
+    tmp_state.replace(state_path)
+
+
+def _update_status(backup_dir: Path, kind: str, status: str, **run: Any) -> None:
+    """Record one run's outcome in backup_status.json (read by the bot)."""
+    status_path = backup_dir / STATUS_FILE
+    try:
+        data = json.loads(status_path.read_text()) if status_path.exists() else {}
+    except (OSError, ValueError):
+        data = {}
+    counts = data.setdefault("counts", {})
+    counts[f"{kind}:{status}"] = counts.get(f"{kind}:{status}", 0) + 1
+    entry = {"status": status, "finished_at": time.time(), **run}
+    data.setdefault("last", {})[kind] = entry
+    if status == "success":
+        # Kept across failures so staleness alerts see an old timestamp
+        data.setdefault("last_success", {})[kind] = entry
+    try:
+        backup_dir.mkdir(parents=True, exist_ok=True)
+        tmp = status_path.with_name(status_path.name + ".partial")
+        tmp.write_text(json.dumps(data, indent=2))
+        tmp.replace(status_path)
+    except OSError as e:
+        logger.warning("Backup status not written to %s: %s", status_path, e)
+
+
+def read_backup_status(backup_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """Run counters, last run and last success per kind, as written by backup runs.
+
+    Defaults to the project backup directory. Returns {} when no backup has
+    run yet or the file is unreadable.
+    """
+    if backup_dir is None:
+        backup_dir = _project_db_path().parent / "backups"
+    status_path = Path(backup_dir) / STATUS_FILE
+    try:
+        return json.loads(status_path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _record_metrics(backup_dir: Path, stats: BackupStats) -> None:
+    logger.info(
+        "Backup %s: %.2fs, %d source bytes -> %d bytes, %.0f B/s",
+        stats.kind,
+        stats.duration_seconds,
+        stats.source_bytes,
+        stats.backup_bytes,
+        stats.throughput_bytes_per_second,
+    )
+    _update_status(
+        backup_dir,
+        stats.kind,
+        "success",
+        duration_seconds=stats.duration_seconds,
+        size_bytes=stats.backup_bytes,
+        source_bytes=stats.source_bytes,
+        pages_written=stats.pages_written,
+    )
+
+
+def _record_failure(backup_dir: Path, kind: str) -> None:
+    _update_status(backup_dir, kind, "failure")
+
+
+# =============================================================================
+# Backup
+# =============================================================================
+
+
+def backup(
+    source_db: Path,
+    backup_dir: Path,
+    pages: int = DEFAULT_BACKUP_PAGES,
+    step_sleep: float = DEFAULT_STEP_SLEEP,
+) -> Optional[Path]:
+    """Create a gzipped full backup of a SQLite database.
+
+    Uses a stepped sqlite3.backup() for a consistent snapshot (safe for WAL
+    mode) into a temporary file and stream-compresses it in chunks. Also
+    resets the incremental chain so later incrementals build on this one.
 
     Args:
         source_db: Path to the source SQLite database file.
         backup_dir: Directory to store the backup. Created if missing.
+        pages: Pages copied per backup step (-1 copies everything at once).
+        step_sleep: Seconds to sleep between steps so writers can proceed.
 
     Returns:
         Path to the created .db.gz file, or None on failure.
@@ -36,48 +306,168 @@ def backup(source_db: Path, backup_dir: Path) -> Optional[Path]:
 
     backup_dir.mkdir(parents=True, exist_ok=True)
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_name = f"telegram_agent_{timestamp}.db.gz"
-    backup_path = backup_dir / backup_name
-
-    # Create an in-memory copy via sqlite3.backup(), then gzip it
-    tmp_db_path = backup_dir / f"_tmp_{timestamp}.db"
+    backup_path = backup_dir / f"{BACKUP_PREFIX}{_timestamp()}{FULL_SUFFIX}"
+    snapshot = _snapshot_path(backup_dir)
+    started = time.monotonic()
 
     try:
-        src_conn = sqlite3.connect(str(source_db))
-        dst_conn = sqlite3.connect(str(tmp_db_path))
-        src_conn.backup(dst_conn)
-        dst_conn.close()
-        src_conn.close()
-
-        # Gzip the temporary copy
-        with open(tmp_db_path, "rb") as f_in:
-            with gzip.open(backup_path, "wb") as f_out:
-                while True:
-                    chunk = f_in.read(65536)
-                    if not chunk:
-                        break
-                    f_out.write(chunk)
+        source_bytes, page_size = _snapshot(source_db, snapshot, pages, step_sleep)
+        size = _write_gzip_stream(backup_path, _iter_file(snapshot))
+        stats = BackupStats(
+            kind="full",
+            path=str(backup_path),
+            duration_seconds=time.monotonic() - started,
+            source_bytes=source_bytes,
+            backup_bytes=size,
+            pages_written=source_bytes // page_size,
+        )
+        _save_state(
+            backup_dir,
+            base=backup_path.name,
+            last=backup_path.name,
+            chain_length=0,
+            page_size=page_size,
+            page_hashes=_page_hashes(snapshot, page_size),
+            stats=stats,
+        )
+        _record_metrics(backup_dir, stats)
 
         logger.info("Backup created: %s", backup_path)
         return backup_path
 
     except Exception:
         logger.exception("Backup failed for %s", source_db)
+        _record_failure(backup_dir, "full")
+        return None
+
+    finally:
+        _remove_snapshot(snapshot)
+
+
+def backup_incremental(
+    source_db: Path,
+    backup_dir: Path,
+    pages: int = DEFAULT_BACKUP_PAGES,
+    step_sleep: float = DEFAULT_STEP_SLEEP,
+) -> Optional[Path]:
+    """Write only the pages changed since the previous backup in the chain.
+
+    Falls back to a full backup when there is no usable chain (first run,
+    missing base snapshot, or page size change).
+
+    Returns:
+        Path to the created .inc.gz (or .db.gz on fallback), or None on failure.
+    """
+    source_db = Path(source_db)
+    backup_dir = Path(backup_dir)
+
+    if not source_db.exists():
+        logger.error("Backup source not found: %s", source_db)
+        return None
+
+    state = _load_state(backup_dir)
+    if state is None or not (backup_dir / state["base"]).exists():
+        logger.info("No usable backup chain in %s, taking full backup", backup_dir)
+        return backup(source_db, backup_dir, pages=pages, step_sleep=step_sleep)
+
+    started = time.monotonic()
+    snapshot = _snapshot_path(backup_dir)
+    try:
+        source_bytes, page_size = _snapshot(source_db, snapshot, pages, step_sleep)
+
+        if page_size != state["page_size"]:
+            logger.info("Page size changed, taking full backup")
+            return backup(source_db, backup_dir, pages=pages, step_sleep=step_sleep)
+
+        new_hashes = _page_hashes(snapshot, page_size)
+        old_hashes: bytes = state["page_hashes"]
+        page_count = source_bytes // page_size
+
+        changed: List[int] = [
+            pgno
+            for pgno in range(page_count)
+            if new_hashes[pgno * _HASH_SIZE : (pgno + 1) * _HASH_SIZE]
+            != old_hashes[pgno * _HASH_SIZE : (pgno + 1) * _HASH_SIZE]
+        ]
+
+        base_match = _FULL_RE.match(state["base"])
+        assert base_match is not None  # state is only written with valid names
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        inc_path = (
+            backup_dir
+            / f"{BACKUP_PREFIX}{base_match.group(1)}+{ts}{INCREMENTAL_SUFFIX}"
+        )
+
+        header = _INCREMENTAL_MAGIC + (
+            json.dumps(
+                {
+                    "base": state["base"],
+                    "parent": state["last"],
+                    "page_size": page_size,
+                    "page_count": page_count,
+                    "pages": len(changed),
+                }
+            ).encode()
+            + b"\n"
+        )
+
+        def changed_pages() -> Iterator[bytes]:
+            with open(snapshot, "rb") as f:
+                for pgno in changed:
+                    f.seek(pgno * page_size)
+                    yield _PAGE_HEADER.pack(pgno + 1) + f.read(page_size)
+
+        size = _write_gzip_stream(inc_path, changed_pages(), header=header)
+
+        stats = BackupStats(
+            kind="incremental",
+            path=str(inc_path),
+            duration_seconds=time.monotonic() - started,
+            source_bytes=source_bytes,
+            backup_bytes=size,
+            pages_written=len(changed),
+        )
+        _save_state(
+            backup_dir,
+            base=state["base"],
+            last=inc_path.name,
+            chain_length=state.get("chain_length", 0) + 1,
+            page_size=page_size,
+            page_hashes=new_hashes,
+            stats=stats,
+        )
+        _record_metrics(backup_dir, stats)
+
+        logger.info(
+            "Incremental backup created: %s (%d/%d pages)",
+            inc_path,
+            len(changed),
+            page_count,
+        )
+        return inc_path
+
+    except Exception:
+        logger.exception("Incremental backup failed for %s", source_db)
+        _record_failure(backup_dir, "incremental")
         return None
 
     finally:
-        # Clean up temp file
-        if tmp_db_path.exists():
-            tmp_db_path.unlink()
+        _remove_snapshot(snapshot)
+
+
+# =============================================================================
+# Rotation
+# =============================================================================
 
 
 def rotate(backup_dir: Path, keep: int = 7) -> int:
-    """Remove old backups, keeping the *keep* most recent .db.gz files.
+    """Remove old backups, keeping the *keep* most recent full snapshots.
+
+    Incrementals are kept only while their base snapshot is kept.
 
     Args:
         backup_dir: Directory containing backup files.
-        keep: Number of most-recent backups to retain.
+        keep: Number of most-recent full backups to retain.
 
     Returns:
         Number of files removed.
@@ -88,32 +478,159 @@ def rotate(backup_dir: Path, keep: int = 7) -> int:
 
     backups = sorted(backup_dir.glob("*.db.gz"), key=lambda p: p.stat().st_mtime)
 
-    if len(backups) <= keep:
+    to_remove = backups[: max(len(backups) - keep, 0)]
+    kept_bases = {p.name for p in backups[len(to_remove) :]}
+
+    for inc in backup_dir.glob(f"*{INCREMENTAL_SUFFIX}"):
+        match = _INCREMENTAL_RE.match(inc.name)
+        base_name = f"{BACKUP_PREFIX}{match.group(1)}{FULL_SUFFIX}" if match else None
+        if base_name not in kept_bases:
+            to_remove.append(inc)
+
+    if not to_remove:
         return 0
 
-    to_remove = backups[: len(backups) - keep]
     for f in to_remove:
         f.unlink()
         logger.debug("Removed old backup: %s", f)
 
     removed = len(to_remove)
-    logger.info("Rotated backups: removed %d, kept %d", removed, keep)
+    logger.info("Rotated backups: removed %d, kept %d full", removed, keep)
     return removed
 
 
-def run_backup(backup_dir: Optional[Path] = None, keep: int = 7) -> Optional[Path]:
-    """Convenience function: backup the project database and rotate.
+# =============================================================================
+# Restore
+# =============================================================================
 
-    Reads the DB path from ``get_database_url()``, performs a backup,
-    then rotates old backups.
+
+def _parse_point(name: str) -> Optional[datetime]:
+    full = _FULL_RE.match(name)
+    if full:
+        return datetime.strptime(full.group(1), "%Y%m%d_%H%M%S")
+    inc = _INCREMENTAL_RE.match(name)
+    if inc:
+        return datetime.strptime(inc.group(2), "%Y%m%d_%H%M%S_%f")
+    return None
+
+
+def list_backup_points(backup_dir: Path) -> List[Tuple[datetime, Path]]:
+    """List restorable backup points (full and incremental), oldest first."""
+    backup_dir = Path(backup_dir)
+    points = []
+    for path in backup_dir.glob(f"{BACKUP_PREFIX}*.gz"):
+        when = _parse_point(path.name)
+        if when is not None:
+            points.append((when, path))
+    return sorted(points)
+
+
+def _read_incremental_header(f) -> Dict:
+    magic = f.read(len(_INCREMENTAL_MAGIC))
+    if magic != _INCREMENTAL_MAGIC:
+        raise ValueError("not an incremental backup")
+    return json.loads(f.readline())
+
+
+def _resolve_chain(backup_dir: Path, point: Path) -> List[Path]:
+    """Return [full, inc1, ..., point] by following parent links back."""
+    chain = [point]
+    current = point
+    while current.name.endswith(INCREMENTAL_SUFFIX):
+        with gzip.open(current, "rb") as f:
+            parent = _read_incremental_header(f)["parent"]
+        current = backup_dir / parent
+        if not current.exists():
+            raise FileNotFoundError(f"Backup chain broken: {parent} is missing")
+        chain.append(current)
+    chain.reverse()
+    return chain
+
+
+def restore(
+    backup_dir: Path,
+    target: Path,
+    point: Optional[Union[str, datetime]] = None,
+) -> Optional[Path]:
+    """Rebuild a database at any backup point.
 
     Args:
-        backup_dir: Override backup directory. Defaults to ``data/backups/``.
-        keep: Number of backups to retain after rotation.
+        backup_dir: Directory containing backups.
+        target: Path of the database file to write (overwritten).
+        point: Backup file name, or a datetime to restore the latest backup
+            taken at or before it. Defaults to the most recent backup.
 
     Returns:
-        Path to the new backup, or None on failure.
+        The target path, or None if no matching backup exists or the
+        restored database fails its integrity check.
     """
+    backup_dir = Path(backup_dir)
+    target = Path(target)
+
+    points = list_backup_points(backup_dir)
+    if isinstance(point, str):
+        selected = [p for _, p in points if p.name == point]
+    elif isinstance(point, datetime):
+        selected = [p for when, p in points if when <= point]
+    else:
+        selected = [p for _, p in points]
+    if not selected:
+        logger.error("No backup found in %s for point %s", backup_dir, point)
+        return None
+
+    try:
+        chain = _resolve_chain(backup_dir, selected[-1])
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(target.name + ".partial")
+
+        with gzip.open(chain[0], "rb") as f_in, open(partial, "wb") as f_out:
+            while True:
+                chunk = f_in.read(_STREAM_CHUNK)
+                if not chunk:
+                    break
+                f_out.write(chunk)
+
+        with open(partial, "r+b") as db_file:
+            for inc in chain[1:]:
+                with gzip.open(inc, "rb") as f_in:
+                    header = _read_incremental_header(f_in)
+                    page_size = header["page_size"]
+                    for _ in range(header["pages"]):
+                        (pgno,) = _PAGE_HEADER.unpack(f_in.read(_PAGE_HEADER.size))
+                        db_file.seek((pgno - 1) * page_size)
+                        db_file.write(f_in.read(page_size))
+                    db_file.truncate(header["page_count"] * page_size)
+
+        conn = sqlite3.connect(str(partial))
+        try:
+            result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+        finally:
+            conn.close()
+        if result != "ok":
+            logger.error("Restored database failed integrity check: %s", result)
+            partial.unlink()
+            return None
+
+        partial.replace(target)
+        logger.info(
+            "Restored %s from %s (%d incremental(s))",
+            target,
+            chain[0].name,
+            len(chain) - 1,
+        )
+        return target
+
+    except Exception:
+        logger.exception("Restore failed from %s", backup_dir)
+        return None
+
+
+# =============================================================================
+# Entry point
+# =============================================================================
+
+
+def _project_db_path() -> Path:
     from ..core.database import get_database_url
 
     db_url = get_database_url()
@@ -125,13 +642,41 @@ def run_backup(backup_dir: Optional[Path] = None, keep: int = 7) -> Optional[Pat
         db_file = db_url.split("://", 1)[1]
     else:
         db_file = db_url
+    return Path(db_file)
+
 
-    source_db = Path(db_file)
+def run_backup(
+    backup_dir: Optional[Path] = None,
+    keep: int = 7,
+    incremental: bool = False,
+    full_every: int = 24,
+) -> Optional[Path]:
+    """Convenience function: backup the project database and rotate.
+
+    Reads the DB path from ``get_database_url()``, performs a backup,
+    then rotates old backups.
+
+    Args:
+        backup_dir: Override backup directory. Defaults to ``data/backups/``.
+        keep: Number of full backups to retain after rotation.
+        incremental: Take an incremental backup when the chain allows it.
+        full_every: Start a new full snapshot after this many incrementals.
+
+    Returns:
+        Path to the new backup, or None on failure.
+    """
+    source_db = _project_db_path()
 
     if backup_dir is None:
         backup_dir = source_db.parent / "backups"
+    backup_dir = Path(backup_dir)
+
+    state = _load_state(backup_dir) if incremental else None
+    if state is not None and state.get("chain_length", 0) < full_every:
+        result = backup_incremental(source_db, backup_dir)
+    else:
+        result = backup(source_db, backup_dir)
 
-    result = backup(source_db, backup_dir)
     if result is not None:
         rotate(backup_dir, keep=keep)
 
@@ -39,6 +39,10 @@ class DesignSkillsService:
             logger.error(f"Error loading design skills config: {e}")
             return {"design_skills": {}, "integration": {}}
 
+    def reload_config(self) -> None:
+        """Re-read the YAML config (e.g. after it changed on disk)."""
+        self.config = self._load_config()
+
     def should_apply_design_skills(self, prompt: str) -> bool:
         """
         Determine if design skills should be applied based on prompt content.
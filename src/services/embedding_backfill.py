@@ -0,0 +1,369 @@
+"""
+Embedding Backfill - resumable, parallel embedding of images that have no
+embedding from the current model.
+
+EmbeddingBackfill walks completed images whose embedding is NULL or whose
+embedding_model is NULL (hash embeddings stored at ingest) or names another
+model, in id order using keyset pagination (``id > last_id ORDER BY id
+LIMIT page_size``), so each page is an index range scan however far the run
+has got. For every page:
+
+1. files are read, decoded and downscaled in a process pool
+   (load_image_file), overlapping with the previous page's embedding
+2. the decoded images go to the embedding runtime as one batch
+3. embeddings and the advanced cursor are committed in one transaction,
+   then copied to the vector index with one connection
+
+The cursor (backfill_cursors row, one per scope) is only advanced together
+with the rows it covers, so an interrupted run resumes after the last
+committed page. A run that reaches the end clears its cursor; the next one
+rescans from the start, which only revisits images that failed or whose
+file was missing, since everything embedded no longer matches.
+
+No-op while embeddings are deterministic (no model loaded): hash vectors
+would otherwise fill the column and hide those images from a later real
+backfill.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Tuple
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.dialects.sqlite import insert
+
+from ..core.config import get_limit
+from ..core.database import get_db_session
+from ..models.backfill_cursor import BackfillCursor
+from ..models.chat import Chat
+from ..models.image import Image
+from .embedding_runtime import load_image_file
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BackfillCandidate:
+    image_id: int
+    path: Optional[str]
+
+
+@dataclass
+class BackfillProgress:
+    """Counters of one run, with throughput and ETA."""
+
+    total: int = 0
+    embedded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    pages: int = 0
+    last_id: int = 0
+    resumed_from: int = 0
+    no_model: bool = False
+    started_at: float = field(default_factory=time.monotonic)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def processed(self) -> int:
+        return self.embedded + self.failed + self.skipped
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def images_per_second(self) -> float:
+        elapsed = self.elapsed
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        rate = self.images_per_second
+        if not rate:
+            return None
+        return max(0, self.total - self.processed) / rate
+
+    def summary(self) -> str:
+        eta = self.eta_seconds
+        eta_text = f"{eta:.0f}s" if eta is not None else "?"
+        return (
+            f"{self.processed}/{self.total} images "
+            f"({self.embedded} embedded, {self.failed} failed, "
+            f"{self.skipped} skipped) at {self.images_per_second:.1f} img/s, "
+            f"ETA {eta_text}"
+        )
+
+
+ProgressCallback = Callable[[BackfillProgress], Any]
+
+
+class EmbeddingBackfill:
+    """Embeds images missing a current-model embedding, page by page, resumably."""
+
+    def __init__(
+        self,
+        embedding_service=None,
+        vector_db=None,
+        user_id: Optional[int] = None,
+        all_modes: bool = True,
+        page_size: Optional[int] = None,
+        decode_workers: Optional[int] = None,
+        image_size: Optional[int] = None,
+        limit: Optional[int] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ):
+        self._embedding_service = embedding_service
+        self._vector_db = vector_db
+        self.user_id = user_id
+        self.all_modes = all_modes
+        self.page_size = page_size or get_limit("embedding_backfill_page_size", 64)
+        self.decode_workers = decode_workers or get_limit(
+            "embedding_backfill_workers", min(4, os.cpu_count() or 1)
+        )
+        self.image_size = image_size or get_limit("embedding_image_size", 224)
+        self.limit = limit
+        self.on_progress = on_progress
+
+    @property
+    def embedding_service(self):
+        if self._embedding_service is None:
+            from .embedding_service import get_embedding_service
+
+            self._embedding_service = get_embedding_service()
+        return self._embedding_service
+
+    @property
+    def vector_db(self):
+        if self._vector_db is None:
+            from ..core.vector_db import get_vector_db
+
+            self._vector_db = get_vector_db()
+        return self._vector_db
+
+    @property
+    def cursor_name(self) -> str:
+        """One cursor per scope, so a user-scoped run never skips other users."""
+        scope = f"user={self.user_id}" if self.user_id else "all"
+        modes = "all_modes" if self.all_modes else "artistic"
+        return f"image_embeddings:{scope}:{modes}"
+
+    # -- candidates -------------------------------------------------------
+
+    def _candidate_filter(self, query):
+        query = query.where(
+            or_(
+                Image.embedding.is_(None),
+                Image.embedding_model.is_(None),
+                Image.embedding_model != self.embedding_service.model_name,
+            ),
+            Image.processing_status == "completed",
+        )
+        if not self.all_modes:
+            query = query.where(Image.mode_used == "artistic")
+        if self.user_id:
+            query = query.join(Image.chat).where(Chat.user_id == self.user_id)
+        return query
+
+    async def count_candidates(self, after_id: int = 0) -> int:
+        query = self._candidate_filter(select(func.count(Image.id))).where(
+            Image.id > after_id
+        )
+        async with get_db_session() as session:
+            return (await session.execute(query)).scalar() or 0
+
+    async def fetch_page(self, after_id: int, size: int) -> List[BackfillCandidate]:
+        """Next ``size`` candidates with id > after_id (keyset pagination)."""
+        query = (
+            self._candidate_filter(
+                select(Image.id, Image.compressed_path, Image.original_path)
+            )
+            .where(Image.id > after_id)
+            .order_by(Image.id)
+            .limit(size)
+        )
+        async with get_db_session() as session:
+            rows = (await session.execute(query)).all()
+        return [
+            BackfillCandidate(
+                image_id=row.id, path=row.compressed_path or row.original_path
+            )
+            for row in rows
+        ]
+
+    # -- cursor -----------------------------------------------------------
+
+    async def load_cursor(self) -> int:
+        async with get_db_session() as session:
+            cursor = await session.get(BackfillCursor, self.cursor_name)
+            return cursor.last_id if cursor else 0
+
+    async def reset_cursor(self) -> None:
+        async with get_db_session() as session:
+            cursor = await session.get(BackfillCursor, self.cursor_name)
+            if cursor is not None:
+                await session.delete(cursor)
+                await session.commit()
+
+    def _cursor_upsert(self, last_id: int, embedded: int, failed: int, skipped: int):
+        stmt = insert(BackfillCursor).values(
+            name=self.cursor_name,
+            last_id=last_id,
+            embedded=embedded,
+            failed=failed,
+            skipped=skipped,
+            updated_at=datetime.utcnow(),
+        )
+        return stmt.on_conflict_do_update(
+            index_elements=[BackfillCursor.name],
+            set_={
+                "last_id": stmt.excluded.last_id,
+                "embedded": BackfillCursor.embedded + stmt.excluded.embedded,
+                "failed": BackfillCursor.failed + stmt.excluded.failed,
+                "skipped": BackfillCursor.skipped + stmt.excluded.skipped,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+
+    # -- run --------------------------------------------------------------
+
+    async def run(self, reset: bool = False) -> BackfillProgress:
+        """Embed all candidates (or ``limit``), resuming from the saved cursor."""
+        progress = BackfillProgress()
+        service = self.embedding_service
+        await service._load_model()
+        if service.is_deterministic:
+            logger.warning(
+                "Embedding backfill skipped: no embedding model loaded "
+                "(deterministic embeddings only)"
+            )
+            progress.no_model = True
+            return progress
+
+        if reset:
+            await self.reset_cursor()
+        progress.resumed_from = progress.last_id = await self.load_cursor()
+        progress.total = await self.count_candidates(progress.last_id)
+        if self.limit is not None:
+            progress.total = min(progress.total, self.limit)
+        if progress.resumed_from:
+            logger.info(
+                f"Resuming embedding backfill after image {progress.resumed_from}"
+            )
+        logger.info(f"Embedding backfill: {progress.total} candidate image(s)")
+        if not progress.total:
+            await self.reset_cursor()
+            return progress
+
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(
+            max_workers=self.decode_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+
+            def decode(page: List[BackfillCandidate]) -> asyncio.Future:
+                return asyncio.gather(
+                    *(
+                        loop.run_in_executor(
+                            pool, load_image_file, c.path, self.image_size
+                        )
+                        for c in page
+                        if c.path
+                    ),
+                    return_exceptions=True,
+                )
+
+            remaining = progress.total
+            page = await self.fetch_page(
+                progress.last_id, min(self.page_size, remaining)
+            )
+            decoding = decode(page) if page else None
+            while page:
+                remaining -= len(page)
+                next_page = []
+                if remaining > 0:
+                    next_page = await self.fetch_page(
+                        page[-1].image_id, min(self.page_size, remaining)
+                    )
+                assert decoding is not None  # started for every non-empty page
+                decoded = await decoding
+                # Decode the next page while this one is embedded and written
+                decoding = decode(next_page) if next_page else None
+                await self._process_page(page, decoded, progress)
+                page = next_page
+
+        if self.limit is None or progress.processed < self.limit:
+            await self.reset_cursor()  # reached the end
+        logger.info(f"Embedding backfill finished: {progress.summary()}")
+        return progress
+
+    async def _process_page(
+        self,
+        page: List[BackfillCandidate],
+        decoded: List[Any],
+        progress: BackfillProgress,
+    ) -> None:
+        """Embed one decoded page and commit it together with the cursor."""
+        images: List[Tuple[int, Any]] = []
+        results = iter(decoded)
+        failed = skipped = 0
+        for candidate in page:
+            image = next(results) if candidate.path else None
+            if isinstance(image, BaseException):
+                failed += 1
+                progress.errors.append(f"Image {candidate.image_id}: {image}")
+            elif image is None:
+                skipped += 1
+                logger.warning(f"No accessible file for image {candidate.image_id}")
+            else:
+                images.append((candidate.image_id, image))
+
+        service = self.embedding_service
+        embeddings = (
+            await service.generate_embeddings_batch([image for _, image in images])
+            if images
+            else []
+        )
+        stored: List[Tuple[int, bytes]] = []
+        for (image_id, _), embedding in zip(images, embeddings):
+            if embedding is None:
+                failed += 1
+                progress.errors.append(f"Image {image_id}: embedding failed")
+            else:
+                stored.append((image_id, embedding))
+
+        last_id = page[-1].image_id
+        async with get_db_session() as session:
+            if stored:
+                await session.execute(
+                    update(Image),
+                    [
+                        {
+                            "id": image_id,
+                            "embedding": embedding,
+                            "embedding_model": service.model_name,
+                        }
+                        for image_id, embedding in stored
+                    ],
+                )
+            await session.execute(
+                self._cursor_upsert(last_id, len(stored), failed, skipped)
+            )
+            await session.commit()
+
+        if stored:
+            await self.vector_db.store_embeddings(stored)
+
+        progress.embedded += len(stored)
+        progress.failed += failed
+        progress.skipped += skipped
+        progress.pages += 1
+        progress.last_id = last_id
+        logger.info(f"Embedding backfill: {progress.summary()}")
+        if self.on_progress is not None:
+            self.on_progress(progress)
@@ -0,0 +1,468 @@
+"""
+Embedding Runtime - CPU inference for the CLIP embedding model.
+
+The model is loaded once, in a dedicated worker process, so encoding never
+holds the bot's GIL or event loop. EmbeddingRuntime batches requests:
+concurrent embed_image()/embed_text() calls that arrive within
+``max_wait`` seconds of each other (or while the previous batch is still
+running) are encoded together in one forward pass of up to
+``max_batch_size`` items.
+
+Images are sent as raw bytes and decoded, converted to RGB and downscaled
+to ``image_size`` inside the worker (decode_image). Embeddings come back
+L2-normalized as float32 arrays; one that fails (e.g. undecodable image)
+comes back as None without failing the rest of its batch.
+
+Quantization (``EmbeddingRuntimeConfig.quantization``):
+- "int8": dynamic int8 quantization of the model's Linear layers
+  (torch.quantization.quantize_dynamic), smaller and faster on CPU
+- "onnx": the sentence-transformers ONNX backend; models it cannot export
+  fall back to the regular PyTorch model with a warning
+
+The "hash" backend returns deterministic pseudo-embeddings without any ML
+dependency; benchmarks and tests use it to exercise the batching and worker
+process machinery.
+"""
+
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Union
+
+import numpy as np
+
+from ..core.config import get_limit, get_model, get_timeout
+from ..utils.lazy_import import lazy_module
+
+Image = lazy_module("PIL.Image")
+
+logger = logging.getLogger(__name__)
+
+KIND_IMAGE = "image"
+KIND_TEXT = "text"
+
+QUANTIZATION_MODES = (None, "int8", "onnx")
+
+ImageData = Union[bytes, bytearray, memoryview]
+
+
+@dataclass(frozen=True)
+class EmbeddingRuntimeConfig:
+    """What the worker loads. Must stay picklable (sent to the worker)."""
+
+    model_name: str = "clip-ViT-B-32"
+    backend: str = "sentence-transformers"  # or "hash"
+    quantization: Optional[str] = None  # None, "int8" or "onnx"
+    image_size: int = 224
+    torch_threads: Optional[int] = None
+    hash_dimension: int = 512
+
+
+def decode_image(data: ImageData, size: int) -> Any:
+    """Decode image bytes to an RGB PIL image no larger than ``size`` px."""
+    image = Image.open(BytesIO(data))
+    image.draft("RGB", (size, size))  # cheap JPEG downscale while decoding
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    image.thumbnail((size, size))
+    return image
+
+
+def load_image_file(path: str, size: int) -> Optional[Any]:
+    """Read and decode_image() a file; None if it does not exist.
+
+    Module-level so it can run in a process pool (see embedding_backfill).
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    image = decode_image(data, size)
+    image.load()
+    return image
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class EmbeddingBackend(Protocol):
+    """A loaded model: encodes batches to L2-normalized float32 rows."""
+
+    dimension: int
+
+    def encode_images(self, images: List[Any]) -> np.ndarray: ...
+
+    def encode_texts(self, texts: List[str]) -> np.ndarray: ...
+
+
+class HashBackend:
+    """Deterministic stand-in: vectors seeded from a hash of the input."""
+
+    def __init__(self, config: EmbeddingRuntimeConfig):
+        self.config = config
+        self.dimension = config.hash_dimension
+
+    def _vector(self, payload: bytes) -> np.ndarray:
+        seed = int.from_bytes(hashlib.sha256(payload).digest()[:8], "little")
+        return np.random.default_rng(seed).standard_normal(self.dimension)
+
+    def encode_images(self, images: List[Any]) -> np.ndarray:
+        return _normalize(np.stack([self._vector(image.tobytes()) for image in images]))
+
+    def encode_texts(self, texts: List[str]) -> np.ndarray:
+        return _normalize(np.stack([self._vector(text.encode()) for text in texts]))
+
+
+class SentenceTransformerBackend:
+    """CLIP (or any sentence-transformers model) on CPU."""
+
+    def __init__(self, config: EmbeddingRuntimeConfig):
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        self.config = config
+        if config.torch_threads:
+            torch.set_num_threads(config.torch_threads)
+
+        model = None
+        if config.quantization == "onnx":
+            try:
+                model = SentenceTransformer(
+                    config.model_name, device="cpu", backend="onnx"
+                )
+            except Exception as e:
+                logger.warning(
+                    f"ONNX backend unavailable for {config.model_name} ({e}), "
+                    f"using the PyTorch model"
+                )
+        if model is None:
+            model = SentenceTransformer(config.model_name, device="cpu")
+            if config.quantization == "int8":
+                model = torch.quantization.quantize_dynamic(
+                    model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+        model.eval()
+        self.model = model
+        self._torch = torch
+        self.dimension = self._probe_dimension()
+
+    def _probe_dimension(self) -> int:
+        dimension = self.model.get_sentence_embedding_dimension()
+        if dimension:
+            return dimension
+        return int(self.encode_texts(["dimension probe"]).shape[1])
+
+    def _encode(self, items: List[Any]) -> np.ndarray:
+        with self._torch.inference_mode():
+            vectors = self.model.encode(
+                items,
+                batch_size=len(items),
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+        return np.asarray(vectors, dtype=np.float32)
+
+    def encode_images(self, images: List[Any]) -> np.ndarray:
+        return self._encode(images)
+
+    def encode_texts(self, texts: List[str]) -> np.ndarray:
+        return self._encode(texts)
+
+
+def load_backend(config: EmbeddingRuntimeConfig) -> EmbeddingBackend:
+    """Instantiate the backend named in ``config``."""
+    if config.backend == "hash":
+        return HashBackend(config)
+    if config.backend == "sentence-transformers":
+        return SentenceTransformerBackend(config)
+    raise ValueError(f"Unknown embedding backend: {config.backend}")
+
+
+def encode_batch(
+    backend: EmbeddingBackend,
+    config: EmbeddingRuntimeConfig,
+    kind: str,
+    items: Sequence[Any],
+) -> List[Optional[np.ndarray]]:
+    """Encode one batch; items that cannot be decoded come back as None."""
+    results: List[Optional[np.ndarray]] = [None] * len(items)
+    if kind == KIND_IMAGE:
+        inputs, positions = [], []
+        for i, item in enumerate(items):
+            try:
+                # Raw bytes are decoded here; pre-decoded PIL images pass through
+                image = (
+                    decode_image(item, config.image_size)
+                    if isinstance(item, (bytes, bytearray, memoryview))
+                    else item
+                )
+            except Exception as e:
+                logger.warning(f"Skipping undecodable image in batch: {e}")
+                continue
+            inputs.append(image)
+            positions.append(i)
+        if not inputs:
+            return results
+        vectors = backend.encode_images(inputs)
+    elif kind == KIND_TEXT:
+        positions = list(range(len(items)))
+        vectors = backend.encode_texts(list(items))
+    else:
+        raise ValueError(f"Unknown embedding kind: {kind}")
+
+    for position, vector in zip(positions, vectors):
+        results[position] = vector
+    return results
+
+
+# -- Worker process -------------------------------------------------------
+
+_worker_backend: Optional[EmbeddingBackend] = None
+_worker_config: Optional[EmbeddingRuntimeConfig] = None
+
+
+def _init_worker(config: EmbeddingRuntimeConfig) -> None:
+    global _worker_backend, _worker_config
+    _worker_config = config
+    _worker_backend = load_backend(config)
+
+
+def _worker_dimension() -> int:
+    assert _worker_backend is not None, "embedding worker not initialized"
+    return _worker_backend.dimension
+
+
+def _worker_encode(kind: str, items: Sequence[Any]) -> List[Optional[np.ndarray]]:
+    assert (
+        _worker_backend is not None and _worker_config is not None
+    ), "embedding worker not initialized"
+    return encode_batch(_worker_backend, _worker_config, kind, items)
+
+
+# -- Batching -------------------------------------------------------------
+
+
+@dataclass
+class _Request:
+    item: Any
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class EmbeddingRuntime:
+    """Loads the model in a worker and batches concurrent requests into it."""
+
+    def __init__(
+        self,
+        config: Optional[EmbeddingRuntimeConfig] = None,
+        max_batch_size: int = 16,
+        max_wait: float = 0.01,
+        use_process: bool = True,
+    ):
+        self.config = config or EmbeddingRuntimeConfig()
+        if self.config.quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization: {self.config.quantization}")
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self.use_process = use_process
+        self.dimension: Optional[int] = None
+
+        self._executor: Optional[Executor] = None
+        self._local_backend: Optional[EmbeddingBackend] = None
+        self._pending: Dict[str, List[_Request]] = {KIND_IMAGE: [], KIND_TEXT: []}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+
+        # Counters for observability
+        self.batch_count = 0
+        self.item_count = 0
+        self.failed_count = 0
+
+    # -- lifecycle --------------------------------------------------------
+
+    @property
+    def started(self) -> bool:
+        return self.dimension is not None
+
+    async def start(self) -> None:
+        """Load the model (once) in the worker. Raises if loading fails."""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self.started:
+                return
+            loop = asyncio.get_running_loop()
+            if self.use_process:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=1,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.config,),
+                )
+                try:
+                    dimension = await loop.run_in_executor(
+                        self._executor, _worker_dimension
+                    )
+                except BaseException:
+                    self._executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = None
+                    raise
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="embedding"
+                )
+                backend = await loop.run_in_executor(
+                    self._executor, load_backend, self.config
+                )
+                self._local_backend = backend
+                dimension = backend.dimension
+            self.dimension = dimension
+            logger.info(
+                f"Embedding runtime ready: {self.config.model_name} "
+                f"(backend={self.config.backend}, "
+                f"quantization={self.config.quantization or 'none'}, "
+                f"dim={dimension}, {'process' if self.use_process else 'thread'})"
+            )
+
+    async def close(self) -> None:
+        """Fail pending requests and shut the worker down."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for queue in self._pending.values():
+            for request in queue:
+                if not request.future.done():
+                    request.future.cancel()
+            queue.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self.dimension = None
+
+    # -- requests ---------------------------------------------------------
+
+    async def embed_image(self, data: ImageData) -> Optional[np.ndarray]:
+        """Normalized embedding of one image (None if it cannot be decoded)."""
+        return (await self._submit(KIND_IMAGE, [data]))[0]
+
+    async def embed_images(self, images: Sequence[Any]) -> List[Optional[np.ndarray]]:
+        return await self._submit(KIND_IMAGE, images)
+
+    async def embed_text(self, text: str) -> Optional[np.ndarray]:
+        return (await self._submit(KIND_TEXT, [text]))[0]
+
+    async def embed_texts(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        return await self._submit(KIND_TEXT, texts)
+
+    @property
+    def pending_count(self) -> int:
+        return sum(len(queue) for queue in self._pending.values())
+
+    async def _submit(self, kind: str, items: Sequence[Any]) -> List[Any]:
+        if not items:
+            return []
+        await self.start()
+        loop = asyncio.get_running_loop()
+        requests = [_Request(item, loop.create_future()) for item in items]
+        self._pending[kind].extend(requests)
+        self._ensure_running()
+        assert self._wakeup is not None
+        self._wakeup.set()
+        return list(await asyncio.gather(*(r.future for r in requests)))
+
+    # -- batch loop -------------------------------------------------------
+
+    def _ensure_running(self) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="embedding_batcher")
+
+    def _oldest_kind(self) -> Optional[str]:
+        queued = [(q[0].enqueued_at, kind) for kind, q in self._pending.items() if q]
+        return min(queued)[1] if queued else None
+
+    async def _run(self) -> None:
+        """Encode when a batch is full or its oldest request has waited long enough."""
+        assert self._wakeup is not None
+        while True:
+            kind = self._oldest_kind()
+            if kind is None:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            queue = self._pending[kind]
+            remaining = self.max_wait - (time.monotonic() - queue[0].enqueued_at)
+            if remaining > 0 and len(queue) < self.max_batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            batch = queue[: self.max_batch_size]
+            del queue[: self.max_batch_size]
+            await self._encode(kind, batch)
+
+    async def _encode(self, kind: str, batch: List[_Request]) -> None:
+        live = [request for request in batch if not request.future.done()]
+        if not live:
+            return
+        loop = asyncio.get_running_loop()
+        items = [request.item for request in live]
+        try:
+            if self.use_process:
+                vectors = await loop.run_in_executor(
+                    self._executor, _worker_encode, kind, items
+                )
+            else:
+                assert self._local_backend is not None  # set by start()
+                vectors = await loop.run_in_executor(
+                    self._executor,
+                    encode_batch,
+                    self._local_backend,
+                    self.config,
+                    kind,
+                    items,
+                )
+        except Exception as e:
+            logger.error(f"Embedding batch of {len(items)} {kind}(s) failed: {e}")
+            self.failed_count += len(items)
+            vectors = [None] * len(items)
+
+        self.batch_count += 1
+        self.item_count += len(items)
+        for request, vector in zip(live, vectors):
+            if not request.future.done():
+                request.future.set_result(vector)
+
+
+def create_embedding_runtime(model_name: str) -> EmbeddingRuntime:
+    """Runtime for ``model_name`` configured from defaults.yaml."""
+    config = EmbeddingRuntimeConfig(
+        model_name=model_name,
+        backend=get_model("embedding_backend", "sentence-transformers"),
+        quantization=get_model("embedding_quantization", "") or None,
+        image_size=get_limit("embedding_image_size", 224),
+        torch_threads=get_limit("embedding_torch_threads", 0) or None,
+    )
+    return EmbeddingRuntime(
+        config,
+        max_batch_size=get_limit("embedding_batch_size", 16),
+        max_wait=get_timeout("embedding_batch_wait", 0.01),
+    )
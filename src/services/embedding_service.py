@@ -3,27 +3,29 @@ import logging
 import os
 import struct
 from io import BytesIO
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional, Sequence, Union
 
 import numpy as np
-from PIL import Image
 
-# Optional imports for ML dependencies
-try:
-    import torch
-
-    TORCH_AVAILABLE = True
-except ImportError:
-    TORCH_AVAILABLE = False
-    torch = None
-
-try:
-    from sentence_transformers import SentenceTransformer
-
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
-    SentenceTransformer = None
+from ..core.config import get_model
+from ..domain.errors import EmbeddingFailure
+from ..utils.lazy_import import is_available, lazy_attribute, lazy_module
+from ..utils.vector_search import pack_embedding
+from .embedding_runtime import EmbeddingRuntime, create_embedding_runtime
+
+if TYPE_CHECKING:
+    import PIL.Image
+
+# Optional ML dependencies: checked without importing, imported on first use
+TORCH_AVAILABLE = is_available("torch")
+SENTENCE_TRANSFORMERS_AVAILABLE = is_available("sentence_transformers")
+torch = lazy_module("torch") if TORCH_AVAILABLE else None
+SentenceTransformer = (
+    lazy_attribute("sentence_transformers", "SentenceTransformer")
+    if SENTENCE_TRANSFORMERS_AVAILABLE
+    else None
+)
+Image = lazy_module("PIL.Image")
 
 logger = logging.getLogger(__name__)
 
@@ -31,9 +33,10 @@ logger = logging.getLogger(__name__)
 class EmbeddingService:
     """Service for generating image embeddings using CLIP model"""
 
-    def __init__(self):
+    def __init__(self, runtime: Optional[EmbeddingRuntime] = None):
         self.model_name = os.getenv("EMBEDDING_MODEL", "clip-ViT-B-32")
         self.model = None
+        self.runtime = runtime
         self.device = (
             "cuda" if (TORCH_AVAILABLE and torch.cuda.is_available()) else "cpu"
         )
@@ -66,6 +69,11 @@ class EmbeddingService:
         """Generate embedding for text input"""
         try:
             await self._load_model()
+            if isinstance(self.model, EmbeddingRuntime):
+                vector = await self.model.embed_text(text)
+                if vector is None:
+                    return [0.0] * self.embedding_dim
+                return vector.tolist()
             if self.model and hasattr(self.model, "encode"):
                 # Use sentence transformer if available
                 embedding = self.model.encode(text, convert_to_numpy=True)
@@ -87,21 +95,79 @@ class EmbeddingService:
             # Return zero vector as fallback
             return [0.0] * self.embedding_dim
 
+    async def generate_text_embeddings_batch(
+        self, texts: List[str]
+    ) -> List[Optional[bytes]]:
+        """Generate packed float32 text embeddings with one model call.
+
+        Raises:
+            EmbeddingFailure: The model call failed.
+        """
+        if not texts:
+            return []
+        try:
+            await self._load_model()
+            if isinstance(self.model, EmbeddingRuntime):
+                vectors = await self.model.embed_texts(texts)
+                return [
+                    self._array_to_bytes(v) if v is not None else None for v in vectors
+                ]
+            if self.model and hasattr(self.model, "encode"):
+                vectors = await asyncio.to_thread(
+                    self.model.encode, texts, convert_to_numpy=True
+                )
+                return [self._array_to_bytes(np.asarray(v)) for v in vectors]
+        except Exception as e:
+            logger.error(f"Error generating batch text embeddings: {e}")
+            raise EmbeddingFailure(str(e)) from e
+
+        # Deterministic fallback, one text at a time
+        return [
+            self._array_to_bytes(np.asarray(await self.generate_text_embedding(text)))
+            for text in texts
+        ]
+
     async def _load_model(self):
-        """Load the embedding model lazily"""
-        if self.model is None:
+        """Load the embedding model lazily.
+
+        With torch and sentence-transformers installed the model is started in
+        the embedding runtime's worker process; without them, or if it fails
+        to load, embeddings are deterministic hashes.
+        """
+        if self.model is not None:
+            return
+
+        if (
+            self.runtime is None
+            and not self._deterministic_mode
+            and get_model("embedding_backend", "sentence-transformers")
+            != "deterministic"
+        ):
+            self.runtime = create_embedding_runtime(self.model_name)
+
+        if self.runtime is not None:
             try:
                 logger.info(f"Attempting to load embedding model: {self.model_name}")
-
-                # For now, skip actual model loading and use deterministic embeddings
-                # This allows the similarity search to work while we debug model issues
-                logger.warning("Using deterministic embeddings instead of actual model")
-                self.model = "deterministic"  # Placeholder to indicate "loaded"
-
+                await self.runtime.start()
+                self.model = self.runtime
+                self.embedding_dim = self.runtime.dimension
+                self._deterministic_mode = self.runtime.config.backend == "hash"
+                return
             except Exception as e:
                 logger.error(f"Failed to load embedding model: {e}")
-                self.model = None
-                raise Exception(f"Embedding model loading failed: {e}")
+                await self.runtime.close()
+                self.runtime = None
+
+        logger.warning("Using deterministic embeddings instead of actual model")
+        self._deterministic_mode = True
+        self.model = "deterministic"  # Placeholder to indicate "loaded"
+
+    async def close(self) -> None:
+        """Shut down the embedding runtime's worker process, if started."""
+        if self.runtime is not None:
+            await self.runtime.close()
+        if self.model is self.runtime:
+            self.model = None
 
     async def generate_embedding(self, image_data: bytes) -> Optional[bytes]:
         """Generate embedding for image data"""
@@ -112,6 +178,14 @@ class EmbeddingService:
                 logger.error("Embedding model not loaded, cannot generate embedding")
                 return None
 
+            if isinstance(self.model, EmbeddingRuntime):
+                # Decoded and resized in the worker, batched with concurrent calls
+                vector = await self.model.embed_image(image_data)
+                if vector is None:
+                    logger.error("Error processing image data: could not decode")
+                    return None
+                return self._array_to_bytes(vector)
+
             # Convert bytes to PIL Image
             try:
                 image = Image.open(BytesIO(image_data))
@@ -180,19 +254,33 @@ class EmbeddingService:
             return None
 
     async def generate_embeddings_batch(
-        self, image_data_list: List[bytes]
+        self, image_data_list: Sequence[Union[bytes, "PIL.Image.Image"]]
     ) -> List[Optional[bytes]]:
-        """Generate embeddings for multiple images efficiently"""
+        """Generate embeddings for multiple images efficiently.
+
+        Accepts raw image bytes or already decoded PIL images (the backfill
+        decodes in a process pool).
+        """
         try:
             await self._load_model()
 
+            if isinstance(self.model, EmbeddingRuntime):
+                vectors = await self.model.embed_images(image_data_list)
+                return [
+                    self._array_to_bytes(v) if v is not None else None for v in vectors
+                ]
+
             # Convert all image data to PIL Images
             images = []
             valid_indices = []
 
             for i, image_data in enumerate(image_data_list):
                 try:
-                    image = Image.open(BytesIO(image_data))
+                    image = (
+                        Image.open(BytesIO(image_data))
+                        if isinstance(image_data, (bytes, bytearray, memoryview))
+                        else image_data
+                    )
                     if image.mode != "RGB":
                         image = image.convert("RGB")
                     images.append(image)
@@ -211,7 +299,7 @@ class EmbeddingService:
             embeddings_array = await asyncio.to_thread(encode_batch)
 
             # Convert to bytes and fill result array
-            results = [None] * len(image_data_list)
+            results: List[Optional[bytes]] = [None] * len(image_data_list)
 
             for i, embedding in enumerate(embeddings_array):
                 original_index = valid_indices[i]
@@ -231,15 +319,8 @@ class EmbeddingService:
 
     def _array_to_bytes(self, array: np.ndarray) -> bytes:
         """Convert numpy array to bytes for database storage"""
-        # Ensure array is float32 for consistency
-        if array.dtype != np.float32:
-            array = array.astype(np.float32)
-
-        # Pack dimension info + array data
         # Format: [dimension: uint32][data: float32 array]
-        dimension = len(array)
-        packed = struct.pack("I", dimension) + array.tobytes()
-        return packed
+        return pack_embedding(array)
 
     def bytes_to_array(self, embedding_bytes: bytes) -> Optional[np.ndarray]:
         """Convert bytes back to numpy array.
@@ -332,6 +413,9 @@ class EmbeddingService:
             "embedding_dimension": self.embedding_dim,
             "device": self.device,
             "loaded": self.model is not None,
+            "quantization": (
+                self.runtime.config.quantization if self.runtime else None
+            ),
         }
 
 
@@ -345,3 +429,9 @@ def get_embedding_service() -> EmbeddingService:
     if _embedding_service is None:
         _embedding_service = EmbeddingService()
     return _embedding_service
+
+
+async def close_embedding_service() -> None:
+    """Stop the global service's embedding worker (no-op if never created)."""
+    if _embedding_service is not None:
+        await _embedding_service.close()
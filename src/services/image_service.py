@@ -5,9 +5,8 @@ from io import BytesIO
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple
 
-from PIL import Image
-
 from ..core.vector_db import get_vector_db
+from ..utils.lazy_import import lazy_module
 from ..utils.logging import (
     ImageProcessingLogContext,
     get_image_logger,
@@ -17,6 +16,8 @@ from ..utils.logging import (
 from .embedding_service import get_embedding_service
 from .llm_service import get_llm_service
 
+Image = lazy_module("PIL.Image")
+
 logger = logging.getLogger(__name__)
 image_logger = get_image_logger("image_service")
 
@@ -262,6 +263,13 @@ class ImageService:
 
                 # Step 6: Add processing metadata
                 processing_time = time.time() - start_time
+                # Hash embeddings record no model, so the backfill redoes them
+                embedding_model = (
+                    getattr(self.embedding_service, "model_name", None)
+                    if embedding_bytes
+                    and not getattr(self.embedding_service, "is_deterministic", True)
+                    else None
+                )
                 analysis.update(
                     {
                         "processing_time": processing_time,
@@ -273,6 +281,7 @@ class ImageService:
                         "telegram_file_info": file_info,
                         "embedding_generated": embedding_bytes is not None,
                         "embedding_bytes": embedding_bytes,  # Include for similarity search
+                        "embedding_model": embedding_model,
                     }
                 )
 
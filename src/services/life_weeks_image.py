@@ -5,13 +5,23 @@ Generates 'Life in Weeks' grid visualization showing weeks lived since birth.
 Inspired by Tim Urban's "Your Life in Weeks" from Wait But Why.
 """
 
+from __future__ import annotations
+
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Tuple, Union
+from typing import TYPE_CHECKING, Tuple, Union
+
+from ..utils.lazy_import import lazy_module
 
-from PIL import Image, ImageDraw, ImageFont
-from PIL.ImageFont import FreeTypeFont
+if TYPE_CHECKING:
+    import PIL.ImageDraw
+    import PIL.ImageFont
+    from PIL.ImageFont import FreeTypeFont
+
+Image = lazy_module("PIL.Image")
+ImageDraw = lazy_module("PIL.ImageDraw")
+ImageFont = lazy_module("PIL.ImageFont")
 
 logger = logging.getLogger(__name__)
 
@@ -64,7 +74,9 @@ def _calculate_grid_dimensions() -> Tuple[int, int]:
     return grid_width, grid_height
 
 
-def _draw_grid_lines(draw: ImageDraw.ImageDraw, x_offset: int, y_offset: int) -> None:
+def _draw_grid_lines(
+    draw: PIL.ImageDraw.ImageDraw, x_offset: int, y_offset: int
+) -> None:
     """Draw grid lines for visual separation."""
     # Vertical lines (every 4 weeks = 1 month approx)
     for col in range(0, WEEKS_PER_YEAR + 1, 4):
@@ -82,7 +94,7 @@ def _draw_grid_lines(draw: ImageDraw.ImageDraw, x_offset: int, y_offset: int) ->
 
 
 def _draw_cells(
-    draw: ImageDraw.ImageDraw, x_offset: int, y_offset: int, weeks_lived: int
+    draw: PIL.ImageDraw.ImageDraw, x_offset: int, y_offset: int, weeks_lived: int
 ) -> None:
     """Draw filled and empty cells representing weeks."""
     total_cells = WEEKS_PER_YEAR * MAX_YEARS
@@ -104,7 +116,7 @@ def _draw_cells(
 
 
 def _draw_text_overlay(
-    draw: ImageDraw.ImageDraw,
+    draw: PIL.ImageDraw.ImageDraw,
     image_width: int,
     image_height: int,
     weeks_lived: int,
@@ -121,9 +133,9 @@ def _draw_text_overlay(
     age_years = (datetime.now() - dob).days / 365.25
 
     # Try to load a nice font, fall back to default
-    font_large: Union[FreeTypeFont, ImageFont.ImageFont]
-    font_medium: Union[FreeTypeFont, ImageFont.ImageFont]
-    font_small: Union[FreeTypeFont, ImageFont.ImageFont]
+    font_large: Union[FreeTypeFont, PIL.ImageFont.ImageFont]
+    font_medium: Union[FreeTypeFont, PIL.ImageFont.ImageFont]
+    font_small: Union[FreeTypeFont, PIL.ImageFont.ImageFont]
 
     try:
         font_large = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 48)
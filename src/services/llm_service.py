@@ -5,12 +5,14 @@ import os
 from io import BytesIO
 from typing import Any, Dict, Optional, Tuple
 
-import litellm
-from PIL import Image
-
 from ..core.mode_manager import ModeManager
+from ..utils.lazy_import import lazy_module
 from ..utils.retry import async_retry
 
+# Imported on first LLM call: litellm alone takes seconds to import
+litellm = lazy_module("litellm")
+Image = lazy_module("PIL.Image")
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,8 +23,9 @@ class LLMService:
         self.model = os.getenv("LLM_MODEL", "gpt-4o-mini")
         self.mode_manager = ModeManager()
 
-        # Set LiteLLM configuration
-        litellm.set_verbose = os.getenv("LLM_VERBOSE", "false").lower() == "true"
+        # Set LiteLLM configuration (off by default; setting it imports litellm)
+        if os.getenv("LLM_VERBOSE", "false").lower() == "true":
+            litellm.set_verbose = True
 
         # Configure API keys from environment
         self._setup_api_keys()
@@ -3,17 +3,29 @@ Message Persistence Service
 
 Lightweight fire-and-forget persistence of incoming messages to the messages table.
 All errors are caught and logged -- persistence failures must never crash message handling.
+
+Two entry points:
+- persist_message(): one session + one INSERT per call (used directly and by tests).
+- MessagePersistenceWriter: write-behind queue used by the message router. Messages
+  are buffered in memory and flushed as a single multi-row INSERT every
+  ``flush_interval`` seconds or ``max_batch_size`` rows, so a burst of forwarded
+  messages becomes one short write transaction instead of N competing writers.
 """
 
+import asyncio
 import logging
+import time
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 
 from ..core.database import get_db_session
 from ..models.chat import Chat
 from ..models.message import Message
+from ..utils.lru_cache import LRUCache
+from ..utils.task_tracker import create_tracked_task
 
 logger = logging.getLogger(__name__)
 
@@ -107,3 +119,284 @@ async def persist_message(
         logger.warning(
             f"Failed to persist message {message_id} for chat {telegram_chat_id}: {e}"
         )
+
+
+@dataclass
+class PendingMessage:
+    """An incoming message waiting to be written by MessagePersistenceWriter."""
+
+    telegram_chat_id: int
+    from_user_id: Optional[int]
+    message_id: int
+    text: Optional[str]
+    message_type: str
+    timestamp: Optional[datetime] = None
+
+
+class MessagePersistenceWriter:
+    """
+    Write-behind batching writer for incoming messages.
+
+    enqueue() is synchronous and never touches the database; a single
+    background task drains the queue in batches. Telegram chat IDs are
+    resolved to internal Chat.id values through a small LRU cache, so a
+    steady stream of messages from the same chat costs no lookups at all.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 0.25,
+        max_batch_size: int = 50,
+        max_queue_size: int = 5000,
+        chat_cache_size: int = 1000,
+    ):
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.max_queue_size = max_queue_size
+
+        self._queue: List[PendingMessage] = []
+        self._oldest_enqueued_at: float = 0.0
+        self._chat_ids: LRUCache[int, int] = LRUCache(max_size=chat_cache_size)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        # Counters for observability
+        self.persisted_count = 0
+        self.dropped_count = 0
+        self.failed_count = 0
+        self.batch_count = 0
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def enqueue(
+        self,
+        telegram_chat_id: int,
+        from_user_id: Optional[int],
+        message_id: int,
+        text: Optional[str],
+        message_type: str,
+        timestamp: Optional[datetime] = None,
+    ) -> bool:
+        """Queue a message for persistence. Returns False if it was dropped.
+
+        Must be called from within a running event loop (the flush task is
+        started lazily on first use).
+        """
+        if self._stopping:
+            logger.debug(
+                f"Writer stopping, not persisting message {message_id} "
+                f"for chat {telegram_chat_id}"
+            )
+            self.dropped_count += 1
+            return False
+
+        if len(self._queue) >= self.max_queue_size:
+            self.dropped_count += 1
+            logger.warning(
+                f"Message persistence queue full ({self.max_queue_size}), "
+                f"dropping message {message_id} for chat {telegram_chat_id}"
+            )
+            return False
+
+        was_empty = not self._queue
+        if was_empty:
+            self._oldest_enqueued_at = time.monotonic()
+        self._queue.append(
+            PendingMessage(
+                telegram_chat_id=telegram_chat_id,
+                from_user_id=from_user_id,
+                message_id=message_id,
+                text=text,
+                message_type=message_type,
+                timestamp=timestamp,
+            )
+        )
+
+        self._ensure_started()
+        if was_empty or len(self._queue) >= self.max_batch_size:
+            assert self._wakeup is not None  # created by _ensure_started
+            self._wakeup.set()
+        return True
+
+    @property
+    def pending_count(self) -> int:
+        """Number of messages waiting to be written."""
+        return len(self._queue)
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+
+    def _ensure_started(self) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        if self._task is None or self._task.done():
+            self._task = create_tracked_task(
+                self._run(), name="message_persistence_writer"
+            )
+
+    async def _run(self) -> None:
+        """Background loop: flush when the batch is full or the oldest row is due."""
+        assert self._wakeup is not None
+        try:
+            while True:
+                if not self._queue:
+                    await self._wakeup.wait()
+                    self._wakeup.clear()
+                    continue
+
+                age = time.monotonic() - self._oldest_enqueued_at
+                remaining = self.flush_interval - age
+                if remaining > 0 and len(self._queue) < self.max_batch_size:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        pass
+                    self._wakeup.clear()
+                    continue
+
+                await self._flush_batch()
+        except asyncio.CancelledError:
+            logger.debug("Message persistence writer loop cancelled")
+
+    async def _flush_batch(self) -> int:
+        """Write up to max_batch_size queued messages. Returns rows taken."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            batch = self._queue[: self.max_batch_size]
+            if not batch:
+                return 0
+            del self._queue[: len(batch)]
+            if self._queue:
+                # Remaining rows were queued after the batch we just took
+                self._oldest_enqueued_at = time.monotonic()
+            await self._write_batch(batch)
+            return len(batch)
+
+    async def flush(self) -> None:
+        """Write everything currently queued, one batch per transaction."""
+        while self._queue:
+            await self._flush_batch()
+
+    async def _resolve_chat_ids(
+        self, session: Any, telegram_chat_ids: Iterable[int]
+    ) -> Dict[int, int]:
+        """Map Telegram chat IDs to internal Chat.id, using the cache first."""
+        resolved: Dict[int, int] = {}
+        missing = []
+        for tg_id in set(telegram_chat_ids):
+            cached = self._chat_ids.get(tg_id)
+            if cached is not None:
+                resolved[tg_id] = cached
+            else:
+                missing.append(tg_id)
+
+        if missing:
+            result = await session.execute(
+                select(Chat.chat_id, Chat.id).where(Chat.chat_id.in_(missing))
+            )
+            for tg_id, internal_id in result.all():
+                self._chat_ids.set(tg_id, internal_id)
+                resolved[tg_id] = internal_id
+
+        return resolved
+
+    async def _write_batch(self, batch: List[PendingMessage]) -> None:
+        """Insert a batch of messages in one transaction. Never raises."""
+        try:
+            async with get_db_session() as session:
+                chat_ids = await self._resolve_chat_ids(
+                    session, (m.telegram_chat_id for m in batch)
+                )
+
+                rows = [
+                    {
+                        "chat_id": chat_ids[m.telegram_chat_id],
+                        "message_id": m.message_id,
+                        "from_user_id": m.from_user_id,
+                        "message_type": m.message_type,
+                        "text": m.text,
+                        "is_bot_message": False,
+                    }
+                    for m in batch
+                    if m.telegram_chat_id in chat_ids
+                ]
+
+                skipped = len(batch) - len(rows)
+                if skipped:
+                    logger.debug(
+                        f"Skipped {skipped} message(s) for chats not found in DB"
+                    )
+                if not rows:
+                    return
+
+                await session.execute(insert(Message), rows)
+                await session.commit()
+
+            self.persisted_count += len(rows)
+            self.batch_count += 1
+            logger.debug(f"Persisted batch of {len(rows)} message(s)")
+
+        except Exception as e:
+            # Fire-and-forget: log and swallow all errors
+            self.failed_count += len(batch)
+            logger.warning(f"Failed to persist batch of {len(batch)} message(s): {e}")
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Stop accepting messages and drain the queue within ``timeout`` seconds.
+
+        Anything still queued when the deadline passes is dropped and logged.
+        """
+        self._stopping = True
+
+        if self._task is not None and not self._task.done():
+            # Cancel only between batches so an in-flight write is never lost
+            if self._flush_lock is not None:
+                async with self._flush_lock:
+                    self._task.cancel()
+            else:
+                self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+        try:
+            await asyncio.wait_for(self.flush(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+        if self._queue:
+            self.dropped_count += len(self._queue)
+            logger.warning(
+                f"Message persistence drain timed out after {timeout}s, "
+                f"dropping {len(self._queue)} queued message(s)"
+            )
+            self._queue.clear()
+
+    def get_stats(self) -> dict:
+        """Get writer statistics."""
+        return {
+            "pending": len(self._queue),
+            "persisted": self.persisted_count,
+            "batches": self.batch_count,
+            "dropped": self.dropped_count,
+            "failed": self.failed_count,
+            "cached_chats": len(self._chat_ids),
+        }
+
+
+def get_message_persistence_writer() -> MessagePersistenceWriter:
+    """Get the global message persistence writer (delegates to DI container)."""
+    from ..core.services import Services, get_service
+
+    return get_service(Services.MESSAGE_PERSISTENCE)
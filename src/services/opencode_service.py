@@ -4,15 +4,17 @@ Mirrors the interface of ``claude_code_service.py`` but delegates execution
 to the OpenCode CLI via ``opencode_subprocess.py``.
 """
 
+import asyncio
 import logging
 import shutil
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from src.core.config import get_settings
 
-from .opencode_subprocess import run_opencode_subprocess
+from .opencode_subprocess import run_opencode_subprocess, stream_opencode_subprocess
+from .streaming_subprocess import StreamOutput
 
 logger = logging.getLogger(__name__)
 
@@ -109,13 +111,7 @@ class OpenCodeService:
         Returns:
             The response text from OpenCode, or an error message string.
         """
-        # Resolve model from settings if not provided
-        if model is None:
-            try:
-                settings = get_settings()
-                model = settings.opencode_model
-            except Exception:
-                model = "anthropic:claude-sonnet-4-20250514"
+        model = self._resolve_model(model)
 
         # Get existing session for this chat
         session_id = self._sessions.get(chat_id)
@@ -125,8 +121,9 @@ class OpenCodeService:
             f"model={model}, session={session_id or 'new'}"
         )
 
-        # Run the subprocess (blocking call wrapped for async compatibility)
-        result = run_opencode_subprocess(
+        # Run the blocking subprocess off the event loop
+        result = await asyncio.to_thread(
+            run_opencode_subprocess,
             prompt=prompt,
             model=model,
             session_id=session_id,
@@ -134,32 +131,97 @@ class OpenCodeService:
         )
 
         if result["success"]:
-            # Update session tracking
-            returned_session = result.get("session_id")
-            if returned_session:
-                self._sessions[chat_id] = returned_session
-
-                # Track in history if it is a new session
-                if chat_id not in self._session_history:
-                    self._session_history[chat_id] = []
-
-                # Check if this session is already in history
-                existing_ids = {s["session_id"] for s in self._session_history[chat_id]}
-                if returned_session not in existing_ids:
-                    self._session_history[chat_id].append(
-                        {
-                            "session_id": returned_session,
-                            "first_prompt": prompt[:200],
-                            "created_at": datetime.utcnow().isoformat() + "Z",
-                        }
-                    )
-
+            self._record_session(chat_id, result.get("session_id"), prompt)
             return result["output"]
         else:
             error_msg = result.get("error", "Unknown error")
             logger.error(f"OpenCode query failed for chat {chat_id}: {error_msg}")
             return f"OpenCode error: {error_msg}"
 
+    async def stream_opencode_query(
+        self,
+        chat_id: int,
+        prompt: str,
+        model: Optional[str] = None,
+        on_output: Optional[Callable[[str], Any]] = None,
+        stream_id: Optional[str] = None,
+        output: Optional[StreamOutput] = None,
+    ) -> Dict[str, Any]:
+        """Execute a prompt through OpenCode, streaming output as it arrives.
+
+        Session handling matches ``run_opencode_query()``.
+
+        Args:
+            chat_id: Telegram chat ID for session tracking.
+            prompt: The prompt to send to OpenCode.
+            model: Optional model override. Defaults to settings.opencode_model.
+            on_output: Called (or awaited) with each output chunk.
+            stream_id: Id from ``register_stream()`` for a stop button.
+            output: Bounded buffer collecting the output.
+
+        Returns:
+            The result dict from ``stream_opencode_subprocess()``.
+        """
+        model = self._resolve_model(model)
+        session_id = self._sessions.get(chat_id)
+
+        logger.info(
+            f"Streaming OpenCode query for chat {chat_id}, "
+            f"model={model}, session={session_id or 'new'}"
+        )
+
+        result = await stream_opencode_subprocess(
+            prompt=prompt,
+            model=model,
+            session_id=session_id,
+            cwd=str(self.work_dir),
+            on_output=on_output,
+            stream_id=stream_id,
+            output=output,
+        )
+
+        if result["success"]:
+            self._record_session(chat_id, result.get("session_id"), prompt)
+        else:
+            logger.error(
+                f"OpenCode query failed for chat {chat_id}: {result.get('error')}"
+            )
+        return result
+
+    @staticmethod
+    def _resolve_model(model: Optional[str]) -> str:
+        """Resolve the model from settings if not provided."""
+        if model is not None:
+            return model
+        try:
+            settings = get_settings()
+            return settings.opencode_model
+        except Exception:
+            return "anthropic:claude-sonnet-4-20250514"
+
+    def _record_session(
+        self, chat_id: int, returned_session: Optional[str], prompt: str
+    ) -> None:
+        """Update session tracking after a successful run."""
+        if not returned_session:
+            return
+        self._sessions[chat_id] = returned_session
+
+        # Track in history if it is a new session
+        if chat_id not in self._session_history:
+            self._session_history[chat_id] = []
+
+        # Check if this session is already in history
+        existing_ids = {s["session_id"] for s in self._session_history[chat_id]}
+        if returned_session not in existing_ids:
+            self._session_history[chat_id].append(
+                {
+                    "session_id": returned_session,
+                    "first_prompt": prompt[:200],
+                    "created_at": datetime.utcnow().isoformat() + "Z",
+                }
+            )
+
 
 # Global instance
 _opencode_service: Optional[OpenCodeService] = None
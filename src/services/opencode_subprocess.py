@@ -4,13 +4,17 @@ Mirrors the pattern from claude_subprocess.py but wraps the OpenCode CLI
 (https://github.com/opencode-ai/opencode) instead of the Claude Code SDK.
 
 OpenCode is invoked via ``opencode run "prompt"`` for non-interactive mode.
+``stream_opencode_subprocess`` runs the same command without blocking and
+delivers output incrementally (see streaming_subprocess.py).
 """
 
 import logging
 import os
 import shutil
 import subprocess
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
+
+from .streaming_subprocess import StreamOutput, stream_subprocess
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +45,37 @@ def parse_opencode_output(raw_output: str) -> str:
     return raw_output.strip()
 
 
+def _not_installed_result() -> Dict[str, Optional[str]]:
+    return {
+        "success": False,
+        "output": "",
+        "error": "OpenCode CLI is not installed or not found in PATH",
+        "session_id": None,
+    }
+
+
+def build_opencode_command(
+    prompt: str, model: Optional[str] = None, session_id: Optional[str] = None
+) -> Optional[List[str]]:
+    """Build the ``opencode run`` argument list, or None if not installed."""
+    opencode_bin = shutil.which("opencode")
+    if opencode_bin is None:
+        return None
+
+    cmd = [opencode_bin, "run"]
+
+    # Add optional flags
+    if model is not None:
+        cmd.extend(["--model", model])
+
+    if session_id is not None:
+        cmd.extend(["--session", session_id])
+
+    # Add the prompt as the final argument
+    cmd.append(prompt)
+    return cmd
+
+
 def run_opencode_subprocess(
     prompt: str,
     model: Optional[str] = None,
@@ -68,29 +103,10 @@ def run_opencode_subprocess(
             - error (Optional[str]): Error message on failure, None on success.
             - session_id (Optional[str]): Session ID if returned by OpenCode.
     """
-    # Check that opencode is installed
-    opencode_bin = shutil.which("opencode")
-    if opencode_bin is None:
+    cmd = build_opencode_command(prompt, model, session_id)
+    if cmd is None:
         logger.error("OpenCode CLI is not installed or not found in PATH")
-        return {
-            "success": False,
-            "output": "",
-            "error": "OpenCode CLI is not installed or not found in PATH",
-            "session_id": None,
-        }
-
-    # Build the command
-    cmd = [opencode_bin, "run"]
-
-    # Add optional flags
-    if model is not None:
-        cmd.extend(["--model", model])
-
-    if session_id is not None:
-        cmd.extend(["--session", session_id])
-
-    # Add the prompt as the final argument
-    cmd.append(prompt)
+        return _not_installed_result()
 
     # Default working directory
     if cwd is None:
@@ -156,3 +172,102 @@ def run_opencode_subprocess(
             "error": str(e),
             "session_id": None,
         }
+
+
+async def stream_opencode_subprocess(
+    prompt: str,
+    model: Optional[str] = None,
+    session_id: Optional[str] = None,
+    cwd: Optional[str] = None,
+    on_output: Optional[Callable[[str], Any]] = None,
+    stream_id: Optional[str] = None,
+    output: Optional[StreamOutput] = None,
+) -> Dict[str, Any]:
+    """Run OpenCode CLI without blocking, streaming stdout to ``on_output``.
+
+    Args:
+        prompt, model, session_id, cwd: As for ``run_opencode_subprocess``.
+        on_output: Called (or awaited) with each stdout chunk as it arrives.
+        stream_id: Id from ``register_stream()`` so a stop button can stop it.
+        output: Bounded buffer collecting stdout (a default one is created).
+
+    Returns:
+        The ``run_opencode_subprocess`` keys, plus:
+            - stopped (bool): The run was stopped on request.
+            - truncated (bool): ``output`` is only the tail of the output.
+            - omitted_chars (int): Characters left out of ``output``.
+            - log_path (Optional[str]): File with the full output if truncated.
+    """
+    cmd = build_opencode_command(prompt, model, session_id)
+    if cmd is None:
+        logger.error("OpenCode CLI is not installed or not found in PATH")
+        return {
+            **_not_installed_result(),
+            "stopped": False,
+            "truncated": False,
+            "omitted_chars": 0,
+            "log_path": None,
+        }
+
+    if cwd is None:
+        cwd = _PROJECT_ROOT
+
+    logger.info(
+        f"Streaming OpenCode subprocess: model={model}, session={session_id}, cwd={cwd}"
+    )
+
+    output = output or StreamOutput()
+    try:
+        result = await stream_subprocess(
+            cmd,
+            cwd=cwd,
+            env={**os.environ},
+            timeout=OPENCODE_TIMEOUT_SECONDS,
+            on_output=on_output,
+            stream_id=stream_id,
+            output=output,
+        )
+    except Exception as e:
+        logger.error(f"Error running OpenCode subprocess: {e}")
+        output.close()
+        return {
+            "success": False,
+            "output": "",
+            "error": str(e),
+            "session_id": None,
+            "stopped": False,
+            "truncated": False,
+            "omitted_chars": 0,
+            "log_path": None,
+        }
+
+    # Keep memory bounded: past the buffer, only the tail is returned and
+    # the full output goes to the (pruned) stream log directory
+    text = output.tail() if output.truncated else output.text()
+    log_path = output.keep_log()
+    output.close()
+
+    error = None
+    if result.timed_out:
+        error = f"OpenCode process timed out after {OPENCODE_TIMEOUT_SECONDS} seconds"
+    elif not result.stopped and result.returncode != 0:
+        error = result.stderr.strip() or f"Exit code {result.returncode}"
+
+    if error:
+        logger.error(f"OpenCode subprocess failed: {error}")
+    else:
+        logger.info(
+            f"OpenCode subprocess {'stopped' if result.stopped else 'completed'}, "
+            f"output_len={output.total_chars}"
+        )
+
+    return {
+        "success": error is None,
+        "output": parse_opencode_output(text),
+        "error": error,
+        "session_id": session_id if error is None else None,
+        "stopped": result.stopped,
+        "truncated": output.truncated,
+        "omitted_chars": output.total_chars - len(text),
+        "log_path": str(log_path) if log_path else None,
+    }
@@ -0,0 +1,281 @@
+"""
+Poll Analytics - poll statistics aggregated in SQL.
+
+Short windows are counted with one GROUP BY over poll_responses, served by
+the (chat_id, created_at) index. Windows of ROLLUP_MIN_DAYS or more read
+poll_response_hourly instead: one row per chat, hour, poll type, category
+and answer. Triggers on poll_responses keep it current, so every insert
+path (PollService, PollingService) and every retention purge is reflected
+without touching the writers.
+
+Rollup-backed results take hour of day and weekday from the hour the
+response was recorded (created_at) rather than the stored hour_of_day.
+"""
+
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Result, func, select, text
+
+from ..core.database import get_db_session
+from ..models.poll_response import PollResponse
+
+logger = logging.getLogger(__name__)
+
+# Windows at least this long are answered from the hourly rollup
+ROLLUP_MIN_DAYS = 30
+
+DAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+# Same layout SQLAlchemy uses for DateTime on SQLite, so range filters on
+# hour_start compare correctly against bound datetimes
+_HOUR_BUCKET = "strftime('%Y-%m-%d %H:00:00.000000', {})"
+
+_ROLLUP_KEY = "chat_id, hour_start, poll_type, poll_category, selected_option_text"
+
+
+def _rollup_values(row: str) -> str:
+    return (
+        f"{row}.chat_id, {_HOUR_BUCKET.format(row + '.created_at')}, "
+        f"{row}.poll_type, coalesce({row}.poll_category, ''), "
+        f"{row}.selected_option_text"
+    )
+
+
+def _rollup_match(row: str) -> str:
+    return (
+        f"chat_id = {row}.chat_id "
+        f"AND hour_start = {_HOUR_BUCKET.format(row + '.created_at')} "
+        f"AND poll_type = {row}.poll_type "
+        f"AND poll_category = coalesce({row}.poll_category, '') "
+        f"AND selected_option_text = {row}.selected_option_text"
+    )
+
+
+_INCREMENT = f"""
+        INSERT INTO poll_response_hourly ({_ROLLUP_KEY}, response_count)
+        VALUES ({_rollup_values('new')}, 1)
+        ON CONFLICT ({_ROLLUP_KEY})
+        DO UPDATE SET response_count = response_count + 1;
+"""
+
+_DECREMENT = f"""
+        UPDATE poll_response_hourly SET response_count = response_count - 1
+        WHERE {_rollup_match('old')};
+        DELETE FROM poll_response_hourly
+        WHERE {_rollup_match('old')} AND response_count <= 0;
+"""
+
+_SCHEMA = [
+    f"""
+    CREATE TABLE IF NOT EXISTS poll_response_hourly (
+        chat_id INTEGER NOT NULL,
+        hour_start DATETIME NOT NULL,
+        poll_type VARCHAR NOT NULL,
+        poll_category VARCHAR NOT NULL DEFAULT '',
+        selected_option_text TEXT NOT NULL,
+        response_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY ({_ROLLUP_KEY})
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS poll_response_hourly_ai
+    AFTER INSERT ON poll_responses BEGIN{_INCREMENT}    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS poll_response_hourly_ad
+    AFTER DELETE ON poll_responses BEGIN{_DECREMENT}    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS poll_response_hourly_au
+    AFTER UPDATE OF chat_id, created_at, poll_type, poll_category,
+        selected_option_text ON poll_responses
+    BEGIN{_DECREMENT}{_INCREMENT}    END
+    """,
+]
+
+_REBUILD = [
+    "DELETE FROM poll_response_hourly",
+    f"""
+    INSERT INTO poll_response_hourly ({_ROLLUP_KEY}, response_count)
+    SELECT {_rollup_values('poll_responses')}, count(*)
+    FROM poll_responses
+    GROUP BY 1, 2, 3, 4, 5
+    """,
+]
+
+_rollup_ready = False
+
+
+async def initialize_poll_rollup(engine) -> bool:
+    """Create the hourly rollup table and its triggers if missing.
+
+    On first creation the rollup is built from the existing responses.
+    Returns True when the rollup was built from scratch.
+    """
+    global _rollup_ready
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            text(
+                "SELECT 1 FROM sqlite_master "
+                "WHERE type = 'table' AND name = 'poll_response_hourly'"
+            )
+        )
+        existed = result.first() is not None
+        for statement in _SCHEMA:
+            await conn.exec_driver_sql(statement)
+        if not existed:
+            for statement in _REBUILD:
+                await conn.exec_driver_sql(statement)
+            logger.info("Built poll_response_hourly rollup from existing responses")
+    _rollup_ready = True
+    return not existed
+
+
+@dataclass
+class PollCount:
+    """Responses for one (type, category, answer, hour, weekday) group."""
+
+    poll_type: str
+    poll_category: Optional[str]
+    option: str
+    hour: Optional[int]
+    weekday: Optional[int]  # 0=Monday, 6=Sunday
+    count: int
+
+
+async def _grouped_counts(chat_id: int, days: int) -> List[PollCount]:
+    since = datetime.utcnow() - timedelta(days=days)
+    async with get_db_session() as session:
+        if _rollup_ready and days >= ROLLUP_MIN_DAYS:
+            result = await session.execute(
+                text(
+                    "SELECT poll_type, poll_category, selected_option_text, "
+                    "CAST(strftime('%H', hour_start) AS INTEGER), "
+                    "(CAST(strftime('%w', hour_start) AS INTEGER) + 6) % 7, "
+                    "sum(response_count) "
+                    "FROM poll_response_hourly "
+                    "WHERE chat_id = :chat_id AND hour_start >= :since "
+                    "GROUP BY 1, 2, 3, 4, 5"
+                ),
+                {
+                    "chat_id": chat_id,
+                    "since": since.replace(minute=0, second=0, microsecond=0),
+                },
+            )
+        else:
+            columns = (
+                PollResponse.poll_type,
+                PollResponse.poll_category,
+                PollResponse.selected_option_text,
+                PollResponse.hour_of_day,
+                PollResponse.day_of_week,
+            )
+            result = await session.execute(
+                select(*columns, func.count())
+                .where(
+                    PollResponse.chat_id == chat_id,
+                    PollResponse.__table__.c.created_at >= since,
+                )
+                .group_by(*columns)
+            )
+        rows = result.all()
+
+    return [
+        PollCount(
+            poll_type=poll_type,
+            poll_category=poll_category or None,
+            option=option,
+            hour=hour,
+            weekday=weekday,
+            count=count,
+        )
+        for poll_type, poll_category, option, hour, weekday, count in rows
+    ]
+
+
+async def get_poll_statistics(chat_id: int, days: int = 7) -> Dict[str, Any]:
+    """Response totals by type, category, hour of day and weekday.
+
+    Returns the same shape as PollingService.get_statistics.
+    """
+    counts = await _grouped_counts(chat_id, days)
+    total = sum(c.count for c in counts)
+    if not total:
+        return {
+            "total_responses": 0,
+            "days_analyzed": days,
+            "message": "No poll responses in time range",
+        }
+
+    by_type: Counter = Counter()
+    by_category: Counter = Counter()
+    by_hour: Counter = Counter()
+    by_weekday: Counter = Counter()
+    for c in counts:
+        by_type[c.poll_type] += c.count
+        if c.poll_category:
+            by_category[c.poll_category] += c.count
+        if c.hour is not None:
+            by_hour[c.hour] += c.count
+        if c.weekday is not None:
+            by_weekday[c.weekday] += c.count
+
+    return {
+        "total_responses": total,
+        "days_analyzed": days,
+        "by_type": dict(by_type),
+        "by_category": dict(by_category),
+        "by_hour": sorted(by_hour.items()),
+        "by_day": {DAY_NAMES[day]: by_weekday[day] for day in sorted(by_weekday)},
+        "avg_per_day": total / days,
+    }
+
+
+async def get_poll_trends(chat_id: int, days: int = 7) -> Dict[str, Any]:
+    """Counts per type, top answers per type and the hour distribution.
+
+    Returns the same shape as PollService.analyze_trends.
+    """
+    counts = await _grouped_counts(chat_id, days)
+    if not counts:
+        return {"error": "No responses found"}
+
+    type_counts: Counter = Counter()
+    options: Dict[str, Counter] = {}
+    hour_distribution: Counter = Counter()
+    for c in counts:
+        type_counts[c.poll_type] += c.count
+        options.setdefault(c.poll_type, Counter())[c.option] += c.count
+        hour_distribution[c.hour] += c.count
+
+    since = datetime.utcnow() - timedelta(days=days)
+    async with get_db_session() as session:
+        result: Result[Optional[datetime], Optional[datetime]] = await session.execute(
+            select(
+                func.min(PollResponse.created_at),
+                func.max(PollResponse.created_at),
+            ).where(
+                PollResponse.chat_id == chat_id,
+                PollResponse.__table__.c.created_at >= since,
+            )
+        )
+        start, end = result.one()
+
+    return {
+        "total_responses": sum(type_counts.values()),
+        "days_analyzed": days,
+        "type_counts": dict(type_counts),
+        "top_responses": {
+            poll_type: sorted(distribution.items(), key=lambda x: (-x[1], x[0]))[:3]
+            for poll_type, distribution in options.items()
+        },
+        "hour_distribution": dict(hour_distribution),
+        "date_range": {
+            "start": start.isoformat() if start else None,
+            "end": end.isoformat() if end else None,
+        },
+    }
@@ -0,0 +1,538 @@
+"""
+Poll Embeddings - batched background embedding of poll responses and
+vector search over them.
+
+Answers are stored first and embedded afterwards: PollEmbeddingWriter
+collects (response id, text) pairs and embeds everything that arrived within
+``flush_interval`` seconds with one batched model call, then writes the
+vectors back with a single executemany UPDATE. Embeddings are stored as
+packed float32 blobs (src.utils.vector_search format) instead of JSON float
+lists, roughly a quarter of the size.
+
+Search reuses the matrix machinery of image similarity (cosine top-k and
+greedy clustering over a stacked float32 matrix):
+- find_similar_responses(): answers similar to a given answer
+- search_responses(): answers similar to free text
+- cluster_responses(): groups of similar answers with their spread over time
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Result, select, text, update
+
+from ..core.database import get_db_session
+from ..domain.errors import EmbeddingFailure
+from ..domain.interfaces import TextEmbeddingProvider
+from ..models.poll_response import PollResponse
+from ..utils.task_tracker import create_tracked_task
+from ..utils.vector_search import (
+    cosine_top_k,
+    greedy_clusters,
+    pack_embedding,
+    stack_embeddings,
+    unpack_embedding,
+)
+
+logger = logging.getLogger(__name__)
+
+_MIGRATION_CHUNK = 500
+
+
+def poll_embedding_text(question: str, answer: str) -> str:
+    """Text embedded for a poll answer."""
+    return f"Q: {question}\nA: {answer}"
+
+
+def _default_embedding_provider() -> TextEmbeddingProvider:
+    """Lazy import to avoid cross-context import at module level."""
+    from ..services.embedding_service import get_embedding_service
+
+    return get_embedding_service()
+
+
+@dataclass
+class PendingEmbedding:
+    """A stored poll response waiting for its embedding."""
+
+    response_id: int
+    text: str
+
+
+class PollEmbeddingWriter:
+    """
+    Write-behind batching embedder for poll responses.
+
+    enqueue() is synchronous and returns immediately; a single background
+    task waits up to ``flush_interval`` for more answers, embeds the batch
+    in one call and writes all vectors in one transaction. When the
+    provider only has deterministic (hash) embeddings nothing is written,
+    so rows stay NULL until enqueue_missing() runs with a real model.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 1.0,
+        max_batch_size: int = 32,
+        max_queue_size: int = 1000,
+        embedding_provider: Optional[TextEmbeddingProvider] = None,
+    ):
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.max_queue_size = max_queue_size
+        self._embedding_provider = embedding_provider
+
+        self._queue: List[PendingEmbedding] = []
+        self._oldest_enqueued_at: float = 0.0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        # Counters for observability
+        self.embedded_count = 0
+        self.skipped_count = 0
+        self.dropped_count = 0
+        self.failed_count = 0
+        self.batch_count = 0
+
+    @property
+    def embedding_provider(self) -> TextEmbeddingProvider:
+        if self._embedding_provider is None:
+            self._embedding_provider = _default_embedding_provider()
+        return self._embedding_provider
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def enqueue(self, response_id: int, text: str) -> bool:
+        """Queue a stored response for embedding. Returns False if dropped.
+
+        Must be called from within a running event loop (the flush task is
+        started lazily on first use).
+        """
+        if self._stopping or len(self._queue) >= self.max_queue_size:
+            self.dropped_count += 1
+            logger.warning(
+                f"Poll embedding queue unavailable, response {response_id} "
+                f"left for the startup backfill"
+            )
+            return False
+
+        was_empty = not self._queue
+        if was_empty:
+            self._oldest_enqueued_at = time.monotonic()
+        self._queue.append(PendingEmbedding(response_id=response_id, text=text))
+
+        self._ensure_started()
+        if was_empty or len(self._queue) >= self.max_batch_size:
+            assert self._wakeup is not None  # created by _ensure_started
+            self._wakeup.set()
+        return True
+
+    async def enqueue_missing(self, limit: int = 1000) -> int:
+        """Queue the most recent responses that have no embedding yet."""
+        async with get_db_session() as session:
+            result: Result[Any] = await session.execute(
+                select(
+                    PollResponse.id,
+                    PollResponse.question,
+                    PollResponse.selected_option_text,
+                )
+                .where(PollResponse.embedding.is_(None))
+                .order_by(PollResponse.id.desc())
+                .limit(limit)
+            )
+            rows = result.all()
+
+        queued = sum(
+            self.enqueue(response_id, poll_embedding_text(question, answer))
+            for response_id, question, answer in rows
+        )
+        if queued:
+            logger.info(f"Queued {queued} poll response(s) without embeddings")
+        return queued
+
+    @property
+    def pending_count(self) -> int:
+        """Number of responses waiting to be embedded."""
+        return len(self._queue)
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+
+    def _ensure_started(self) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        if self._task is None or self._task.done():
+            self._task = create_tracked_task(self._run(), name="poll_embedding_writer")
+
+    async def _run(self) -> None:
+        """Background loop: flush when the batch is full or the oldest row is due."""
+        assert self._wakeup is not None
+        try:
+            while True:
+                if not self._queue:
+                    await self._wakeup.wait()
+                    self._wakeup.clear()
+                    continue
+
+                age = time.monotonic() - self._oldest_enqueued_at
+                remaining = self.flush_interval - age
+                if remaining > 0 and len(self._queue) < self.max_batch_size:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        pass
+                    self._wakeup.clear()
+                    continue
+
+                await self._flush_batch()
+        except asyncio.CancelledError:
+            logger.debug("Poll embedding writer loop cancelled")
+
+    async def _flush_batch(self) -> int:
+        """Embed and store up to max_batch_size queued responses."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            batch = self._queue[: self.max_batch_size]
+            if not batch:
+                return 0
+            del self._queue[: len(batch)]
+            if self._queue:
+                self._oldest_enqueued_at = time.monotonic()
+            await self._write_batch(batch)
+            return len(batch)
+
+    async def flush(self) -> None:
+        """Embed everything currently queued, one batch at a time."""
+        while self._queue:
+            await self._flush_batch()
+
+    async def _write_batch(self, batch: List[PendingEmbedding]) -> None:
+        """Embed a batch and store the vectors. Never raises."""
+        provider = self.embedding_provider
+        if getattr(provider, "is_deterministic", False):
+            self.skipped_count += len(batch)
+            logger.debug(
+                f"Skipped embedding {len(batch)} poll response(s): "
+                f"no embedding model loaded"
+            )
+            return
+
+        try:
+            blobs = await provider.generate_text_embeddings_batch(
+                [pending.text for pending in batch]
+            )
+            rows = [
+                {"id": pending.response_id, "embedding": blob}
+                for pending, blob in zip(batch, blobs)
+                if blob is not None
+            ]
+            self.failed_count += len(batch) - len(rows)
+            if not rows:
+                return
+
+            async with get_db_session() as session:
+                await session.execute(update(PollResponse), rows)
+                await session.commit()
+
+            self.embedded_count += len(rows)
+            self.batch_count += 1
+            logger.debug(f"Stored embeddings for {len(rows)} poll response(s)")
+
+        except EmbeddingFailure as e:
+            self.failed_count += len(batch)
+            logger.warning(
+                f"Embedding model failed for {len(batch)} poll response(s), "
+                f"left for the startup backfill: {e}"
+            )
+        except Exception as e:
+            self.failed_count += len(batch)
+            logger.warning(f"Failed to embed {len(batch)} poll response(s): {e}")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop accepting responses and embed the queue within ``timeout``.
+
+        Anything left is dropped; those rows keep a NULL embedding and are
+        picked up by enqueue_missing() on the next start.
+        """
+        self._stopping = True
+
+        if self._task is not None and not self._task.done():
+            # Cancel only between batches so an in-flight write is never lost
+            if self._flush_lock is not None:
+                async with self._flush_lock:
+                    self._task.cancel()
+            else:
+                self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+        try:
+            await asyncio.wait_for(self.flush(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+        if self._queue:
+            self.dropped_count += len(self._queue)
+            logger.warning(
+                f"Poll embedding drain timed out after {timeout}s, "
+                f"{len(self._queue)} response(s) left for the startup backfill"
+            )
+            self._queue.clear()
+
+    def get_stats(self) -> dict:
+        """Get writer statistics."""
+        return {
+            "pending": len(self._queue),
+            "embedded": self.embedded_count,
+            "batches": self.batch_count,
+            "skipped": self.skipped_count,
+            "dropped": self.dropped_count,
+            "failed": self.failed_count,
+        }
+
+
+def get_poll_embedding_writer() -> PollEmbeddingWriter:
+    """Get the global poll embedding writer (delegates to DI container)."""
+    from ..core.services import Services, get_service
+
+    return get_service(Services.POLL_EMBEDDINGS)
+
+
+# ----------------------------------------------------------------------
+# Search
+# ----------------------------------------------------------------------
+
+
+def _response_summary(response: PollResponse, similarity: float) -> Dict[str, Any]:
+    return {
+        "id": response.id,
+        "question": response.question,
+        "answer": response.selected_option_text,
+        "poll_type": response.poll_type,
+        "created_at": (
+            response.created_at.isoformat() if response.created_at else None
+        ),
+        "similarity": similarity,
+    }
+
+
+async def _ranked_neighbours(
+    chat_id: int,
+    query: Any,
+    limit: int,
+    threshold: float,
+    exclude_id: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    async with get_db_session() as session:
+        result: Result[Any] = await session.execute(
+            select(PollResponse.id, PollResponse.embedding).where(
+                PollResponse.chat_id == chat_id,
+                PollResponse.embedding.is_not(None),
+            )
+        )
+        candidates = [row for row in result.all() if row[0] != exclude_id]
+        matrix, kept = stack_embeddings(
+            [embedding for _, embedding in candidates], dimension=len(query)
+        )
+        top = cosine_top_k(query, matrix, limit, threshold=threshold)
+        ids = [candidates[kept[index]][0] for index, _ in top]
+        if not ids:
+            return []
+
+        result = await session.execute(
+            select(PollResponse).where(PollResponse.id.in_(ids))
+        )
+        by_id = {response.id: response for response in result.scalars()}
+
+    return [
+        _response_summary(by_id[candidates[kept[index]][0]], similarity)
+        for index, similarity in top
+        if candidates[kept[index]][0] in by_id
+    ]
+
+
+async def find_similar_responses(
+    response_id: int, limit: int = 5, threshold: float = 0.7
+) -> List[Dict[str, Any]]:
+    """Answers in the same chat most similar to ``response_id``, best first."""
+    async with get_db_session() as session:
+        result: Result[Any] = await session.execute(
+            select(PollResponse.chat_id, PollResponse.embedding).where(
+                PollResponse.id == response_id
+            )
+        )
+        row = result.first()
+
+    if row is None:
+        logger.debug(f"Unknown poll response {response_id}")
+        return []
+    query = unpack_embedding(row.embedding)
+    if query is None:
+        logger.debug(f"No embedding for poll response {response_id}")
+        return []
+    return await _ranked_neighbours(
+        row.chat_id, query, limit, threshold, exclude_id=response_id
+    )
+
+
+async def search_responses(
+    chat_id: int,
+    query_text: str,
+    limit: int = 5,
+    threshold: float = 0.5,
+    embedding_provider: Optional[TextEmbeddingProvider] = None,
+) -> List[Dict[str, Any]]:
+    """Answers in a chat most similar to free text, best first."""
+    provider = embedding_provider or _default_embedding_provider()
+    if getattr(provider, "is_deterministic", False):
+        logger.warning(
+            "Poll response search skipped: no embedding model loaded "
+            "(results would be meaningless)"
+        )
+        return []
+    try:
+        [blob] = await provider.generate_text_embeddings_batch([query_text])
+    except EmbeddingFailure as e:
+        logger.warning(f"Poll response search failed: {e}")
+        return []
+    query = unpack_embedding(blob)
+    if query is None:
+        return []
+    return await _ranked_neighbours(chat_id, query, limit, threshold)
+
+
+def _period_key(created_at: datetime, period: str) -> str:
+    if period == "day":
+        return created_at.strftime("%Y-%m-%d")
+    if period == "month":
+        return created_at.strftime("%Y-%m")
+    year, week, _ = created_at.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+async def cluster_responses(
+    chat_id: int,
+    days: int = 30,
+    threshold: float = 0.85,
+    period: str = "week",
+) -> List[Dict[str, Any]]:
+    """Group a chat's recent answers by similarity and show each group over time.
+
+    Args:
+        chat_id: Telegram chat ID
+        days: How far back to look
+        threshold: Cosine similarity needed to join a cluster
+        period: Time bucket for the per-cluster counts ("day", "week", "month")
+
+    Returns:
+        Clusters, largest first, with a representative answer, counts per
+        poll type and per period, first/last seen and mean sentiment score.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    async with get_db_session() as session:
+        result = await session.execute(
+            select(PollResponse)
+            .where(
+                PollResponse.chat_id == chat_id,
+                PollResponse.__table__.c.created_at >= cutoff,
+                PollResponse.embedding.is_not(None),
+            )
+            .order_by(PollResponse.created_at)
+        )
+        responses = list(result.scalars())
+
+    matrix, kept = stack_embeddings([response.embedding for response in responses])
+    clusters = []
+    for members in greedy_clusters(matrix, threshold):
+        group = [responses[kept[index]] for index in members]
+        sentiments = [r.sentiment_score for r in group if r.sentiment_score is not None]
+        clusters.append(
+            {
+                "size": len(group),
+                "representative": _response_summary(group[0], 1.0),
+                "response_ids": [r.id for r in group],
+                "poll_types": dict(Counter(r.poll_type for r in group)),
+                "by_period": dict(
+                    Counter(_period_key(r.created_at, period) for r in group)
+                ),
+                "first_seen": min(r.created_at for r in group).isoformat(),
+                "last_seen": max(r.created_at for r in group).isoformat(),
+                "avg_sentiment": (
+                    sum(sentiments) / len(sentiments) if sentiments else None
+                ),
+            }
+        )
+    clusters.sort(key=lambda cluster: cluster["size"], reverse=True)
+    return clusters
+
+
+# ----------------------------------------------------------------------
+# Migration
+# ----------------------------------------------------------------------
+
+
+def _json_to_blob(value: str) -> Optional[bytes]:
+    try:
+        vector = json.loads(value)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(vector, list) or not vector:
+        return None
+    if not all(isinstance(x, (int, float)) for x in vector):
+        return None
+    return pack_embedding(vector)
+
+
+async def migrate_json_embeddings(engine) -> int:
+    """Convert JSON-encoded poll embeddings to float32 blobs, in chunks.
+
+    Values that are not a JSON list of numbers are cleared so the writer
+    can re-embed them. Returns the number of rows converted.
+    """
+    converted = 0
+    last_id = 0
+    while True:
+        async with engine.begin() as conn:
+            result = await conn.execute(
+                text(
+                    "SELECT id, embedding FROM poll_responses "
+                    "WHERE typeof(embedding) = 'text' AND id > :last_id "
+                    "ORDER BY id LIMIT :chunk"
+                ),
+                {"last_id": last_id, "chunk": _MIGRATION_CHUNK},
+            )
+            rows = result.all()
+            if not rows:
+                break
+            updates = [
+                {"id": row_id, "embedding": _json_to_blob(value)}
+                for row_id, value in rows
+            ]
+            await conn.execute(
+                text("UPDATE poll_responses SET embedding = :embedding WHERE id = :id"),
+                updates,
+            )
+        converted += sum(1 for row in updates if row["embedding"] is not None)
+        last_id = rows[-1][0]
+
+    if converted:
+        logger.info(f"Converted {converted} poll embedding(s) from JSON to float32")
+    return converted
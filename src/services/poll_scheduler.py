@@ -8,10 +8,12 @@ poll_handlers to keep the service→handler dependency direction correct).
 
 import logging
 import os
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from telegram.ext import Application, ContextTypes
 
+from .poll_state_store import KIND_SCHEDULED, get_poll_state_store
+
 logger = logging.getLogger(__name__)
 
 
@@ -110,6 +112,7 @@ async def _startup_expire_callback(context):
 
     tracker = get_poll_lifecycle_tracker()
     tracker.record_expired(poll_id)
+    await forget_scheduled_poll(context, poll_id)
 
     logger.info(f"Startup cleanup: expiring poll {poll_id} in chat {chat_id}")
 
@@ -205,19 +208,20 @@ async def send_scheduled_poll(context: ContextTypes.DEFAULT_TYPE) -> None:
                 }
 
             # Store poll context
-            if "poll_context" not in context.bot_data:
-                context.bot_data["poll_context"] = {}
-
-            context.bot_data["poll_context"][poll_message.poll.id] = {
-                "question": poll_template["question"],
-                "options": poll_template["options"],
-                "poll_type": poll_template["type"],
-                "poll_category": poll_template.get("category"),
-                "template_id": poll_template["id"],
-                "chat_id": chat_id,
-                "message_id": poll_message.message_id,
-                "origin": origin_info,
-            }
+            await track_scheduled_poll(
+                context,
+                poll_message.poll.id,
+                {
+                    "question": poll_template["question"],
+                    "options": poll_template["options"],
+                    "poll_type": poll_template["type"],
+                    "poll_category": poll_template.get("category"),
+                    "template_id": poll_template["id"],
+                    "chat_id": chat_id,
+                    "message_id": poll_message.message_id,
+                    "origin": origin_info,
+                },
+            )
 
             # Register in lifecycle tracker for TTL and backpressure tracking
             tracker.record_sent(
@@ -313,13 +317,50 @@ async def _expire_poll_callback(context: ContextTypes.DEFAULT_TYPE) -> None:
         },
     )
 
-    # Step 3: Clean up bot_data
-    if "poll_context" in context.bot_data:
-        context.bot_data["poll_context"].pop(poll_id, None)
+    # Step 3: Forget the poll context
+    await forget_scheduled_poll(context, poll_id)
 
     logger.info(f"Poll {poll_id} expired and deleted from chat {chat_id}")
 
 
+async def track_scheduled_poll(
+    context: ContextTypes.DEFAULT_TYPE, poll_id: str, poll_ctx: Dict[str, Any]
+) -> None:
+    """Remember a sent poll's context in bot_data and the durable registry.
+
+    The registry copy lets answers that arrive after a restart (when
+    bot_data is empty) still be saved; see get_scheduled_poll_context().
+    """
+    context.bot_data.setdefault("poll_context", {})[poll_id] = poll_ctx
+    try:
+        await get_poll_state_store().register(
+            poll_id, KIND_SCHEDULED, poll_ctx["chat_id"], poll_ctx
+        )
+    except Exception as e:
+        logger.error(f"Failed to persist poll context for {poll_id}: {e}")
+
+
+async def get_scheduled_poll_context(
+    context: ContextTypes.DEFAULT_TYPE, poll_id: str
+) -> Optional[Dict[str, Any]]:
+    """Context of a sent poll from bot_data, falling back to the registry."""
+    poll_ctx = context.bot_data.get("poll_context", {}).get(poll_id)
+    if poll_ctx is None:
+        poll_ctx = await get_poll_state_store().get(poll_id, KIND_SCHEDULED)
+    return poll_ctx
+
+
+async def forget_scheduled_poll(
+    context: ContextTypes.DEFAULT_TYPE, poll_id: str
+) -> None:
+    """Drop a poll's context once it is answered or expired."""
+    context.bot_data.get("poll_context", {}).pop(poll_id, None)
+    try:
+        await get_poll_state_store().unregister(poll_id)
+    except Exception as e:
+        logger.error(f"Failed to forget poll context for {poll_id}: {e}")
+
+
 def get_poll_scheduler_config() -> PollSchedulerConfig:
     """Get the global poll scheduler configuration."""
     global _config
@@ -4,51 +4,60 @@ Poll Service - Manages poll scheduling, sending, and response tracking.
 This service handles:
 - Scheduling polls throughout the day
 - Sending polls via Telegram bot
-- Tracking sent polls for response handling
-- Storing responses with embeddings
+- Tracking sent polls for response handling (durable, see poll_state_store)
+- Storing responses (embedded in the background by PollEmbeddingWriter)
 - Analyzing trends and generating insights
 """
 
-import json
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 if TYPE_CHECKING:
     from src.domain.ports.poll_sender import PollSender
 
 from ..core.database import get_db_session
-from ..domain.errors import EmbeddingFailure, PollNotTracked, PollSendFailure
+from ..domain.errors import PollNotTracked, PollSendFailure
 from ..domain.events import EventBus, PollAnswered, get_event_bus
-from ..domain.interfaces import EmbeddingProvider
 from ..models.poll_response import PollResponse, PollTemplate
+from .poll_analytics import get_poll_trends
+from .poll_embeddings import (
+    PollEmbeddingWriter,
+    get_poll_embedding_writer,
+    poll_embedding_text,
+)
+from .poll_state_store import KIND_POLL, PollStateStore, get_poll_state_store
 
 logger = logging.getLogger(__name__)
 
 
-def _default_embedding_provider() -> EmbeddingProvider:
-    """Lazy import to avoid cross-context import at module level."""
-    from ..services.embedding_service import EmbeddingService
-
-    return EmbeddingService()
-
-
 class PollService:
     """Service for managing polls and responses."""
 
     def __init__(
         self,
-        embedding_provider: Optional[EmbeddingProvider] = None,
+        embedding_writer: Optional[PollEmbeddingWriter] = None,
         event_bus: Optional[EventBus] = None,
+        poll_store: Optional[PollStateStore] = None,
     ):
-        self._embedding_provider: EmbeddingProvider = (
-            embedding_provider or _default_embedding_provider()
-        )
+        self._embedding_writer: Optional[PollEmbeddingWriter] = embedding_writer
         self._event_bus: EventBus = event_bus or get_event_bus()
-        self._poll_tracker: Dict[str, Dict[str, Any]] = (
-            {}
-        )  # poll_id -> {template_id, chat_id, sent_at}
-        self._event_bus = event_bus or get_event_bus()
+        # poll_id -> {template_id, chat_id, sent_at, ...}, survives restarts
+        self._poll_store: Optional[PollStateStore] = poll_store
+
+    @property
+    def embedding_writer(self) -> PollEmbeddingWriter:
+        """Resolved on first use so construction does not need the container."""
+        if self._embedding_writer is None:
+            self._embedding_writer = get_poll_embedding_writer()
+        return self._embedding_writer
+
+    @property
+    def poll_store(self) -> PollStateStore:
+        """Resolved on first use so construction does not need the container."""
+        if self._poll_store is None:
+            self._poll_store = get_poll_state_store()
+        return self._poll_store
 
     async def send_poll(
         self,
@@ -86,17 +95,22 @@ class PollService:
         poll_id = result["poll_id"]
 
         # Track the poll
-        self._poll_tracker[poll_id] = {
-            "template_id": template.id,
-            "chat_id": chat_id,
-            "sent_at": datetime.utcnow(),
-            "question": template.question,
-            "options": template.options,
-            "poll_type": template.poll_type,
-            "poll_category": template.poll_category,
-            "message_id": result.get("message_id"),
-            "context_data": context_data or {},
-        }
+        await self.poll_store.register(
+            poll_id,
+            KIND_POLL,
+            chat_id,
+            {
+                "template_id": template.id,
+                "chat_id": chat_id,
+                "sent_at": datetime.utcnow().isoformat(),
+                "question": template.question,
+                "options": template.options,
+                "poll_type": template.poll_type,
+                "poll_category": template.poll_category,
+                "message_id": result.get("message_id"),
+                "context_data": context_data or {},
+            },
+        )
 
         # Update template stats
         async with get_db_session() as session:
@@ -126,14 +140,15 @@ class PollService:
             True on success.
 
         Raises:
-            PollNotTracked: poll_id is not in the in-memory tracker.
-            EmbeddingFailure: Embedding generation failed.
+            PollNotTracked: poll_id is unknown or its tracking expired.
+
+        The embedding is generated afterwards in a batch by the poll
+        embedding writer, so a slow or failing model never delays the answer.
         """
-        if poll_id not in self._poll_tracker:
+        poll_data = await self.poll_store.get(poll_id, KIND_POLL)
+        if poll_data is None:
             raise PollNotTracked(poll_id=poll_id)
 
-        poll_data = self._poll_tracker[poll_id]
-
         # Get selected option text
         selected_option_text = poll_data["options"][selected_option_id]
 
@@ -142,14 +157,6 @@ class PollService:
         day_of_week = now.weekday()
         hour_of_day = now.hour
 
-        # Generate embedding for the response
-        response_text = f"Q: {poll_data['question']}\nA: {selected_option_text}"
-        try:
-            embedding = await self._embedding_provider.generate_embedding(response_text)
-        except Exception as e:
-            raise EmbeddingFailure(str(e)) from e
-        embedding_str = json.dumps(embedding) if embedding else None
-
         response_id: Optional[int] = None
 
         # Store response in database
@@ -158,17 +165,21 @@ class PollService:
                 chat_id=poll_data["chat_id"],
                 poll_id=poll_id,
                 message_id=poll_data.get("message_id"),
+                template_id=(
+                    str(poll_data["template_id"])
+                    if poll_data.get("template_id") is not None
+                    else None
+                ),
                 question=poll_data["question"],
                 options=poll_data["options"],
                 selected_option_id=selected_option_id,
                 selected_option_text=selected_option_text,
                 poll_type=poll_data["poll_type"],
                 poll_category=poll_data.get("poll_category"),
-                created_at=poll_data["sent_at"],
+                created_at=datetime.fromisoformat(poll_data["sent_at"]),
                 day_of_week=day_of_week,
                 hour_of_day=hour_of_day,
                 context_metadata=poll_data.get("context_data"),
-                embedding=embedding_str,
             )
 
             session.add(response)
@@ -182,6 +193,14 @@ class PollService:
                 f"answer='{selected_option_text}'"
             )
 
+        await self.poll_store.unregister(poll_id)
+
+        if response_id is not None:
+            self.embedding_writer.enqueue(
+                response_id,
+                poll_embedding_text(poll_data["question"], selected_option_text),
+            )
+
         # Emit domain event after successful persist
         await self._event_bus.publish(
             PollAnswered(
@@ -305,6 +324,9 @@ class PollService:
         """
         Analyze poll response trends over a time period.
 
+        Counted in SQL; windows of 30+ days read the hourly rollup
+        (see poll_analytics).
+
         Args:
             chat_id: Chat ID
             days: Number of days to analyze
@@ -312,57 +334,7 @@ class PollService:
         Returns:
             Dictionary with trend analysis
         """
-        since = datetime.utcnow() - timedelta(days=days)
-        responses = await self.get_responses(chat_id, since=since, limit=1000)
-
-        if not responses:
-            return {"error": "No responses found"}
-
-        # Analyze by poll type
-        type_counts = {}
-        type_distributions = {}
-
-        for response in responses:
-            poll_type = response.poll_type
-            if poll_type not in type_counts:
-                type_counts[poll_type] = 0
-                type_distributions[poll_type] = {}
-
-            type_counts[poll_type] += 1
-
-            # Track option distribution
-            option_text = response.selected_option_text
-            if option_text not in type_distributions[poll_type]:
-                type_distributions[poll_type][option_text] = 0
-            type_distributions[poll_type][option_text] += 1
-
-        # Calculate most common responses by type
-        top_responses = {}
-        for poll_type, distribution in type_distributions.items():
-            sorted_options = sorted(
-                distribution.items(), key=lambda x: x[1], reverse=True
-            )
-            top_responses[poll_type] = sorted_options[:3]
-
-        # Analyze temporal patterns
-        hour_distribution = {}
-        for response in responses:
-            hour = response.hour_of_day
-            if hour not in hour_distribution:
-                hour_distribution[hour] = 0
-            hour_distribution[hour] += 1
-
-        return {
-            "total_responses": len(responses),
-            "days_analyzed": days,
-            "type_counts": type_counts,
-            "top_responses": top_responses,
-            "hour_distribution": hour_distribution,
-            "date_range": {
-                "start": min(r.created_at for r in responses).isoformat(),
-                "end": max(r.created_at for r in responses).isoformat(),
-            },
-        }
+        return await get_poll_trends(chat_id, days=days)
 
 
 # Singleton instance
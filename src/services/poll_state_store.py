@@ -0,0 +1,158 @@
+"""
+Poll State Store - durable registry of in-flight polls.
+
+Every sent poll whose answer must later be matched to its metadata (general
+scheduled polls, PollService template polls, trail review polls) is kept in
+the indexed ``tracked_polls`` table instead of process memory or a JSON
+state file, so answers that arrive after a restart, or on another worker,
+still resolve.
+
+- register()/unregister() are single-row upserts/deletes by primary key.
+- get() is read-through: a bounded in-process LRU cache in front of a
+  primary-key lookup. Misses are not cached, so polls registered by another
+  worker are found on the next answer.
+- Rows carry an expires_at; expired rows are ignored on read and removed
+  in bulk by purge_expired() through the expires_at index.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, cast
+
+from sqlalchemy import CursorResult, delete, select
+from sqlalchemy.dialects.sqlite import insert
+
+from ..core.database import get_db_session
+from ..models.tracked_poll import TrackedPoll
+from ..utils.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+KIND_POLL = "poll"  # PollService (database templates)
+KIND_SCHEDULED = "scheduled"  # poll_scheduler and /polls:send (YAML templates)
+KIND_TRAIL = "trail"  # TrailReviewService review sequences
+
+
+@dataclass
+class _CachedPoll:
+    kind: str
+    payload: Dict[str, Any]
+    expires_at: datetime
+
+
+class PollStateStore:
+    """Durable poll_id -> metadata registry with TTL and a read-through cache."""
+
+    def __init__(self, ttl_hours: float = 48.0, cache_size: int = 1000):
+        self.ttl = timedelta(hours=ttl_hours)
+        self._cache: LRUCache[str, _CachedPoll] = LRUCache(max_size=cache_size)
+
+    async def register(
+        self,
+        poll_id: str,
+        kind: str,
+        chat_id: int,
+        payload: Dict[str, Any],
+        ttl: Optional[timedelta] = None,
+    ) -> None:
+        """Record a sent poll. ``payload`` must be JSON-serializable."""
+        now = datetime.utcnow()
+        expires_at = now + (ttl or self.ttl)
+        stmt = insert(TrackedPoll).values(
+            poll_id=poll_id,
+            kind=kind,
+            chat_id=chat_id,
+            payload=payload,
+            created_at=now,
+            expires_at=expires_at,
+        )
+        async with get_db_session() as session:
+            await session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[TrackedPoll.poll_id],
+                    set_={
+                        "kind": stmt.excluded.kind,
+                        "chat_id": stmt.excluded.chat_id,
+                        "payload": stmt.excluded.payload,
+                        "created_at": stmt.excluded.created_at,
+                        "expires_at": stmt.excluded.expires_at,
+                    },
+                )
+            )
+            await session.commit()
+        self._cache.set(poll_id, _CachedPoll(kind, payload, expires_at))
+
+    async def get(
+        self, poll_id: str, kind: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Metadata for a live poll, or None if unknown, expired or another kind."""
+        cached = self._cache.get(poll_id)
+        if cached is None:
+            async with get_db_session() as session:
+                result = await session.execute(
+                    select(
+                        TrackedPoll.kind, TrackedPoll.payload, TrackedPoll.expires_at
+                    ).where(TrackedPoll.poll_id == poll_id)
+                )
+                row = result.first()
+            if row is None:
+                return None
+            cached = _CachedPoll(*row)
+            self._cache.set(poll_id, cached)
+
+        if cached.expires_at <= datetime.utcnow():
+            self._cache.pop(poll_id)
+            return None
+        if kind is not None and cached.kind != kind:
+            return None
+        return dict(cached.payload)
+
+    async def unregister(self, poll_id: str) -> bool:
+        """Forget a poll (answered or expired). Returns True if it was tracked."""
+        self._cache.pop(poll_id)
+        async with get_db_session() as session:
+            result = await session.execute(
+                delete(TrackedPoll).where(TrackedPoll.poll_id == poll_id)
+            )
+            await session.commit()
+        return bool(cast(CursorResult, result).rowcount)
+
+    async def purge_expired(self) -> int:
+        """Delete expired rows. Returns the number removed."""
+        now = datetime.utcnow()
+        async with get_db_session() as session:
+            result = await session.execute(
+                delete(TrackedPoll).where(TrackedPoll.expires_at <= now)
+            )
+            await session.commit()
+        for poll_id, cached in self._cache.items():
+            if cached.expires_at <= now:
+                self._cache.pop(poll_id)
+        return cast(CursorResult, result).rowcount or 0
+
+
+def get_poll_state_store() -> PollStateStore:
+    """Get the global poll state store (delegates to DI container)."""
+    from ..core.services import Services, get_service
+
+    return get_service(Services.POLL_STATE)
+
+
+async def run_periodic_poll_state_purge(interval_hours: float = 1.0) -> None:
+    """Periodically delete expired tracked polls."""
+    interval_seconds = interval_hours * 3600
+    logger.info(f"Starting periodic poll state purge (interval: {interval_hours}h)")
+
+    while True:
+        try:
+            await asyncio.sleep(interval_seconds)
+            removed = await get_poll_state_store().purge_expired()
+            if removed:
+                logger.info(f"Purged {removed} expired tracked poll(s)")
+        except asyncio.CancelledError:
+            logger.info("Poll state purge task cancelled")
+            break
+        except Exception as e:
+            logger.error(f"Error purging poll state: {e}", exc_info=True)
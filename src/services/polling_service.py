@@ -3,12 +3,11 @@ Polling Service - Manages poll delivery, responses, and analysis.
 
 Features:
 - Smart scheduling with time windows and frequency control
-- Response tracking with embeddings
+- Response tracking (embedded in the background by PollEmbeddingWriter)
 - Trend analysis and insights
 - Trail/todo integration
 """
 
-import json
 import logging
 import random
 from datetime import datetime, timedelta
@@ -18,33 +17,36 @@ import yaml
 from sqlalchemy import and_, func, select
 
 from ..core.database import get_db_session
-from ..domain.interfaces import EmbeddingProvider
 from ..models.poll_response import PollResponse, PollTemplate
+from .poll_analytics import get_poll_statistics
+from .poll_embeddings import (
+    PollEmbeddingWriter,
+    get_poll_embedding_writer,
+    poll_embedding_text,
+)
 
 logger = logging.getLogger(__name__)
 
 
-def _default_embedding_provider() -> EmbeddingProvider:
-    """Lazy import to avoid cross-context import at module level."""
-    from ..services.embedding_service import EmbeddingService
-
-    return EmbeddingService()
-
-
 class PollingService:
     """Manages poll scheduling, delivery, and analysis."""
 
     def __init__(
         self,
-        embedding_provider: Optional[EmbeddingProvider] = None,
+        embedding_writer: Optional[PollEmbeddingWriter] = None,
     ):
         self.templates: List[Dict] = []
         self.config: Dict = {}
-        self._embedding_provider: EmbeddingProvider = (
-            embedding_provider or _default_embedding_provider()
-        )
+        self._embedding_writer: Optional[PollEmbeddingWriter] = embedding_writer
         self._load_templates()
 
+    @property
+    def embedding_writer(self) -> PollEmbeddingWriter:
+        """Resolved on first use so construction does not need the container."""
+        if self._embedding_writer is None:
+            self._embedding_writer = get_poll_embedding_writer()
+        return self._embedding_writer
+
     def _load_templates(self):
         """Load poll templates from YAML config."""
         try:
@@ -126,18 +128,17 @@ class PollingService:
                 hour=0, minute=0, second=0, microsecond=0
             )
             result = await session.execute(
-                select(PollResponse.context_metadata).where(
+                select(PollResponse.template_id)
+                .where(
                     and_(
                         PollResponse.chat_id == chat_id,
                         PollResponse.created_at >= today_start,
+                        PollResponse.template_id.is_not(None),
                     )
                 )
+                .distinct()
             )
-            sent_ids = set()
-            for (metadata,) in result:
-                if metadata and "template_id" in metadata:
-                    sent_ids.add(metadata["template_id"])
-            return sent_ids
+            return set(result.scalars())
 
     async def get_next_poll(self, chat_id: int) -> Optional[Dict]:
         """
@@ -293,9 +294,10 @@ class PollingService:
         poll_type: str,
         poll_category: Optional[str] = None,
         context_metadata: Optional[Dict] = None,
+        template_id: Optional[str] = None,
     ) -> PollResponse:
         """
-        Save poll response to database with embedding.
+        Save poll response to database and queue it for embedding.
 
         Args:
             chat_id: Telegram chat ID
@@ -307,25 +309,22 @@ class PollingService:
             selected_option_text: Text of selected option
             poll_type: Type of poll (emotion, decision, activity, etc)
             poll_category: Category (work, personal, health, etc)
-            context_metadata: Additional context (template_id, current_trail, etc)
+            context_metadata: Additional context (current_trail, origin, etc)
+            template_id: Source template ID (defaults to context_metadata's)
 
         Returns:
             Saved PollResponse object
         """
         now = datetime.utcnow()
-
-        # Generate embedding for semantic search
-        embedding_text = f"{question}\n{selected_option_text}"
-        embedding_vector = await self._embedding_provider.generate_embedding(
-            embedding_text
-        )
-        embedding_json = json.dumps(embedding_vector) if embedding_vector else None
+        if template_id is None and context_metadata:
+            template_id = context_metadata.get("template_id")
 
         # Create response object
         response = PollResponse(
             chat_id=chat_id,
             poll_id=poll_id,
             message_id=message_id,
+            template_id=str(template_id) if template_id is not None else None,
             question=question,
             options=options,
             selected_option_id=selected_option_id,
@@ -336,7 +335,6 @@ class PollingService:
             day_of_week=now.weekday(),
             hour_of_day=now.hour,
             context_metadata=context_metadata or {},
-            embedding=embedding_json,
         )
 
         async with get_db_session() as session:
@@ -344,6 +342,11 @@ class PollingService:
             await session.commit()
             await session.refresh(response)
 
+        # Embedded in a batch after the answer is stored
+        self.embedding_writer.enqueue(
+            response.id, poll_embedding_text(question, selected_option_text)
+        )
+
         logger.info(
             f"Saved poll response: {response.id} "
             f"(type={poll_type}, answer='{selected_option_text}')"
@@ -385,57 +388,18 @@ class PollingService:
         """
         Get statistics and trends from poll responses.
 
+        Counted in SQL; windows of 30+ days read the hourly rollup
+        (see poll_analytics).
+
         Returns dict with:
         - total_responses
         - by_type: counts by poll_type
         - by_category: counts by poll_category
         - by_hour: distribution by hour of day
         - by_day: distribution by day of week
-        - recent_trends: patterns in recent responses
+        - avg_per_day
         """
-        responses = await self.get_responses(chat_id, days=days)
-
-        if not responses:
-            return {
-                "total_responses": 0,
-                "days_analyzed": days,
-                "message": "No poll responses in time range",
-            }
-
-        # Count by type
-        by_type = {}
-        for r in responses:
-            by_type[r.poll_type] = by_type.get(r.poll_type, 0) + 1
-
-        # Count by category
-        by_category = {}
-        for r in responses:
-            if r.poll_category:
-                by_category[r.poll_category] = by_category.get(r.poll_category, 0) + 1
-
-        # Distribution by hour
-        by_hour = {}
-        for r in responses:
-            if r.hour_of_day is not None:
-                by_hour[r.hour_of_day] = by_hour.get(r.hour_of_day, 0) + 1
-
-        # Distribution by day of week
-        by_day = {}
-        day_names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-        for r in responses:
-            if r.day_of_week is not None:
-                day_name = day_names[r.day_of_week]
-                by_day[day_name] = by_day.get(day_name, 0) + 1
-
-        return {
-            "total_responses": len(responses),
-            "days_analyzed": days,
-            "by_type": by_type,
-            "by_category": by_category,
-            "by_hour": sorted(by_hour.items()),
-            "by_day": by_day,
-            "avg_per_day": len(responses) / days,
-        }
+        return await get_poll_statistics(chat_id, days=days)
 
 
 # Singleton instance
@@ -6,12 +6,18 @@ When a user replies to a bot message, this service provides
 the context needed to continue that conversation appropriately.
 """
 
+import heapq
+import itertools
+import json
 import logging
+import sqlite3
+import threading
 from collections import OrderedDict
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field, fields
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -142,6 +148,257 @@ class LRUCache(OrderedDict):
         except KeyError:
             return default
 
+    def peek(self, key, default=None):
+        """Get a value without marking it as recently used."""
+        return OrderedDict.get(self, key, default)
+
+
+_REPLY_CONTEXT_FIELDS = {f.name for f in fields(ReplyContext)}
+
+
+def _context_to_json(context: ReplyContext) -> str:
+    data = asdict(context)
+    data["message_type"] = context.message_type.value
+    data["created_at"] = context.created_at.isoformat()
+    return json.dumps(data, default=str)
+
+
+def _context_from_json(payload: str) -> ReplyContext:
+    data = json.loads(payload)
+    data["message_type"] = MessageType(data["message_type"])
+    data["created_at"] = datetime.fromisoformat(data["created_at"])
+    return ReplyContext(**{k: v for k, v in data.items() if k in _REPLY_CONTEXT_FIELDS})
+
+
+class ReplyContextSpillStore:
+    """SQLite-backed second tier for reply contexts.
+
+    Every tracked context is written through, so contexts evicted from the
+    in-memory LRU (or lost on restart) can still be found by message,
+    session or recency. Lookups are point/range queries on indexed columns.
+    Errors are logged and treated as misses; the in-memory tier stays
+    authoritative.
+
+    save() only queues the row; a writer thread commits queued rows in
+    batches, so the event loop never waits on SQLite for a write. Rows stay
+    queued until committed, and lookups check the queue before reading
+    through a separate connection (WAL readers never wait on the writer),
+    so they see every save without forcing a flush. Deletes flush first.
+    """
+
+    def __init__(self, db_path: str, flush_interval: float = 0.5):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            db_path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS reply_contexts (
+                chat_id INTEGER NOT NULL,
+                message_id INTEGER NOT NULL,
+                message_type TEXT NOT NULL,
+                session_id TEXT,
+                created_at TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                PRIMARY KEY (chat_id, message_id)
+            );
+            CREATE INDEX IF NOT EXISTS ix_reply_contexts_chat_type_created
+                ON reply_contexts (chat_id, message_type, created_at);
+            CREATE INDEX IF NOT EXISTS ix_reply_contexts_session_created
+                ON reply_contexts (session_id, created_at);
+            CREATE INDEX IF NOT EXISTS ix_reply_contexts_created
+                ON reply_contexts (created_at);
+            """)
+        self._reader = sqlite3.connect(
+            db_path, check_same_thread=False, isolation_level=None
+        )
+        self._read_lock = threading.Lock()
+
+        # (chat_id, message_id) -> row; later saves of a message replace
+        # earlier ones still waiting to be written
+        self._pending: Dict[Tuple[int, int], tuple] = {}
+        self._pending_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._writer = threading.Thread(
+            target=self._write_loop, name="reply-context-spill", daemon=True
+        )
+        self._writer.start()
+
+    def _write_loop(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """Write queued rows in one transaction. Returns the number written."""
+        with self._lock:
+            with self._pending_lock:
+                batch = dict(self._pending)
+            if not batch:
+                return 0
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO reply_contexts "
+                    "(chat_id, message_id, message_type, session_id, created_at, payload) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    batch.values(),
+                )
+                self._conn.execute("COMMIT")
+                written = len(batch)
+            except sqlite3.Error as e:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                logger.warning(f"Failed to spill {len(batch)} reply context(s): {e}")
+                written = 0
+            with self._pending_lock:
+                # Keep rows re-queued while this batch was being written
+                for key, row in batch.items():
+                    if self._pending.get(key) is row:
+                        del self._pending[key]
+            return written
+
+    def _fetch_one(
+        self, sql: str, params: tuple, matches: Callable[[tuple], bool]
+    ) -> Optional[ReplyContext]:
+        """Newest row matching both the queue predicate and the SQL query.
+
+        The query must select chat_id, message_id, created_at, payload.
+        """
+        with self._pending_lock:
+            pending = dict(self._pending)
+        candidates = [row for row in pending.values() if matches(row)]
+        try:
+            with self._read_lock:
+                row = self._reader.execute(sql, params).fetchone()
+            if row and (row[0], row[1]) not in pending:
+                candidates.append((row[0], row[1], None, None, row[2], row[3]))
+            if not candidates:
+                return None
+            newest = max(candidates, key=lambda r: r[4])
+            return _context_from_json(newest[5])
+        except (sqlite3.Error, ValueError, TypeError) as e:
+            logger.warning(f"Reply context spill lookup failed: {e}")
+            return None
+
+    def save(self, context: ReplyContext) -> None:
+        try:
+            row = (
+                context.chat_id,
+                context.message_id,
+                context.message_type.value,
+                context.session_id,
+                context.created_at.isoformat(),
+                _context_to_json(context),
+            )
+        except (TypeError, ValueError) as e:
+            logger.warning(
+                f"Failed to spill reply context {context.chat_id}/{context.message_id}: {e}"
+            )
+            return
+        with self._pending_lock:
+            self._pending[(context.chat_id, context.message_id)] = row
+        self._wake.set()
+
+    def load(self, chat_id: int, message_id: int) -> Optional[ReplyContext]:
+        return self._fetch_one(
+            "SELECT chat_id, message_id, created_at, payload FROM reply_contexts "
+            "WHERE chat_id = ? AND message_id = ?",
+            (chat_id, message_id),
+            lambda row: row[0] == chat_id and row[1] == message_id,
+        )
+
+    def find_recent(
+        self, chat_id: int, message_type: MessageType, since: datetime
+    ) -> Optional[ReplyContext]:
+        since_iso = since.isoformat()
+        return self._fetch_one(
+            "SELECT chat_id, message_id, created_at, payload FROM reply_contexts "
+            "WHERE chat_id = ? AND message_type = ? AND created_at >= ? "
+            "ORDER BY created_at DESC LIMIT 1",
+            (chat_id, message_type.value, since_iso),
+            lambda row: (
+                row[0] == chat_id
+                and row[2] == message_type.value
+                and row[4] >= since_iso
+            ),
+        )
+
+    def find_latest_for_session(
+        self, session_id: str, since: datetime
+    ) -> Optional[ReplyContext]:
+        since_iso = since.isoformat()
+        return self._fetch_one(
+            "SELECT chat_id, message_id, created_at, payload FROM reply_contexts "
+            "WHERE session_id = ? AND created_at >= ? "
+            "ORDER BY created_at DESC LIMIT 1",
+            (session_id, since_iso),
+            lambda row: row[3] == session_id and row[4] >= since_iso,
+        )
+
+    def _delete(self, where: str, params: tuple) -> int:
+        try:
+            self.flush()
+            with self._lock:
+                cursor = self._conn.execute(
+                    f"DELETE FROM reply_contexts WHERE {where}", params
+                )
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            logger.warning(f"Reply context spill purge failed: {e}")
+            return 0
+
+    def purge_older_than(
+        self, cutoff: datetime, user_ids: Optional[Sequence[int]] = None
+    ) -> int:
+        """Delete rows created before cutoff, optionally only for some users."""
+        if user_ids is None:
+            return self._delete("created_at < ?", (cutoff.isoformat(),))
+        if not user_ids:
+            return 0
+        placeholders = ", ".join("?" * len(user_ids))
+        return self._delete(
+            f"created_at < ? AND json_extract(payload, '$.user_id') IN ({placeholders})",
+            (cutoff.isoformat(), *user_ids),
+        )
+
+    def delete_for_user(self, user_id: int, chat_ids: Sequence[int]) -> int:
+        """Delete rows triggered by the user or belonging to their chats."""
+        placeholders = ", ".join("?" * len(chat_ids))
+        where = "json_extract(payload, '$.user_id') = ?"
+        if chat_ids:
+            where += f" OR chat_id IN ({placeholders})"
+        return self._delete(where, (user_id, *chat_ids))
+
+    def count(self) -> int:
+        """Written plus queued rows (a queued update of a written row counts twice)."""
+        with self._pending_lock:
+            queued = len(self._pending)
+        try:
+            with self._read_lock:
+                written = self._reader.execute(
+                    "SELECT COUNT(*) FROM reply_contexts"
+                ).fetchone()[0]
+        except sqlite3.Error:
+            written = 0
+        return written + queued
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake.set()
+        self._writer.join(timeout=5)
+        self.flush()
+        with self._read_lock:
+            self._reader.close()
+        with self._lock:
+            self._conn.close()
+
 
 class ReplyContextService:
     """
@@ -150,14 +407,19 @@ class ReplyContextService:
     Features:
     - LRU cache with configurable max size
     - TTL-based expiration
-    - Lookup by message_id
+    - Lookup by message_id, by session and by (chat, type) recency
+    - Optional SQLite spill tier that survives restarts and eviction
     - Context injection for reply handling
+
+    Secondary indexes and the expiry heap are updated on every insert,
+    overwrite, eviction and expiry, so no lookup scans the whole cache.
     """
 
     def __init__(
         self,
         max_cache_size: int = 1000,
         ttl_hours: int = 24,
+        spill_path: Optional[str] = None,
     ):
         self.max_cache_size = max_cache_size
         self.ttl_hours = ttl_hours
@@ -167,12 +429,27 @@ class ReplyContextService:
             max_size=max_cache_size, on_evict=self._on_cache_evict
         )
 
-        # Secondary index: session_id -> list of message_ids
-        # Useful for finding all messages in a Claude session
-        self._session_messages: Dict[str, List[int]] = {}
+        # Secondary index: session_id -> {message_id: chat_id}, oldest first
+        self._session_messages: Dict[str, "OrderedDict[int, int]"] = {}
+
+        # Secondary index: (chat_id, message_type) -> message_ids, oldest first
+        self._type_index: Dict[Tuple[int, MessageType], "OrderedDict[int, None]"] = {}
+
+        # Min-heap of (created_at, seq, key, context); entries whose context
+        # is no longer cached are skipped lazily and compacted periodically
+        self._expiry_heap: List[Tuple[datetime, int, tuple, ReplyContext]] = []
+        self._heap_seq = itertools.count()
+
+        self._spill: Optional[ReplyContextSpillStore] = None
+        if spill_path:
+            try:
+                self._spill = ReplyContextSpillStore(spill_path)
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"Reply context spill tier disabled: {e}")
 
         logger.info(
-            f"ReplyContextService initialized: max_size={max_cache_size}, ttl={ttl_hours}h"
+            f"ReplyContextService initialized: max_size={max_cache_size}, "
+            f"ttl={ttl_hours}h, spill={'on' if self._spill else 'off'}"
         )
 
     def _make_key(self, chat_id: int, message_id: int) -> tuple:
@@ -183,16 +460,101 @@ class ReplyContextService:
         """
         Called when a cache entry is evicted by LRU.
 
-        Cleans up the corresponding _session_messages entry so the
-        secondary index stays bounded alongside the primary cache.
+        Cleans up the secondary indexes so they stay bounded alongside
+        the primary cache. The expiry heap entry is dropped lazily.
+        """
+        self._unindex(context)
+
+    def _index(self, key: tuple, context: ReplyContext) -> None:
+        """Add a cached context to the secondary indexes and expiry heap."""
+        if context.session_id:
+            messages = self._session_messages.setdefault(
+                context.session_id, OrderedDict()
+            )
+            self._insert_by_created_at(
+                messages, context, context.chat_id, lambda mid: messages[mid]
+            )
+
+        by_type = self._type_index.setdefault(
+            (context.chat_id, context.message_type), OrderedDict()
+        )
+        self._insert_by_created_at(by_type, context, None, lambda _: context.chat_id)
+
+        heapq.heappush(
+            self._expiry_heap,
+            (context.created_at, next(self._heap_seq), key, context),
+        )
+        if len(self._expiry_heap) > 2 * self.max_cache_size:
+            self._compact_expiry_heap()
+
+    def _insert_by_created_at(
+        self,
+        ordered: "OrderedDict[int, Any]",
+        context: ReplyContext,
+        value: Any,
+        chat_of: Callable[[int], int],
+    ) -> None:
+        """Insert into an oldest-first index, keeping it sorted by created_at.
+
+        New contexts append in order; only older ones (promoted from the
+        spill tier) trigger a re-sort of this one index.
         """
+        ordered[context.message_id] = value
+        ordered.move_to_end(context.message_id)
+        if len(ordered) < 2:
+            return
+
+        def created_at(message_id: int) -> datetime:
+            cached = self._cache.peek(self._make_key(chat_of(message_id), message_id))
+            return cached.created_at if cached is not None else datetime.min
+
+        previous = next(itertools.islice(reversed(ordered), 1, None))
+        if created_at(previous) <= context.created_at:
+            return
+        entries = sorted(ordered.items(), key=lambda item: created_at(item[0]))
+        ordered.clear()
+        ordered.update(entries)
+
+    def _unindex(self, context: ReplyContext) -> None:
+        """Remove a context from the secondary indexes."""
         if context.session_id and context.session_id in self._session_messages:
-            msg_list = self._session_messages[context.session_id]
-            if context.message_id in msg_list:
-                msg_list.remove(context.message_id)
-            if not msg_list:
+            messages = self._session_messages[context.session_id]
+            if messages.get(context.message_id) == context.chat_id:
+                del messages[context.message_id]
+            if not messages:
                 del self._session_messages[context.session_id]
 
+        type_key = (context.chat_id, context.message_type)
+        by_type = self._type_index.get(type_key)
+        if by_type is not None:
+            by_type.pop(context.message_id, None)
+            if not by_type:
+                del self._type_index[type_key]
+
+    def _compact_expiry_heap(self) -> None:
+        """Rebuild the expiry heap from live cache entries only."""
+        self._expiry_heap = [
+            entry
+            for entry in self._expiry_heap
+            if self._cache.peek(entry[2]) is entry[3]
+        ]
+        heapq.heapify(self._expiry_heap)
+
+    def _cache_context(self, context: ReplyContext) -> None:
+        """Insert a context into the LRU and keep the indexes in sync."""
+        key = self._make_key(context.chat_id, context.message_id)
+        previous = self._cache.peek(key)
+        if previous is not None:
+            self._unindex(previous)
+        self._cache[key] = context
+        self._index(key, context)
+
+    def store_context(self, context: ReplyContext) -> None:
+        """Cache an already-built context (and write it to the spill tier)."""
+        self._cache_context(context)
+        if self._spill:
+            self._spill.save(context)
+
     def track_message(
         self,
         message_id: int,
@@ -222,14 +584,7 @@ class ReplyContextService:
             **kwargs,
         )
 
-        key = self._make_key(chat_id, message_id)
-        self._cache[key] = context
-
-        # Track session messages
-        if context.session_id:
-            if context.session_id not in self._session_messages:
-                self._session_messages[context.session_id] = []
-            self._session_messages[context.session_id].append(message_id)
+        self.store_context(context)
 
         logger.debug(
             f"Tracked message {message_id} in chat {chat_id}: "
@@ -258,6 +613,12 @@ class ReplyContextService:
         key = self._make_key(chat_id, message_id)
         context = self._cache.get(key)
 
+        if context is None and self._spill:
+            context = self._spill.load(chat_id, message_id)
+            if context is not None:
+                # Promote back into memory without rewriting the spill row
+                self._cache_context(context)
+
         if context is None:
             return None
 
@@ -277,16 +638,19 @@ class ReplyContextService:
         Returns:
             Most recent ReplyContext for this session, or None
         """
-        message_ids = self._session_messages.get(session_id, [])
-        if not message_ids:
-            return None
-
-        # Get most recent (last in list)
-        for msg_id in reversed(message_ids):
-            # We need chat_id to look up, but we don't have it here
-            # This is a limitation - we'd need to iterate the cache
-            # For now, return None and use message-based lookup instead
-            pass
+        messages = self._session_messages.get(session_id)
+        if messages:
+            for message_id, chat_id in reversed(messages.items()):
+                context = self._cache.peek(self._make_key(chat_id, message_id))
+                if context is not None and not context.is_expired(self.ttl_hours):
+                    return context
+
+        if self._spill:
+            since = datetime.now() - timedelta(hours=self.ttl_hours)
+            context = self._spill.find_latest_for_session(session_id, since)
+            if context is not None:
+                self._cache_context(context)
+            return context
 
         return None
 
@@ -308,19 +672,24 @@ class ReplyContextService:
             Most recent ReplyContext of the specified type, or None
         """
         cutoff = datetime.now() - timedelta(minutes=max_age_minutes)
-        best = None
 
-        for key, ctx in self._cache.items():
-            if (
-                ctx.chat_id == chat_id
-                and ctx.message_type == message_type
-                and ctx.created_at >= cutoff
-                and not ctx.is_expired(self.ttl_hours)
-            ):
-                if best is None or ctx.created_at > best.created_at:
-                    best = ctx
+        message_ids = self._type_index.get((chat_id, message_type))
+        if message_ids:
+            # Newest first; the index is kept sorted by created_at
+            for message_id in reversed(message_ids):
+                ctx = self._cache.peek(self._make_key(chat_id, message_id))
+                if ctx is None:
+                    continue
+                if ctx.created_at >= cutoff and not ctx.is_expired(self.ttl_hours):
+                    return ctx
+
+        if self._spill:
+            ctx = self._spill.find_recent(chat_id, message_type, cutoff)
+            if ctx is not None and not ctx.is_expired(self.ttl_hours):
+                self._cache_context(ctx)
+                return ctx
 
-        return best
+        return None
 
     def track_claude_response(
         self,
@@ -517,31 +886,72 @@ class ReplyContextService:
 
         return "\n".join(parts)
 
-    def cleanup_expired(self) -> int:
+    def cleanup_expired(self, purge_spill: bool = True) -> int:
         """Remove expired contexts and their session index entries.
 
+        With purge_spill=False the spill tier is left for
+        purge_expired_spill(), which can run in a worker thread.
+
         Returns count of removed items.
         """
-        expired_entries = []
+        removed = 0
+
+        # Pop oldest-first until the first live, unexpired context
+        while self._expiry_heap:
+            _, _, key, context = self._expiry_heap[0]
+            if self._cache.peek(key) is not context:
+                heapq.heappop(self._expiry_heap)  # evicted or overwritten
+                continue
+            if not context.is_expired(self.ttl_hours):
+                break
+            heapq.heappop(self._expiry_heap)
+            del self._cache[key]
+            self._unindex(context)
+            removed += 1
 
-        for key, context in list(self._cache.items()):
-            if context.is_expired(self.ttl_hours):
-                expired_entries.append((key, context))
+        if removed:
+            logger.info(f"Cleaned up {removed} expired contexts")
 
-        for key, context in expired_entries:
-            del self._cache[key]
-            # Clean up session messages for the expired entry
-            if context.session_id and context.session_id in self._session_messages:
-                msg_list = self._session_messages[context.session_id]
-                if context.message_id in msg_list:
-                    msg_list.remove(context.message_id)
-                if not msg_list:
-                    del self._session_messages[context.session_id]
+        if purge_spill:
+            self.purge_expired_spill()
+
+        return removed
 
-        if expired_entries:
-            logger.info(f"Cleaned up {len(expired_entries)} expired contexts")
+    def purge_expired_spill(self) -> int:
+        """Delete expired rows from the spill tier; safe to call from a worker thread."""
+        if not self._spill:
+            return 0
+        cutoff = datetime.now() - timedelta(hours=self.ttl_hours)
+        purged = self._spill.purge_older_than(cutoff)
+        if purged:
+            logger.info(f"Purged {purged} expired contexts from spill tier")
+        return purged
 
-        return len(expired_entries)
+    def forget_user(self, user_id: int, chat_ids: Sequence[int]) -> int:
+        """Drop every context of a user (GDPR deletion), in memory and spilled.
+
+        Returns the number of spilled rows deleted.
+        """
+        chats = set(chat_ids)
+        for key in list(self._cache):
+            context = self._cache.peek(key)
+            if context.chat_id in chats or context.user_id == user_id:
+                del self._cache[key]
+                self._unindex(context)
+        if not self._spill:
+            return 0
+        return self._spill.delete_for_user(user_id, list(chats))
+
+    def purge_spill_older_than(self, cutoff: datetime, user_ids: Sequence[int]) -> int:
+        """Retention purge of the spill tier; safe to call from a worker thread."""
+        if not self._spill:
+            return 0
+        return self._spill.purge_older_than(cutoff, user_ids=user_ids)
+
+    def close(self) -> None:
+        """Write out queued spill rows and close the spill tier."""
+        if self._spill:
+            self._spill.close()
 
     def get_stats(self) -> dict:
         """Get cache statistics."""
@@ -550,6 +960,7 @@ class ReplyContextService:
             "max_size": self.max_cache_size,
             "sessions_tracked": len(self._session_messages),
             "ttl_hours": self.ttl_hours,
+            "spill_size": self._spill.count() if self._spill else None,
         }
 
 
@@ -563,6 +974,7 @@ def get_reply_context_service() -> ReplyContextService:
 def init_reply_context_service(
     max_cache_size: int = 1000,
     ttl_hours: int = 24,
+    spill_path: Optional[str] = None,
 ) -> ReplyContextService:
     """Initialize the reply context service with custom settings.
 
@@ -574,6 +986,7 @@ def init_reply_context_service(
     service = ReplyContextService(
         max_cache_size=max_cache_size,
         ttl_hours=ttl_hours,
+        spill_path=spill_path,
     )
     get_container().register_instance("reply_context", service)
     return service
@@ -1,30 +1,194 @@
 """
 Routing memory service - learns and remembers where content should go
-Stores routing preferences in a human-readable markdown file
+
+Routing preferences live in memory (dict lookups per suggestion) and are
+persisted to a small SQLite table on every decision. The human-readable
+markdown file in the vault is an export for Obsidian: it is regenerated
+in the background, debounced, and only read once to seed an empty store.
 """
 
+import asyncio
 import logging
 import re
+import sqlite3
+import threading
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Deque, Dict, Optional, Tuple
 from urllib.parse import urlparse
 
 import yaml
 
+from ..utils.task_tracker import create_tracked_task
+
 logger = logging.getLogger(__name__)
 
+RECENT_ROUTES_LIMIT = 20
+
+# Seed for a brand-new store: content type -> destination
+DEFAULT_CONTENT_TYPES = {"links": "inbox", "voice": "daily", "images": "inbox"}
+
+
+class RoutingStore:
+    """SQLite persistence for routing memory (one row per domain/type)."""
+
+    def __init__(self, db_path: str = ":memory:"):
+        self.db_path = db_path
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            db_path, check_same_thread=False, isolation_level=None
+        )
+        if db_path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS routing_domains (
+                domain TEXT PRIMARY KEY,
+                destination TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS routing_content_types (
+                content_type TEXT PRIMARY KEY,
+                destination TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS routing_recent (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                entry TEXT NOT NULL
+            );
+            """)
+
+    def load(self) -> Dict:
+        """Load everything into the structure used by RoutingMemory."""
+        with self._lock:
+            domains = self._conn.execute(
+                "SELECT domain, destination, count FROM routing_domains"
+            ).fetchall()
+            types = self._conn.execute(
+                "SELECT content_type, destination, count FROM routing_content_types"
+            ).fetchall()
+            recent = self._conn.execute(
+                "SELECT entry FROM routing_recent ORDER BY id DESC LIMIT ?",
+                (RECENT_ROUTES_LIMIT,),
+            ).fetchall()
+        return {
+            "domains": {d: {"destination": dest, "count": c} for d, dest, c in domains},
+            "content_types": {
+                t: {"destination": dest, "count": c} for t, dest, c in types
+            },
+            "recent": [row[0] for row in reversed(recent)],
+        }
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT (SELECT COUNT(*) FROM routing_domains)"
+                " + (SELECT COUNT(*) FROM routing_content_types)"
+            ).fetchone()
+        return row[0] == 0
+
+    def replace_all(self, memory: Dict) -> None:
+        """Overwrite the store with a full memory structure (seeding)."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for table in ("routing_domains", "routing_content_types"):
+                    self._conn.execute(f"DELETE FROM {table}")
+                self._conn.execute("DELETE FROM routing_recent")
+                self._conn.executemany(
+                    "INSERT INTO routing_domains VALUES (?, ?, ?)",
+                    [
+                        (d, info["destination"], info["count"])
+                        for d, info in memory["domains"].items()
+                    ],
+                )
+                self._conn.executemany(
+                    "INSERT INTO routing_content_types VALUES (?, ?, ?)",
+                    [
+                        (t, info["destination"], info["count"])
+                        for t, info in memory["content_types"].items()
+                    ],
+                )
+                self._conn.executemany(
+                    "INSERT INTO routing_recent (entry) VALUES (?)",
+                    [(entry,) for entry in memory["recent"][-RECENT_ROUTES_LIMIT:]],
+                )
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def record(
+        self,
+        domain: Optional[Tuple[str, str, int]],
+        content_type: Tuple[str, str, int],
+        recent_entry: str,
+    ) -> None:
+        """Persist one routing decision in a single transaction."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                if domain:
+                    self._conn.execute(
+                        "INSERT INTO routing_domains VALUES (?, ?, ?) "
+                        "ON CONFLICT(domain) DO UPDATE SET "
+                        "destination = excluded.destination, count = excluded.count",
+                        domain,
+                    )
+                self._conn.execute(
+                    "INSERT INTO routing_content_types VALUES (?, ?, ?) "
+                    "ON CONFLICT(content_type) DO UPDATE SET "
+                    "destination = excluded.destination, count = excluded.count",
+                    content_type,
+                )
+                cursor = self._conn.execute(
+                    "INSERT INTO routing_recent (entry) VALUES (?)", (recent_entry,)
+                )
+                self._conn.execute(
+                    "DELETE FROM routing_recent WHERE id <= ?",
+                    (cursor.lastrowid - RECENT_ROUTES_LIMIT,),
+                )
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
 
 class RoutingMemory:
     """Learns routing preferences from user choices"""
 
-    def __init__(self, vault_path: Optional[str] = None):
+    def __init__(
+        self,
+        vault_path: Optional[str] = None,
+        db_path: Optional[str] = None,
+        export_delay: float = 2.0,
+    ):
         self.config = self._load_config()
         vault = vault_path or self.config.get("obsidian", {}).get(
             "vault_path", "~/Research/vault"
         )
         self.vault_path = Path(vault).expanduser()
         self.memory_file = self.vault_path / "meta" / "telegram-routing.md"
+        self.export_delay = export_delay
+
+        # Without a db_path the markdown file is the only thing that persists
+        self._store = RoutingStore(db_path or ":memory:")
+        self._domains: Dict[str, Dict] = {}
+        self._content_types: Dict[str, Dict] = {}
+        self._recent: Deque[str] = deque(maxlen=RECENT_ROUTES_LIMIT)
+
+        self._export_dirty = False
+        self._export_task: Optional[asyncio.Task] = None
+        self._write_lock = threading.Lock()
+
+        self._load_store()
         self._ensure_memory_file()
 
     def _load_config(self) -> Dict:
@@ -37,42 +201,42 @@ class RoutingMemory:
             logger.error(f"Error loading routing config: {e}")
             return {}
 
+    def _load_store(self) -> None:
+        """Fill the in-memory model, seeding an empty store first."""
+        try:
+            if self._store.is_empty():
+                if self.memory_file.exists():
+                    memory = self._parse_memory()
+                    logger.info(f"Imported routing memory from {self.memory_file}")
+                else:
+                    memory = {
+                        "domains": {},
+                        "content_types": {
+                            ctype: {"destination": dest, "count": 0}
+                            for ctype, dest in DEFAULT_CONTENT_TYPES.items()
+                        },
+                        "recent": [],
+                    }
+                self._store.replace_all(memory)
+            else:
+                memory = self._store.load()
+        except sqlite3.Error as e:
+            logger.error(f"Error loading routing store: {e}")
+            memory = self._parse_memory()
+
+        self._domains = memory["domains"]
+        self._content_types = memory["content_types"]
+        self._recent.extend(memory["recent"])
+
     def _ensure_memory_file(self) -> None:
         """Create memory file if it doesn't exist"""
         self.memory_file.parent.mkdir(parents=True, exist_ok=True)
         if not self.memory_file.exists():
-            initial_content = """---
-description: Telegram bot routing memory - tracks where content gets saved
-updated: {date}
----
-
-# Routing Memory
-
-This file tracks routing preferences learned from your choices.
-The bot uses this to suggest default destinations for similar content.
-
-## Domains
-
-<!-- Format: domain -> destination (count) -->
-
-## Content Types
-
-<!-- Format: type -> destination (count) -->
-- links -> inbox (default)
-- voice -> daily (default)
-- images -> inbox (default)
-
-## Recent Routes
-
-<!-- Last 20 routing decisions -->
-
-""".format(date=datetime.now().strftime("%Y-%m-%d"))
-            with open(self.memory_file, "w", encoding="utf-8") as f:
-                f.write(initial_content)
+            self.export_markdown()
             logger.info(f"Created routing memory file: {self.memory_file}")
 
     def _parse_memory(self) -> Dict:
-        """Parse the memory file into structured data"""
+        """Parse the markdown export into structured data"""
         try:
             with open(self.memory_file, "r", encoding="utf-8") as f:
                 content = f.read()
@@ -125,30 +289,35 @@ The bot uses this to suggest default destinations for similar content.
             logger.error(f"Error parsing memory file: {e}")
             return {"domains": {}, "content_types": {}, "recent": []}
 
-    def _save_memory(self, memory: Dict) -> None:
-        """Save structured data back to memory file"""
-        try:
-            # Build domains section
-            domains_lines = ["<!-- Format: domain -> destination (count) -->"]
-            for domain, info in sorted(
-                memory["domains"].items(), key=lambda x: -x[1]["count"]
-            ):
-                domains_lines.append(
-                    f"- {domain} -> {info['destination']} ({info['count']})"
-                )
+    def snapshot(self) -> Dict:
+        """Copy of the current routing memory"""
+        return {
+            "domains": {d: dict(info) for d, info in self._domains.items()},
+            "content_types": {t: dict(info) for t, info in self._content_types.items()},
+            "recent": list(self._recent),
+        }
+
+    def _render_markdown(self) -> str:
+        """Render the in-memory model as the Obsidian markdown export"""
+        # Build domains section
+        domains_lines = ["<!-- Format: domain -> destination (count) -->"]
+        for domain, info in sorted(self._domains.items(), key=lambda x: -x[1]["count"]):
+            domains_lines.append(
+                f"- {domain} -> {info['destination']} ({info['count']})"
+            )
 
-            # Build content types section
-            types_lines = ["<!-- Format: type -> destination (count) -->"]
-            for ctype, info in memory["content_types"].items():
-                count_str = "default" if info["count"] == 0 else str(info["count"])
-                types_lines.append(f"- {ctype} -> {info['destination']} ({count_str})")
+        # Build content types section
+        types_lines = ["<!-- Format: type -> destination (count) -->"]
+        for ctype, info in self._content_types.items():
+            count_str = "default" if info["count"] == 0 else str(info["count"])
+            types_lines.append(f"- {ctype} -> {info['destination']} ({count_str})")
 
-            # Build recent section (keep last 20)
-            recent_lines = ["<!-- Last 20 routing decisions -->"]
-            for item in memory["recent"][-20:]:
-                recent_lines.append(f"- {item}")
+        # Build recent section
+        recent_lines = [f"<!-- Last {RECENT_ROUTES_LIMIT} routing decisions -->"]
+        for item in self._recent:
+            recent_lines.append(f"- {item}")
 
-            content = f"""---
+        return f"""---
 description: Telegram bot routing memory - tracks where content gets saved
 updated: {datetime.now().strftime("%Y-%m-%d")}
 ---
@@ -171,12 +340,56 @@ The bot uses this to suggest default destinations for similar content.
 {chr(10).join(recent_lines)}
 
 """
-            with open(self.memory_file, "w", encoding="utf-8") as f:
-                f.write(content)
 
+    def _write_markdown(self, content: str) -> None:
+        try:
+            with self._write_lock:
+                self.memory_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = self.memory_file.with_suffix(".md.tmp")
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    f.write(content)
+                tmp_file.replace(self.memory_file)
         except Exception as e:
             logger.error(f"Error saving memory file: {e}")
 
+    def export_markdown(self) -> None:
+        """Write the markdown export now"""
+        self._export_dirty = False
+        self._write_markdown(self._render_markdown())
+
+    def _schedule_export(self) -> None:
+        """Regenerate the markdown export, debounced when inside a loop"""
+        self._export_dirty = True
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self.export_markdown()
+            return
+        if self._export_task is None or self._export_task.done():
+            self._export_task = create_tracked_task(
+                self._debounced_export(), name="routing_memory_export"
+            )
+
+    async def _debounced_export(self) -> None:
+        # Decisions arriving during the delay or the write are folded in
+        while self._export_dirty:
+            await asyncio.sleep(self.export_delay)
+            self._export_dirty = False
+            await asyncio.to_thread(self._write_markdown, self._render_markdown())
+
+    async def flush(self) -> None:
+        """Write any pending markdown export immediately"""
+        if self._export_task is not None and not self._export_task.done():
+            self._export_task.cancel()
+            try:
+                await self._export_task
+            except asyncio.CancelledError:
+                pass
+        self._export_task = None
+        if self._export_dirty:
+            self._export_dirty = False
+            await asyncio.to_thread(self._write_markdown, self._render_markdown())
+
     def get_domain(self, url: str) -> str:
         """Extract domain from URL"""
         try:
@@ -193,19 +406,19 @@ The bot uses this to suggest default destinations for similar content.
         self, url: Optional[str] = None, content_type: str = "links"
     ) -> str:
         """Get suggested destination based on history"""
-        memory = self._parse_memory()
-
         # Check domain-specific routing first
         if url:
             domain = self.get_domain(url)
-            if domain in memory["domains"]:
-                dest = memory["domains"][domain]["destination"]
+            info = self._domains.get(domain)
+            if info:
+                dest = info["destination"]
                 logger.info(f"Suggesting {dest} for domain {domain} (learned)")
                 return dest
 
         # Fall back to content type default
-        if content_type in memory["content_types"]:
-            return memory["content_types"][content_type]["destination"]
+        info = self._content_types.get(content_type)
+        if info:
+            return info["destination"]
 
         return "inbox"
 
@@ -217,35 +430,43 @@ The bot uses this to suggest default destinations for similar content.
         title: Optional[str] = None,
     ) -> None:
         """Record a routing decision to learn from"""
-        memory = self._parse_memory()
+        domain = self.get_domain(url) if url else "n/a"
 
-        # Update domain count
+        # Update domain count; the latest choice becomes the destination
+        domain_row = None
         if url:
-            domain = self.get_domain(url)
-            if domain not in memory["domains"]:
-                memory["domains"][domain] = {"destination": destination, "count": 0}
-
-            memory["domains"][domain]["count"] += 1
-            # Update destination if this is a new choice
-            memory["domains"][domain]["destination"] = destination
+            info = self._domains.setdefault(
+                domain, {"destination": destination, "count": 0}
+            )
+            info["count"] += 1
+            info["destination"] = destination
+            domain_row = (domain, destination, info["count"])
 
         # Update content type count
-        if content_type not in memory["content_types"]:
-            memory["content_types"][content_type] = {"destination": "inbox", "count": 0}
-        memory["content_types"][content_type]["count"] += 1
-        memory["content_types"][content_type]["destination"] = destination
+        info = self._content_types.setdefault(
+            content_type, {"destination": "inbox", "count": 0}
+        )
+        info["count"] += 1
+        info["destination"] = destination
 
         # Add to recent
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-        domain = self.get_domain(url) if url else "n/a"
         title_short = (
             (title[:40] + "...") if title and len(title) > 40 else (title or "untitled")
         )
-        memory["recent"].append(
+        entry = (
             f"{timestamp} | {content_type} | {domain} | {destination} | {title_short}"
         )
+        self._recent.append(entry)
+
+        try:
+            self._store.record(
+                domain_row, (content_type, destination, info["count"]), entry
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Error persisting route: {e}")
 
-        self._save_memory(memory)
+        self._schedule_export()
         logger.info(f"Recorded route: {content_type} from {domain} -> {destination}")
 
 
@@ -257,5 +478,13 @@ def get_routing_memory() -> RoutingMemory:
     """Get the global routing memory instance"""
     global _routing_memory
     if _routing_memory is None:
-        _routing_memory = RoutingMemory()
+        from ..core.config import get_path
+
+        _routing_memory = RoutingMemory(db_path=get_path("routing_memory_db") or None)
     return _routing_memory
+
+
+async def flush_routing_memory() -> None:
+    """Write a pending markdown export, if the routing memory was used"""
+    if _routing_memory is not None:
+        await _routing_memory.flush()
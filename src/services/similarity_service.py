@@ -7,6 +7,7 @@ from ..core.database import get_db_session
 from ..core.vector_db import get_vector_db
 from ..models.image import Image
 from ..services.embedding_service import get_embedding_service
+from ..utils.vector_search import greedy_clusters
 
 logger = logging.getLogger(__name__)
 
@@ -107,28 +108,11 @@ class SimilarityService:
     ) -> List[List[str]]:
         """Cluster images by similarity"""
         try:
-            clusters = []
-            used_indices = set()
-
-            for i, embedding1 in enumerate(embeddings):
-                if i in used_indices:
-                    continue
-
-                cluster = [image_ids[i]]
-                used_indices.add(i)
-
-                for j, embedding2 in enumerate(embeddings):
-                    if j in used_indices or i == j:
-                        continue
-
-                    similarity = self.calculate_similarity(embedding1, embedding2)
-                    if similarity >= similarity_threshold:
-                        cluster.append(image_ids[j])
-                        used_indices.add(j)
-
-                clusters.append(cluster)
-
-            return clusters
+            matrix = np.asarray(embeddings, dtype=np.float32)
+            return [
+                [image_ids[index] for index in cluster]
+                for cluster in greedy_clusters(matrix, similarity_threshold)
+            ]
         except Exception as e:
             logger.error(f"Error clustering images: {e}")
             return [
@@ -349,123 +333,27 @@ class SimilarityService:
     ) -> int:
         """Regenerate embeddings for images that don't have them
 
+        Runs an EmbeddingBackfill over at most ``limit`` images; repeated
+        calls continue where the previous one stopped.
+
         Args:
             user_id: Only process images for this user
             limit: Maximum number of images to process
             all_modes: If True, process images from all modes. If False, only artistic mode (backward compatibility)
         """
+        from .embedding_backfill import EmbeddingBackfill
 
         try:
-            async with get_db_session() as session:
-                from sqlalchemy import select
-
-                # Query for images without embeddings
-                query = select(Image).where(
-                    Image.embedding.is_(None), Image.processing_status == "completed"
-                )
-
-                # Filter by mode if not processing all modes
-                if not all_modes:
-                    query = query.where(Image.mode_used == "artistic")
-
-                if user_id:
-                    query = query.join(Image.chat).where(
-                        Image.chat.has(user_id=user_id)
-                    )
-
-                query = query.limit(limit)
-
-                result = await session.execute(query)
-                images_without_embeddings = result.scalars().all()
-
-                if not images_without_embeddings:
-                    mode_msg = "all modes" if all_modes else "artistic mode"
-                    logger.info(
-                        f"No images found that need embedding regeneration ({mode_msg})"
-                    )
-                    return 0
-
-                mode_msg = "all modes" if all_modes else "artistic mode only"
-                logger.info(
-                    f"Regenerating embeddings for {len(images_without_embeddings)} images ({mode_msg})"
-                )
-
-                # Process images in batches
-                regenerated_count = 0
-                batch_size = 10
-
-                for i in range(0, len(images_without_embeddings), batch_size):
-                    batch = images_without_embeddings[i : i + batch_size]
-
-                    # Load image data and generate embeddings
-                    for image in batch:
-                        try:
-                            # Find accessible file path
-                            file_path = None
-                            if (
-                                hasattr(image, "compressed_path")
-                                and image.compressed_path
-                            ):
-                                from pathlib import Path
-
-                                file_path = Path(image.compressed_path)
-                            elif (
-                                hasattr(image, "original_path") and image.original_path
-                            ):
-                                from pathlib import Path
-
-                                file_path = Path(image.original_path)
-                            elif hasattr(image, "file_path") and image.file_path:
-                                from pathlib import Path
-
-                                file_path = Path(image.file_path)
-
-                            if file_path and file_path.exists():
-                                with open(file_path, "rb") as f:
-                                    image_data = f.read()
-
-                                # Generate embedding
-                                embedding_bytes = (
-                                    await self.embedding_service.generate_embedding(
-                                        image_data
-                                    )
-                                )
-
-                                if embedding_bytes:
-                                    # Update database
-                                    image.embedding = embedding_bytes
-                                    image.embedding_model = (
-                                        self.embedding_service.model_name
-                                    )
-
-                                    # Store in vector database
-                                    await self.vector_db.store_embedding(
-                                        image.id, embedding_bytes
-                                    )
-
-                                    regenerated_count += 1
-                                    logger.info(
-                                        f"Regenerated embedding for image {image.id}"
-                                    )
-                                else:
-                                    logger.warning(
-                                        f"Failed to generate embedding for image {image.id}"
-                                    )
-                            else:
-                                logger.warning(
-                                    f"No accessible file path for image {image.id}"
-                                )
-
-                        except Exception as e:
-                            logger.error(
-                                f"Error regenerating embedding for image {image.id}: {e}"
-                            )
-
-                    # Commit batch
-                    await session.commit()
-
-                logger.info(f"Successfully regenerated {regenerated_count} embeddings")
-                return regenerated_count
+            backfill = EmbeddingBackfill(
+                embedding_service=self.embedding_service,
+                vector_db=self.vector_db,
+                user_id=user_id,
+                all_modes=all_modes,
+                limit=limit,
+            )
+            progress = await backfill.run()
+            logger.info(f"Successfully regenerated {progress.embedded} embeddings")
+            return progress.embedded
 
         except Exception as e:
             logger.error(f"Error regenerating embeddings: {e}")
@@ -0,0 +1,342 @@
+"""Async streaming runner for CLI agents (OpenCode, Codex).
+
+Unlike ``subprocess.run(capture_output=True)``, output is delivered as it
+is produced and the event loop is never blocked:
+
+- stdout is read in chunks and decoded incrementally. The next chunk is
+  only read after ``on_output`` has returned, so a slow consumer stalls the
+  child on a full pipe instead of growing memory (backpressure).
+- Output is kept in a bounded ``StreamOutput``: the last ``max_chars``
+  characters stay in memory and, once that is exceeded, everything is
+  spilled to a temporary file. ``keep_log()`` moves a spill the user should
+  be able to read into the stream log directory, which is pruned by age and
+  total size (``prune_stream_logs``).
+- A stop request (``stop_check`` or ``request_stop(stream_id)`` from a stop
+  button) or the timeout terminates the whole process group.
+"""
+
+import asyncio
+import codecs
+import logging
+import os
+import secrets
+import shutil
+import signal
+import tempfile
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK_SIZE = 4096
+DEFAULT_MAX_CHARS = 64_000
+STDERR_TAIL_CHARS = 8_000
+STOP_POLL_SECONDS = 0.25
+TERMINATE_GRACE_SECONDS = 3.0
+
+DEFAULT_LOG_DIR = Path("data") / "stream_logs"
+DEFAULT_LOG_MAX_AGE_HOURS = 72.0
+DEFAULT_LOG_MAX_MB = 200
+LOG_PREFIX = "stream_"
+
+
+def prune_stream_logs(
+    log_dir: Path,
+    max_age_hours: float = DEFAULT_LOG_MAX_AGE_HOURS,
+    max_bytes: int = DEFAULT_LOG_MAX_MB * 1024 * 1024,
+) -> int:
+    """Delete kept logs older than max_age_hours, then oldest-first until the
+    directory is under max_bytes (the newest log is always kept).
+
+    Returns the number of files removed.
+    """
+    logs = []
+    for path in Path(log_dir).glob(f"{LOG_PREFIX}*.log"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        logs.append((stat.st_mtime, stat.st_size, path))
+    logs.sort(reverse=True)  # newest first
+
+    cutoff = time.time() - max_age_hours * 3600
+    total = 0
+    removed = 0
+    for index, (mtime, size, path) in enumerate(logs):
+        total += size
+        if index and (mtime < cutoff or total > max_bytes):
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+    return removed
+
+
+class StreamOutput:
+    """Bounded output buffer: in-memory tail plus spill-to-file overflow."""
+
+    def __init__(
+        self, max_chars: int = DEFAULT_MAX_CHARS, spill_dir: Optional[str] = None
+    ):
+        self.max_chars = max_chars
+        self.spill_dir = spill_dir
+        self.total_chars = 0
+        self.spill_path: Optional[Path] = None
+        self._chunks: Deque[str] = deque()
+        self._buffered = 0
+        self._spill_file: Optional[Any] = None
+        self._kept = False
+
+    @property
+    def truncated(self) -> bool:
+        """True when output no longer fits in memory (see ``text()``)."""
+        return self.spill_path is not None
+
+    def append(self, text: str) -> None:
+        if not text:
+            return
+        self.total_chars += len(text)
+
+        if self._spill_file is None and self._buffered + len(text) > self.max_chars:
+            fd, path = tempfile.mkstemp(
+                prefix=LOG_PREFIX, suffix=".log", dir=self.spill_dir
+            )
+            self._spill_file = os.fdopen(fd, "w", encoding="utf-8")
+            self.spill_path = Path(path)
+            self._spill_file.write("".join(self._chunks))
+        if self._spill_file is not None:
+            self._spill_file.write(text)
+
+        self._chunks.append(text)
+        self._buffered += len(text)
+        while self._buffered - len(self._chunks[0]) >= self.max_chars:
+            self._buffered -= len(self._chunks.popleft())
+
+    def tail(self, max_chars: Optional[int] = None) -> str:
+        """The most recent output (at most ``max_chars``, default all buffered)."""
+        limit = min(max_chars or self.max_chars, self.max_chars)
+        return "".join(self._chunks)[-limit:]
+
+    def text(self) -> str:
+        """The complete output, read back from the spill file if needed."""
+        if self.spill_path is None:
+            return "".join(self._chunks)
+        if self._spill_file is not None:
+            self._spill_file.flush()
+        return self.spill_path.read_text(encoding="utf-8")
+
+    def keep_log(self, log_dir: Optional[Path] = None) -> Optional[Path]:
+        """Move the spill file into the stream log directory and prune it.
+
+        Returns the kept log's path, or None if nothing was spilled.
+        Defaults to ``paths.stream_log_dir``; retention comes from
+        ``timeouts.stream_log_max_age_hours`` and ``limits.stream_log_max_mb``.
+        """
+        if self.spill_path is None:
+            return None
+        from ..core.config import get_limit, get_path, get_timeout
+
+        log_dir = Path(log_dir or get_path("stream_log_dir") or DEFAULT_LOG_DIR)
+        log_dir.mkdir(parents=True, exist_ok=True)
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+        kept = log_dir / self.spill_path.name
+        if kept != self.spill_path:
+            shutil.move(str(self.spill_path), str(kept))
+        self.spill_path = kept
+        self._kept = True
+        prune_stream_logs(
+            log_dir,
+            max_age_hours=get_timeout(
+                "stream_log_max_age_hours", DEFAULT_LOG_MAX_AGE_HOURS
+            ),
+            max_bytes=get_limit("stream_log_max_mb", DEFAULT_LOG_MAX_MB) * 1024 * 1024,
+        )
+        return kept
+
+    def close(self, keep_spill: bool = False) -> None:
+        """Close the spill file, deleting it unless ``keep_spill`` or kept."""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+        if self.spill_path is not None and not (keep_spill or self._kept):
+            self.spill_path.unlink(missing_ok=True)
+
+
+@dataclass
+class StreamResult:
+    """Outcome of a streamed subprocess run."""
+
+    returncode: Optional[int]
+    output: StreamOutput
+    stderr: str = ""
+    timed_out: bool = False
+    stopped: bool = False
+
+    @property
+    def success(self) -> bool:
+        return self.returncode == 0 and not self.timed_out and not self.stopped
+
+
+# stream_id -> stop event, for stop buttons ("stream:stop:<id>")
+_active_streams: Dict[str, asyncio.Event] = {}
+
+
+def register_stream() -> str:
+    """Reserve a stream id that a stop button can refer to."""
+    stream_id = secrets.token_hex(6)
+    _active_streams[stream_id] = asyncio.Event()
+    return stream_id
+
+
+def unregister_stream(stream_id: str) -> None:
+    _active_streams.pop(stream_id, None)
+
+
+def request_stop(stream_id: str) -> bool:
+    """Ask a running stream to stop. Returns False if it is not running."""
+    event = _active_streams.get(stream_id)
+    if event is None:
+        return False
+    event.set()
+    return True
+
+
+def _terminate(process: asyncio.subprocess.Process, sig: int) -> None:
+    try:
+        os.killpg(process.pid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def _read_stderr(stream: asyncio.StreamReader, tail: Deque[str]) -> None:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    size = 0
+    while chunk := await stream.read(READ_CHUNK_SIZE):
+        text = decoder.decode(chunk)
+        tail.append(text)
+        size += len(text)
+        while size - len(tail[0]) >= STDERR_TAIL_CHARS:
+            size -= len(tail.popleft())
+
+
+async def stream_subprocess(
+    cmd: Union[str, Sequence[str]],
+    *,
+    cwd: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+    on_output: Optional[Callable[[str], Any]] = None,
+    stop_check: Optional[Callable[[], bool]] = None,
+    stream_id: Optional[str] = None,
+    output: Optional[StreamOutput] = None,
+) -> StreamResult:
+    """Run a command, streaming stdout into ``on_output`` as it arrives.
+
+    Args:
+        cmd: Argument list, or a shell command string.
+        cwd: Working directory.
+        env: Environment (defaults to the current one).
+        timeout: Seconds before the process group is terminated.
+        on_output: Called (or awaited) with each decoded stdout chunk.
+        stop_check: Polled; returning True stops the process.
+        stream_id: Id from ``register_stream()`` so a stop button can stop it.
+        output: Buffer to collect stdout into (a default one is created).
+
+    Returns:
+        StreamResult. The caller owns ``result.output`` and should
+        ``close()`` it once done with the spill file.
+    """
+    output = output or StreamOutput()
+    kwargs: Dict[str, Any] = dict(
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        stdin=asyncio.subprocess.DEVNULL,
+        cwd=cwd,
+        env=env,
+        start_new_session=True,  # own process group, so shell children die too
+    )
+    if isinstance(cmd, str):
+        process = await asyncio.create_subprocess_shell(cmd, **kwargs)
+    else:
+        process = await asyncio.create_subprocess_exec(*cmd, **kwargs)
+
+    stdout, stderr = process.stdout, process.stderr
+    assert stdout is not None and stderr is not None  # both are PIPEs
+    stop_event = _active_streams.get(stream_id) if stream_id else None
+    stderr_tail: Deque[str] = deque()
+
+    async def pump_stdout() -> None:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        while True:
+            chunk = await stdout.read(READ_CHUNK_SIZE)
+            text = decoder.decode(chunk, final=not chunk)
+            if text:
+                output.append(text)
+                if on_output is not None:
+                    result = on_output(text)
+                    if asyncio.iscoroutine(result):
+                        await result
+            if not chunk:
+                break
+        await process.wait()
+
+    async def watch_stop() -> None:
+        while not (
+            (stop_event is not None and stop_event.is_set())
+            or (stop_check is not None and stop_check())
+        ):
+            await asyncio.sleep(STOP_POLL_SECONDS)
+
+    tasks: List[asyncio.Task] = [
+        asyncio.ensure_future(pump_stdout()),
+        asyncio.ensure_future(_read_stderr(stderr, stderr_tail)),
+    ]
+    watcher = None
+    if stop_event is not None or stop_check is not None:
+        watcher = asyncio.ensure_future(watch_stop())
+
+    timed_out = stopped = False
+    try:
+        waiting = {tasks[0]} | ({watcher} if watcher else set())
+        done, _ = await asyncio.wait(
+            waiting, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+        if tasks[0] not in done:
+            stopped = watcher in done
+            timed_out = not stopped
+            logger.info(
+                f"Stopping subprocess {process.pid} "
+                f"({'stop requested' if stopped else f'timed out after {timeout}s'})"
+            )
+            _terminate(process, signal.SIGTERM)
+            try:
+                await asyncio.wait_for(process.wait(), TERMINATE_GRACE_SECONDS)
+            except asyncio.TimeoutError:
+                _terminate(process, signal.SIGKILL)
+                await process.wait()
+        elif (error := tasks[0].exception()) is not None:
+            # on_output failed; don't leave the child running unattended
+            _terminate(process, signal.SIGKILL)
+            await process.wait()
+            raise error
+        await asyncio.gather(*tasks, return_exceptions=True)
+    except asyncio.CancelledError:
+        _terminate(process, signal.SIGKILL)
+        raise
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+        for task in tasks:
+            task.cancel()
+
+    return StreamResult(
+        returncode=process.returncode,
+        output=output,
+        stderr="".join(stderr_tail),
+        timed_out=timed_out,
+        stopped=stopped,
+    )
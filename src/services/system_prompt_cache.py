@@ -0,0 +1,179 @@
+"""
+Cached system prompt assembly for Claude Code runs.
+
+The Telegram system prompt combines a static preamble, design skills
+guidance (from config/design_skills.yaml) and the chat's CLAUDE.md memory.
+Building it costs a YAML-backed render, a workspace mkdir/exists check and
+a file read, which used to be paid on every message.
+
+Entries are keyed by (chat_id, prefix) and validated against the
+modification time and size of the input files, so a prompt is only rebuilt when
+the design config or the chat's memory changes on disk. Each prompt carries
+a content hash that stays the same while the prompt is unchanged.
+"""
+
+import hashlib
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+from ..utils.lru_cache import LRUCache
+from .design_skills_service import get_design_skills_service
+from .workspace_service import ensure_workspace, memory_path
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_SYSTEM_PROMPT = """You are running inside a Telegram bot. Important capabilities:
+
+FILE SENDING: When you create or reference files (PDF, images, audio, video, documents),
+the bot will automatically detect file paths in your response and send them to the user.
+Just mention the full file path and the file will be delivered. You CAN send files!
+
+Supported formats: .pdf, .png, .jpg, .jpeg, .gif, .mp3, .mp4, .wav, .doc, .docx, .xlsx, .csv, .zip
+
+Example: After creating a PDF, say "Created: /path/to/file.pdf" and it will be sent automatically.
+
+FORMATTING: Your responses are converted to Telegram HTML. Markdown works (bold, italic, code, links).
+Tables are converted to ASCII format for readability.
+
+CRITICAL - Note References: When you mention or reference vault notes in your responses, ALWAYS use the
+full absolute path. The bot automatically converts these paths to clickable Obsidian deep links.
+
+Examples:
+- When creating: "Created note: /Users/server/Research/vault/Folder/Note-Name.md"
+- When referencing: "See /Users/server/Research/vault/Mem0.md for details"
+- When listing: "Updated files: /Users/server/Research/vault/Config.md, /Users/server/Research/vault/Index.md"
+
+The full path will become a clickable link that opens the note in Telegram and Obsidian.
+
+VAULT SEMANTIC SEARCH (supplemental to Grep/Glob):
+Use for discovering related notes, building See Also sections, or exploratory searches.
+NOT a replacement for exact text search (use Grep) or file lookup (use Glob).
+
+Commands:
+- Search: python3 ~/Research/vault/scripts/vault_search.py "query" [--format see-also|wikilinks]
+- Embed new note: python3 ~/Research/vault/scripts/embed_note.py "/path/to/note.md"
+
+WORKFLOW for creating notes:
+1. Write note with Write tool
+2. ALWAYS mention the full path in your response (e.g., "Created: /full/path/to/note.md")
+3. Embed it: python3 ~/Research/vault/scripts/embed_note.py "/path/to/note.md"
+4. Find related: python3 ~/Research/vault/scripts/vault_search.py "note title concepts" -f see-also -n 5 -e "note name"
+5. Append See also section to the note"""
+
+
+@dataclass(frozen=True)
+class SystemPrompt:
+    """An assembled system prompt and the hash of its content."""
+
+    text: str
+    content_hash: str
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class SystemPromptCache:
+    """LRU of assembled system prompts, invalidated by input file changes."""
+
+    def __init__(self, max_entries: int = 256):
+        # (chat_id, prefix) -> ((design_sig, memory_sig), SystemPrompt)
+        self._entries: LRUCache[Tuple[int, Optional[str]], Tuple[tuple, SystemPrompt]]
+        self._entries = LRUCache(max_size=max_entries)
+        self._design_sig: Optional[Tuple[int, int]] = None
+        self._design_guidance: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _get_design_guidance(self, design_sig: Optional[Tuple[int, int]]) -> str:
+        """Render design guidance, re-reading the YAML only when it changed."""
+        if self._design_guidance is None or design_sig != self._design_sig:
+            service = get_design_skills_service()
+            if self._design_guidance is not None:
+                service.reload_config()
+            try:
+                self._design_guidance = service.get_enhanced_system_prompt()
+            except Exception as e:
+                logger.warning(f"Failed to load design skills guidance: {e}")
+                self._design_guidance = ""
+            self._design_sig = design_sig
+        return self._design_guidance
+
+    def _build(
+        self,
+        chat_id: int,
+        prefix: Optional[str],
+        design_sig: Optional[Tuple[int, int]],
+    ) -> str:
+        text = TELEGRAM_SYSTEM_PROMPT
+
+        design_guidance = self._get_design_guidance(design_sig)
+        if design_guidance:
+            text += "\n\n" + design_guidance
+
+        # Append per-chat memory (highest priority — user prefs win)
+        ensure_workspace(chat_id)
+        try:
+            chat_memory = memory_path(chat_id).read_text(encoding="utf-8")
+        except OSError:
+            chat_memory = None
+        if chat_memory:
+            text += "\n\n# User Memory\n" + chat_memory
+
+        # Prepend caller-supplied system prompt (e.g. research mode)
+        if prefix:
+            text = prefix + "\n\n" + text
+        return text
+
+    def get(self, chat_id: int, prefix: Optional[str] = None) -> SystemPrompt:
+        """Return the system prompt for a chat, rebuilding it only if stale."""
+        design_path = get_design_skills_service().config_path
+        signatures = (
+            _file_signature(design_path),
+            _file_signature(memory_path(chat_id)),
+        )
+        key = (chat_id, prefix)
+
+        cached = self._entries.get(key)
+        # A missing memory file (None) always rebuilds so the workspace is created
+        if cached is not None and cached[0] == signatures and signatures[1] is not None:
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        text = self._build(chat_id, prefix, signatures[0])
+        prompt = SystemPrompt(
+            text=text, content_hash=hashlib.sha256(text.encode("utf-8")).hexdigest()
+        )
+        # Re-stat memory: _build may just have created it from the template
+        signatures = (signatures[0], _file_signature(memory_path(chat_id)))
+        self._entries.set(key, (signatures, prompt))
+        return prompt
+
+    def invalidate(self, chat_id: Optional[int] = None) -> None:
+        """Drop cached prompts for one chat, or all of them."""
+        if chat_id is None:
+            self._entries.clear()
+            return
+        for key, _ in self._entries.items():
+            if key[0] == chat_id:
+                self._entries.pop(key)
+
+
+_system_prompt_cache: Optional[SystemPromptCache] = None
+
+
+def get_system_prompt_cache() -> SystemPromptCache:
+    """Get the global system prompt cache instance."""
+    global _system_prompt_cache
+    if _system_prompt_cache is None:
+        _system_prompt_cache = SystemPromptCache()
+    return _system_prompt_cache
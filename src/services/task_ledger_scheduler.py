@@ -0,0 +1,382 @@
+"""
+Task Ledger Scheduler - fires scheduled_tasks runs exactly when they are due.
+
+Instead of polling ``get_tasks_due()``, enabled tasks are loaded once at
+startup into an in-process min-heap keyed by next_run_at. A single loop
+sleeps until the earliest entry (or until woken), so a run starts at its
+due time rather than up to one polling interval late, and no session is
+opened while nothing is due. TaskLedgerService create/toggle/delete notify
+the scheduler through a task listener, which updates the heap and wakes the
+loop; stale heap entries are skipped lazily via a per-task version.
+
+Runs are claimed with TaskLedgerService.claim_run(): a conditional UPDATE
+that takes a lease and advances next_run_at only if the row still holds the
+due time this worker saw. With several workers on one database each run is
+fired by exactly one of them; the losers re-read the row and reschedule.
+Changes made on other workers are picked up by a slow full resync.
+
+Handlers are registered per task_type. Runs due at the same wakeup execute
+concurrently and their run logs are written with one batched INSERT.
+
+The scheduler is opt-in: no task type has a handler by default, so it stays
+idle (and does not query the ledger) until a plugin or service calls
+register_handler(). Ledger rows of type ``proactive:<task_id>`` are run by
+scripts/proactive_tasks/task_daemon on its own schedule and only logged
+here; they must not get a handler, or they would run twice.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import socket
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ..models.scheduled_task import ScheduledTask, TaskRunStatus
+from ..utils.cron import next_cron_time
+from ..utils.task_tracker import create_tracked_task
+
+logger = logging.getLogger(__name__)
+
+
+def _as_utc(moment: datetime) -> datetime:
+    """SQLite returns naive datetimes; all ledger times are UTC."""
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def compute_next_run(
+    task: ScheduledTask, after: Optional[datetime] = None
+) -> Optional[datetime]:
+    """Next run of a cron or interval task after ``after`` (default now).
+
+    One-shot tasks have no next run once their first run was taken, so this
+    returns None for them (create_task already sets their next_run_at).
+    """
+    after = _as_utc(after or datetime.now(timezone.utc))
+    if task.schedule_cron:
+        return next_cron_time(task.schedule_cron, after)
+    if task.schedule_interval_seconds:
+        return after + timedelta(seconds=task.schedule_interval_seconds)
+    return None
+
+
+@dataclass
+class DueTask:
+    """A claimed run handed to a task handler."""
+
+    task_id: int
+    chat_id: int
+    task_type: str
+    context_mode: str
+    due_at: datetime
+
+
+# DueTask -> optional result summary
+TaskHandler = Callable[[DueTask], Awaitable[Optional[str]]]
+
+
+@dataclass
+class _Entry:
+    task: ScheduledTask  # row as loaded; claim_run matches its next_run_at
+    version: int
+
+
+class TaskLedgerScheduler:
+    """Min-heap scheduler over the task ledger with leased, batched runs."""
+
+    def __init__(
+        self,
+        ledger: Any = None,
+        lease_seconds: float = 600.0,
+        resync_seconds: Optional[float] = 300.0,
+        owner: Optional[str] = None,
+    ):
+        self._ledger = ledger
+        self.lease_seconds = lease_seconds
+        self.resync_seconds = resync_seconds
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self._handlers: Dict[str, TaskHandler] = {}
+        self._heap: List[Tuple[datetime, int, int, int]] = []
+        self._entries: Dict[int, _Entry] = {}
+        self._seq = itertools.count()
+        self._versions = itertools.count(1)
+        self._wakeup = asyncio.Event()
+        self._resync_at: Optional[datetime] = None
+        self._loaded = False
+        self._running: set = set()
+
+    @property
+    def ledger(self):
+        if self._ledger is None:
+            from .task_ledger_service import get_task_ledger_service
+
+            self._ledger = get_task_ledger_service()
+        return self._ledger
+
+    # -- registration ---------------------------------------------------
+
+    def register_handler(self, task_type: str, handler: TaskHandler) -> None:
+        """Run ``handler`` for due tasks of ``task_type``.
+
+        Only task types with a handler are scheduled; registering one later
+        triggers a resync so existing tasks of that type are picked up.
+        """
+        self._handlers[task_type] = handler
+        if self._loaded:
+            self._resync_at = datetime.now(timezone.utc)
+            self._wakeup.set()
+
+    # -- heap maintenance -----------------------------------------------
+
+    def schedule(self, task: ScheduledTask) -> None:
+        """Add or replace the heap entry for ``task`` from its current row.
+
+        Recurring tasks without a next_run_at yet are due immediately; firing
+        them only stores their first next_run_at.
+        """
+        if not task.enabled or task.task_type not in self._handlers:
+            self.unschedule(task.id)
+            return
+        if task.next_run_at is not None:
+            wake_at = _as_utc(task.next_run_at)
+        elif task.schedule_cron or task.schedule_interval_seconds:
+            wake_at = datetime.now(timezone.utc)
+        else:
+            self.unschedule(task.id)  # one-shot task that already ran
+            return
+        self._push(task, wake_at)
+
+    def _push(self, task: ScheduledTask, wake_at: datetime) -> None:
+        version = next(self._versions)
+        self._entries[task.id] = _Entry(task=task, version=version)
+        heapq.heappush(self._heap, (wake_at, next(self._seq), task.id, version))
+        self._wakeup.set()
+
+    def unschedule(self, task_id: int) -> None:
+        """Drop ``task_id``; its heap entries become stale and are skipped."""
+        if self._entries.pop(task_id, None) is not None:
+            self._wakeup.set()
+
+    def _on_task_changed(self, task_id: int, task: Optional[ScheduledTask]) -> None:
+        if task is None:
+            self.unschedule(task_id)
+        else:
+            self.schedule(task)
+
+    def next_wakeup(self) -> Optional[datetime]:
+        """Time of the earliest scheduled run (stale entries discarded)."""
+        while self._heap:
+            _, _, task_id, version = self._heap[0]
+            entry = self._entries.get(task_id)
+            if entry is not None and entry.version == version:
+                return self._heap[0][0]
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now: Optional[datetime] = None) -> List[_Entry]:
+        """Remove and return every entry due at or before ``now``."""
+        now = now or datetime.now(timezone.utc)
+        due = []
+        while (wake_at := self.next_wakeup()) is not None and wake_at <= now:
+            _, _, task_id, _ = heapq.heappop(self._heap)
+            due.append(self._entries.pop(task_id))
+        return due
+
+    async def load(self) -> int:
+        """(Re)build the heap from enabled tasks that have a handler."""
+        tasks = (
+            await self.ledger.get_schedulable_tasks(list(self._handlers))
+            if self._handlers
+            else []
+        )
+        self._entries.clear()
+        self._heap.clear()
+        for task in tasks:
+            self.schedule(task)
+        self._loaded = True
+        if self.resync_seconds:
+            self._resync_at = datetime.now(timezone.utc) + timedelta(
+                seconds=self.resync_seconds
+            )
+        else:
+            self._resync_at = None
+        return len(self._entries)
+
+    # -- running --------------------------------------------------------
+
+    async def run(self) -> None:
+        """Load the ledger and fire runs as they come due, until cancelled."""
+        from .task_ledger_service import add_task_listener, remove_task_listener
+
+        add_task_listener(self._on_task_changed)
+        try:
+            await self.load()
+            if self._handlers:
+                logger.info(
+                    f"Task ledger scheduler started with {len(self._entries)} "
+                    f"task(s)"
+                )
+            else:
+                logger.info("Task ledger scheduler idle: no task handlers registered")
+            while True:
+                self._wakeup.clear()
+                await self._sleep_until_next()
+
+                now = datetime.now(timezone.utc)
+                if self._resync_at is not None and self._resync_at <= now:
+                    await self.load()
+                due = self.pop_due(now)
+                if due:
+                    task = create_tracked_task(self.fire(due), name="task_ledger_runs")
+                    self._running.add(task)
+                    task.add_done_callback(self._running.discard)
+        except asyncio.CancelledError:
+            logger.info("Task ledger scheduler cancelled")
+            raise
+        finally:
+            remove_task_listener(self._on_task_changed)
+
+    async def _sleep_until_next(self) -> None:
+        now = datetime.now(timezone.utc)
+        deadlines = [
+            at for at in (self.next_wakeup(), self._resync_at) if at is not None
+        ]
+        timeout = (
+            max(0.0, (min(deadlines) - now).total_seconds()) if deadlines else None
+        )
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def fire(self, entries: List[_Entry]) -> int:
+        """Claim and run due entries concurrently, then log them in one batch.
+
+        Returns the number of runs this worker executed.
+        """
+        claimed = []
+        for entry in entries:
+            if entry.task.next_run_at is None:
+                await self._initialize(entry.task)
+            elif await self._claim(entry.task):
+                claimed.append(entry.task)
+
+        results = await asyncio.gather(*(self._execute(task) for task in claimed))
+        if results:
+            try:
+                await self.ledger.log_runs(results)
+            except Exception as e:
+                logger.error(f"Failed to log {len(results)} task run(s): {e}")
+        for task in claimed:
+            try:
+                await self.ledger.release_run(task.id, self.owner)
+            except Exception as e:
+                logger.error(f"Failed to release lease on task {task.id}: {e}")
+
+        # Reschedule from the rows as they are now (advanced, or changed
+        # by another worker when a claim was lost)
+        for entry in entries:
+            await self._refresh(entry.task.id)
+        return len(claimed)
+
+    async def _initialize(self, task: ScheduledTask) -> None:
+        try:
+            await self.ledger.initialize_next_run(task.id, compute_next_run(task))
+        except Exception as e:
+            logger.error(f"Failed to schedule task {task.id}: {e}")
+
+    async def _claim(self, task: ScheduledTask) -> bool:
+        assert task.next_run_at is not None  # fire() initializes the others
+        now = datetime.now(timezone.utc)
+        try:
+            next_run = compute_next_run(task, max(_as_utc(task.next_run_at), now))
+            won = await self.ledger.claim_run(
+                task.id,
+                task.next_run_at,
+                next_run,
+                self.owner,
+                now + timedelta(seconds=self.lease_seconds),
+            )
+        except Exception as e:
+            logger.error(f"Failed to claim run of task {task.id}: {e}")
+            return False
+        if not won:
+            logger.debug(
+                f"Run of task {task.id} due {task.next_run_at} taken elsewhere"
+            )
+        return won
+
+    async def _execute(self, task: ScheduledTask) -> Dict[str, Any]:
+        assert task.next_run_at is not None  # only claimed runs get here
+        due = _as_utc(task.next_run_at)
+        started_at = datetime.now(timezone.utc)
+        run = {
+            "task_id": task.id,
+            "started_at": started_at,
+            "queue_wait_seconds": max(0.0, (started_at - due).total_seconds()),
+        }
+        due_task = DueTask(
+            task_id=task.id,
+            chat_id=task.chat_id,
+            task_type=task.task_type,
+            context_mode=getattr(task.context_mode, "value", task.context_mode),
+            due_at=due,
+        )
+        handler = self._handlers.get(task.task_type)
+        try:
+            if handler is None:
+                raise RuntimeError(f"No handler for task type {task.task_type}")
+            summary = await asyncio.wait_for(
+                handler(due_task), timeout=self.lease_seconds
+            )
+            run.update(status=TaskRunStatus.SUCCESS.value, result_summary=summary)
+        except asyncio.TimeoutError:
+            run.update(
+                status=TaskRunStatus.TIMEOUT.value,
+                error_message=f"exceeded {self.lease_seconds}s lease",
+            )
+        except Exception as e:
+            logger.error(f"Task {task.id} ({task.task_type}) failed: {e}")
+            run.update(status=TaskRunStatus.ERROR.value, error_message=str(e))
+        run["completed_at"] = datetime.now(timezone.utc)
+        return run
+
+    async def _refresh(self, task_id: int) -> None:
+        try:
+            task = await self.ledger.get_task(task_id)
+        except Exception as e:
+            logger.error(f"Failed to reload task {task_id}: {e}")
+            return
+        if task is None:
+            self.unschedule(task_id)
+            return
+        now = datetime.now(timezone.utc)
+        if (
+            task.enabled
+            and task.task_type in self._handlers
+            and task.next_run_at is not None
+            and _as_utc(task.next_run_at) <= now
+            and task.lease_expires_at is not None
+            and _as_utc(task.lease_expires_at) > now
+        ):
+            # Due again while a run is still leased: retry when it lapses
+            self._push(task, _as_utc(task.lease_expires_at))
+            return
+        self.schedule(task)
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Wait (bounded) for in-flight runs so their logs are written."""
+        if self._running:
+            await asyncio.wait(set(self._running), timeout=timeout)
+
+
+def get_task_ledger_scheduler() -> TaskLedgerScheduler:
+    """Get the global task ledger scheduler (delegates to DI container)."""
+    from ..core.services import Services, get_service
+
+    return get_service(Services.TASK_LEDGER_SCHEDULER)
@@ -2,14 +2,17 @@
 Task ledger service — persistent CRUD for scheduled tasks and run history.
 
 Provides create/list/get/toggle/delete for ScheduledTask rows and
-log_run/get_run_history for TaskRunLog entries.
+log_run/log_runs/get_run_history for TaskRunLog entries.
+
+Create/toggle/delete notify task listeners (see add_task_listener) so the
+in-process TaskLedgerScheduler can reschedule without polling the table.
 """
 
 import logging
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Any, Callable, Collection, Dict, List, Optional, Sequence, cast
 
-from sqlalchemy import select
+from sqlalchemy import CursorResult, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.database import get_db_session
@@ -22,6 +25,30 @@ from ..models.scheduled_task import (
 
 logger = logging.getLogger(__name__)
 
+# (task_id, task) -> None; task is None when the task was deleted
+TaskListener = Callable[[int, Optional[ScheduledTask]], None]
+
+_task_listeners: List[TaskListener] = []
+
+
+def add_task_listener(listener: TaskListener) -> None:
+    """Call ``listener`` after a task is created, toggled or deleted."""
+    if listener not in _task_listeners:
+        _task_listeners.append(listener)
+
+
+def remove_task_listener(listener: TaskListener) -> None:
+    if listener in _task_listeners:
+        _task_listeners.remove(listener)
+
+
+def _notify_task_changed(task_id: int, task: Optional[ScheduledTask]) -> None:
+    for listener in list(_task_listeners):
+        try:
+            listener(task_id, task)
+        except Exception:
+            logger.exception(f"Task listener failed for task {task_id}")
+
 
 class TaskLedgerService:
     """Service layer for the persistent task ledger.
@@ -86,13 +113,13 @@ class TaskLedgerService:
         if session is not None:
             session.add(task)
             await session.flush()
-            return task
-
-        async with get_db_session() as session:
-            session.add(task)
-            await session.commit()
-            await session.refresh(task)
-            return task
+        else:
+            async with get_db_session() as session:
+                session.add(task)
+                await session.commit()
+                await session.refresh(task)
+        _notify_task_changed(task.id, task)
+        return task
 
     async def list_tasks(self, chat_id: Optional[int] = None) -> List[ScheduledTask]:
         """List tasks, optionally filtered by chat_id."""
@@ -135,19 +162,19 @@ class TaskLedgerService:
                 raise ValueError(f"Task {task_id} not found")
             task.enabled = not task.enabled
             await session.flush()
-            return task
-
-        async with get_db_session() as session:
-            result = await session.execute(
-                select(ScheduledTask).where(ScheduledTask.id == task_id)
-            )
-            task = result.scalar_one_or_none()
-            if task is None:
-                raise ValueError(f"Task {task_id} not found")
-            task.enabled = not task.enabled
-            await session.commit()
-            await session.refresh(task)
-            return task
+        else:
+            async with get_db_session() as session:
+                result = await session.execute(
+                    select(ScheduledTask).where(ScheduledTask.id == task_id)
+                )
+                task = result.scalar_one_or_none()
+                if task is None:
+                    raise ValueError(f"Task {task_id} not found")
+                task.enabled = not task.enabled
+                await session.commit()
+                await session.refresh(task)
+        _notify_task_changed(task_id, task)
+        return task
 
     async def delete_task(self, task_id: int) -> bool:
         """Delete a task by ID.  Returns ``True`` if deleted, ``False`` if not found."""
@@ -158,20 +185,46 @@ class TaskLedgerService:
                 return False
             await session.delete(task)
             await session.flush()
-            return True
+        else:
+            async with get_db_session() as session:
+                result = await session.execute(
+                    select(ScheduledTask).where(ScheduledTask.id == task_id)
+                )
+                task = result.scalar_one_or_none()
+                if task is None:
+                    return False
+                await session.delete(task)
+                await session.commit()
+        _notify_task_changed(task_id, None)
+        return True
 
-        async with get_db_session() as session:
-            result = await session.execute(
-                select(ScheduledTask).where(ScheduledTask.id == task_id)
+    # -- Run logging ----------------------------------------------------
+
+    async def ensure_task(self, chat_id: int, task_type: str) -> ScheduledTask:
+        """Return the task with this chat_id and task_type, creating it if needed.
+
+        Used by runners that execute tasks defined outside the ledger (e.g. the
+        proactive task registry) so their runs can still be logged.
+        """
+        stmt = (
+            select(ScheduledTask)
+            .where(
+                ScheduledTask.chat_id == chat_id,
+                ScheduledTask.task_type == task_type,
             )
-            task = result.scalar_one_or_none()
-            if task is None:
-                return False
-            await session.delete(task)
-            await session.commit()
-            return True
+            .order_by(ScheduledTask.id)
+            .limit(1)
+        )
 
-    # -- Run logging ----------------------------------------------------
+        session = self._session
+        if session is not None:
+            task = (await session.execute(stmt)).scalar_one_or_none()
+        else:
+            async with get_db_session() as session:
+                task = (await session.execute(stmt)).scalar_one_or_none()
+        if task is None:
+            task = await self.create_task(chat_id=chat_id, task_type=task_type)
+        return task
 
     async def log_run(
         self,
@@ -179,6 +232,9 @@ class TaskLedgerService:
         status: str,
         result_summary: Optional[str] = None,
         error_message: Optional[str] = None,
+        started_at: Optional[datetime] = None,
+        completed_at: Optional[datetime] = None,
+        queue_wait_seconds: Optional[float] = None,
     ) -> TaskRunLog:
         """Record an execution attempt for a task.
 
@@ -187,26 +243,30 @@ class TaskLedgerService:
             status: ``"success"``, ``"error"``, or ``"timeout"``.
             result_summary: Optional human-readable result.
             error_message: Optional error details.
+            started_at: When the run started (default: now).
+            completed_at: When the run finished (default: now).
+            queue_wait_seconds: Time the run waited for a runner slot.
 
         Raises:
             ValueError: If the task does not exist.
         """
         run_status = TaskRunStatus(status)
         now = datetime.now(timezone.utc)
+        log = TaskRunLog(
+            task_id=task_id,
+            status=run_status,
+            started_at=started_at or now,
+            completed_at=completed_at or now,
+            queue_wait_seconds=queue_wait_seconds,
+            result_summary=result_summary,
+            error_message=error_message,
+        )
 
         session = self._session
         if session is not None:
             task = await self.get_task(task_id)
             if task is None:
                 raise ValueError(f"Task {task_id} not found")
-            log = TaskRunLog(
-                task_id=task_id,
-                status=run_status,
-                started_at=now,
-                completed_at=now,
-                result_summary=result_summary,
-                error_message=error_message,
-            )
             session.add(log)
             await session.flush()
             return log
@@ -217,19 +277,58 @@ class TaskLedgerService:
             )
             if result.scalar_one_or_none() is None:
                 raise ValueError(f"Task {task_id} not found")
-            log = TaskRunLog(
-                task_id=task_id,
-                status=run_status,
-                started_at=now,
-                completed_at=now,
-                result_summary=result_summary,
-                error_message=error_message,
-            )
             session.add(log)
             await session.commit()
             await session.refresh(log)
             return log
 
+    async def log_runs(self, runs: Sequence[Dict[str, Any]]) -> int:
+        """Record several execution attempts with one multi-row INSERT.
+
+        Each entry takes the keyword arguments of :meth:`log_run`
+        (``task_id`` and ``status`` required).
+
+        Returns:
+            The number of run logs written.
+
+        Raises:
+            ValueError: If any task does not exist.
+        """
+        if not runs:
+            return 0
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "task_id": run["task_id"],
+                "status": TaskRunStatus(run["status"]),
+                "started_at": run.get("started_at") or now,
+                "completed_at": run.get("completed_at") or now,
+                "queue_wait_seconds": run.get("queue_wait_seconds"),
+                "result_summary": run.get("result_summary"),
+                "error_message": run.get("error_message"),
+            }
+            for run in runs
+        ]
+        task_ids = {row["task_id"] for row in rows}
+        exists_stmt = select(ScheduledTask.id).where(ScheduledTask.id.in_(task_ids))
+
+        async def write(session: AsyncSession) -> None:
+            found = set((await session.execute(exists_stmt)).scalars().all())
+            missing = task_ids - found
+            if missing:
+                raise ValueError(f"Task(s) not found: {sorted(missing)}")
+            await session.execute(insert(TaskRunLog), rows)
+
+        session = self._session
+        if session is not None:
+            await write(session)
+            await session.flush()
+        else:
+            async with get_db_session() as session:
+                await write(session)
+                await session.commit()
+        return len(rows)
+
     async def get_run_history(self, task_id: int, limit: int = 10) -> List[TaskRunLog]:
         """Return recent run logs for a task (most recent first)."""
         stmt = (
@@ -251,7 +350,11 @@ class TaskLedgerService:
     # -- Scheduler queries ----------------------------------------------
 
     async def get_tasks_due(self) -> List[ScheduledTask]:
-        """Return enabled tasks whose next_run_at is in the past (i.e. due now)."""
+        """Return enabled tasks whose next_run_at is in the past (i.e. due now).
+
+        For ad-hoc checks; runs are fired by TaskLedgerScheduler, which does
+        not poll this.
+        """
         now = datetime.now(timezone.utc)
         stmt = (
             select(ScheduledTask)
@@ -272,6 +375,119 @@ class TaskLedgerService:
             result = await session.execute(stmt)
             return list(result.scalars().all())
 
+    async def get_schedulable_tasks(
+        self, task_types: Optional[Collection[str]] = None
+    ) -> List[ScheduledTask]:
+        """Return enabled tasks, optionally only those of the given types."""
+        stmt = select(ScheduledTask).where(ScheduledTask.enabled == True)  # noqa: E712
+        if task_types is not None:
+            stmt = stmt.where(ScheduledTask.task_type.in_(list(task_types)))
+
+        session = self._session
+        if session is not None:
+            result = await session.execute(stmt)
+            return list(result.scalars().all())
+
+        async with get_db_session() as session:
+            result = await session.execute(stmt)
+            return list(result.scalars().all())
+
+    async def claim_run(
+        self,
+        task_id: int,
+        due_at: Optional[datetime],
+        next_run_at: Optional[datetime],
+        owner: str,
+        lease_until: datetime,
+    ) -> bool:
+        """Atomically take the run of *task_id* that is due at *due_at*.
+
+        Succeeds only if the task is enabled, its next_run_at still equals
+        *due_at* and no other owner holds an unexpired lease. On success the
+        lease is taken and next_run_at advances to *next_run_at* in the same
+        UPDATE, so each run is claimed by exactly one worker.
+
+        Returns:
+            ``True`` if this caller owns the run.
+        """
+        now = datetime.now(timezone.utc)
+        due_clause = (
+            ScheduledTask.next_run_at.is_(None)
+            if due_at is None
+            else ScheduledTask.next_run_at == due_at
+        )
+        stmt = (
+            update(ScheduledTask)
+            .where(
+                ScheduledTask.id == task_id,
+                ScheduledTask.enabled == True,  # noqa: E712
+                due_clause,
+                (ScheduledTask.lease_expires_at.is_(None))
+                | (ScheduledTask.lease_expires_at <= now),
+            )
+            .values(
+                next_run_at=next_run_at,
+                lease_owner=owner,
+                lease_expires_at=lease_until,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        session = self._session
+        if session is not None:
+            result = await session.execute(stmt)
+            await session.flush()
+            return cast(CursorResult, result).rowcount == 1
+
+        async with get_db_session() as session:
+            result = await session.execute(stmt)
+            await session.commit()
+            return cast(CursorResult, result).rowcount == 1
+
+    async def initialize_next_run(
+        self, task_id: int, next_run_at: Optional[datetime]
+    ) -> bool:
+        """Set next_run_at on a task that has none yet.
+
+        Returns ``True`` if this call set it (another worker may have first).
+        """
+        stmt = (
+            update(ScheduledTask)
+            .where(ScheduledTask.id == task_id, ScheduledTask.next_run_at.is_(None))
+            .values(next_run_at=next_run_at)
+            .execution_options(synchronize_session=False)
+        )
+
+        session = self._session
+        if session is not None:
+            result = await session.execute(stmt)
+            await session.flush()
+            return cast(CursorResult, result).rowcount == 1
+
+        async with get_db_session() as session:
+            result = await session.execute(stmt)
+            await session.commit()
+            return cast(CursorResult, result).rowcount == 1
+
+    async def release_run(self, task_id: int, owner: str) -> None:
+        """Drop the lease on *task_id* if *owner* still holds it."""
+        stmt = (
+            update(ScheduledTask)
+            .where(ScheduledTask.id == task_id, ScheduledTask.lease_owner == owner)
+            .values(lease_owner=None, lease_expires_at=None)
+            .execution_options(synchronize_session=False)
+        )
+
+        session = self._session
+        if session is not None:
+            await session.execute(stmt)
+            await session.flush()
+            return
+
+        async with get_db_session() as session:
+            await session.execute(stmt)
+            await session.commit()
+
 
 # -- Module-level singleton access --------------------------------------
 
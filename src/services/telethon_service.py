@@ -4,16 +4,47 @@ The Telegram Bot API has a 20MB file download limit. For larger files,
 we use Telethon (MTProto client) which supports up to 2GB.
 
 This service reuses the existing Telethon session from the transcribe-telegram-video skill.
+
+Downloads run concurrently; only connecting the client is serialized.
+Large files are fetched as parallel byte ranges written into a
+pre-allocated partial file, bounded by a global connection cap and an
+optional bandwidth cap. Completed ranges are checkpointed next to the
+partial file, so a download interrupted by a timeout, a dropped
+connection or a restart resumes instead of starting over; any other error
+discards the partial file. Partial files left untouched for
+``timeouts.telethon_partial_ttl_hours`` are pruned at startup
+(prune_partial_downloads). Resolved channel entities are kept in an LRU.
 """
 
 import asyncio
+import inspect
 import json
 import logging
+import os
+import shutil
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set, Tuple
+
+from ..utils.lru_cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
+# MTProto upload.getFile allows at most 512 KB per request; ranges are
+# whole multiples of it so every request stays aligned.
+REQUEST_SIZE = 512 * 1024
+PART_SIZE = 16 * REQUEST_SIZE  # 8 MB per parallel range
+# Below this a single download_media call is cheaper than range bookkeeping
+PARALLEL_THRESHOLD = 2 * PART_SIZE
+
+DEFAULT_PARTIAL_DIR = Path("data") / "telethon_partial"
+DEFAULT_PARTIAL_TTL_HOURS = 48.0
+
+# Failures after which a retry can still resume from the partial file
+_RESUMABLE_ERRORS = (asyncio.CancelledError, asyncio.TimeoutError, ConnectionError)
+
 # Lazy import to avoid loading Telethon unless needed
 TelegramClient = None
 _telethon_imported = False
@@ -38,15 +69,153 @@ def _import_telethon():
         raise
 
 
+class _BandwidthLimiter:
+    """Spaces chunk writes so total throughput stays under a byte rate."""
+
+    def __init__(self, bytes_per_second: float = 0):
+        self.bytes_per_second = bytes_per_second
+        self._next_slot = 0.0
+
+    async def acquire(self, nbytes: int) -> None:
+        if self.bytes_per_second <= 0:
+            return
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + nbytes / self.bytes_per_second
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+@dataclass
+class _PartialDownload:
+    """A pre-allocated partial file plus the set of ranges already written."""
+
+    data_path: Path
+    state_path: Path
+    document_id: int
+    size: int
+    part_size: int
+    completed: Set[int] = field(default_factory=set)
+
+    @classmethod
+    def open(
+        cls, partial_dir: Path, document_id: int, size: int, part_size: int
+    ) -> "_PartialDownload":
+        """Resume a matching partial download, or start a fresh one."""
+        partial_dir.mkdir(parents=True, exist_ok=True)
+        partial = cls(
+            data_path=partial_dir / f"{document_id}.part",
+            state_path=partial_dir / f"{document_id}.json",
+            document_id=document_id,
+            size=size,
+            part_size=part_size,
+        )
+        try:
+            with open(partial.state_path) as f:
+                state = json.load(f)
+            if (
+                state.get("size") == size
+                and state.get("part_size") == part_size
+                and partial.data_path.stat().st_size == size
+            ):
+                partial.completed = set(state.get("completed", []))
+        except (OSError, ValueError):
+            pass
+
+        if not partial.completed:
+            with open(partial.data_path, "wb") as f:
+                f.truncate(size)
+        return partial
+
+    @property
+    def num_parts(self) -> int:
+        return (self.size + self.part_size - 1) // self.part_size
+
+    def part_range(self, index: int) -> Tuple[int, int]:
+        start = index * self.part_size
+        return start, min(start + self.part_size, self.size)
+
+    @property
+    def done_bytes(self) -> int:
+        return sum(end - start for start, end in map(self.part_range, self.completed))
+
+    def mark_done(self, index: int) -> None:
+        self.completed.add(index)
+        tmp_path = self.state_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "size": self.size,
+                    "part_size": self.part_size,
+                    "completed": sorted(self.completed),
+                },
+                f,
+            )
+        os.replace(tmp_path, self.state_path)
+
+    def finish(self, output_path: Path) -> None:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(self.data_path), str(output_path))
+        self.state_path.unlink(missing_ok=True)
+
+    def discard(self) -> None:
+        for path in (
+            self.data_path,
+            self.state_path,
+            self.state_path.with_suffix(".json.tmp"),
+        ):
+            path.unlink(missing_ok=True)
+
+
+def prune_partial_downloads(
+    partial_dir: Optional[Path] = None,
+    max_age_hours: float = DEFAULT_PARTIAL_TTL_HOURS,
+) -> int:
+    """Delete partial-download files not written for max_age_hours.
+
+    Returns the number of files removed.
+    """
+    partial_dir = Path(partial_dir or DEFAULT_PARTIAL_DIR)
+    if not partial_dir.is_dir():
+        return 0
+    cutoff = time.time() - max_age_hours * 3600
+    removed = 0
+    for path in partial_dir.iterdir():
+        try:
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError as e:
+            logger.warning(f"Could not prune partial download {path}: {e}")
+    if removed:
+        logger.info(f"Pruned {removed} stale partial download file(s)")
+    return removed
+
+
 class TelethonService:
     """Singleton service for downloading large files via Telethon MTProto."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_connections: int = 8,
+        parallel_parts: int = 4,
+        max_bandwidth_bytes: float = 0,
+        entity_cache_size: int = 256,
+        partial_dir: Optional[Path] = None,
+    ):
         self._client: Optional[Any] = None
-        self._lock = asyncio.Lock()
+        self._lock = asyncio.Lock()  # Guards connecting the client only
         self._config: Optional[Dict[str, Any]] = None
         self._session_path: Optional[Path] = None
 
+        self.parallel_parts = max(1, parallel_parts)
+        self.partial_dir = Path(partial_dir or DEFAULT_PARTIAL_DIR)
+        self._connections = asyncio.Semaphore(max_connections)
+        self._bandwidth = _BandwidthLimiter(max_bandwidth_bytes)
+        self._entities: LRUCache[str, Any] = LRUCache(max_size=entity_cache_size)
+        # document_id -> (lock, holders); one writer per partial file
+        self._document_locks: Dict[int, Tuple[asyncio.Lock, int]] = {}
+
     def _load_config(self) -> Dict[str, Any]:
         """Load Telethon config from transcribe-telegram-video skill location."""
         # Reuse existing config from transcribe skill
@@ -76,26 +245,170 @@ class TelethonService:
         if self._client:
             return  # Already connected
 
+        async with self._lock:
+            if not self._client:
+                await self._connect()
+
+    async def _connect(self):
         _import_telethon()  # Lazy import
 
         if not self._config:
             self._config = self._load_config()
 
         # Create client with existing session
-        self._client = TelegramClient(
+        client = TelegramClient(
             str(self._session_path), self._config["api_id"], self._config["api_hash"]
         )
 
-        await self._client.connect()
+        await client.connect()
 
-        if not await self._client.is_user_authorized():
+        if not await client.is_user_authorized():
+            await client.disconnect()
             raise RuntimeError(
                 "Telethon session expired or not authorized. "
                 "Re-authenticate with: python3 ~/.claude/skills/telegram-telethon/scripts/tg.py setup"
             )
 
+        self._client = client
         logger.info("Telethon client connected and authorized")
 
+    async def _resolve_entity(self, username: str) -> Any:
+        """Resolve a channel username, caching the entity."""
+        key = username.lower()
+        entity = self._entities.get(key)
+        if entity is None:
+            entity = await self._client.get_entity(username)
+            self._entities.set(key, entity)
+        return entity
+
+    @asynccontextmanager
+    async def _document_lock(self, document_id: int) -> AsyncIterator[None]:
+        lock, holders = self._document_locks.get(document_id, (asyncio.Lock(), 0))
+        self._document_locks[document_id] = (lock, holders + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, holders = self._document_locks[document_id]
+            if holders <= 1:
+                del self._document_locks[document_id]
+            else:
+                self._document_locks[document_id] = (lock, holders - 1)
+
+    @staticmethod
+    async def _report_progress(
+        progress_callback: Optional[Callable[[int, int], Any]],
+        current: int,
+        total: int,
+    ) -> None:
+        if progress_callback is None:
+            return
+        try:
+            result = progress_callback(current, total)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.debug(f"Progress callback failed: {e}")
+
+    async def _download_document(
+        self,
+        document: Any,
+        output_path: Path,
+        progress_callback: Optional[Callable[[int, int], Any]] = None,
+    ) -> None:
+        """Download a document, in parallel ranges when it is large."""
+        size = document.size
+        if size < PARALLEL_THRESHOLD or self.parallel_parts == 1:
+            async with self._connections:
+                await self._client.download_media(
+                    document, file=str(output_path), progress_callback=progress_callback
+                )
+            return
+
+        async with self._document_lock(document.id):
+            partial = _PartialDownload.open(
+                self.partial_dir, document.id, size, PART_SIZE
+            )
+            pending = [
+                i for i in range(partial.num_parts) if i not in partial.completed
+            ]
+            done = partial.done_bytes
+            if done:
+                logger.info(
+                    f"Resuming download of document {document.id}: "
+                    f"{done / (1024 * 1024):.1f} of {size / (1024 * 1024):.1f} MB on disk"
+                )
+            await self._report_progress(progress_callback, done, size)
+
+            async def on_chunk(nbytes: int) -> None:
+                nonlocal done
+                done += nbytes
+                await self._report_progress(progress_callback, done, size)
+
+            failed_for_good = False
+            fd = os.open(partial.data_path, os.O_RDWR)
+            try:
+
+                async def worker() -> None:
+                    while pending:
+                        index = pending.pop(0)
+                        await self._fetch_part(document, fd, partial, index, on_chunk)
+
+                workers = [
+                    asyncio.ensure_future(worker())
+                    for _ in range(min(self.parallel_parts, len(pending)))
+                ]
+                try:
+                    await asyncio.gather(*workers)
+                except BaseException:
+                    # Stop sibling ranges before the file is closed
+                    for task in workers:
+                        task.cancel()
+                    await asyncio.gather(*workers, return_exceptions=True)
+                    raise
+            except _RESUMABLE_ERRORS:
+                raise  # completed ranges are kept for the retry
+            except Exception:
+                failed_for_good = True
+                raise
+            finally:
+                os.close(fd)
+                if failed_for_good:
+                    partial.discard()
+
+            partial.finish(output_path)
+
+    async def _fetch_part(
+        self,
+        document: Any,
+        fd: int,
+        partial: _PartialDownload,
+        index: int,
+        on_chunk: Callable[[int], Any],
+    ) -> None:
+        """Fetch one byte range into the pre-allocated file and checkpoint it."""
+        start, end = partial.part_range(index)
+        offset = start
+        async with self._connections:
+            async for chunk in self._client.iter_download(
+                document,
+                offset=start,
+                request_size=REQUEST_SIZE,
+                limit=(end - start + REQUEST_SIZE - 1) // REQUEST_SIZE,
+                file_size=partial.size,
+            ):
+                chunk = bytes(chunk[: end - offset])
+                await self._bandwidth.acquire(len(chunk))
+                os.pwrite(fd, chunk, offset)
+                offset += len(chunk)
+                await on_chunk(len(chunk))
+
+        if offset < end:
+            raise RuntimeError(
+                f"Range {start}-{end} of document {document.id} ended at {offset}"
+            )
+        partial.mark_done(index)
+
     async def download_from_url(
         self,
         url: str,
@@ -124,82 +437,80 @@ class TelethonService:
             >>> if result["success"]:
             ...     print(f"Downloaded {result['size_mb']:.1f} MB")
         """
-        async with self._lock:
-            try:
-                await self._ensure_client()
-
-                # Parse URL: https://t.me/ACT_Russia/3902
-                parts = url.rstrip("/").split("/")
-                if len(parts) < 2:
-                    return {"success": False, "error": f"Invalid URL format: {url}"}
-
-                channel_username = parts[-2]
-                try:
-                    msg_id = int(parts[-1])
-                except ValueError:
-                    return {
-                        "success": False,
-                        "error": f"Invalid message ID in URL: {parts[-1]}",
-                    }
-
-                # Get message
-                logger.info(f"Fetching message from @{channel_username}/{msg_id}...")
-                try:
-                    entity = await self._client.get_entity(channel_username)
-                    message = await self._client.get_messages(entity, ids=msg_id)
-                except Exception as e:
-                    return {"success": False, "error": f"Failed to fetch message: {e}"}
-
-                if not message or not message.video:
-                    return {"success": False, "error": "No video found in message"}
+        try:
+            await self._ensure_client()
 
-                # Calculate timeout and size
-                size_mb = message.video.size / (1024 * 1024)
-                if timeout is None:
-                    timeout = int((size_mb * 2) + 60)  # 2s per MB + 60s base
+            # Parse URL: https://t.me/ACT_Russia/3902
+            parts = url.rstrip("/").split("/")
+            if len(parts) < 2:
+                return {"success": False, "error": f"Invalid URL format: {url}"}
 
-                logger.info(
-                    f"Downloading {size_mb:.1f} MB from @{channel_username}/{msg_id} (timeout: {timeout}s)..."
-                )
+            channel_username = parts[-2]
+            try:
+                msg_id = int(parts[-1])
+            except ValueError:
+                return {
+                    "success": False,
+                    "error": f"Invalid message ID in URL: {parts[-1]}",
+                }
 
-                # Download with timeout
-                try:
+            # Get message
+            logger.info(f"Fetching message from @{channel_username}/{msg_id}...")
+            try:
+                entity = await self._resolve_entity(channel_username)
+                message = await self._client.get_messages(entity, ids=msg_id)
+            except Exception as e:
+                self._entities.pop(channel_username.lower())
+                return {"success": False, "error": f"Failed to fetch message: {e}"}
 
-                    async def do_download():
-                        await self._client.download_media(
-                            message.video,
-                            file=str(output_path),
-                            progress_callback=progress_callback,
-                        )
+            if not message or not message.video:
+                return {"success": False, "error": "No video found in message"}
 
-                    await asyncio.wait_for(do_download(), timeout=timeout)
+            # Calculate timeout and size
+            size_mb = message.video.size / (1024 * 1024)
+            if timeout is None:
+                timeout = int((size_mb * 2) + 60)  # 2s per MB + 60s base
 
-                except asyncio.TimeoutError:
-                    return {
-                        "success": False,
-                        "error": f"Download timed out after {timeout}s ({size_mb:.1f} MB)",
-                    }
+            logger.info(
+                f"Downloading {size_mb:.1f} MB from @{channel_username}/{msg_id} (timeout: {timeout}s)..."
+            )
 
-                # Verify file exists
-                if not output_path.exists():
-                    return {
-                        "success": False,
-                        "error": "Download completed but file not found",
-                    }
+            # Download with timeout
+            try:
+                await asyncio.wait_for(
+                    self._download_document(
+                        message.video, output_path, progress_callback
+                    ),
+                    timeout=timeout,
+                )
 
-                actual_size_mb = output_path.stat().st_size / (1024 * 1024)
-                logger.info(f"✅ Downloaded {actual_size_mb:.1f} MB via Telethon")
+            except asyncio.TimeoutError:
+                # Completed ranges are kept; a retry resumes from them
+                return {
+                    "success": False,
+                    "error": f"Download timed out after {timeout}s ({size_mb:.1f} MB)",
+                }
 
+            # Verify file exists
+            if not output_path.exists():
                 return {
-                    "success": True,
-                    "file_path": str(output_path),
-                    "size_mb": actual_size_mb,
-                    "error": None,
+                    "success": False,
+                    "error": "Download completed but file not found",
                 }
 
-            except Exception as e:
-                logger.error(f"Telethon download failed: {e}", exc_info=True)
-                return {"success": False, "error": str(e)}
+            actual_size_mb = output_path.stat().st_size / (1024 * 1024)
+            logger.info(f"✅ Downloaded {actual_size_mb:.1f} MB via Telethon")
+
+            return {
+                "success": True,
+                "file_path": str(output_path),
+                "size_mb": actual_size_mb,
+                "error": None,
+            }
+
+        except Exception as e:
+            logger.error(f"Telethon download failed: {e}", exc_info=True)
+            return {"success": False, "error": str(e)}
 
     async def disconnect(self):
         """Disconnect Telethon client (cleanup)."""
@@ -217,5 +528,12 @@ def get_telethon_service() -> TelethonService:
     """Get the singleton TelethonService instance."""
     global _service
     if _service is None:
-        _service = TelethonService()
+        from ..core.config import get_limit, get_path
+
+        _service = TelethonService(
+            max_connections=get_limit("telethon_max_connections", 8),
+            parallel_parts=get_limit("telethon_parallel_parts", 4),
+            max_bandwidth_bytes=get_limit("telethon_max_bandwidth_kbps", 0) * 1024,
+            partial_dir=Path(get_path("telethon_partial_dir") or DEFAULT_PARTIAL_DIR),
+        )
     return _service
@@ -4,8 +4,9 @@ Trail Review Service - Manages trail reviews via Telegram polls.
 Provides scheduled trail status checks with multi-question polling sequences.
 Integrates with vault trail files to update status and schedule next reviews.
 
-State persistence: poll states are saved to a JSON file so that in-progress
-reviews survive bot restarts.
+State persistence: review sequences are saved to a JSON file and sent
+poll ids are kept in the shared tracked_polls registry (PollStateStore), so
+in-progress reviews survive bot restarts.
 """
 
 import json
@@ -17,6 +18,11 @@ from typing import Dict, List, Optional, Tuple
 import frontmatter
 
 from src.core.i18n import t
+from src.services.poll_state_store import (
+    KIND_TRAIL,
+    PollStateStore,
+    get_poll_state_store,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -34,9 +40,11 @@ class TrailReviewService:
         # Poll state tracking: {chat_id: {trail_path: poll_state}}
         self._poll_states: Dict[int, Dict[str, Dict]] = {}
 
-        # Mapping: {poll_id: {trail_path, field, chat_id, options}}
-        # Persisted alongside _poll_states so answers work after restart
-        self._poll_id_map: Dict[str, Dict] = {}
+        # Mapping: {poll_id: {trail_path, field, chat_id, options}} lives in
+        # the poll state store; this only holds entries from state files
+        # written before the store existed, until they are answered
+        self._legacy_poll_ids: Dict[str, Dict] = {}
+        self._poll_store: Optional[PollStateStore] = None
 
         # Load persisted state
         self._load_state()
@@ -53,15 +61,15 @@ class TrailReviewService:
                 # Convert chat_id keys back to int
                 raw_states = data.get("poll_states", {})
                 self._poll_states = {int(k): v for k, v in raw_states.items()}
-                self._poll_id_map = data.get("poll_id_map", {})
+                self._legacy_poll_ids = data.get("poll_id_map", {})
                 logger.info(
                     f"Loaded trail poll state: {len(self._poll_states)} chats, "
-                    f"{len(self._poll_id_map)} poll mappings"
+                    f"{len(self._legacy_poll_ids)} legacy poll mappings"
                 )
         except Exception as e:
             logger.error(f"Error loading trail poll state: {e}")
             self._poll_states = {}
-            self._poll_id_map = {}
+            self._legacy_poll_ids = {}
 
     def _save_state(self) -> None:
         """Persist poll state to disk."""
@@ -69,7 +77,7 @@ class TrailReviewService:
             _STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
             data = {
                 "poll_states": {str(k): v for k, v in self._poll_states.items()},
-                "poll_id_map": self._poll_id_map,
+                "poll_id_map": self._legacy_poll_ids,
                 "saved_at": datetime.now().isoformat(),
             }
             _STATE_FILE.write_text(json.dumps(data, indent=2, default=str))
@@ -78,10 +86,16 @@ class TrailReviewService:
             logger.error(f"Error saving trail poll state: {e}")
 
     # ------------------------------------------------------------------
-    # Poll-ID mapping (replaces context.bot_data['trail_polls'])
+    # Poll-ID mapping (shared poll state store)
     # ------------------------------------------------------------------
 
-    def register_poll(
+    @property
+    def poll_store(self) -> PollStateStore:
+        if self._poll_store is None:
+            self._poll_store = get_poll_state_store()
+        return self._poll_store
+
+    async def register_poll(
         self,
         poll_id: str,
         trail_path: str,
@@ -90,22 +104,30 @@ class TrailReviewService:
         options: List[str],
     ) -> None:
         """Register a sent poll so its answer can be matched later."""
-        self._poll_id_map[poll_id] = {
-            "trail_path": trail_path,
-            "field": field,
-            "chat_id": chat_id,
-            "options": options,
-        }
-        self._save_state()
+        await self.poll_store.register(
+            poll_id,
+            KIND_TRAIL,
+            chat_id,
+            {
+                "trail_path": trail_path,
+                "field": field,
+                "chat_id": chat_id,
+                "options": options,
+            },
+        )
 
-    def unregister_poll(self, poll_id: str) -> None:
+    async def unregister_poll(self, poll_id: str) -> None:
         """Remove a poll mapping after it has been answered."""
-        self._poll_id_map.pop(poll_id, None)
-        self._save_state()
+        await self.poll_store.unregister(poll_id)
+        if self._legacy_poll_ids.pop(poll_id, None) is not None:
+            self._save_state()
 
-    def get_poll_info(self, poll_id: str) -> Optional[Dict]:
+    async def get_poll_info(self, poll_id: str) -> Optional[Dict]:
         """Look up trail info for a poll_id.  Returns None if not a trail poll."""
-        return self._poll_id_map.get(poll_id)
+        info = await self.poll_store.get(poll_id, KIND_TRAIL)
+        if info is None:
+            info = self._legacy_poll_ids.get(poll_id)
+        return info
 
     # ------------------------------------------------------------------
     # Trail discovery
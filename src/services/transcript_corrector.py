@@ -3,13 +3,22 @@ Transcript Corrector Service (#12)
 
 Applies vocabulary corrections and filler word removal to transcripts.
 Supports configurable correction levels.
+
+Correction terms and fillers are compiled into a single Aho–Corasick
+automaton, so one linear scan finds every candidate regardless of how many
+terms are loaded. Word boundaries and the filler context rules (e.g. "ну"
+only before a comma) are checked on the candidates afterwards. The
+corrections file is reloaded when it changes on disk.
 """
 
 import json
 import logging
 import re
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..utils.aho_corasick import AhoCorasick
 
 logger = logging.getLogger(__name__)
 
@@ -18,32 +27,90 @@ DEFAULT_CORRECTIONS_FILE = (
     Path(__file__).parent.parent.parent / "config" / "corrections_map.json"
 )
 
+# Letters and digits that may not touch a vocabulary term (Latin + Cyrillic,
+# plus the characters case-insensitive regex matching folds onto Latin)
+VOCABULARY_WORD_CHARS = frozenset(
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+    "абвгдежзийклмнопрстуфхцчшщъыьэюяАБВГДЕЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯёЁ"
+    "İıſK"
+)
+
+LIKE_FILLER_FOLLOWERS = ("i", "you", "he", "she", "it", "we", "they", "so", "um", "uh")
+
+
+def _followed_by_comma(text: str, end: int) -> bool:
+    """Only whitespace between the match and a comma ("so, ...")."""
+    while end < len(text) and text[end].isspace():
+        end += 1
+    return end < len(text) and text[end] == ","
+
+
+def _followed_by_pronoun(text: str, end: int) -> bool:
+    """ "like" as a filler: "like I said", "like you know"."""
+    start = end
+    while end < len(text) and text[end].isspace():
+        end += 1
+    return end > start and text.startswith(LIKE_FILLER_FOLLOWERS, end)
+
+
+@dataclass(frozen=True)
+class FillerRule:
+    """A filler phrase to drop.
+
+    ``repeat``: the last letter may repeat ("эээ", "ээээ").
+    ``context``: extra condition on the (lowercased) text after the match.
+    """
+
+    phrase: str
+    repeat: bool = False
+    context: Optional[Callable[[str, int], bool]] = None
+
+
 # Filler words to remove (English and Russian)
 FILLER_WORDS_EN = [
-    r"\bum\b",
-    r"\buh\b",
-    r"\blike\b(?=\s+(?:I|you|he|she|it|we|they|so|um|uh))",  # Only "like" as filler
-    r"\byou know\b",
-    r"\bI mean\b",
-    r"\bso\b(?=\s*,)",  # "so," at start
-    r"\bactually\b(?=\s*,)",
-    r"\bbasically\b(?=\s*,)",
+    FillerRule("um"),
+    FillerRule("uh"),
+    FillerRule("like", context=_followed_by_pronoun),  # Only "like" as filler
+    FillerRule("you know"),
+    FillerRule("i mean"),
+    FillerRule("so", context=_followed_by_comma),  # "so," at start
+    FillerRule("actually", context=_followed_by_comma),
+    FillerRule("basically", context=_followed_by_comma),
 ]
 
 FILLER_WORDS_RU = [
-    r"\bэээ+\b",
-    r"\bммм+\b",
-    r"\bаааа+\b",
-    r"\bну\b(?=\s*,)",  # "ну," as filler
-    r"\bвот\b(?=\s*,)",  # "вот," as filler
-    r"\bзначит\b(?=\s*,)",
-    r"\bкороче\b(?=\s*,)",
-    r"\bтипа\b",
-    r"\bкак бы\b",
-    r"\bтак сказать\b",
+    FillerRule("эээ", repeat=True),
+    FillerRule("ммм", repeat=True),
+    FillerRule("аааа", repeat=True),
+    FillerRule("ну", context=_followed_by_comma),  # "ну," as filler
+    FillerRule("вот", context=_followed_by_comma),  # "вот," as filler
+    FillerRule("значит", context=_followed_by_comma),
+    FillerRule("короче", context=_followed_by_comma),
+    FillerRule("типа"),
+    FillerRule("как бы"),
+    FillerRule("так сказать"),
 ]
 
 
+def _is_word_char(char: str) -> bool:
+    """Regex ``\\w`` for filler boundaries (any Unicode letter/digit, "_")."""
+    return char.isalnum() or char == "_"
+
+
+def _fold_case(text: str) -> str:
+    """Lowercase without changing length, so match offsets map back to text."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+@dataclass(frozen=True)
+class _Vocabulary:
+    term: str
+    replacement: str
+
+
 class TranscriptCorrector:
     """
     Service for correcting transcripts with vocabulary fixes and filler removal.
@@ -100,12 +167,13 @@ class TranscriptCorrector:
         Args:
             corrections_file: Path to JSON file with term corrections
         """
+        self.corrections_file = corrections_file
         self.corrections: Dict[str, str] = {}
-        self.pattern: Optional[re.Pattern] = None
-        self.filler_pattern: Optional[re.Pattern] = None
+        self._corrections_mtime: Optional[int] = None
+        self.matcher: AhoCorasick = AhoCorasick([])
 
         self._load_corrections(corrections_file)
-        self._build_filler_pattern()
+        self._build_matcher()
 
     def _load_corrections(self, corrections_file: Path) -> None:
         """Load corrections from JSON file."""
@@ -114,6 +182,7 @@ class TranscriptCorrector:
             return
 
         try:
+            mtime = corrections_file.stat().st_mtime_ns
             with open(corrections_file, "r", encoding="utf-8") as f:
                 raw_corrections = json.load(f)
 
@@ -123,36 +192,125 @@ class TranscriptCorrector:
                 for k, v in raw_corrections.items()
                 if k.lower() not in self.SKIP_TERMS and len(k) >= 3
             }
+            self._corrections_mtime = mtime
 
-            self._build_correction_pattern()
             logger.info(f"Loaded {len(self.corrections)} correction rules")
 
         except Exception as e:
             logger.error(f"Failed to load corrections: {e}")
 
-    def _build_correction_pattern(self) -> None:
-        """Build regex pattern for vocabulary corrections."""
-        if not self.corrections:
-            return
-
-        # Sort by length (longest first) to avoid partial matches
-        sorted_terms = sorted(self.corrections.keys(), key=len, reverse=True)
+    def _build_matcher(self) -> None:
+        """Compile vocabulary terms and fillers into one automaton."""
+        patterns: List[Tuple[str, object]] = [
+            (term, _Vocabulary(term, replacement))
+            for term, replacement in self.corrections.items()
+        ]
+        patterns += [(rule.phrase, rule) for rule in FILLER_WORDS_EN + FILLER_WORDS_RU]
+        # Swapped in whole, so concurrent calls see the old or the new matcher
+        self.matcher = AhoCorasick(patterns)
 
-        # Escape special regex chars
-        escaped = [re.escape(term) for term in sorted_terms]
-        pattern_str = "|".join(escaped)
+    def reload_if_changed(self) -> bool:
+        """Reload the corrections file if it changed on disk.
 
-        # Word boundary pattern supporting Cyrillic
-        word_char = r"a-zA-Z0-9а-яА-ЯёЁ"
-        self.pattern = re.compile(
-            rf"(?<![{word_char}])({pattern_str})(?![{word_char}])", re.IGNORECASE
-        )
-
-    def _build_filler_pattern(self) -> None:
-        """Build regex pattern for filler word removal."""
-        all_fillers = FILLER_WORDS_EN + FILLER_WORDS_RU
-        if all_fillers:
-            self.filler_pattern = re.compile("|".join(all_fillers), re.IGNORECASE)
+        Returns:
+            True if corrections were reloaded.
+        """
+        try:
+            mtime = self.corrections_file.stat().st_mtime_ns
+        except OSError:
+            return False
+        if mtime == self._corrections_mtime:
+            return False
+        self._load_corrections(self.corrections_file)
+        self._build_matcher()
+        return True
+
+    def _find_matches(
+        self, text: str, vocabulary: bool, fillers: bool
+    ) -> List[Tuple[int, int, object]]:
+        """Non-overlapping matches in one scan, sorted by position.
+
+        Vocabulary terms win over fillers (corrections used to run first);
+        within each kind the leftmost match wins, longest first, like the
+        regex alternations this replaces.
+        """
+        folded = _fold_case(text)
+        length = len(text)
+        terms: List[Tuple[int, int, object]] = []
+        filler_hits: List[Tuple[int, int, object]] = []
+
+        for start, end, value in self.matcher.iter_matches(folded):
+            if isinstance(value, _Vocabulary):
+                if not vocabulary:
+                    continue
+                if (start and text[start - 1] in VOCABULARY_WORD_CHARS) or (
+                    end < length and text[end] in VOCABULARY_WORD_CHARS
+                ):
+                    continue
+                terms.append((start, end, value))
+            elif fillers:
+                if value.repeat:
+                    last = value.phrase[-1]
+                    while end < length and folded[end] == last:
+                        end += 1
+                if (start and _is_word_char(text[start - 1])) or (
+                    end < length and _is_word_char(text[end])
+                ):
+                    continue
+                if value.context is not None and not value.context(folded, end):
+                    continue
+                filler_hits.append((start, end, value))
+
+        chosen = self._leftmost(terms, [])
+        return sorted(self._leftmost(filler_hits, chosen) + chosen)
+
+    @staticmethod
+    def _leftmost(
+        candidates: List[Tuple[int, int, object]],
+        taken: List[Tuple[int, int, object]],
+    ) -> List[Tuple[int, int, object]]:
+        """Greedy leftmost-longest selection avoiding ``taken`` spans."""
+        blocked = sorted((start, end) for start, end, _ in taken)
+        chosen = []
+        last_end = 0
+        block = 0
+        for start, end, value in sorted(candidates, key=lambda m: (m[0], -m[1])):
+            if start < last_end:
+                continue
+            while block < len(blocked) and blocked[block][1] <= start:
+                block += 1
+            if block < len(blocked) and blocked[block][0] < end:
+                continue
+            chosen.append((start, end, value))
+            last_end = end
+        return chosen
+
+    def _apply(
+        self,
+        text: str,
+        vocabulary: bool,
+        fillers: bool,
+        terms_corrected: Optional[List[Dict]] = None,
+    ) -> str:
+        """Rewrite text with the matches from a single automaton scan."""
+        matches = self._find_matches(text, vocabulary, fillers)
+        if not matches:
+            return self._clean_whitespace(text) if fillers else text
+
+        out = []
+        position = 0
+        for start, end, value in matches:
+            out.append(text[position:start])
+            if isinstance(value, _Vocabulary):
+                out.append(value.replacement)
+                if terms_corrected is not None:
+                    terms_corrected.append(
+                        {"original": text[start:end], "corrected": value.replacement}
+                    )
+            position = end
+        out.append(text[position:])
+        result = "".join(out)
+        return self._clean_whitespace(result) if fillers else result
 
     def correct_text(
         self,
@@ -177,18 +335,11 @@ class TranscriptCorrector:
         if level == "none":
             return text
 
-        result = text
-
-        # Apply vocabulary corrections
-        if level in ("vocabulary", "full") and self.pattern:
-            result = self._apply_vocabulary_corrections(result)
-
-        # Apply filler removal
-        should_remove_fillers = remove_fillers or level == "full"
-        if should_remove_fillers and self.filler_pattern:
-            result = self._remove_fillers(result)
-
-        return result
+        vocabulary = level in ("vocabulary", "full") and bool(self.corrections)
+        fillers = remove_fillers or level == "full"
+        if not vocabulary and not fillers:
+            return text
+        return self._apply(text, vocabulary, fillers)
 
     def correct_text_with_stats(
         self,
@@ -208,24 +359,13 @@ class TranscriptCorrector:
         if not text or level == "none":
             return text, {"corrections_count": 0, "terms_corrected": []}
 
-        terms_corrected = []
-
-        def replace_with_tracking(match):
-            term = match.group(1)
-            term_lower = term.lower()
-            if term_lower in self.corrections:
-                terms_corrected.append(
-                    {"original": term, "corrected": self.corrections[term_lower]}
-                )
-                return self.corrections[term_lower]
-            return term
-
-        result = text
-        if self.pattern:
-            result = self.pattern.sub(replace_with_tracking, result)
-
-        if level == "full" and self.filler_pattern:
-            result = self._remove_fillers(result)
+        terms_corrected: List[Dict] = []
+        result = self._apply(
+            text,
+            vocabulary=bool(self.corrections),
+            fillers=level == "full",
+            terms_corrected=terms_corrected,
+        )
 
         stats = {
             "corrections_count": len(terms_corrected),
@@ -236,31 +376,18 @@ class TranscriptCorrector:
 
     def _apply_vocabulary_corrections(self, text: str) -> str:
         """Apply vocabulary corrections to text."""
-        if not self.pattern:
-            return text
-
-        def replace(match):
-            term = match.group(1)
-            term_lower = term.lower()
-            if term_lower in self.corrections:
-                return self.corrections[term_lower]
-            return term
-
-        return self.pattern.sub(replace, text)
+        return self._apply(text, vocabulary=True, fillers=False)
 
     def _remove_fillers(self, text: str) -> str:
         """Remove filler words from text."""
-        if not self.filler_pattern:
-            return text
+        return self._apply(text, vocabulary=False, fillers=True)
 
-        # Remove fillers
-        result = self.filler_pattern.sub("", text)
-
-        # Clean up extra spaces
-        result = re.sub(r"\s+", " ", result)
+    @staticmethod
+    def _clean_whitespace(text: str) -> str:
+        """Tidy the gaps left by removed fillers."""
+        result = re.sub(r"\s+", " ", text)
         result = re.sub(r"\s+,", ",", result)
         result = re.sub(r",\s*,", ",", result)
-
         return result.strip()
 
     def get_correction_count(self) -> int:
@@ -277,4 +404,6 @@ def get_transcript_corrector() -> TranscriptCorrector:
     global _transcript_corrector
     if _transcript_corrector is None:
         _transcript_corrector = TranscriptCorrector()
+    else:
+        _transcript_corrector.reload_if_changed()
     return _transcript_corrector
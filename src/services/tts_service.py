@@ -13,7 +13,10 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional
 
-import aiohttp
+from ..utils.lazy_import import lazy_module
+
+# Only needed when a voice response is synthesized
+aiohttp = lazy_module("aiohttp")
 
 logger = logging.getLogger(__name__)
 
@@ -3,13 +3,23 @@ Vault User Service
 
 Looks up Telegram users in Obsidian vault People folder
 to provide rich context in Claude prompts.
+
+Lookups go through a handle -> note index of the People folder. The index
+is refreshed incrementally: only notes whose mtime/size changed are
+re-parsed, and the folder is only re-listed when its mtime changes or the
+periodic rescan interval (which catches in-place edits) has passed. It is
+persisted to data/people_index.json so a restart re-parses nothing that
+did not change.
 """
 
+import json
 import logging
+import os
 import re
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 from ..core.config import get_settings
 
@@ -28,6 +38,12 @@ VAULT_PEOPLE_PATH = Path.home() / "Research" / "vault" / "People"
 _user_cache: Dict[str, tuple[Optional[str], datetime]] = {}
 CACHE_TTL_MINUTES = 30
 
+# Persisted People index and how often unchanged folders are re-statted
+PEOPLE_INDEX_PATH = (
+    Path(__file__).resolve().parent.parent.parent / "data" / "people_index.json"
+)
+INDEX_RESCAN_SECONDS = 60
+
 
 def _normalize_handle(handle: str) -> str:
     """Normalize telegram handle (lowercase, strip @)."""
@@ -79,9 +95,163 @@ def _parse_frontmatter(content: str) -> Dict[str, str]:
     return result
 
 
+def _note_handle(note_path: Path) -> Optional[str]:
+    """Parse a People note's telegram handle (normalized), if it has one."""
+    content = note_path.read_text(encoding="utf-8")
+    telegram_value = _parse_frontmatter(content).get("telegram", "")
+    handle = _extract_handle_from_yaml(telegram_value)
+    return _normalize_handle(handle) if handle else None
+
+
+class PeopleIndex:
+    """Handle -> note name index over a People folder."""
+
+    def __init__(
+        self,
+        people_path: Path,
+        index_path: Optional[Path] = None,
+        rescan_seconds: float = INDEX_RESCAN_SECONDS,
+    ):
+        self.people_path = people_path
+        self.index_path = index_path
+        self.rescan_seconds = rescan_seconds
+
+        # note filename -> (mtime_ns, size, normalized handle or None)
+        self._files: Dict[str, Tuple[int, int, Optional[str]]] = {}
+        self._handles: Dict[str, str] = {}
+        self._dir_mtime: Optional[int] = None
+        self._last_sweep: Optional[float] = None
+
+        self._load()
+
+    def _load(self) -> None:
+        """Load the persisted index (only if it describes this folder)."""
+        if not self.index_path or not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("people_path") != str(self.people_path):
+                return
+            self._files = {
+                name: (mtime, size, handle)
+                for name, (mtime, size, handle) in data["files"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable People index {self.index_path}: {e}")
+            self._files = {}
+            return
+        # The folder may have changed while we were down; the first lookup
+        # still sweeps, but only re-parses notes whose mtime/size differ.
+        self._rebuild_handles()
+        logger.info(f"Loaded People index: {len(self._handles)} handles")
+
+    def _save(self) -> None:
+        if not self.index_path:
+            return
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix(".json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"people_path": str(self.people_path), "files": self._files}, f
+                )
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logger.warning(f"Could not persist People index: {e}")
+
+    def _rebuild_handles(self) -> None:
+        handles: Dict[str, str] = {}
+        # Sorted so duplicate handles resolve to the same note every time
+        for name in sorted(self._files):
+            handle = self._files[name][2]
+            if handle:
+                handles.setdefault(handle, name[: -len(".md")].lstrip("@"))
+        self._handles = handles
+
+    def refresh(self, force: bool = False) -> bool:
+        """Bring the index up to date. Returns True if anything changed."""
+        try:
+            dir_mtime = os.stat(self.people_path).st_mtime_ns
+        except OSError:
+            return False
+
+        now = time.monotonic()
+        if (
+            not force
+            and dir_mtime == self._dir_mtime
+            and self._last_sweep is not None
+            and now - self._last_sweep < self.rescan_seconds
+        ):
+            return False
+
+        changed = False
+        files: Dict[str, Tuple[int, int, Optional[str]]] = {}
+        with os.scandir(self.people_path) as entries:
+            for entry in entries:
+                name = entry.name
+                if not (name.startswith("@") and name.endswith(".md")):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+
+                previous = self._files.get(name)
+                if previous and previous[:2] == (st.st_mtime_ns, st.st_size):
+                    files[name] = previous
+                    continue
+                try:
+                    handle = _note_handle(Path(entry.path))
+                except Exception as e:
+                    # Left out of the index so the next sweep retries it
+                    logger.warning(f"Error reading {entry.path}: {e}")
+                    continue
+                files[name] = (st.st_mtime_ns, st.st_size, handle)
+                changed = True
+
+        if files.keys() != self._files.keys():
+            changed = True
+        self._files = files
+        self._dir_mtime = dir_mtime
+        self._last_sweep = now
+
+        if changed:
+            self._rebuild_handles()
+            self._save()
+            logger.debug(
+                f"People index refreshed: {len(files)} notes, "
+                f"{len(self._handles)} handles"
+            )
+        return changed
+
+    def lookup(self, normalized_handle: str) -> Optional[str]:
+        """Return the note name for a normalized handle, refreshing if stale."""
+        self.refresh()
+        return self._handles.get(normalized_handle)
+
+    def __len__(self) -> int:
+        return len(self._handles)
+
+
+_people_index: Optional[PeopleIndex] = None
+
+
+def get_people_index(people_path: Optional[Path] = None) -> PeopleIndex:
+    """Get the People index for the configured (or given) folder."""
+    global _people_index
+    if people_path is None:
+        people_path = _get_vault_people_path()
+    if _people_index is None or _people_index.people_path != people_path:
+        _people_index = PeopleIndex(people_path, index_path=PEOPLE_INDEX_PATH)
+    return _people_index
+
+
 def lookup_telegram_user(telegram_handle: str) -> Optional[str]:
     """
-    Search People/ folder for a note with matching telegram field.
+    Find the People/ note whose telegram field matches the handle.
 
     Args:
         telegram_handle: Telegram username (with or without @)
@@ -106,24 +276,11 @@ def lookup_telegram_user(telegram_handle: str) -> Optional[str]:
         logger.warning(f"Vault People path does not exist: {people_path}")
         return None
 
-    for note_path in people_path.glob("@*.md"):
-        try:
-            content = note_path.read_text(encoding="utf-8")
-            frontmatter = _parse_frontmatter(content)
-
-            telegram_value = frontmatter.get("telegram", "")
-            note_handle = _extract_handle_from_yaml(telegram_value)
-
-            if note_handle and _normalize_handle(note_handle) == normalized:
-                # Extract note name (remove @ prefix and .md suffix)
-                note_name = note_path.stem.lstrip("@")
-                _user_cache[normalized] = (note_name, datetime.now())
-                logger.info(f"Found vault note for @{telegram_handle}: {note_name}")
-                return note_name
-
-        except Exception as e:
-            logger.warning(f"Error reading {note_path}: {e}")
-            continue
+    note_name = get_people_index(people_path).lookup(normalized)
+    if note_name:
+        _user_cache[normalized] = (note_name, datetime.now())
+        logger.info(f"Found vault note for @{telegram_handle}: {note_name}")
+        return note_name
 
     # Not found - cache negative result
     _user_cache[normalized] = (None, datetime.now())
@@ -29,6 +29,11 @@ def _workspace_dir(chat_id: int) -> Path:
     return WORKSPACES_DIR / safe_id
 
 
+def memory_path(chat_id: int) -> Path:
+    """Return the CLAUDE.md path for a chat (it may not exist yet)."""
+    return _workspace_dir(chat_id) / "CLAUDE.md"
+
+
 def ensure_workspace(chat_id: int) -> Path:
     """Create workspace directory and CLAUDE.md from template if missing.
 
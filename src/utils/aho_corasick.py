@@ -0,0 +1,86 @@
+"""Aho–Corasick automaton for linear-time multi-pattern string matching.
+
+Matching cost is proportional to the text length plus the number of
+matches, independent of how many patterns are loaded — unlike a regex
+alternation, which retries every alternative at each position.
+"""
+
+from typing import Dict, Generic, Iterable, Iterator, List, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class AhoCorasick(Generic[V]):
+    """
+    Immutable multi-pattern matcher built from ``(pattern, value)`` pairs.
+
+    Patterns are matched exactly; callers normalise case (e.g. lowercase
+    both patterns and text) before building and searching.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, V]]):
+        # State 0 is the root. goto[state] maps a character to the next state.
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Patterns ending at each state (including via failure links), as
+        # (pattern length, value) pairs, longest first
+        self._out: List[List[Tuple[int, V]]] = [[]]
+        self.pattern_count = 0
+
+        for pattern, value in patterns:
+            if pattern:
+                self._add(pattern, value)
+        self._build_failure_links()
+
+    def _add(self, pattern: str, value: V) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._out[state].append((len(pattern), value))
+        self.pattern_count += 1
+
+    def _build_failure_links(self) -> None:
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target
+                # target is shallower, so its outputs are already complete
+                self._out[next_state] = self._out[next_state] + self._out[target]
+        # Longest first, so callers can prefer the longest match at an end
+        for outputs in self._out:
+            outputs.sort(key=lambda item: item[0], reverse=True)
+
+    def __len__(self) -> int:
+        return self.pattern_count
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, V]]:
+        """Yield ``(start, end, value)`` for every occurrence, ordered by end."""
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        state = 0
+        for index, char in enumerate(text):
+            next_state = goto[state].get(char)
+            while next_state is None and state:
+                state = fail[state]
+                next_state = goto[state].get(char)
+            state = next_state or 0
+            if out[state]:
+                end = index + 1
+                for length, value in out[state]:
+                    yield end - length, end, value
@@ -0,0 +1,113 @@
+"""
+Minimal five-field cron expressions (minute hour day-of-month month weekday).
+
+Supports ``*``, single values, ranges (``1-5``), steps (``*/15``, ``0-30/10``)
+and comma-separated lists. Weekdays are 0-6 with 0 (or 7) meaning Sunday.
+As in standard cron, when both day-of-month and weekday are restricted a day
+matches if either does.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import FrozenSet, List, Set, Tuple
+
+_FIELD_RANGES: List[Tuple[int, int]] = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+# Upper bound on search steps; a valid expression matches well before this
+_MAX_STEPS = 100_000
+
+
+def _parse_field(field: str, low: int, high: int) -> FrozenSet[int]:
+    values: Set[int] = set()
+    for part in field.split(","):
+        base, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if step < 1:
+            raise ValueError(f"Invalid cron step: {part}")
+        if base == "*":
+            start, end = low, high
+        elif "-" in base:
+            start_text, end_text = base.split("-", 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = int(base)
+            end = high if step_text else start
+        if not low <= start <= end <= high:
+            raise ValueError(f"Cron value out of range {low}-{high}: {part}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class CronSchedule:
+    """A parsed cron expression."""
+
+    minutes: FrozenSet[int]
+    hours: FrozenSet[int]
+    days: FrozenSet[int]
+    months: FrozenSet[int]
+    weekdays: FrozenSet[int]
+    any_day: bool
+    any_weekday: bool
+
+    @classmethod
+    def parse(cls, expression: str) -> "CronSchedule":
+        """Parse ``expression``.
+
+        Raises:
+            ValueError: If the expression is not a valid five-field cron line.
+        """
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        try:
+            minutes, hours, days, months, weekdays = (
+                _parse_field(field, low, high)
+                for field, (low, high) in zip(fields, _FIELD_RANGES)
+            )
+        except ValueError as e:
+            raise ValueError(f"Invalid cron expression {expression!r}: {e}") from e
+        return cls(
+            minutes=minutes,
+            hours=hours,
+            days=days,
+            months=months,
+            weekdays=frozenset(d % 7 for d in weekdays),
+            any_day=fields[2] == "*",
+            any_weekday=fields[4] == "*",
+        )
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, after: datetime) -> datetime:
+        """First matching minute strictly after ``after`` (same tzinfo).
+
+        Raises:
+            ValueError: If the expression never matches (e.g. ``0 0 30 2 *``).
+        """
+        moment = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        for _ in range(_MAX_STEPS):
+            if moment.month not in self.months:
+                year, month = divmod(moment.month, 12)
+                moment = moment.replace(
+                    year=moment.year + year, month=month + 1, day=1, hour=0, minute=0
+                )
+            elif not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment
+        raise ValueError("Cron expression has no upcoming match")
+
+
+def next_cron_time(expression: str, after: datetime) -> datetime:
+    """Next time ``expression`` fires after ``after``."""
+    return CronSchedule.parse(expression).next_after(after)
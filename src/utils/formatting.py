@@ -15,7 +15,6 @@ Contains:
 
 import logging
 import re
-import uuid
 from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
@@ -214,7 +213,7 @@ def _reformat_code_block(text: str, max_width: int = TELEGRAM_CODE_BLOCK_WIDTH)
     if max_line <= max_width:
         return text
 
-    has_box = any(c in _BOX_ALL for c in text)
+    has_box = not _BOX_ALL.isdisjoint(text)
     pipe_lines = sum(1 for line in lines if "|" in line and line.count("|") >= 2)
 
     if has_box or pipe_lines >= 2:
@@ -383,98 +382,376 @@ def split_message(text: str, max_size: int = 3800) -> List[str]:
     return chunks
 
 
-def markdown_to_telegram_html(text: str, include_frontmatter: bool = True) -> str:
-    """
-    Convert markdown to Telegram-compatible HTML.
+# === Markdown -> Telegram HTML ===
+#
+# The converter is a small tokenizer rather than a chain of regex
+# substitutions: fenced code is split off first, the rest is grouped into
+# line blocks (tables, headers, paragraphs) and each block is scanned once
+# for inline markup. Blocks become (kind, tag, html) tokens that
+# _HtmlChunkWriter packs into Telegram-sized chunks as they are produced.
+
+_TEXT, _OPEN, _CLOSE = 0, 1, 2
+_FENCE_OPEN_RE = re.compile(r"```(?:\w+(?=\n))?\n?")
+_TABLE_ROW_RE = re.compile(r"\|.+\|")
+_HEADER_RE = re.compile(r"#{1,6}\s+(.+)")
+# Inline spans, tried left to right. Emphasis closes at the first single
+# marker (possessive, so no backtracking) and must not touch a word
+# character on the outside, which keeps snake_case and 2*3*4 literal.
+_INLINE_RE = re.compile(
+    r"`(?P<code>[^`]+)`"
+    r"|\[\[(?P<wikilink>[^\]]+)\]\]"
+    r"|\[(?P<label>[^\]]+)\]\((?P<href>[^)]+)\)"
+    r"|\*\*(?P<bold>[^\n]+?)\*\*"
+    r"|__(?P<bold_>[^\n]+?)__"
+    r"|\*(?<![a-zA-Z0-9]\*)(?P<italic>[^*\s](?:[^*]|\*\*)*+)\*(?![a-zA-Z0-9])"
+    r"|_(?<![a-zA-Z0-9]_)(?P<italic_>[^_\s](?:[^_]|__)*+)_(?![a-zA-Z0-9])"
+)
 
-    Args:
-        text: Markdown content (may include YAML frontmatter)
-        include_frontmatter: If True, prepend formatted frontmatter summary
+_Token = Tuple[int, Optional[str], str]
+
+
+def _wrap(tag: str, inner: List[_Token], open_html: str = "") -> List[_Token]:
+    return [(_OPEN, tag, open_html or f"<{tag}>"), *inner, (_CLOSE, tag, f"</{tag}>")]
+
+
+def _wikilink_tokens(note_name: str) -> List[_Token]:
+    """Wikilink -> deep link that opens the note in the bot.
+
+    ``note_name`` is HTML-escaped already, like all _inline_tokens input.
     """
-    # Parse and remove frontmatter
-    frontmatter, body = parse_frontmatter(text)
+    import urllib.parse
 
-    # Format frontmatter summary if present and requested
-    frontmatter_summary = ""
-    if frontmatter and include_frontmatter:
-        summary = format_frontmatter_summary(frontmatter)
-        if summary:
-            frontmatter_summary = f"{summary}\n\n"
+    from src.core.config import get_config_value
 
-    # Generate unique placeholder prefix
-    placeholder = f"CODEBLOCK{uuid.uuid4().hex[:8]}"
+    display_name = note_name.lstrip("@")
+    raw_name = (
+        display_name.replace("&lt;", "<").replace("&gt;", ">").replace("&amp;", "&")
+    )
+    encoded_name = urllib.parse.quote(raw_name, safe="")
+    bot_username = get_config_value("bot.bot_username", "toolbuildingape_bot")
+    deep_link = f"https://t.me/{bot_username}?start=note_{encoded_name}"
+    return _wrap(
+        "a",
+        [(_TEXT, None, f"\U0001f4c4 {display_name}")],
+        f'<a href="{escape_html(deep_link)}">',
+    )
 
-    # First escape HTML entities
-    text = escape_html(body)
 
-    # Process code blocks first (```code```) - preserve them
-    code_blocks = []
+def _inline_tokens(text: str) -> List[_Token]:
+    """Scan one HTML-escaped block of markdown for inline markup.
 
-    def save_code_block(match):
-        code_blocks.append(match.group(1))
-        return f"{placeholder}{len(code_blocks) - 1}{placeholder}"
+    Covers `code`, **bold**/__bold__, *italic*/_italic_, [text](url) and
+    [[wikilinks]]. Code spans are opaque; other spans are scanned
+    recursively. Unmatched markers are kept as literal text.
+    """
+    tokens: List[_Token] = []
+    pos = 0
+    for match in _INLINE_RE.finditer(text):
+        start = match.start()
+        if pos < start:
+            tokens.append((_TEXT, None, text[pos:start]))
+        pos = match.end()
+        kind = match.lastgroup
+        assert kind is not None  # every alternative is a named group
+        value = match.group(kind)
+        if kind == "code":
+            tokens.extend(_wrap("code", [(_TEXT, None, value)]))
+        elif kind == "wikilink":
+            tokens.extend(_wikilink_tokens(value))
+        elif kind == "href":
+            label = _inline_tokens(match.group("label"))
+            href = value.replace('"', "&quot;")
+            tokens.extend(_wrap("a", label, f'<a href="{href}">'))
+        else:
+            tag = "b" if kind.startswith("bold") else "i"
+            tokens.extend(_wrap(tag, _inline_tokens(value)))
+    if pos < len(text):
+        tokens.append((_TEXT, None, text[pos:]))
+    return tokens
 
-    text = re.sub(r"```(?:\w+)?\n?(.*?)```", save_code_block, text, flags=re.DOTALL)
 
-    # Detect and convert markdown tables using compact renderer
-    def convert_table(match):
-        try:
-            parsed = _parse_table_text(match.group(0))
-            if parsed:
-                headers, data = parsed
-                compact = render_compact_table(headers, data)
-                code_blocks.append(compact)
-                return f"{placeholder}{len(code_blocks) - 1}{placeholder}"
-        except Exception as e:
-            logger.warning(f"Table conversion failed: {e}")
-        code_blocks.append(match.group(0))
-        return f"{placeholder}{len(code_blocks) - 1}{placeholder}"
+def _pre_tokens(content: str) -> List[_Token]:
+    return _wrap("pre", [(_TEXT, None, escape_html(_reformat_code_block(content)))])
 
-    table_pattern = r"(?:^\|.+\|$\n?)+"
-    text = re.sub(table_pattern, convert_table, text, flags=re.MULTILINE)
 
-    # Inline code (`code`)
-    text = re.sub(r"`([^`]+)`", r"<code>\1</code>", text)
+def _table_tokens(table: str, raw_suffix: str = "") -> List[_Token]:
+    """Markdown table -> compact <pre> table (see render_compact_table).
 
-    # Bold (**text** or __text__)
-    text = re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", text)
-    text = re.sub(r"__(.+?)__", r"<b>\1</b>", text)
+    Rows that do not parse as a table are kept verbatim, plus ``raw_suffix``.
+    """
+    try:
+        parsed = _parse_table_text(table)
+        if parsed:
+            headers, data = parsed
+            return _pre_tokens(render_compact_table(headers, data))
+    except Exception as e:
+        logger.warning(f"Table conversion failed: {e}")
+    return _pre_tokens(table + raw_suffix)
 
-    # Italic (*text* or _text_)
-    text = re.sub(r"(?<![a-zA-Z0-9])\*([^*]+)\*(?![a-zA-Z0-9])", r"<i>\1</i>", text)
-    text = re.sub(r"(?<![a-zA-Z0-9])_([^_]+)_(?![a-zA-Z0-9])", r"<i>\1</i>", text)
 
-    # Headers (# Header) -> bold
-    text = re.sub(r"^#{1,6}\s+(.+)$", r"<b>\1</b>", text, flags=re.MULTILINE)
+def _break_point(text: str, limit: int) -> Tuple[int, int]:
+    """Last paragraph, line or word break in the second half of text[:limit].
 
-    # Markdown links [text](url) -> <a href="url">text</a>
-    text = re.sub(r"\[([^\]]+)\]\(([^)]+)\)", r'<a href="\2">\1</a>', text)
+    Returns (index, separator length), or (-1, 0) if there is none.
+    """
+    window = text[:limit]
+    for sep in ("\n\n", "\n", " "):
+        index = window.rfind(sep)
+        if index > limit // 2:
+            return index, len(sep)
+    return -1, 0
+
+
+def _hard_cut(text: str, limit: int) -> int:
+    """Cut position <= limit that does not split an HTML entity."""
+    amp = text.rfind("&", max(0, limit - 5), limit)
+    if amp != -1 and ";" not in text[amp:limit]:
+        return amp if amp else text.find(";") + 1
+    return limit
+
+
+class _HtmlChunkWriter:
+    """Packs HTML tokens into tag-balanced chunks of at most ``max_size``.
+
+    Whole blocks go into the current chunk when they fit and start a new
+    chunk otherwise; only a block larger than a chunk is split, preferring
+    line breaks. Tags open at a split are closed at the end of the chunk
+    and reopened at the start of the next, so every chunk is valid
+    Telegram HTML on its own. A tag whose markup would take more than half
+    a chunk (e.g. a long link) is dropped and only its text kept, since
+    reopening it would leave almost no room for content.
+    ``max_size=None`` disables splitting.
+    """
 
-    # Wikilinks [[Note Name]] -> clickable deep link
-    def format_wikilink(match):
-        import urllib.parse
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = max_size
+        self.chunks: List[str] = []
+        self._parts: List[str] = []
+        self._size = 0
+        self._fresh_size = 0  # size of the tags reopened at the chunk start
+        self._stack: List[Tuple[str, str]] = []  # (tag, opening html)
+        self._reserve = 0  # size of the closing tags for _stack
+        self._kept: List[bool] = []  # per open tag: False if its markup was dropped
+        self._pending_sep = ""
+        # (part index, offset, chunk position) of the last newline outside tags
+        self._soft_break: Optional[Tuple[int, int, int]] = None
+
+    def separator(self, text: str) -> None:
+        """Whitespace between blocks; dropped if a chunk boundary falls here."""
+        self._pending_sep += text
+
+    def block(self, tokens: List[_Token]) -> None:
+        sep, self._pending_sep = self._pending_sep, ""
+        html = "".join([token[2] for token in tokens])
+        if not self._fits(len(sep) + len(html)):
+            if self._size > self._fresh_size:
+                self._break()
+            sep = ""
+        if self._fits(len(sep) + len(html)):
+            self._append(sep + html)
+        else:
+            self._feed(tokens)
+
+    def finish(self) -> List[str]:
+        if self._pending_sep and self._fits(len(self._pending_sep)):
+            self._parts.append(self._pending_sep)
+        html = "".join(self._parts)
+        if html or not self.chunks:
+            self.chunks.append(html)
+        return self.chunks
+
+    def _fits(self, size: int) -> bool:
+        return (
+            self.max_size is None or self._size + size + self._reserve <= self.max_size
+        )
+
+    def _append(self, html: str) -> None:
+        self._parts.append(html)
+        self._size += len(html)
+
+    def _break(self) -> None:
+        closing = "".join(f"</{tag}>" for tag, _ in reversed(self._stack))
+        self.chunks.append("".join(self._parts) + closing)
+        self._parts = [html for _, html in self._stack]
+        self._size = self._fresh_size = sum(len(html) for html in self._parts)
+        self._soft_break = None
+
+    def _break_at_soft_line(self) -> bool:
+        """End the chunk at the last newline outside tags, carrying the rest."""
+        assert self.max_size is not None  # only called while splitting
+        if self._soft_break is None:
+            return False
+        index, offset, position = self._soft_break
+        self._soft_break = None
+        if position <= self.max_size // 2:
+            return False
+        piece = self._parts[index]
+        self.chunks.append("".join(self._parts[:index]) + piece[:offset])
+        self._parts = [piece[offset + 1 :]] + self._parts[index + 1 :]
+        self._size = sum(len(html) for html in self._parts)
+        self._fresh_size = 0
+        return True
 
-        from src.core.config import get_config_value
+    def _feed(self, tokens: List[_Token]) -> None:
+        assert self.max_size is not None  # whole blocks always fit otherwise
+        for kind, tag, html in tokens:
+            if kind == _OPEN:
+                assert tag is not None
+                closing = len(tag) + 3
+                reopened = sum(len(open_html) for _, open_html in self._stack)
+                if reopened + self._reserve + len(html) + closing > self.max_size // 2:
+                    self._kept.append(False)
+                    continue
+                self._kept.append(True)
+                if not self._fits(len(html) + closing):
+                    self._break_at_soft_line()
+                    if not self._fits(len(html) + closing) and (
+                        self._size > self._fresh_size
+                    ):
+                        self._break()
+                at_start = self._size == self._fresh_size
+                self._append(html)
+                self._stack.append((tag, html))
+                self._reserve += closing
+                if at_start:
+                    # Opening tags alone are not content worth a chunk
+                    self._fresh_size = self._size
+            elif kind == _CLOSE:
+                if not self._kept.pop():
+                    continue
+                self._stack.pop()
+                self._reserve -= len(html)
+                self._append(html)
+            else:
+                self._feed_text(html)
+
+    def _feed_text(self, text: str) -> None:
+        assert self.max_size is not None
+        while text:
+            room = self.max_size - self._size - self._reserve
+            if room <= 0 and self._size > self._fresh_size:
+                self._break()
+                continue
+            room = max(room, 1)
+            if len(text) <= room:
+                piece, text = text, ""
+            else:
+                cut, skip = _break_point(text, room)
+                if cut == -1 or text[cut] == " ":
+                    # Prefer an earlier line break to splitting mid-line
+                    if self._break_at_soft_line():
+                        continue
+                    if cut == -1 and self._size > self._fresh_size:
+                        self._break()
+                        continue
+                if cut == -1:
+                    cut = _hard_cut(text, room)
+                piece, text = text[:cut], text[cut + skip :]
+            if not self._stack and "\n" in piece:
+                offset = piece.rfind("\n")
+                self._soft_break = (len(self._parts), offset, self._size + offset)
+            self._append(piece)
+            if text:
+                self._break()
+
+
+def _is_table_row(line: str) -> bool:
+    return line[:1] == "|" and _TABLE_ROW_RE.fullmatch(line) is not None
+
+
+def _match_header(line: str) -> Optional[re.Match]:
+    return _HEADER_RE.fullmatch(line) if line[:1] == "#" else None
+
+
+def _write_markdown(text: str, writer: _HtmlChunkWriter) -> None:
+    """Tokenize markdown outside fenced code, block by block."""
+    lines = text.split("\n")
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        end = index + 1
+        newline_after = end < len(lines)
+        if _is_table_row(line):
+            while end < len(lines) and _is_table_row(lines[end]):
+                end += 1
+            # The table swallows its trailing newline; <pre> ends the line
+            suffix = "\n" if end < len(lines) else ""
+            writer.block(_table_tokens("\n".join(lines[index:end]), suffix))
+            newline_after = False
+        elif header := _match_header(line):
+            writer.block(_wrap("b", _inline_tokens(escape_html(header.group(1)))))
+        elif line:
+            while (
+                end < len(lines)
+                and lines[end]
+                and not _is_table_row(lines[end])
+                and not _match_header(lines[end])
+            ):
+                end += 1
+            newline_after = end < len(lines)
+            paragraph = escape_html("\n".join(lines[index:end]))
+            writer.block(_inline_tokens(paragraph))
+        if newline_after:
+            writer.separator("\n")
+        index = end
+
+
+def _render_markdown(
+    text: str, include_frontmatter: bool, max_size: Optional[int]
+) -> List[str]:
+    frontmatter, body = parse_frontmatter(text)
+    writer = _HtmlChunkWriter(max_size)
 
-        note_name = match.group(1)
-        display_name = note_name.lstrip("@")
-        encoded_name = urllib.parse.quote(display_name, safe="")
-        bot_username = get_config_value("bot.bot_username", "toolbuildingape_bot")
-        deep_link = f"https://t.me/{bot_username}?start=note_{encoded_name}"
-        return f'<a href="{deep_link}">\U0001f4c4 {display_name}</a>'
+    if frontmatter and include_frontmatter:
+        summary = format_frontmatter_summary(frontmatter)
+        if summary:
+            writer.block([(_TEXT, None, escape_html(summary))])
+            writer.separator("\n\n")
+
+    pos = 0
+    while pos < len(body):
+        start = body.find("```", pos)
+        fence = _FENCE_OPEN_RE.match(body, start) if start != -1 else None
+        end = body.find("```", fence.end()) if fence else -1
+        if end == -1:
+            _write_markdown(body[pos:], writer)
+            break
+        if start > pos:
+            _write_markdown(body[pos:start], writer)
+        writer.block(_pre_tokens(body[fence.end() : end]))
+        pos = end + 3
 
-    text = re.sub(r"\[\[([^\]]+)\]\]", format_wikilink, text)
+    return writer.finish()
 
-    # Restore code blocks (reformat wide tables to fit mobile)
-    for i, block in enumerate(code_blocks):
-        block = _reformat_code_block(block)
-        text = text.replace(f"{placeholder}{i}{placeholder}", f"<pre>{block}</pre>")
 
-    # Prepend frontmatter summary if present
-    if frontmatter_summary:
-        text = frontmatter_summary + text
+def markdown_to_telegram_html(text: str, include_frontmatter: bool = True) -> str:
+    """
+    Convert markdown to Telegram-compatible HTML.
 
-    return text
+    Args:
+        text: Markdown content (may include YAML frontmatter)
+        include_frontmatter: If True, prepend formatted frontmatter summary
+    """
+    return _render_markdown(text, include_frontmatter, None)[0]
+
+
+def markdown_to_telegram_html_chunks(
+    text: str, max_size: int = 3800, include_frontmatter: bool = True
+) -> List[str]:
+    """
+    Convert markdown straight to Telegram-sendable HTML chunks.
+
+    Equivalent to ``split_message_html_safe(markdown_to_telegram_html(text))``
+    in a single pass, except that every chunk is tag-balanced: formatting
+    open at a split is closed and reopened in the next chunk, and oversized
+    code blocks continue in the next chunk instead of being truncated.
+
+    Args:
+        text: Markdown content (may include YAML frontmatter)
+        max_size: Maximum length of each chunk's HTML
+        include_frontmatter: If True, prepend formatted frontmatter summary
+    """
+    return _render_markdown(text, include_frontmatter, max_size)
 
 
 def validate_telegram_html(text: str) -> tuple:
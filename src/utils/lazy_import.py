@@ -0,0 +1,118 @@
+"""
+Lazy imports for heavy optional dependencies.
+
+Importing litellm alone takes seconds, and torch/sentence_transformers even
+more when installed, yet most processes (the webhook server before its
+first LLM call, CLI status scripts) never touch them. Modules bind these
+dependencies to stand-ins instead:
+
+    litellm = lazy_module("litellm")
+    TORCH_AVAILABLE = is_available("torch")
+
+The real import happens on first attribute access, from whichever thread
+makes it. Attribute assignment is forwarded to the real module, so
+``patch("pkg.mod.litellm.completion")`` and ``litellm.set_verbose = ...``
+behave as before. Names bound this way can still be replaced wholesale in
+tests with ``patch("pkg.mod.litellm")``.
+
+Introspection probes (dunders such as ``hasattr(obj, "__func__")`` and
+asyncio's ``_is_coroutine`` marker, made by mock.patch and inspect) raise
+AttributeError while the module is unloaded instead of importing it.
+"""
+
+import importlib
+import importlib.util
+import threading
+import types
+from typing import Any
+
+
+def is_available(name: str) -> bool:
+    """True if module ``name`` can be imported, without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+# Looked up by asyncio.iscoroutinefunction / inspect.markcoroutinefunction
+_PROBE_ATTRS = frozenset({"_is_coroutine", "_is_coroutine_marker"})
+
+
+def _is_probe(name: str) -> bool:
+    return name in _PROBE_ATTRS or (
+        len(name) > 4 and name.startswith("__") and name.endswith("__")
+    )
+
+
+class LazyModule(types.ModuleType):
+    """Module stand-in that imports the real module on first use."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_lock"] = threading.Lock()
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__dict__["_lazy_module"] is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        if _is_probe(attr) and not self.is_loaded:
+            raise AttributeError(attr)
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr: str) -> None:
+        delattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+class LazyAttribute:
+    """Stand-in for ``from module import attr``, resolved on first use."""
+
+    def __init__(self, module: str, attr: str):
+        self._module = LazyModule(module)
+        self._attr = attr
+
+    def resolve(self) -> Any:
+        return getattr(self._module, self._attr)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr: str) -> Any:
+        if _is_probe(attr) and not self._module.is_loaded:
+            raise AttributeError(attr)
+        return getattr(self.resolve(), attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy attribute {self._module.__name__}.{self._attr}>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    """Return a stand-in for ``import name`` that defers the import."""
+    return LazyModule(name)
+
+
+def lazy_attribute(module: str, attr: str) -> LazyAttribute:
+    """Return a stand-in for ``from module import attr``."""
+    return LazyAttribute(module, attr)
@@ -0,0 +1,144 @@
+"""Vectorized cosine search over packed float32 embeddings.
+
+Embeddings are stored as ``[dimension: uint32][float32 * dimension]`` blobs
+(the format EmbeddingService writes for images). Candidate blobs are decoded
+into one contiguous matrix and scored with a single matrix-vector product,
+instead of unpacking and comparing one row at a time.
+"""
+
+import struct
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+_HEADER = struct.Struct("I")
+
+Blob = Union[bytes, bytearray, memoryview, str]
+
+
+def pack_embedding(vector: Union[Sequence[float], np.ndarray]) -> bytes:
+    """Pack a vector as ``[dimension: uint32][float32 data]``."""
+    array = np.asarray(vector, dtype=np.float32).ravel()
+    return _HEADER.pack(len(array)) + array.tobytes()
+
+
+def _as_bytes(blob: Blob) -> bytes:
+    if isinstance(blob, str):
+        # SQLite may hand back BLOBs stored in TEXT columns as latin-1 str
+        return blob.encode("latin-1")
+    return bytes(blob)
+
+
+def _payload(blob: Blob, dimension: Optional[int]) -> Optional[bytes]:
+    data = _as_bytes(blob)
+    if len(data) < _HEADER.size:
+        return None
+    (stored_dim,) = _HEADER.unpack_from(data)
+    if dimension is not None and stored_dim != dimension:
+        return None
+    if len(data) != _HEADER.size + stored_dim * 4:
+        return None
+    return data[_HEADER.size :]
+
+
+def unpack_embedding(blob: Optional[Blob]) -> Optional[np.ndarray]:
+    """Decode one packed embedding, or None if it is missing or malformed."""
+    if blob is None:
+        return None
+    payload = _payload(blob, None)
+    if payload is None:
+        return None
+    return np.frombuffer(payload, dtype=np.float32)
+
+
+def stack_embeddings(
+    blobs: Sequence[Optional[Blob]], dimension: Optional[int] = None
+) -> Tuple[np.ndarray, List[int]]:
+    """Decode packed embeddings into an ``(n, dimension)`` float32 matrix.
+
+    Rows that are missing, malformed or of a different dimension are
+    skipped. ``dimension`` defaults to that of the first valid blob.
+
+    Returns:
+        (matrix, kept) where ``kept[i]`` is the index in ``blobs`` of row i
+    """
+    payloads = []
+    kept = []
+    for index, blob in enumerate(blobs):
+        if blob is None:
+            continue
+        payload = _payload(blob, dimension)
+        if payload is None:
+            continue
+        if dimension is None:
+            dimension = len(payload) // 4
+        payloads.append(payload)
+        kept.append(index)
+
+    if not payloads:
+        return np.empty((0, dimension or 0), dtype=np.float32), []
+    assert dimension is not None  # set by the first valid blob
+    matrix = np.frombuffer(b"".join(payloads), dtype=np.float32)
+    return matrix.reshape(len(payloads), dimension), kept
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row; all-zero rows stay zero (similarity 0)."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        norm = float(np.linalg.norm(matrix))
+        return matrix / norm if norm else matrix
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def cosine_top_k(
+    query: Union[Sequence[float], np.ndarray],
+    matrix: np.ndarray,
+    k: int,
+    threshold: Optional[float] = None,
+) -> List[Tuple[int, float]]:
+    """Rows of ``matrix`` most similar to ``query`` by cosine similarity.
+
+    Returns up to ``k`` ``(row_index, similarity)`` pairs, best first,
+    keeping only rows at or above ``threshold`` when given.
+    """
+    if k <= 0 or len(matrix) == 0:
+        return []
+    query = normalize_rows(np.asarray(query, dtype=np.float32))
+    if query.shape[0] != matrix.shape[1]:
+        return []
+    scores = normalize_rows(matrix) @ query
+
+    candidates = np.arange(len(scores))
+    if threshold is not None:
+        candidates = np.flatnonzero(scores >= threshold)
+    if len(candidates) > k:
+        top = np.argpartition(scores[candidates], -k)[-k:]
+        candidates = candidates[top]
+    order = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return [(int(index), float(scores[index])) for index in order]
+
+
+def greedy_clusters(matrix: np.ndarray, threshold: float) -> List[List[int]]:
+    """Group rows by cosine similarity to a seed row.
+
+    Rows are visited in order; each unassigned row seeds a cluster that
+    takes every other unassigned row at or above ``threshold`` similarity
+    to it.
+    """
+    if len(matrix) == 0:
+        return []
+    normalized = normalize_rows(matrix)
+    assigned = np.zeros(len(normalized), dtype=bool)
+    clusters = []
+    for seed in range(len(normalized)):
+        if assigned[seed]:
+            continue
+        assigned[seed] = True
+        similar = (normalized @ normalized[seed] >= threshold) & ~assigned
+        members = np.flatnonzero(similar)
+        assigned[members] = True
+        clusters.append([seed, *members.tolist()])
+    return clusters
@@ -1282,3 +1282,50 @@ class TestEdgeCases:
             )
 
         assert response.status_code == 201
+
+    def test_search_returns_ranked_hits(self, client, messaging_api_key):
+        """Search endpoint should pass filters through and serialise hits."""
+        from src.services.conversation_search import SearchHit
+
+        hits = [
+            SearchHit(
+                source="archives",
+                chat_id=111,
+                snippet="<b>deploy</b> script",
+                rank=-3.2,
+                session_id="abc",
+                archive="111/2026-01-01_000000_abc.md",
+            )
+        ]
+        with patch(
+            "src.services.conversation_search.search_conversations",
+            new_callable=AsyncMock,
+            return_value=hits,
+        ) as search:
+            response = client.get(
+                "/api/messaging/search",
+                params={"q": "deploy", "chat_id": 111, "source": "archives"},
+                headers={"X-Api-Key": messaging_api_key},
+            )
+
+        assert response.status_code == 200
+        assert response.json()[0]["archive"] == "111/2026-01-01_000000_abc.md"
+        assert search.call_args[1] == {
+            "chat_id": 111,
+            "sources": ("archives",),
+            "limit": 20,
+        }
+
+    def test_search_requires_api_key(self, client):
+        """Search endpoint should reject requests without an API key."""
+        response = client.get("/api/messaging/search", params={"q": "deploy"})
+        assert response.status_code == 401
+
+    def test_search_rejects_unknown_source(self, client, messaging_api_key):
+        """Search endpoint should validate the source filter."""
+        response = client.get(
+            "/api/messaging/search",
+            params={"q": "deploy", "source": "everything"},
+            headers={"X-Api-Key": messaging_api_key},
+        )
+        assert response.status_code == 422
@@ -68,18 +68,18 @@ def populated_manager(manager, sample_file_id):
 class TestShortIdGeneration:
     """Tests for get_short_file_id functionality."""
 
-    def test_generates_8_char_hash(self, manager, sample_file_id):
-        """Test that short ID is 8 characters from SHA-256 hash."""
+    def test_generates_16_char_hash(self, manager, sample_file_id):
+        """Test that short ID is 16 characters from SHA-256 hash."""
         short_id = manager.get_short_file_id(sample_file_id)
 
         # Verify length
-        assert len(short_id) == 8
+        assert len(short_id) == 16
 
         # Verify it's a valid hex string
         assert all(c in "0123456789abcdef" for c in short_id)
 
         # Verify it matches expected hash
-        expected_hash = hashlib.sha256(sample_file_id.encode()).hexdigest()[:8]
+        expected_hash = hashlib.sha256(sample_file_id.encode()).hexdigest()[:16]
         assert short_id == expected_hash
 
     def test_same_file_id_returns_same_short_id(self, manager, sample_file_id):
@@ -156,7 +156,7 @@ class TestCollisionHandling:
         # For testing, we'll manually set up the collision scenario
         # by pre-populating the cache with the expected hash
 
-        expected_hash = hashlib.sha256(file_id2.encode()).hexdigest()[:8]
+        expected_hash = hashlib.sha256(file_id2.encode()).hexdigest()[:16]
         manager._file_id_cache[expected_hash] = "already_exists"
 
         short_id2 = manager.get_short_file_id(file_id2)
@@ -167,7 +167,7 @@ class TestCollisionHandling:
     def test_handles_multiple_collisions(self, manager):
         """Test handling multiple consecutive collisions."""
         file_id = "test_file_id"
-        expected_hash = hashlib.sha256(file_id.encode()).hexdigest()[:8]
+        expected_hash = hashlib.sha256(file_id.encode()).hexdigest()[:16]
 
         # Pre-populate cache to simulate multiple collisions
         for i in range(5):
@@ -185,19 +185,12 @@ class TestCollisionHandling:
     def test_collision_fallback_to_timestamp(self, manager):
         """Test fallback to timestamp when counter exceeds limit."""
         file_id = "test_file_id"
-        expected_hash = hashlib.sha256(file_id.encode()).hexdigest()[:8]
+        expected_hash = hashlib.sha256(file_id.encode()).hexdigest()[:16]
 
         # Pre-populate cache to simulate too many collisions
-        # The timestamp fallback triggers when len(short_id) > 12
-        # 8-char hash + counter, so counter needs to be >= 10000 (5 digits)
-        # to make total length > 12. But the code breaks at counter that would
-        # cause > 12, so we need to populate all counters up to 9999.
-        # However, length > 12 triggers at counter 10000, but the check happens
-        # after incrementing, so we need counters 1-9999 (4 digits max = 12 chars).
-        # Actually: 8 + len("10000") = 13 > 12, so we need to fill up to 9999.
-        # For efficiency, just fill the base + counters up to where len > 12.
-        # Base (8 chars), 1-9 (9 chars), 10-99 (10 chars), 100-999 (11 chars),
-        # 1000-9999 (12 chars), 10000+ (13+ chars) -> triggers fallback at 10000.
+        # The timestamp fallback triggers when len(short_id) > 20
+        # (the short_id column width): 16-char hash + counters 1-9999 fit,
+        # counter 10000 (21 chars) triggers the fallback.
         # We need to pre-populate all keys that would be tried before fallback.
         manager._file_id_cache[expected_hash] = "existing_file_0"
         for i in range(1, 10000):
@@ -208,8 +201,8 @@ class TestCollisionHandling:
             short_id = manager.get_short_file_id(file_id)
 
         # Should fall back to timestamp format after too many collisions
-        # Format: first 6 chars of hash + (timestamp % 1000)
-        assert short_id.startswith(expected_hash[:6])
+        # Format: first 14 chars of hash + (timestamp % 1000)
+        assert short_id == f"{expected_hash[:14]}890"
         assert "890" in short_id  # 1234567890 % 1000 = 890
 
 
@@ -312,7 +305,7 @@ class TestCreateCallbackData:
 
         parts = callback_data.split(":")
         assert parts[0] == "save"
-        assert len(parts[1]) == 8  # short_id
+        assert len(parts[1]) == 16  # short_id
         assert parts[2] == "vision"
         assert parts[3] == "default"
 
@@ -327,7 +320,7 @@ class TestCreateCallbackData:
 
         parts = callback_data.split(":")
         assert parts[0] == "analyze"
-        assert len(parts[1]) == 8  # short_id
+        assert len(parts[1]) == 16  # short_id
         assert parts[2] == "collect"
         assert parts[3] == ""  # Empty preset
 
@@ -551,7 +544,7 @@ class TestEdgeCases:
         short_id = manager.get_short_file_id("")
 
         # Should still work - empty string has a valid hash
-        assert len(short_id) == 8
+        assert len(short_id) == 16
 
     def test_unicode_file_id(self, manager):
         """Test handling file_id with unicode characters."""
@@ -559,7 +552,7 @@ class TestEdgeCases:
 
         short_id = manager.get_short_file_id(unicode_file_id)
 
-        assert len(short_id) == 8
+        assert len(short_id) == 16
         assert manager.get_file_id(short_id) == unicode_file_id
 
     def test_special_characters_in_file_id(self, manager):
@@ -568,14 +561,14 @@ class TestEdgeCases:
 
         short_id = manager.get_short_file_id(special_file_id)
 
-        assert len(short_id) == 8
+        assert len(short_id) == 16
         assert manager.get_file_id(short_id) == special_file_id
 
     def test_very_long_file_id(self, manager, sample_long_file_id):
         """Test handling very long file_id."""
         short_id = manager.get_short_file_id(sample_long_file_id)
 
-        assert len(short_id) == 8
+        assert len(short_id) == 16
         assert manager.get_file_id(short_id) == sample_long_file_id
 
     def test_callback_data_with_unicode_mode(self, manager, sample_file_id):
@@ -1131,3 +1124,143 @@ class TestCallbackDataPersistence:
 
         assert len(manager._file_id_cache) == 0
         assert len(manager._data_cache) == 0
+
+
+class TestBoundedCacheAndLazyLookup:
+    """Tests for the bounded LRU and on-demand lookups of cold short ids."""
+
+    def test_least_recently_used_entries_evicted(self):
+        manager = CallbackDataManager(max_entries=2)
+        first = manager.get_short_file_id("file_id_first")
+        second = manager.get_short_file_id("file_id_second")
+        manager.get_file_id(first)  # first is now most recently used
+
+        manager.get_short_file_id("file_id_third")
+
+        assert first in manager._file_id_cache
+        assert second not in manager._file_id_cache
+        assert "file_id_second" not in manager._reverse_cache
+        assert len(manager._file_id_cache) == 2
+
+    @pytest.mark.asyncio
+    async def test_hydrate_loads_evicted_entry(self, patched_db_session):
+        manager = CallbackDataManager(max_entries=1)
+        short_id = manager.get_short_file_id("file_id_cold")
+        generic_cb = manager.create_callback_data(action="nav", page="1")
+        manager.get_short_file_id("file_id_hot")
+        manager.create_callback_data(action="nav", page="2")
+        await manager.flush_pending_writes()
+
+        # Evicted from memory, still in the database
+        assert manager.get_file_id(short_id) is None
+        assert manager.get_generic_data(generic_cb[3:]) is None
+
+        assert await manager.hydrate(f"reanalyze:{short_id}:default:")
+        assert manager.get_file_id(short_id) == "file_id_cold"
+        assert await manager.hydrate(generic_cb)
+        assert manager.get_generic_data(generic_cb[3:])["page"] == "1"
+
+    @pytest.mark.asyncio
+    async def test_hydrate_uses_unflushed_writes(self, patched_db_session):
+        manager = CallbackDataManager(max_entries=1)
+        short_id = manager.get_short_file_id("file_id_pending")
+        manager.get_short_file_id("file_id_newer")
+
+        assert await manager.hydrate(f"reanalyze:{short_id}:default:")
+        assert manager.get_file_id(short_id) == "file_id_pending"
+
+    @pytest.mark.asyncio
+    async def test_hydrate_unknown_id(self, patched_db_session):
+        manager = CallbackDataManager()
+
+        assert not await manager.hydrate("cb:doesnotexist")
+        assert not await manager.hydrate("noparams")
+
+    @pytest.mark.asyncio
+    async def test_hydrate_skips_foreign_callbacks(self, patched_db_session):
+        """Only registered prefixes with id-shaped segments hit the database."""
+        manager = CallbackDataManager()
+
+        with patch(
+            "src.bot.callback_data_manager.get_db_session",
+            side_effect=AssertionError("unexpected lookup"),
+        ):
+            assert not await manager.hydrate("stream:stop:0123456789ab")
+            assert not await manager.hydrate("poll:123456789:yes")
+            assert not await manager.hydrate("cb:stop")
+            assert not await manager.hydrate("reanalyze:not-an-id:default:")
+
+    @pytest.mark.asyncio
+    async def test_load_from_db_warms_most_recent_only(self, patched_db_session):
+        from datetime import datetime, timedelta, timezone
+
+        now = datetime.now(timezone.utc)
+        async with patched_db_session() as session:
+            for i in range(5):
+                session.add(
+                    CallbackData(
+                        short_id=f"id{i}",
+                        data_type="file_id",
+                        payload=f"file_{i}",
+                        accessed_at=now - timedelta(minutes=i),
+                    )
+                )
+
+        manager = CallbackDataManager(warm_entries=2)
+        await manager.load_from_db()
+
+        assert set(manager._file_id_cache) == {"id0", "id1"}
+        assert list(manager._cache_timestamps)[-1] == "id0"
+
+    @pytest.mark.asyncio
+    async def test_stale_rows_purged_by_access_time(self, patched_db_session):
+        from datetime import datetime, timedelta, timezone
+
+        stale = datetime.now(timezone.utc) - timedelta(days=8)
+        async with patched_db_session() as session:
+            session.add(
+                CallbackData(
+                    short_id="stale",
+                    data_type="file_id",
+                    payload="file_stale",
+                    accessed_at=stale,
+                )
+            )
+
+        manager = CallbackDataManager()
+        fresh_id = manager.get_short_file_id("file_fresh")
+        await manager.flush_pending_writes()
+
+        assert not await manager.hydrate("reanalyze:stale:default:")
+        await manager.cleanup_expired_from_db()
+
+        async with patched_db_session() as session:
+            result = await session.execute(select(CallbackData.short_id))
+            assert [row[0] for row in result] == [fresh_id]
+
+    @pytest.mark.asyncio
+    async def test_access_refreshes_persisted_timestamp(self, patched_db_session):
+        from datetime import datetime, timedelta, timezone
+
+        old = datetime.now(timezone.utc) - timedelta(days=6)
+        async with patched_db_session() as session:
+            session.add(
+                CallbackData(
+                    short_id="a1b2c3d4e5f6",
+                    data_type="generic",
+                    payload=json.dumps({"action": "nav"}),
+                    accessed_at=old,
+                )
+            )
+
+        manager = CallbackDataManager()
+        assert await manager.hydrate("cb:a1b2c3d4e5f6")
+        manager.get_generic_data("a1b2c3d4e5f6")
+        await manager.flush_pending_writes()
+
+        async with patched_db_session() as session:
+            result = await session.execute(
+                select(CallbackData).where(CallbackData.short_id == "a1b2c3d4e5f6")
+            )
+            row = result.scalar_one()
+            assert row.accessed_at.replace(tzinfo=None) > old.replace(tzinfo=None)
@@ -62,6 +62,7 @@ class TestContactResearchCallback:
         ):
             # Setup callback data parsing to return contact_research action
             cdm = MagicMock()
+            cdm.hydrate = AsyncMock(return_value=False)
             cdm.parse_callback_data.return_value = (
                 "contact_research",
                 None,
@@ -97,6 +98,7 @@ class TestContactResearchCallback:
             patch("src.bot.callback_handlers.get_keyboard_utils") as mock_ku,
         ):
             cdm = MagicMock()
+            cdm.hydrate = AsyncMock(return_value=False)
             cdm.parse_callback_data.return_value = (
                 "contact_research",
                 None,
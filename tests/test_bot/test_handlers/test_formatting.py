@@ -7,6 +7,7 @@ from src.bot.handlers.formatting import (
     escape_html,
     format_frontmatter_summary,
     markdown_to_telegram_html,
+    markdown_to_telegram_html_chunks,
     parse_frontmatter,
     render_compact_table,
     split_message,
@@ -921,3 +922,107 @@ class TestSplitMessageHtmlSafe:
             assert len(chunk) <= 350  # allow slight overage at boundaries
             valid, _ = validate_telegram_html(chunk)
             assert valid
+
+
+class TestMarkdownToTelegramHtmlChunks:
+    """Tests for markdown_to_telegram_html_chunks() — one-pass convert + split."""
+
+    def test_short_text_is_single_chunk_matching_full_conversion(self):
+        text = "# Title\n\n**bold**, *italic* and `code`\n\n|a|b|\n|-|-|\n|1|2|\nafter"
+        assert markdown_to_telegram_html_chunks(text) == [
+            markdown_to_telegram_html(text)
+        ]
+
+    def test_empty_string(self):
+        assert markdown_to_telegram_html_chunks("") == [""]
+
+    def test_chunks_within_size_and_valid(self):
+        text = "\n\n".join(
+            f"## Section {i}\n\n**Point {i}:** " + "some words here " * 20
+            for i in range(30)
+        )
+        chunks = markdown_to_telegram_html_chunks(text, max_size=500)
+        assert len(chunks) > 1
+        for i, chunk in enumerate(chunks):
+            assert len(chunk) <= 500
+            valid, err = validate_telegram_html(chunk)
+            assert valid, f"Chunk {i} invalid: {err}"
+
+    def test_splits_between_blocks(self):
+        paragraphs = [f"Paragraph {i} " + "x" * 150 for i in range(6)]
+        chunks = markdown_to_telegram_html_chunks("\n\n".join(paragraphs), 400)
+        for chunk in chunks:
+            assert chunk.startswith("Paragraph")
+            assert chunk.endswith("x")
+
+    def test_formatting_reopened_across_split(self):
+        text = "**" + "bold words " * 60 + "**"
+        chunks = markdown_to_telegram_html_chunks(text, max_size=200)
+        assert len(chunks) > 1
+        for chunk in chunks:
+            assert chunk.startswith("<b>")
+            assert chunk.endswith("</b>")
+        assert strip_telegram_html(" ".join(chunks)).split() == ["bold", "words"] * 60
+
+    def test_oversized_code_block_continues_instead_of_truncating(self):
+        code = "\n".join(f"line {i}" for i in range(200))
+        chunks = markdown_to_telegram_html_chunks(f"```\n{code}\n```", 300)
+        assert len(chunks) > 1
+        for chunk in chunks:
+            assert chunk.startswith("<pre>")
+            assert chunk.endswith("</pre>")
+            assert len(chunk) <= 300
+        lines = strip_telegram_html("\n".join(chunks)).split("\n")
+        assert [line for line in lines if line] == code.split("\n")
+
+    def test_entities_not_split(self):
+        text = "&" * 300
+        chunks = markdown_to_telegram_html_chunks(text, max_size=100)
+        for chunk in chunks:
+            assert len(chunk) <= 100
+            assert strip_telegram_html(chunk) == "&" * (len(chunk) // 5)
+
+    def test_oversized_link_markup_dropped(self):
+        text = "See [[Some Note]] and " + "more words " * 10
+        chunks = markdown_to_telegram_html_chunks(text, max_size=50)
+        assert len(chunks) < 10
+        for chunk in chunks:
+            assert len(chunk) <= 50
+            valid, err = validate_telegram_html(chunk)
+            assert valid, err
+        assert "Some Note" in " ".join(chunks)
+        assert strip_telegram_html(" ".join(chunks)).split()[-1] == "words"
+
+    def test_frontmatter_summary_first(self):
+        text = "---\ntype: tool\n---\n# Tool Name\n\nBody"
+        chunks = markdown_to_telegram_html_chunks(text, max_size=20)
+        assert chunks[0] == "[tool]"
+        assert chunks[1] == "<b>Tool Name</b>"
+
+
+class TestMarkdownInlineScanner:
+    """Inline markup edge cases handled by the tokenizer."""
+
+    def test_markup_inside_code_span_is_literal(self):
+        result = markdown_to_telegram_html("use `**kwargs` and `*.py`")
+        assert result == "use <code>**kwargs</code> and <code>*.py</code>"
+
+    def test_bullets_and_arithmetic_not_italic(self):
+        result = markdown_to_telegram_html("* one\n* two\n\n2 * 3 * 4")
+        assert "<i>" not in result
+
+    def test_snake_case_not_italic(self):
+        assert markdown_to_telegram_html("my_var_name") == "my_var_name"
+
+    def test_bold_nested_in_italic(self):
+        result = markdown_to_telegram_html("*italic with **bold** inside*")
+        assert result == "<i>italic with <b>bold</b> inside</i>"
+
+    def test_link_text_formatted_and_href_escaped(self):
+        result = markdown_to_telegram_html('[**Docs**](https://x.io/?a=1&b="2")')
+        assert (
+            result == '<a href="https://x.io/?a=1&amp;b=&quot;2&quot;"><b>Docs</b></a>'
+        )
+
+    def test_unclosed_markers_kept(self):
+        assert markdown_to_telegram_html("a ** b ` c [d") == "a ** b ` c [d"
@@ -0,0 +1,108 @@
+"""Tests for /search command handler."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.bot.handlers.search_commands import search_command
+from src.core.authorization import AuthTier
+from src.services.conversation_search import SearchHit
+
+
+@pytest.fixture
+def mock_update():
+    update = MagicMock()
+    update.effective_user = MagicMock()
+    update.effective_user.id = 12345
+    update.effective_user.language_code = "en"
+    update.effective_chat = MagicMock()
+    update.effective_chat.id = 777
+    update.message = AsyncMock()
+    update.message.reply_text = AsyncMock()
+    return update
+
+
+def _context(*args):
+    context = MagicMock()
+    context.args = list(args)
+    return context
+
+
+@pytest.fixture(autouse=True)
+def user_tier():
+    with patch(
+        "src.core.authorization.get_user_tier", return_value=AuthTier.USER
+    ) as tier:
+        yield tier
+
+
+class TestSearchCommand:
+    @pytest.mark.asyncio
+    async def test_usage_without_query(self, mock_update):
+        with patch(
+            "src.bot.handlers.search_commands.search_conversations",
+            new_callable=AsyncMock,
+        ) as search:
+            await search_command(mock_update, _context())
+
+        search.assert_not_called()
+        text = mock_update.message.reply_text.call_args[0][0]
+        assert "/search" in text
+
+    @pytest.mark.asyncio
+    async def test_searches_current_chat_and_formats_hits(self, mock_update):
+        hits = [
+            SearchHit(
+                source="archives",
+                chat_id=777,
+                snippet="tune the <b>WAL</b> checkpoint",
+                rank=-2.0,
+                timestamp="2026-03-01T10:00:00Z",
+                role="user",
+            ),
+            SearchHit(
+                source="messages",
+                chat_id=777,
+                snippet="<b>WAL</b> mode on",
+                rank=-1.0,
+                timestamp="2026-02-01 09:00:00",
+                role="assistant",
+            ),
+        ]
+        with patch(
+            "src.bot.handlers.search_commands.search_conversations",
+            new_callable=AsyncMock,
+            return_value=hits,
+        ) as search:
+            await search_command(mock_update, _context("WAL", "<mode>"))
+
+        assert search.call_args[0][0] == "WAL <mode>"
+        assert search.call_args[1]["chat_id"] == 777
+        text = mock_update.message.reply_text.call_args[0][0]
+        assert "WAL &lt;mode&gt;" in text
+        assert "1. 🗂 <i>2026-03-01 · user</i>\ntune the <b>WAL</b> checkpoint" in text
+        assert "2. 💬 <i>2026-02-01 · assistant</i>" in text
+        assert mock_update.message.reply_text.call_args[1]["parse_mode"] == "HTML"
+
+    @pytest.mark.asyncio
+    async def test_no_results(self, mock_update):
+        with patch(
+            "src.bot.handlers.search_commands.search_conversations",
+            new_callable=AsyncMock,
+            return_value=[],
+        ):
+            await search_command(mock_update, _context("nothing"))
+
+        text = mock_update.message.reply_text.call_args[0][0]
+        assert "<b>nothing</b>" in text
+
+    @pytest.mark.asyncio
+    async def test_group_tier_rejected(self, mock_update, user_tier):
+        user_tier.return_value = AuthTier.GROUP
+        with patch(
+            "src.bot.handlers.search_commands.search_conversations",
+            new_callable=AsyncMock,
+        ) as search:
+            await search_command(mock_update, _context("anything"))
+
+        search.assert_not_called()
@@ -202,11 +202,13 @@ def mock_reply_service():
 
 @pytest.fixture
 def mock_persist():
-    """Mock message persistence (fire-and-forget)."""
+    """Mock the write-behind message persistence writer (fire-and-forget)."""
     with patch(
-        "src.bot.processors.router.persist_message", new_callable=AsyncMock
-    ) as mock:
-        yield mock
+        "src.bot.processors.router.get_message_persistence_writer"
+    ) as mock_factory:
+        writer = MagicMock()
+        mock_factory.return_value = writer
+        yield writer
 
 
 @pytest.fixture
@@ -303,8 +305,7 @@ class TestPluginRouting:
         await processor.process(combined)
 
         mock_plugin_manager.route_message.assert_awaited_once()
-        # No content-type routing should happen (no background tasks created
-        # beyond persist_message tasks)
+        # No content-type routing should happen (persistence is only queued)
 
     @pytest.mark.asyncio
     async def test_plugin_declines_falls_through(self, processor, mock_plugin_manager):
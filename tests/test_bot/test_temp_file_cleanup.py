@@ -89,7 +89,6 @@ class TestVoiceDownloadCleanup:
                 return_value=fail_result,
             ),
             patch.object(processor, "_mark_as_read_sync"),
-            patch.object(processor, "_send_typing_sync"),
             patch.object(processor, "_send_message_sync"),
         ):
             await processor._process_with_voice(
@@ -153,7 +152,6 @@ class TestVideoDownloadCleanup:
                 return_value=fail_result,
             ),
             patch.object(processor, "_mark_as_read_sync"),
-            patch.object(processor, "_send_typing_sync"),
         ):
             await processor._process_with_videos(
                 mock_combined, reply_context=None, is_claude_mode=False
@@ -242,7 +240,6 @@ class TestVideoAudioExtractCleanup:
                 return_value=extract_fail,
             ),
             patch.object(processor, "_mark_as_read_sync"),
-            patch.object(processor, "_send_typing_sync"),
             patch.object(Path, "unlink", tracking_unlink),
         ):
             await processor._process_with_videos(
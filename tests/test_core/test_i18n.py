@@ -1,7 +1,8 @@
 """Tests for the i18n framework."""
 
+import asyncio
 from pathlib import Path
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 import yaml
@@ -11,6 +12,7 @@ from src.core.i18n import (
     _plural_form,
     _translations,
     clear_locale_cache,
+    compile_catalog,
     get_user_locale_from_update,
     load_translations,
     normalize_locale,
@@ -351,6 +353,7 @@ class TestPluralTranslation:
             "one": "1 thing",
             "other": "{n} things",
         }
+        compile_catalog()
         assert t("only_en_plural", "ru", count=5, n=5) == "5 things"
         assert t("only_en_plural", "ru", count=1, n=1) == "1 thing"
 
@@ -361,6 +364,7 @@ class TestPluralTranslation:
         _translations["en"][
             "morning_header"
         ] = "<b>Morning Review</b>\n\n{count} cards due today:"
+        compile_catalog()
         assert (
             t("morning_header", "en", count=39)
             == "<b>Morning Review</b>\n\n39 cards due today:"
@@ -376,4 +380,102 @@ class TestPluralTranslation:
 
         # Test that {n} is also available as an alias
         _translations["en"]["items_count"] = "{n} items"
+        compile_catalog()
         assert t("items_count", "en", count=5) == "5 items"
+
+
+class TestCompiledTemplates:
+    """Interpolation through the precompiled template representation."""
+
+    def test_format_spec_and_conversion(self):
+        from src.core.i18n import _Template
+
+        template = _Template("{value:.1f}% of {name!r}")
+        assert template.render({"value": 12.345, "name": "x"}) == "12.3% of 'x'"
+
+    def test_attribute_access_uses_format_map(self):
+        from src.core.i18n import _Template
+
+        template = _Template("{user.name}")
+        assert not template.simple
+        assert template.render({"user": MagicMock(name="u")}) != "{user.name}"
+
+    def test_escaped_braces_kept_without_variables(self):
+        from src.core.i18n import _Template
+
+        template = _Template("{{literal}} {name}")
+        assert template.render({}) == "{{literal}} {name}"
+        assert template.render({"name": "x"}) == "{literal} x"
+
+    def test_malformed_template_returned_unchanged(self):
+        from src.core.i18n import _Template
+
+        assert _Template("broken {").render({"name": "x"}) == "broken {"
+
+    def test_plural_forms_grouped_under_parent_key(self, locales_dir):
+        from src.core import i18n
+
+        load_translations(locales_dir)
+        ru_chain = i18n._fallback_chains["ru"]
+        assert [c.locale for c in ru_chain] == ["ru", "en"]
+        assert set(ru_chain[0].plurals["items"]) == {"one", "few", "many"}
+        assert "items.few" in ru_chain[0].strings
+
+
+class TestHotReload:
+    def test_no_reload_when_unchanged(self, locales_dir):
+        from src.core.i18n import reload_translations_if_changed
+
+        load_translations(locales_dir)
+        assert not reload_translations_if_changed()
+
+    def test_reloads_modified_file(self, locales_dir):
+        import os
+
+        from src.core.i18n import reload_translations_if_changed
+
+        load_translations(locales_dir)
+        en_file = locales_dir / "en.yaml"
+        data = yaml.safe_load(en_file.read_text())
+        data["messages"]["greeting"] = "Hi there"
+        en_file.write_text(yaml.dump(data))
+        stat = en_file.stat()
+        os.utime(en_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert reload_translations_if_changed()
+        assert t("messages.greeting", "en") == "Hi there"
+
+    def test_reloads_new_locale(self, locales_dir):
+        from src.core.i18n import SUPPORTED_LOCALES, reload_translations_if_changed
+
+        load_translations(locales_dir)
+        (locales_dir / "de.yaml").write_text(yaml.dump({"messages": {"x": "Hallo"}}))
+
+        assert reload_translations_if_changed()
+        assert "de" in SUPPORTED_LOCALES
+        assert t("messages.x", "de") == "Hallo"
+
+    @pytest.mark.asyncio
+    async def test_watcher_installs_on_loop_thread(self, locales_dir):
+        """Files are parsed off the loop; the swap happens on the loop thread."""
+        import threading
+
+        from src.core import i18n
+
+        load_translations(locales_dir)
+        (locales_dir / "de.yaml").write_text(yaml.dump({"messages": {"x": "Hallo"}}))
+
+        installed_on = []
+        real_install = i18n._install_translations
+
+        def recording_install(*args):
+            installed_on.append(threading.current_thread())
+            real_install(*args)
+            raise asyncio.CancelledError  # stop the watcher after one reload
+
+        with patch.object(i18n, "_install_translations", recording_install):
+            with pytest.raises(asyncio.CancelledError):
+                await i18n.run_locale_watcher(interval_seconds=0)
+
+        assert installed_on == [threading.main_thread()]
+        assert t("messages.x", "de") == "Hallo"
@@ -177,6 +177,16 @@ class TestVectorDatabaseSetup:
             assert result is False
 
 
+async def _create_plain_vss_tables(vector_db, db, dimension):
+    """Stand-in for VectorDatabase._create_vss_tables without the extension"""
+    await db.execute(f"""
+        CREATE TABLE IF NOT EXISTS image_embeddings (
+            rowid INTEGER PRIMARY KEY AUTOINCREMENT,
+            embedding BLOB -- embedding({dimension})
+        )
+    """)
+
+
 class TestEmbeddingStorage:
     """Tests for embedding storage functionality"""
 
@@ -306,6 +316,79 @@ class TestEmbeddingStorage:
             mapping = await cursor.fetchone()
             assert mapping is not None
 
+    @pytest.mark.asyncio
+    async def test_store_embeddings_writes_index_only(
+        self, initialized_db, sample_embedding_bytes, temp_db_path
+    ):
+        """Batch storage fills the index tables and leaves images alone"""
+        async with aiosqlite.connect(temp_db_path) as db:
+            await db.execute("""
+                CREATE TABLE image_embeddings (
+                    rowid INTEGER PRIMARY KEY AUTOINCREMENT,
+                    embedding BLOB
+                )
+            """)
+            await db.commit()
+
+        assert await initialized_db.store_embeddings([(1, sample_embedding_bytes)]) == 1
+
+        async with aiosqlite.connect(temp_db_path) as db:
+            cursor = await db.execute("SELECT embedding FROM images WHERE id = 1")
+            assert (await cursor.fetchone())[0] is None
+            cursor = await db.execute(
+                "SELECT image_id FROM embedding_mappings WHERE image_id = 1"
+            )
+            assert await cursor.fetchone() is not None
+
+    @pytest.mark.asyncio
+    async def test_store_embeddings_resizes_vss_tables(
+        self, initialized_db, temp_db_path
+    ):
+        """A 512-d model recreates a 384-d index instead of failing every insert"""
+        async with aiosqlite.connect(temp_db_path) as db:
+            await _create_plain_vss_tables(initialized_db, db, 384)
+            await db.execute(
+                "INSERT INTO embedding_mappings (image_id, embedding_id) VALUES (99, 1)"
+            )
+            await db.commit()
+
+        array = np.random.rand(512).astype(np.float32)
+        initialized_db.embedding_service.bytes_to_array = Mock(return_value=array)
+        with patch.object(
+            VectorDatabase, "_create_vss_tables", new=_create_plain_vss_tables
+        ):
+            embedding = struct.pack("I", 512) + array.tobytes()
+            assert await initialized_db.store_embeddings([(1, embedding)]) == 1
+
+        async with aiosqlite.connect(temp_db_path) as db:
+            assert await initialized_db._vss_dimension(db) == 512
+            cursor = await db.execute("SELECT image_id FROM embedding_mappings")
+            assert await cursor.fetchall() == [(1,)]
+
+    @pytest.mark.asyncio
+    async def test_store_embeddings_skips_vss_when_resize_fails(
+        self, initialized_db, temp_db_path
+    ):
+        """Without the extension the mismatched index is left alone and skipped"""
+        async with aiosqlite.connect(temp_db_path) as db:
+            await _create_plain_vss_tables(initialized_db, db, 384)
+            await db.commit()
+
+        array = np.random.rand(512).astype(np.float32)
+        initialized_db.embedding_service.bytes_to_array = Mock(return_value=array)
+        with patch.object(
+            VectorDatabase,
+            "_create_vss_tables",
+            AsyncMock(side_effect=sqlite3.OperationalError("no such module: vss0")),
+        ):
+            embedding = struct.pack("I", 512) + array.tobytes()
+            assert await initialized_db.store_embeddings([(1, embedding)]) == 1
+
+        async with aiosqlite.connect(temp_db_path) as db:
+            assert await initialized_db._vss_dimension(db) == 384
+            cursor = await db.execute("SELECT COUNT(*) FROM embedding_mappings")
+            assert (await cursor.fetchone())[0] == 0
+
     @pytest.mark.asyncio
     async def test_store_embedding_invalid_bytes(self, initialized_db):
         """Test handling of invalid embedding bytes"""
@@ -8,24 +8,36 @@ from src.domain.events import EventBus, PollAnswered
 from src.services.poll_service import PollService
 
 
+class FakePollStore:
+    """In-memory stand-in for PollStateStore."""
+
+    def __init__(self):
+        self.polls = {}
+
+    async def get(self, poll_id, kind=None):
+        return self.polls.get(poll_id)
+
+    async def unregister(self, poll_id):
+        return self.polls.pop(poll_id, None) is not None
+
+
 class TestPollServiceEmitsEvents:
     """Verify handle_poll_answer publishes PollAnswered on the EventBus."""
 
     def _make_service(self, event_bus: EventBus) -> PollService:
         """Create a PollService wired to the given EventBus."""
         svc = PollService.__new__(PollService)
-        svc._embedding_provider = MagicMock()
-        svc._embedding_provider.generate_embedding = AsyncMock(return_value=[0.1, 0.2])
-        svc._poll_tracker = {}
+        svc._embedding_writer = MagicMock()
+        svc._poll_store = FakePollStore()
         svc._event_bus = event_bus
         return svc
 
     def _seed_tracker(self, svc: PollService, poll_id: str = "poll1") -> None:
         """Add a tracked poll so handle_poll_answer can find it."""
-        svc._poll_tracker[poll_id] = {
+        svc._poll_store.polls[poll_id] = {
             "template_id": 1,
             "chat_id": 100,
-            "sent_at": datetime(2026, 1, 15, 10, 0),
+            "sent_at": datetime(2026, 1, 15, 10, 0).isoformat(),
             "question": "How are you?",
             "options": ["Great", "OK", "Bad"],
             "poll_type": "emotion",
@@ -114,10 +126,10 @@ class TestPollServiceEmitsEvents:
         bus.subscribe(PollAnswered, capture)
 
         svc = self._make_service(bus)
-        svc._poll_tracker["mood1"] = {
+        svc._poll_store.polls["mood1"] = {
             "template_id": 2,
             "chat_id": 200,
-            "sent_at": datetime(2026, 2, 1, 8, 0),
+            "sent_at": datetime(2026, 2, 1, 8, 0).isoformat(),
             "question": "Current mood?",
             "options": ["Energized", "Calm", "Tired", "Anxious"],
             "poll_type": "emotion",
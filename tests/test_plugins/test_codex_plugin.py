@@ -14,6 +14,7 @@ Tests cover:
 """
 
 import subprocess
+from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
@@ -246,40 +247,88 @@ class TestCodexSubprocessExecution:
         plugin._timeout = 600
         return plugin
 
-    def test_run_subprocess_success(self, plugin):
-        """Test successful subprocess execution."""
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = Mock(
-                returncode=0, stdout="Analysis complete", stderr=""
-            )
+    @pytest.mark.asyncio
+    async def test_run_subprocess_success(self, plugin, tmp_path):
+        """Test successful subprocess execution streams output."""
+        chunks = []
+
+        output, log_path = await plugin._run_subprocess(
+            "printf 'Analysis complete'",
+            cwd=str(tmp_path),
+            timeout=10,
+            on_output=chunks.append,
+        )
 
-            output = plugin._run_subprocess("codex exec test", cwd="/tmp", timeout=10)
+        assert output == "Analysis complete"
+        assert log_path is None
+        assert "".join(chunks) == "Analysis complete"
 
-            assert output == "Analysis complete"
-            mock_run.assert_called_once()
-            args, kwargs = mock_run.call_args
-            assert kwargs["shell"] is True
-            assert kwargs["cwd"] == "/tmp"
-            assert kwargs["timeout"] == 10
+    @pytest.mark.asyncio
+    async def test_run_subprocess_long_output_returns_tail_and_log(
+        self, plugin, tmp_path
+    ):
+        """Past the buffer only the tail is returned; the full output is kept."""
+        from src.services.streaming_subprocess import StreamOutput
+
+        buffer = StreamOutput(max_chars=10, spill_dir=str(tmp_path))
+        with patch("src.core.config.get_path", return_value=str(tmp_path / "logs")):
+            output, log_path = await plugin._run_subprocess(
+                "printf '0123456789abcdefghij'",
+                cwd=str(tmp_path),
+                timeout=10,
+                output=buffer,
+            )
+        buffer.close()
 
-    def test_run_subprocess_failure(self, plugin):
-        """Test subprocess execution failure."""
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = Mock(returncode=1, stdout="", stderr="Codex error")
+        assert output == "abcdefghij"
+        assert Path(log_path).parent == tmp_path / "logs"
+        assert Path(log_path).read_text() == "0123456789abcdefghij"
 
-            with pytest.raises(RuntimeError) as exc_info:
-                plugin._run_subprocess("codex exec test", cwd="/tmp", timeout=10)
+    @pytest.mark.asyncio
+    async def test_run_subprocess_failure(self, plugin, tmp_path):
+        """Test subprocess execution failure."""
+        with pytest.raises(RuntimeError) as exc_info:
+            await plugin._run_subprocess(
+                "echo 'Codex error' >&2; exit 1", cwd=str(tmp_path), timeout=10
+            )
 
-            assert "Codex failed" in str(exc_info.value)
-            assert "Codex error" in str(exc_info.value)
+        assert "Codex failed" in str(exc_info.value)
+        assert "Codex error" in str(exc_info.value)
 
-    def test_run_subprocess_timeout(self, plugin):
+    @pytest.mark.asyncio
+    async def test_run_subprocess_timeout(self, plugin, tmp_path):
         """Test subprocess timeout."""
-        with patch("subprocess.run") as mock_run:
-            mock_run.side_effect = subprocess.TimeoutExpired("cmd", 10)
+        with pytest.raises(subprocess.TimeoutExpired):
+            await plugin._run_subprocess("sleep 5", cwd=str(tmp_path), timeout=0.2)
+
+    @pytest.mark.asyncio
+    async def test_run_subprocess_stopped(self, plugin, tmp_path):
+        """Test a stop request ends the run with the partial output."""
+        from plugins.codex.plugin import CodexStopped
+        from src.services.streaming_subprocess import (
+            register_stream,
+            request_stop,
+            unregister_stream,
+        )
+
+        stream_id = register_stream()
+
+        def stop_after_first_chunk(chunk):
+            request_stop(stream_id)
+
+        try:
+            with pytest.raises(CodexStopped) as exc_info:
+                await plugin._run_subprocess(
+                    "printf 'partial'; sleep 5",
+                    cwd=str(tmp_path),
+                    timeout=10,
+                    on_output=stop_after_first_chunk,
+                    stream_id=stream_id,
+                )
+        finally:
+            unregister_stream(stream_id)
 
-            with pytest.raises(subprocess.TimeoutExpired):
-                plugin._run_subprocess("codex exec test", cwd="/tmp", timeout=10)
+        assert exc_info.value.output == "partial"
 
 
 class TestCodexOutputFormatting:
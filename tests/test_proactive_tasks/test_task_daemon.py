@@ -0,0 +1,230 @@
+"""Tests for the concurrent proactive task daemon."""
+
+import asyncio
+import sys
+from datetime import datetime
+
+import pytest
+
+from scripts.proactive_tasks.task_daemon import (
+    TaskBudget,
+    next_batch,
+    next_run_time,
+    resolve_dependencies,
+    run_process,
+    run_tasks,
+)
+
+
+def _registry(**tasks):
+    return {"tasks": tasks, "settings": {"max_parallel_tasks": 2}}
+
+
+class FakeExecutor:
+    """Records start order and concurrency; fails tasks listed in ``fail``."""
+
+    def __init__(self, delay=0.05, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.started = []
+        self.running = 0
+        self.max_running = 0
+
+    async def __call__(self, task_id, budget):
+        self.started.append(task_id)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(self.delay)
+        self.running -= 1
+        if task_id in self.fail:
+            return "error", "boom"
+        return "success", "completed"
+
+
+class TestResolveDependencies:
+    def test_pulls_in_dependencies(self):
+        tasks = {"a": {}, "b": {"depends_on": ["a"]}, "c": {"depends_on": ["b"]}}
+        assert resolve_dependencies(["c"], tasks) == {
+            "c": ["b"],
+            "b": ["a"],
+            "a": [],
+        }
+
+    def test_scheduled_batch_ignores_outside_dependencies(self):
+        tasks = {"a": {}, "b": {"depends_on": ["a"]}}
+        assert resolve_dependencies(["b"], tasks, include_dependencies=False) == {
+            "b": []
+        }
+
+    def test_rejects_cycles_and_unknown_tasks(self):
+        with pytest.raises(ValueError, match="cycle"):
+            resolve_dependencies(
+                ["a"], {"a": {"depends_on": ["b"]}, "b": {"depends_on": ["a"]}}
+            )
+        with pytest.raises(ValueError, match="Unknown task"):
+            resolve_dependencies(["missing"], {})
+
+
+class TestRunTasks:
+    async def test_independent_tasks_run_concurrently(self):
+        executor = FakeExecutor()
+        runs = await run_tasks(
+            ["a", "b", "c"], _registry(a={}, b={}, c={}), executor=executor
+        )
+
+        assert executor.max_running == 2
+        assert all(run.success for run in runs.values())
+        # The third task waited for a slot
+        assert max(run.queue_wait_seconds for run in runs.values()) >= 0.04
+        assert all(run.duration_seconds >= 0.04 for run in runs.values())
+
+    async def test_dependencies_run_first(self):
+        executor = FakeExecutor()
+        registry = _registry(a={}, b={"depends_on": ["a"]}, c={})
+        await run_tasks(["b", "c"], registry, max_parallel=4, executor=executor)
+
+        assert executor.started.index("a") < executor.started.index("b")
+        assert executor.max_running == 2  # a and c together, then b
+
+    async def test_failed_dependency_skips_dependents(self):
+        executor = FakeExecutor(fail={"a"})
+        registry = _registry(a={}, b={"depends_on": ["a"]}, c={"depends_on": ["b"]})
+        runs = await run_tasks(["c"], registry, executor=executor)
+
+        assert executor.started == ["a"]
+        assert runs["b"].skipped and runs["c"].skipped
+        assert "a" in runs["b"].message
+
+    async def test_disabled_task_not_run(self):
+        executor = FakeExecutor()
+        runs = await run_tasks(
+            ["a"], _registry(a={"enabled": False}), executor=executor
+        )
+        assert executor.started == []
+        assert runs["a"].skipped
+
+    async def test_budget_passed_and_runs_recorded(self):
+        budgets = {}
+        recorded = []
+
+        async def executor(task_id, budget):
+            budgets[task_id] = budget
+            return "success", "ok"
+
+        async def recorder(run, task_config):
+            recorded.append((run.task_id, run.status, task_config))
+
+        registry = _registry(
+            a={"budget": {"timeout_seconds": 30, "cpu_seconds": 10}}, b={}
+        )
+        await run_tasks(["a", "b"], registry, executor=executor, recorder=recorder)
+
+        assert budgets["a"] == TaskBudget(timeout_seconds=30, cpu_seconds=10)
+        assert budgets["b"] == TaskBudget()
+        assert sorted(r[:2] for r in recorded) == [
+            ("a", "success"),
+            ("b", "success"),
+        ]
+
+    async def test_executor_exception_is_an_error_run(self):
+        async def executor(task_id, budget):
+            raise RuntimeError("spawn failed")
+
+        runs = await run_tasks(["a"], _registry(a={}), executor=executor)
+        assert runs["a"].status == "error"
+        assert runs["a"].message == "spawn failed"
+
+
+def _is_running(pid):
+    """True unless the process is gone or a zombie waiting to be reaped."""
+    try:
+        with open(f"/proc/{pid}/stat") as stat:
+            return stat.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+class TestRunProcess:
+    async def test_success_and_failure(self):
+        ok = await run_process([sys.executable, "-c", "pass"], TaskBudget())
+        failed = await run_process(
+            [sys.executable, "-c", "raise SystemExit(3)"], TaskBudget()
+        )
+        assert ok == ("success", "completed")
+        assert failed == ("error", "exited with code 3")
+
+    async def test_time_budget_kills_process(self):
+        status, message = await run_process(
+            [sys.executable, "-c", "import time; time.sleep(30)"],
+            TaskBudget(timeout_seconds=0.5),
+        )
+        assert status == "timeout"
+        assert "time budget" in message
+
+    async def test_timeout_kills_child_processes(self, tmp_path):
+        pid_file = tmp_path / "child.pid"
+        script = (
+            "import subprocess, sys, time; "
+            "child = subprocess.Popen([sys.executable, '-c', "
+            "'import time; time.sleep(60)']); "
+            f"open({str(pid_file)!r}, 'w').write(str(child.pid)); "
+            "time.sleep(30)"
+        )
+        status, _ = await run_process(
+            [sys.executable, "-c", script], TaskBudget(timeout_seconds=1)
+        )
+        assert status == "timeout"
+
+        child_pid = int(pid_file.read_text())
+        for _ in range(50):
+            if not _is_running(child_pid):
+                break
+            await asyncio.sleep(0.1)
+        assert not _is_running(child_pid)
+
+    async def test_cpu_budget_kills_process(self):
+        status, message = await run_process(
+            [sys.executable, "-c", "while True: pass"],
+            TaskBudget(timeout_seconds=30, cpu_seconds=1),
+        )
+        assert status == "timeout"
+        assert "CPU budget" in message
+
+
+def test_next_run_time():
+    schedule = {"hour": 9, "minute": 30}
+    assert next_run_time(schedule, datetime(2026, 2, 7, 8, 0)) == datetime(
+        2026, 2, 7, 9, 30
+    )
+    assert next_run_time(schedule, datetime(2026, 2, 7, 9, 30)) == datetime(
+        2026, 2, 8, 9, 30
+    )
+
+
+def test_next_run_time_with_additional_times():
+    schedule = {"hour": 9, "minute": 0, "also": [{"hour": 21, "minute": 0}]}
+    assert next_run_time(schedule, datetime(2026, 2, 7, 9, 0)) == datetime(
+        2026, 2, 7, 21, 0
+    )
+    assert next_run_time(schedule, datetime(2026, 2, 7, 21, 0)) == datetime(
+        2026, 2, 8, 9, 0
+    )
+
+
+def test_next_batch_advances_from_previous_slot():
+    """Slots that pass while a batch runs are still due next."""
+    tasks = {
+        "health": {"schedule": {"hour": 9, "minute": 30}},
+        "research": {"schedule": {"hour": 10, "minute": 0}},
+        "review": {"schedule": {"hour": 10, "minute": 0}},
+        "off": {"enabled": False, "schedule": {"hour": 9, "minute": 45}},
+    }
+    wake_at, due = next_batch(tasks, datetime(2026, 2, 7, 8, 0))
+    assert (wake_at, due) == (datetime(2026, 2, 7, 9, 30), ["health"])
+
+    # Computed from the 09:30 slot even if the clock is already past 10:00
+    assert next_batch(tasks, wake_at) == (
+        datetime(2026, 2, 7, 10, 0),
+        ["research", "review"],
+    )
+    assert next_batch({"off": tasks["off"]}, wake_at) is None
@@ -0,0 +1,180 @@
+"""Tests for health_rollup.py daily aggregates.
+
+Covers:
+- Per-day count/sum/min/max rolled up from raw records
+- Sleep stage durations
+- Incremental refresh via the id watermark (only touched days recomputed)
+- Re-imported days and re-created databases do not double count
+- Readers used by the report scripts
+"""
+
+import sqlite3
+from datetime import date
+
+import pytest
+
+from scripts import health_rollup
+from scripts.health_rollup import (
+    SLEEP_RECORD_TYPE,
+    daily_sleep_hours,
+    daily_values,
+    latest_record_timestamp,
+    load_daily_metrics,
+    refresh_rollups,
+)
+
+STEPS = "HKQuantityTypeIdentifierStepCount"
+HRV = "HKQuantityTypeIdentifierHeartRateVariabilitySDNN"
+TODAY = date(2026, 2, 7)
+
+
+@pytest.fixture
+def conn(tmp_path):
+    """Temporary health.db with the health-data export schema."""
+    conn = sqlite3.connect(tmp_path / "health.db")
+    conn.execute("""
+        CREATE TABLE health_records (
+            id INTEGER PRIMARY KEY,
+            record_type TEXT,
+            value REAL,
+            unit TEXT,
+            start_date TEXT,
+            end_date TEXT
+        )
+    """)
+    yield conn
+    conn.close()
+
+
+def _add(conn, record_type, value, start, end=None):
+    conn.execute(
+        "INSERT INTO health_records (record_type, value, start_date, end_date) "
+        "VALUES (?, ?, ?, ?)",
+        (record_type, value, f"{start} +0100", f"{end or start} +0100"),
+    )
+    conn.commit()
+
+
+def _metrics(conn):
+    return conn.execute(
+        "SELECT record_type, day, sample_count, value_sum, value_min, value_max "
+        "FROM health_daily_metrics ORDER BY record_type, day"
+    ).fetchall()
+
+
+class TestRefresh:
+    def test_daily_aggregates(self, conn):
+        _add(conn, STEPS, 1000, "2026-02-06 08:00:00")
+        _add(conn, STEPS, 500, "2026-02-06 23:59:00")
+        _add(conn, STEPS, 200, "2026-02-07 00:10:00")
+        _add(conn, HRV, 40, "2026-02-06 03:00:00")
+        _add(conn, HRV, 60, "2026-02-06 04:00:00")
+
+        assert refresh_rollups(conn) == 3
+        assert _metrics(conn) == [
+            (HRV, "2026-02-06", 2, 100.0, 40.0, 60.0),
+            (STEPS, "2026-02-06", 2, 1500.0, 500.0, 1000.0),
+            (STEPS, "2026-02-07", 1, 200.0, 200.0, 200.0),
+        ]
+        assert latest_record_timestamp(conn) == "2026-02-07 00:10:00 +0100"
+
+    def test_sleep_stage_durations(self, conn):
+        _add(conn, SLEEP_RECORD_TYPE, 2, "2026-02-06 23:00:00", "2026-02-07 00:30:00")
+        _add(conn, SLEEP_RECORD_TYPE, 2, "2026-02-06 23:45:00", "2026-02-07 00:00:00")
+        _add(conn, SLEEP_RECORD_TYPE, 5, "2026-02-06 22:00:00", "2026-02-06 23:00:00")
+        refresh_rollups(conn)
+
+        rows = conn.execute(
+            "SELECT day, stage, sample_count, round(duration_hours, 2) "
+            "FROM health_daily_sleep ORDER BY stage"
+        ).fetchall()
+        assert rows == [("2026-02-06", 2, 2, 1.75), ("2026-02-06", 5, 1, 1.0)]
+
+    def test_incremental_recomputes_only_new_days(self, conn):
+        _add(conn, STEPS, 1000, "2026-02-05 08:00:00")
+        _add(conn, STEPS, 1000, "2026-02-06 08:00:00")
+        refresh_rollups(conn)
+        assert refresh_rollups(conn) == 0
+
+        # Tamper with an old day: an incremental refresh must not touch it
+        conn.execute("UPDATE health_daily_metrics SET value_sum = -1")
+        conn.commit()
+        _add(conn, STEPS, 250, "2026-02-06 12:00:00")
+
+        assert refresh_rollups(conn) == 1
+        assert [row[3] for row in _metrics(conn)] == [-1.0, 1250.0]
+
+    def test_reimported_day_not_double_counted(self, conn):
+        _add(conn, STEPS, 1000, "2026-02-06 08:00:00")
+        refresh_rollups(conn)
+
+        # Importer replaces the day's records with fresh ids
+        conn.execute("DELETE FROM health_records")
+        _add(conn, STEPS, 1000, "2026-02-06 08:00:00")
+        _add(conn, STEPS, 300, "2026-02-06 09:00:00")
+        refresh_rollups(conn)
+
+        assert [row[2:4] for row in _metrics(conn)] == [(2, 1300.0)]
+
+    def test_recreated_database_rebuilds(self, conn):
+        for hour in range(10, 15):
+            _add(conn, STEPS, 100, f"2026-02-06 {hour}:00:00")
+        refresh_rollups(conn)
+
+        # Ids restart below the watermark
+        conn.execute("DELETE FROM health_records")
+        _add(conn, HRV, 50, "2026-02-01 08:00:00")
+        refresh_rollups(conn)
+
+        assert [row[:2] for row in _metrics(conn)] == [(HRV, "2026-02-01")]
+        assert latest_record_timestamp(conn) == "2026-02-01 08:00:00 +0100"
+
+    def test_empty_database(self, conn):
+        assert refresh_rollups(conn) == 0
+        assert _metrics(conn) == []
+
+    def test_connect_refreshes(self, tmp_path, conn):
+        _add(conn, STEPS, 10, "2026-02-06 08:00:00")
+        shared = health_rollup.connect(tmp_path / "health.db")
+        try:
+            assert daily_values(shared, STEPS, days=2, aggregation="SUM", end=TODAY)
+        finally:
+            shared.close()
+
+
+class TestReaders:
+    @pytest.fixture
+    def rolled(self, conn):
+        _add(conn, STEPS, 1000, "2026-01-01 08:00:00")
+        _add(conn, STEPS, 4000, "2026-02-05 08:00:00")
+        _add(conn, STEPS, 6000, "2026-02-07 08:00:00")
+        _add(conn, HRV, 40, "2026-02-07 03:00:00")
+        _add(conn, HRV, 50, "2026-02-07 04:00:00")
+        _add(conn, SLEEP_RECORD_TYPE, 2, "2026-02-06 23:00:00", "2026-02-07 01:00:00")
+        _add(conn, SLEEP_RECORD_TYPE, 3, "2026-02-06 22:00:00", "2026-02-06 23:00:00")
+        refresh_rollups(conn)
+        return conn
+
+    def test_daily_values(self, rolled):
+        assert daily_values(rolled, STEPS, days=7, aggregation="SUM", end=TODAY) == [
+            ("2026-02-05", 4000.0),
+            ("2026-02-07", 6000.0),
+        ]
+        assert daily_values(rolled, HRV, days=1, end=TODAY) == [("2026-02-07", 45.0)]
+        assert daily_values(rolled, HRV, days=1, aggregation="max", end=TODAY) == [
+            ("2026-02-07", 50.0)
+        ]
+
+    def test_load_daily_metrics_one_query(self, rolled):
+        series = load_daily_metrics(rolled, [STEPS, HRV], "2026-02-01", "2026-02-07")
+        assert sorted(series[STEPS]) == ["2026-02-05", "2026-02-07"]
+        assert series[HRV]["2026-02-07"].sample_count == 2
+        assert series[HRV]["2026-02-07"].value_avg == 45.0
+
+    def test_daily_sleep_hours(self, rolled):
+        assert daily_sleep_hours(rolled, stages=[2], end=TODAY) == [
+            ("2026-02-06", pytest.approx(2.0))
+        ]
+        assert daily_sleep_hours(rolled, end=TODAY) == [
+            ("2026-02-06", pytest.approx(3.0))
+        ]
@@ -3,7 +3,7 @@
 import ast
 import os
 from pathlib import Path
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -124,38 +124,47 @@ class TestAccountabilityDecoupled:
 
 
 class TestPollServiceDecoupled:
-    """PollService should accept an EmbeddingProvider dependency."""
+    """PollService should accept a PollEmbeddingWriter dependency."""
 
-    def test_poll_service_accepts_embedding_provider(self):
+    def test_poll_service_accepts_embedding_writer(self):
         from src.services.poll_service import PollService
 
-        mock_emb = AsyncMock(spec=EmbeddingProvider)
-        svc = PollService(embedding_provider=mock_emb)
-        assert svc._embedding_provider is mock_emb
+        mock_writer = MagicMock()
+        svc = PollService(embedding_writer=mock_writer)
+        assert svc._embedding_writer is mock_writer
 
-    def test_poll_service_default_embedding_provider(self):
-        """When no provider is passed, it should still work (backward compat)."""
+    def test_poll_service_default_embedding_writer(self):
+        """When no writer is passed, the shared one is used (backward compat)."""
         from src.services.poll_service import PollService
 
         svc = PollService()
-        assert svc._embedding_provider is not None
+        writer = MagicMock()
+        with patch(
+            "src.services.poll_service.get_poll_embedding_writer", return_value=writer
+        ):
+            assert svc.embedding_writer is writer
 
 
 class TestPollingServiceDecoupled:
-    """PollingService should accept an EmbeddingProvider dependency."""
+    """PollingService should accept a PollEmbeddingWriter dependency."""
 
-    def test_polling_service_accepts_embedding_provider(self):
+    def test_polling_service_accepts_embedding_writer(self):
         from src.services.polling_service import PollingService
 
-        mock_emb = AsyncMock(spec=EmbeddingProvider)
-        svc = PollingService(embedding_provider=mock_emb)
-        assert svc._embedding_provider is mock_emb
+        mock_writer = MagicMock()
+        svc = PollingService(embedding_writer=mock_writer)
+        assert svc._embedding_writer is mock_writer
 
-    def test_polling_service_default_embedding_provider(self):
+    def test_polling_service_default_embedding_writer(self):
         from src.services.polling_service import PollingService
 
         svc = PollingService()
-        assert svc._embedding_provider is not None
+        writer = MagicMock()
+        with patch(
+            "src.services.polling_service.get_poll_embedding_writer",
+            return_value=writer,
+        ):
+            assert svc.embedding_writer is writer
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,215 @@
+"""
+Tests for the chat action service (coalesced reactions, typing keep-alives).
+"""
+
+import asyncio
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.services.chat_action_service import ChatActionService
+
+
+class _FakeResponse:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+class _FakeClient:
+    """Records Bot API calls and tracks peak concurrency."""
+
+    def __init__(self, delay=0.0, responses=None):
+        self.delay = delay
+        self.responses = list(responses or [])
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+        self.is_closed = False
+
+    async def post(self, url, json):
+        self.calls.append((url.rsplit("/", 1)[-1], json))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if self.responses:
+            return _FakeResponse(self.responses.pop(0))
+        return _FakeResponse({"ok": True, "result": True})
+
+    async def aclose(self):
+        self.is_closed = True
+
+
+@pytest.fixture
+def bot_token():
+    with patch.dict(os.environ, {"TELEGRAM_BOT_TOKEN": "fake"}):
+        yield
+
+
+def _service(client, **kwargs):
+    kwargs.setdefault("coalesce_delay", 0)
+    kwargs.setdefault("max_requests_per_second", 1000)
+    service = ChatActionService(**kwargs)
+    service._client = client
+    return service
+
+
+def _reactions(client):
+    return [
+        (payload["message_id"], payload["reaction"][0]["emoji"])
+        for method, payload in client.calls
+        if method == "setMessageReaction"
+    ]
+
+
+class TestReactions:
+    @pytest.mark.asyncio
+    async def test_react_returns_before_sending(self, bot_token):
+        client = _FakeClient()
+        service = _service(client)
+
+        service.react(1, [10, 11], "👀")
+
+        assert client.calls == []
+        await service.flush()
+        assert sorted(_reactions(client)) == [(10, "👀"), (11, "👀")]
+
+    @pytest.mark.asyncio
+    async def test_pending_reactions_coalesce_to_latest(self, bot_token):
+        client = _FakeClient()
+        service = _service(client, coalesce_delay=0.01)
+
+        service.react(1, [10], "👀")
+        service.react(1, [10], "👍")
+        await service.flush()
+
+        assert _reactions(client) == [(10, "👍")]
+        assert service.coalesced_count == 1
+
+    @pytest.mark.asyncio
+    async def test_already_applied_reaction_skipped(self, bot_token):
+        client = _FakeClient()
+        service = _service(client)
+
+        service.react(1, [10], "👍")
+        await service.flush()
+        service.react(1, [10], "👍")
+        await service.flush()
+
+        assert len(client.calls) == 1
+        assert service.skipped_count == 1
+
+    @pytest.mark.asyncio
+    async def test_media_group_sent_concurrently_within_cap(self, bot_token):
+        client = _FakeClient(delay=0.01)
+        service = _service(client, max_concurrency=4)
+
+        service.react(1, list(range(20)), "👀")
+        await service.flush()
+
+        assert len(client.calls) == 20
+        assert 1 < client.peak <= 4
+
+    @pytest.mark.asyncio
+    async def test_later_reaction_applied_after_earlier(self, bot_token):
+        """A 👍 queued while 👀 is in flight is sent after it."""
+        client = _FakeClient(delay=0.02)
+        service = _service(client)
+
+        service.react(1, [10], "👀")
+        await asyncio.sleep(0.005)  # 👀 now in flight
+        service.react(1, [10], "👍")
+        await service.flush()
+
+        assert _reactions(client) == [(10, "👀"), (10, "👍")]
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_call_retried_once(self, bot_token):
+        client = _FakeClient(
+            responses=[
+                {"ok": False, "error_code": 429, "parameters": {"retry_after": 0}}
+            ]
+        )
+        service = _service(client)
+
+        service.react(1, [10], "👀")
+        await service.flush()
+
+        assert len(client.calls) == 2
+        assert service.sent_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_reaction_counted(self, bot_token):
+        client = _FakeClient(responses=[{"ok": False, "description": "bad emoji"}])
+        service = _service(client)
+
+        service.react(1, [10], "✅")
+        await service.flush()
+
+        assert service.failed_count == 1
+        # Not recorded as applied, so a retry is allowed
+        service.react(1, [10], "✅")
+        await service.flush()
+        assert len(client.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_no_token_is_noop(self):
+        client = _FakeClient()
+        service = _service(client)
+
+        with patch.dict(os.environ, {"TELEGRAM_BOT_TOKEN": ""}):
+            service.react(1, [10], "👀")
+            await service.flush()
+
+        assert client.calls == []
+
+
+class TestChatActionKeepAlive:
+    @pytest.mark.asyncio
+    async def test_action_refreshed_while_job_runs(self, bot_token):
+        client = _FakeClient()
+        service = _service(client, action_interval=0.01)
+
+        async with service.chat_action(1, "typing"):
+            await asyncio.sleep(0.045)
+
+        sent = [c for c in client.calls if c[0] == "sendChatAction"]
+        assert len(sent) >= 3
+        assert sent[0][1] == {"chat_id": 1, "action": "typing"}
+        assert service._keepalives == {}
+
+    @pytest.mark.asyncio
+    async def test_nested_jobs_share_one_keepalive(self, bot_token):
+        client = _FakeClient()
+        service = _service(client, action_interval=10)
+
+        async with service.chat_action(1):
+            task = service._keepalives[(1, "typing")].task
+            async with service.chat_action(1):
+                assert service._keepalives[(1, "typing")].task is task
+                assert service._keepalives[(1, "typing")].holders == 2
+            assert not task.cancelled()
+            await asyncio.sleep(0)
+
+        await asyncio.sleep(0)
+        assert task.cancelled() or task.done()
+        assert len([c for c in client.calls if c[0] == "sendChatAction"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_close_cancels_keepalives(self, bot_token):
+        client = _FakeClient()
+        service = _service(client, action_interval=10)
+
+        async with service.chat_action(1):
+            task = service._keepalives[(1, "typing")].task
+            await service.close()
+            await asyncio.sleep(0)
+            assert task.cancelled() or task.done()
+
+        assert client.is_closed
@@ -5,6 +5,7 @@ Tests cover:
 - Writing archive files with correct content and structure
 - Listing archives sorted newest first
 - Reading specific archive files
+- Deleting a chat's archives
 - Directory auto-creation
 - Edge cases: empty messages, special characters, path traversal prevention
 """
@@ -16,6 +17,7 @@ import pytest
 
 from src.services.conversation_archive import (
     archive_conversation,
+    delete_archives,
     get_archive,
     list_archives,
 )
@@ -295,6 +297,23 @@ class TestGetArchive:
         assert content is None
 
 
+class TestDeleteArchives:
+    """Tests for delete_archives function."""
+
+    def test_deletes_chat_archives_only(self, archive_dir):
+        archive_conversation(12345, "sess-a", [{"role": "user", "content": "a"}])
+        archive_conversation(67890, "sess-b", [{"role": "user", "content": "b"}])
+
+        assert delete_archives(12345) == 1
+
+        assert list_archives(12345) == []
+        assert not (archive_dir / "12345").exists()
+        assert len(list_archives(67890)) == 1
+
+    def test_missing_chat_dir(self, archive_dir):
+        assert delete_archives(99999) == 0
+
+
 class TestRoundTrip:
     """Integration tests: archive then read back."""
 
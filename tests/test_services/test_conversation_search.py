@@ -0,0 +1,269 @@
+"""
+Tests for the Conversation Search Service.
+
+Tests cover:
+- FTS5 query sanitisation (operators, phrases, prefixes)
+- messages_fts kept in sync by triggers on insert, update and delete
+- Existing messages indexed when the index is first created
+- Archive turns indexed at archive time, once per archive
+- Backfill of archive files written before the index existed
+- Data deletion removes a chat's archive turns from the index
+- BM25 ordering, per-chat filtering and HTML-safe snippets
+"""
+
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import delete, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.core.database import Base
+from src.models.chat import Chat
+from src.models.message import Message
+from src.models.user import User
+from src.services.conversation_archive import archive_conversation, delete_archives
+from src.services.conversation_search import (
+    SOURCE_ARCHIVES,
+    SOURCE_MESSAGES,
+    backfill_archive_index,
+    build_match_query,
+    delete_archived_conversations,
+    index_archived_conversation,
+    initialize_search_index,
+    parse_archive,
+    search_conversations,
+)
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'search.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User).values(id=1, user_id=77, first_name="a"))
+        await conn.execute(
+            insert(Chat),
+            [
+                {"id": 1, "chat_id": 1001, "user_id": 1, "chat_type": "private"},
+                {"id": 2, "chat_id": 2002, "user_id": 1, "chat_type": "private"},
+            ],
+        )
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    """Patch the service's get_db_session onto the temp DB."""
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def fake_get_db_session():
+        async with factory() as session:
+            yield session
+
+    with patch("src.services.conversation_search.get_db_session", fake_get_db_session):
+        yield engine
+
+
+@pytest.fixture
+def archive_dir(tmp_path):
+    base = tmp_path / "conversations"
+    with patch("src.services.conversation_archive.ARCHIVE_BASE_DIR", base):
+        yield base
+
+
+async def _add_message(engine, chat_pk, message_id, text_value, caption=None):
+    async with engine.begin() as conn:
+        await conn.execute(
+            insert(Message).values(
+                chat_id=chat_pk,
+                message_id=message_id,
+                message_type="text",
+                text=text_value,
+                caption=caption,
+            )
+        )
+
+
+class TestBuildMatchQuery:
+    def test_words_are_quoted_and_anded(self):
+        assert build_match_query("deploy script") == '"deploy" "script"'
+
+    def test_fts_operators_are_neutralised(self):
+        assert build_match_query('NEAR(a b) OR text:foo -bar "') == (
+            '"NEAR" "a" "b" "OR" "text" "foo" "bar"'
+        )
+
+    def test_phrase_and_prefix(self):
+        assert build_match_query('"vector index" embed*') == '"vector index" "embed"*'
+
+    def test_no_words(self):
+        assert build_match_query("  ?! ") is None
+
+
+class TestMessagesIndex:
+    @pytest.mark.asyncio
+    async def test_existing_rows_indexed_on_creation(self, db):
+        await _add_message(db, 1, 1, "the migration plan for sqlite")
+        assert await initialize_search_index(db) is True
+
+        hits = await search_conversations("migration", sources=[SOURCE_MESSAGES])
+        assert [h.message_id for h in hits] == [1]
+        assert hits[0].chat_id == 1001
+        assert hits[0].source == SOURCE_MESSAGES
+
+    @pytest.mark.asyncio
+    async def test_triggers_track_insert_update_delete(self, db):
+        await initialize_search_index(db)
+        await _add_message(db, 1, 1, "first draft", caption="photo of a heron")
+
+        assert len(await search_conversations("heron")) == 1
+
+        async with db.begin() as conn:
+            await conn.execute(update(Message).values(caption="photo of a crane"))
+        assert await search_conversations("heron") == []
+        assert len(await search_conversations("crane")) == 1
+
+        async with db.begin() as conn:
+            await conn.execute(delete(Message))
+        assert await search_conversations("crane") == []
+
+    @pytest.mark.asyncio
+    async def test_initialize_is_idempotent(self, db):
+        await initialize_search_index(db)
+        await _add_message(db, 1, 1, "hello there")
+        await initialize_search_index(db)
+        assert len(await search_conversations("hello")) == 1
+
+    @pytest.mark.asyncio
+    async def test_chat_filter_and_ranking(self, db):
+        await initialize_search_index(db)
+        await _add_message(db, 1, 1, "cache " * 5 + "warmup")
+        await _add_message(db, 1, 2, "unrelated words with one cache mention " * 3)
+        await _add_message(db, 2, 3, "cache")
+
+        hits = await search_conversations("cache", chat_id=1001)
+        assert [h.message_id for h in hits] == [1, 2]
+        assert hits[0].rank <= hits[1].rank
+
+        assert [h.message_id for h in await search_conversations("cache", 2002)] == [3]
+
+    @pytest.mark.asyncio
+    async def test_snippet_is_html_safe(self, db):
+        await initialize_search_index(db)
+        await _add_message(db, 1, 1, "use <b>bold</b> & keep tags")
+
+        [hit] = await search_conversations("bold")
+        assert "&lt;b&gt;" in hit.snippet
+        assert "<b>bold</b>" in hit.snippet
+        assert "&amp;" in hit.snippet
+
+    @pytest.mark.asyncio
+    async def test_limit(self, db):
+        await initialize_search_index(db)
+        for i in range(5):
+            await _add_message(db, 1, i, f"needle {i}")
+        assert len(await search_conversations("needle", limit=3)) == 3
+        assert await search_conversations("needle", limit=0) == []
+
+
+class TestArchiveIndex:
+    MESSAGES = [
+        {"role": "user", "content": "How do I tune the WAL checkpoint?"},
+        {"role": "assistant", "content": "Set wal_autocheckpoint to 1000 pages."},
+        {"role": "tool", "content": ""},
+    ]
+
+    @pytest.mark.asyncio
+    async def test_index_archived_conversation(self, db, archive_dir):
+        await initialize_search_index(db)
+        path = archive_conversation(1001, "sess-abcdef12", self.MESSAGES)
+
+        assert await index_archived_conversation(
+            1001, "sess-abcdef12", path, self.MESSAGES
+        )
+        # Second call for the same file is a no-op
+        assert not await index_archived_conversation(
+            1001, "sess-abcdef12", path, self.MESSAGES
+        )
+
+        hits = await search_conversations("checkpoint", sources=[SOURCE_ARCHIVES])
+        assert len(hits) == 1
+        assert hits[0].role == "user"
+        assert hits[0].session_id == "sess-abcdef12"
+        assert hits[0].archive == f"1001/{path.name}"
+        assert await search_conversations("checkpoint", chat_id=2002) == []
+
+    @pytest.mark.asyncio
+    async def test_results_merge_sources(self, db, archive_dir):
+        await initialize_search_index(db)
+        await _add_message(db, 1, 1, "wal_autocheckpoint explained")
+        path = archive_conversation(1001, "sess-1", self.MESSAGES)
+        await index_archived_conversation(1001, "sess-1", path, self.MESSAGES)
+
+        hits = await search_conversations("wal_autocheckpoint", chat_id=1001)
+        assert {h.source for h in hits} == {SOURCE_MESSAGES, SOURCE_ARCHIVES}
+        assert [h.rank for h in hits] == sorted(h.rank for h in hits)
+
+    def test_parse_archive_roundtrip(self, archive_dir):
+        messages = [
+            {"role": "user", "content": "multi\n\nline", "timestamp": "2026-01-01"},
+            {"role": "assistant", "content": "### heading inside\ntext"},
+        ]
+        path = archive_conversation(5, "session-xyz", messages)
+        metadata, turns = parse_archive(path.read_text(encoding="utf-8"))
+
+        assert metadata["session_id"] == "session-xyz"
+        assert metadata["archived"].endswith("Z")
+        assert turns == [
+            ("user", "multi\n\nline"),
+            ("assistant", "### heading inside\ntext"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_backfill_skips_indexed_archives(self, db, archive_dir):
+        await initialize_search_index(db)
+        first = archive_conversation(1001, "sess-old", self.MESSAGES)
+        await index_archived_conversation(1001, "sess-old", first, self.MESSAGES)
+        with patch("src.services.conversation_archive.datetime") as fake_dt:
+            fake_dt.utcnow.return_value.strftime.return_value = "2020-01-01_000000"
+            fake_dt.utcnow.return_value.isoformat.return_value = "2020-01-01T00:00"
+            archive_conversation(
+                2002, "sess-new", [{"role": "user", "content": "backfilled kestrel"}]
+            )
+        (archive_dir / "not-a-chat").mkdir()
+
+        assert await backfill_archive_index() == 1
+        assert await backfill_archive_index() == 0
+
+        [hit] = await search_conversations("kestrel")
+        assert hit.chat_id == 2002
+        assert hit.session_id == "sess-new"
+        assert hit.timestamp == "2020-01-01T00:00Z"
+        assert len(await search_conversations("checkpoint")) == 1
+
+    @pytest.mark.asyncio
+    async def test_delete_archived_conversations(self, db, archive_dir):
+        await initialize_search_index(db)
+        for chat_id in (1001, 2002):
+            path = archive_conversation(chat_id, f"sess-{chat_id}", self.MESSAGES)
+            await index_archived_conversation(
+                chat_id, f"sess-{chat_id}", path, self.MESSAGES
+            )
+
+        async with AsyncSession(db) as session:
+            assert await delete_archived_conversations(session, [1001]) == 1
+            await session.commit()
+
+        [hit] = await search_conversations("checkpoint")
+        assert hit.chat_id == 2002
+        # With the files gone too, the backfill has nothing to re-index
+        delete_archives(1001)
+        assert await backfill_archive_index() == 0
+
+    @pytest.mark.asyncio
+    async def test_backfill_without_archive_dir(self, db, archive_dir):
+        await initialize_search_index(db)
+        assert await backfill_archive_index() == 0
@@ -6,180 +6,323 @@ to the user whose retention policy is being enforced, using the correct ID
 column for each table:
 - Message.chat_id -> FK to chats.id (database PK)
 - PollResponse.chat_id -> Telegram chat ID (matches Chat.chat_id)
+
+Deletes run in bounded chunks with per-chunk checkpoints, so these tests use
+a real in-memory SQLite database rather than statement-capturing mocks.
 """
 
-from unittest.mock import MagicMock, patch
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.models.base import Base
+from src.models.chat import Chat
+from src.models.image import Image
+from src.models.message import Message
+from src.models.poll_response import PollResponse
+from src.models.privacy_settings import PrivacySettings
+from src.models.retention_progress import RetentionProgress
+from src.models.tracker import CheckIn, Tracker
+from src.models.user import User
+from src.models.user_settings import UserSettings
+
+OLD = datetime.utcnow() - timedelta(days=60)
+RECENT = datetime.utcnow() - timedelta(days=1)
+
+# Deliberately overlapping ID spaces: user 1's Telegram chat ID equals
+# user 2's chat database PK, so a wrong join column deletes the wrong rows.
+USER1_TG_CHAT = 2
+USER2_TG_CHAT = 5000
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    yield factory
+    await engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    """Patch the service's get_db_session onto the in-memory DB."""
+
+    @asynccontextmanager
+    async def fake_get_db_session():
+        async with session_factory() as session:
+            yield session
+
+    with patch(
+        "src.services.data_retention_service.get_db_session", fake_get_db_session
+    ):
+        yield session_factory
+
+
+async def _seed_user(session, user_pk, tg_chat_id, retention):
+    session.add(User(id=user_pk, user_id=1000 + user_pk, first_name=f"u{user_pk}"))
+    session.add(UserSettings(user_id=user_pk))
+    session.add(PrivacySettings(user_id=user_pk, data_retention=retention))
+    chat = Chat(id=user_pk, chat_id=tg_chat_id, user_id=user_pk, chat_type="private")
+    session.add(chat)
+    await session.flush()
+    tracker = Tracker(user_id=user_pk, type="habit", name="walk")
+    session.add(tracker)
+    await session.flush()
+    return chat, tracker
+
+
+async def _add_rows(session, chat, tracker, created_at, n=1, start_id=0):
+    for i in range(n):
+        session.add(
+            Message(
+                chat_id=chat.id,
+                message_id=start_id + i,
+                message_type="text",
+                text="hi",
+                created_at=created_at,
+            )
+        )
+        session.add(
+            CheckIn(
+                user_id=chat.user_id,
+                tracker_id=tracker.id,
+                status="completed",
+                created_at=created_at,
+            )
+        )
+        session.add(
+            PollResponse(
+                chat_id=chat.chat_id,
+                poll_id=f"poll-{chat.id}-{start_id + i}-{created_at.date()}",
+                message_id=start_id + i,
+                question="How?",
+                options=["a", "b"],
+                selected_option_id=0,
+                selected_option_text="a",
+                poll_type="mood",
+                created_at=created_at,
+            )
+        )
 
 
-class TestDataRetentionUserScoping:
-    """Tests that data retention correctly scopes deletions to the target user."""
+async def _count(factory, model, **filters):
+    async with factory() as session:
+        stmt = select(func.count()).select_from(model)
+        for col, value in filters.items():
+            stmt = stmt.where(getattr(model, col) == value)
+        return (await session.execute(stmt)).scalar()
 
-    def _make_mock_session(self, executed_statements):
-        """Create a mock session that captures executed SQL statements."""
 
-        class MockResult:
-            rowcount = 0
+class TestDataRetentionUserScoping:
+    """Tests that data retention correctly scopes deletions to the target user."""
 
-            def scalars(self):
-                return self
+    @pytest.mark.asyncio
+    async def test_deletes_only_old_rows_of_expiring_user(self, db):
+        """Old rows of a 1_month user go; recent rows and other users stay."""
+        from src.services.data_retention_service import enforce_data_retention
 
-            def all(self):
-                settings = MagicMock()
-                settings.data_retention = "1_month"
-                settings.user_id = 42
-                return [settings]
+        async with db() as session:
+            chat1, tracker1 = await _seed_user(session, 1, USER1_TG_CHAT, "1_month")
+            chat2, tracker2 = await _seed_user(session, 2, USER2_TG_CHAT, "forever")
+            await _add_rows(session, chat1, tracker1, OLD, n=3)
+            await _add_rows(session, chat1, tracker1, RECENT, n=2, start_id=100)
+            await _add_rows(session, chat2, tracker2, OLD, n=4)
+            await session.commit()
+
+        results = await enforce_data_retention(pause_seconds=0)
+
+        # 3 messages + 3 check-ins + 3 poll responses
+        assert results == {1: 9}
+        assert await _count(db, Message, chat_id=chat1.id) == 2
+        assert await _count(db, CheckIn, user_id=1) == 2
+        assert await _count(db, PollResponse, chat_id=USER1_TG_CHAT) == 2
+        assert await _count(db, Message, chat_id=chat2.id) == 4
+        assert await _count(db, CheckIn, user_id=2) == 4
+        assert await _count(db, PollResponse, chat_id=USER2_TG_CHAT) == 4
 
-        class MockSession:
-            async def execute(self, stmt):
-                executed_statements.append(str(stmt))
-                return MockResult()
+    @pytest.mark.asyncio
+    async def test_poll_response_deletion_uses_telegram_chat_id(self, db):
+        """Poll responses are matched via Chat.chat_id, not Chat.id.
 
-            async def commit(self):
-                pass
+        User 1 (forever) uses Telegram chat 2, which equals user 2's chat PK;
+        joining on the wrong column would delete user 1's responses instead.
+        """
+        from src.services.data_retention_service import enforce_data_retention
 
-            async def __aenter__(self):
-                return self
+        async with db() as session:
+            chat1, tracker1 = await _seed_user(session, 1, USER1_TG_CHAT, "forever")
+            chat2, tracker2 = await _seed_user(session, 2, 1, "1_month")
+            await _add_rows(session, chat1, tracker1, OLD, n=2)
+            await _add_rows(session, chat2, tracker2, OLD, n=1)
+            await session.commit()
 
-            async def __aexit__(self, *args):
-                pass
+        await enforce_data_retention(pause_seconds=0)
 
-        return MockSession()
+        # User 2's (Telegram chat 1) responses are gone; user 1's remain
+        assert await _count(db, PollResponse, chat_id=1) == 0
+        assert await _count(db, PollResponse, chat_id=USER1_TG_CHAT) == 2
 
     @pytest.mark.asyncio
-    async def test_message_deletion_uses_db_pk(self):
-        """Message deletion uses Chat.id (database PK) since Message.chat_id is FK to chats.id."""
+    async def test_forever_retention_skips_deletion(self, db):
+        """Users with 'forever' retention keep everything."""
         from src.services.data_retention_service import enforce_data_retention
 
-        executed_statements = []
-        mock_session = self._make_mock_session(executed_statements)
-
-        with patch(
-            "src.services.data_retention_service.get_db_session",
-            return_value=mock_session,
-        ):
-            await enforce_data_retention()
-
-        message_deletes = [
-            s
-            for s in executed_statements
-            if "messages" in s.lower() and "DELETE" in s.upper()
-        ]
-        assert len(message_deletes) > 0, "Expected a message delete statement"
-
-        stmt_str = message_deletes[0]
-        assert (
-            "chats" in stmt_str.lower()
-        ), f"Message deletion must join to chats table, got: {stmt_str}"
-        # Must use chats.id (database PK) since Message.chat_id is FK to chats.id
-        assert (
-            "chats.id" in stmt_str.lower()
-        ), f"Message deletion must use chats.id (database PK), got: {stmt_str}"
-        assert (
-            "user_id" in stmt_str.lower()
-        ), f"Message deletion must filter by user_id, got: {stmt_str}"
+        async with db() as session:
+            chat, tracker = await _seed_user(session, 1, USER1_TG_CHAT, "forever")
+            await _add_rows(session, chat, tracker, OLD, n=2)
+            await session.commit()
 
-    @pytest.mark.asyncio
-    async def test_poll_response_deletion_uses_telegram_chat_id(self):
-        """Poll response deletion must use Chat.chat_id (Telegram ID), not Chat.id (PK).
+        result = await enforce_data_retention()
 
-        PollResponse.chat_id stores Telegram chat IDs (no FK), so the subquery
-        must select Chat.chat_id to match correctly.
-        """
-        from src.services.data_retention_service import enforce_data_retention
+        assert result == {}
+        assert await _count(db, Message) == 2
 
-        executed_statements = []
-        mock_session = self._make_mock_session(executed_statements)
-
-        with patch(
-            "src.services.data_retention_service.get_db_session",
-            return_value=mock_session,
-        ):
-            await enforce_data_retention()
-
-        poll_deletes = [
-            s
-            for s in executed_statements
-            if "poll_responses" in s.lower() and "DELETE" in s.upper()
-        ]
-        assert len(poll_deletes) > 0, "Expected a poll response delete statement"
-
-        stmt_str = poll_deletes[0]
-        assert (
-            "chats" in stmt_str.lower()
-        ), f"PollResponse deletion must join to chats table, got: {stmt_str}"
-        # CRITICAL: Must use chats.chat_id (Telegram ID), NOT chats.id (database PK)
-        assert "chats.chat_id" in stmt_str.lower(), (
-            f"PollResponse deletion must use chats.chat_id (Telegram ID), "
-            f"not chats.id (database PK). Got: {stmt_str}"
-        )
-        assert (
-            "user_id" in stmt_str.lower()
-        ), f"PollResponse deletion must filter by user_id, got: {stmt_str}"
+
+class TestChunkedDeletes:
+    """Deletes are bounded per transaction and checkpointed."""
 
     @pytest.mark.asyncio
-    async def test_check_in_deletion_scoped_to_user(self):
-        """Check-in deletion uses direct user_id filter."""
-        from src.services.data_retention_service import enforce_data_retention
+    async def test_deletes_in_chunks(self, db):
+        """Rows are deleted in several chunk-sized transactions."""
+        from src.services.data_retention_service import DataRetentionEngine
+
+        async with db() as session:
+            chat, tracker = await _seed_user(session, 1, USER1_TG_CHAT, "1_month")
+            await _add_rows(session, chat, tracker, OLD, n=7)
+            await session.commit()
+
+        engine = DataRetentionEngine(chunk_size=3, pause_seconds=0)
+        with patch.object(
+            engine, "_purge_chunk", wraps=engine._purge_chunk
+        ) as purge_chunk:
+            results = await engine.run()
+
+        assert results == {1: 21}
+        # Per table: 3 + 3 + 1 + final empty chunk; four tables (images empty)
+        assert purge_chunk.await_count == 3 * 4 + 1
+        assert await _count(db, Message) == 0
+        # Checkpoints are cleared once the run completes
+        assert await _count(db, RetentionProgress) == 0
 
-        executed_statements = []
-        mock_session = self._make_mock_session(executed_statements)
+    @pytest.mark.asyncio
+    async def test_interrupted_run_resumes_from_checkpoint(self, db):
+        """A run that dies mid-way resumes with the stored cutoff and last_id."""
+        from src.services.data_retention_service import DataRetentionEngine
 
-        with patch(
-            "src.services.data_retention_service.get_db_session",
-            return_value=mock_session,
-        ):
-            await enforce_data_retention()
+        async with db() as session:
+            chat, tracker = await _seed_user(session, 1, USER1_TG_CHAT, "1_month")
+            await _add_rows(session, chat, tracker, OLD, n=6)
+            await session.commit()
 
-        checkin_deletes = [
-            s
-            for s in executed_statements
-            if "check_ins" in s.lower() and "DELETE" in s.upper()
-        ]
-        assert len(checkin_deletes) > 0, "Expected a check-in delete statement"
+        engine = DataRetentionEngine(chunk_size=2, pause_seconds=0)
+        original = engine._purge_chunk
+        calls = {"n": 0}
 
-        stmt_str = checkin_deletes[0]
-        assert (
-            "user_id" in stmt_str.lower()
-        ), f"CheckIn deletion must filter by user_id, got: {stmt_str}"
+        async def flaky_purge(*args, **kwargs):
+            calls["n"] += 1
+            if calls["n"] == 3:
+                raise RuntimeError("database is locked")
+            return await original(*args, **kwargs)
 
-    @pytest.mark.asyncio
-    async def test_forever_retention_skips_deletion(self):
-        """Users with 'forever' retention produce no DELETE statements."""
-        from src.services.data_retention_service import enforce_data_retention
+        with patch.object(engine, "_purge_chunk", side_effect=flaky_purge):
+            with pytest.raises(RuntimeError):
+                await engine.run()
 
-        executed_statements = []
+        # Two message chunks committed before the failure
+        assert await _count(db, Message) == 2
+        async with db() as session:
+            progress = (await session.execute(select(RetentionProgress))).scalar_one()
+        assert progress.table_name == "messages"
+        assert progress.deleted_count == 4
+        assert progress.completed is False
 
-        class MockResult:
-            rowcount = 0
+        results = await DataRetentionEngine(chunk_size=2, pause_seconds=0).run()
 
-            def scalars(self):
-                return self
+        # Resumed run only reports what it deleted itself
+        assert results == {1: 2 + 6 + 6}
+        assert await _count(db, Message) == 0
+        assert await _count(db, RetentionProgress) == 0
 
-            def all(self):
-                return []  # No users with non-forever retention
 
-        class MockSession:
-            async def execute(self, stmt):
-                executed_statements.append(str(stmt))
-                return MockResult()
+class TestImagePurge:
+    """Purged images lose their files on disk and their embeddings."""
 
-            async def commit(self):
-                pass
+    @pytest.mark.asyncio
+    async def test_image_files_and_embeddings_cleaned(self, db, tmp_path):
+        from src.services.data_retention_service import DataRetentionEngine
+
+        old_file = tmp_path / "old.jpg"
+        old_file.write_bytes(b"x")
+        old_compressed = tmp_path / "old_small.jpg"
+        old_compressed.write_bytes(b"x")
+        new_file = tmp_path / "new.jpg"
+        new_file.write_bytes(b"x")
+
+        async with db() as session:
+            chat, _ = await _seed_user(session, 1, USER1_TG_CHAT, "1_month")
+            old_image = Image(
+                chat_id=chat.id,
+                file_id="f1",
+                file_unique_id="u1",
+                original_path=str(old_file),
+                compressed_path=str(old_compressed),
+                embedding=b"\x00" * 8,
+                created_at=OLD,
+            )
+            new_image = Image(
+                chat_id=chat.id,
+                file_id="f2",
+                file_unique_id="u2",
+                original_path=str(new_file),
+                created_at=RECENT,
+            )
+            session.add_all([old_image, new_image])
+            await session.flush()
+            # A recent message still referencing the old image
+            session.add(
+                Message(
+                    chat_id=chat.id,
+                    message_id=1,
+                    message_type="photo",
+                    image_id=old_image.id,
+                    created_at=RECENT,
+                )
+            )
+            await session.commit()
+
+        vector_db = MagicMock()
+        vector_db.cleanup_orphaned_embeddings = AsyncMock(return_value=1)
+        engine = DataRetentionEngine(pause_seconds=0, vector_db=vector_db)
+
+        results = await engine.run()
+
+        assert results == {1: 1}
+        assert not old_file.exists()
+        assert not old_compressed.exists()
+        assert new_file.exists()
+        vector_db.cleanup_orphaned_embeddings.assert_awaited_once()
+        assert await _count(db, Image) == 1
+        async with db() as session:
+            msg = (await session.execute(select(Message))).scalar_one()
+        assert msg.image_id is None
 
-            async def __aenter__(self):
-                return self
+    @pytest.mark.asyncio
+    async def test_no_embedding_cleanup_without_image_purge(self, db):
+        from src.services.data_retention_service import DataRetentionEngine
 
-            async def __aexit__(self, *args):
-                pass
+        async with db() as session:
+            chat, tracker = await _seed_user(session, 1, USER1_TG_CHAT, "1_month")
+            await _add_rows(session, chat, tracker, OLD, n=1)
+            await session.commit()
 
-        with patch(
-            "src.services.data_retention_service.get_db_session",
-            return_value=MockSession(),
-        ):
-            result = await enforce_data_retention()
+        vector_db = MagicMock()
+        vector_db.cleanup_orphaned_embeddings = AsyncMock(return_value=0)
+        await DataRetentionEngine(pause_seconds=0, vector_db=vector_db).run()
 
-        assert result == {}
-        delete_stmts = [s for s in executed_statements if "DELETE" in s.upper()]
-        assert len(delete_stmts) == 0
+        vector_db.cleanup_orphaned_embeddings.assert_not_awaited()
@@ -6,8 +6,17 @@ import gzip
 import sqlite3
 import time
 from pathlib import Path
-
-from src.services.database_backup_service import backup, rotate, run_backup
+from unittest.mock import patch
+
+from src.services.database_backup_service import (
+    backup,
+    backup_incremental,
+    list_backup_points,
+    read_backup_status,
+    restore,
+    rotate,
+    run_backup,
+)
 
 # =============================================================================
 # Helpers
@@ -128,6 +137,205 @@ class TestDatabaseBackupService:
 
         assert result is None
 
+    def test_backup_copies_in_steps(self, tmp_path):
+        """A small pages value performs several backup steps with pauses."""
+        db_path = tmp_path / "source.db"
+        _create_test_db(db_path)
+        _insert_rows(db_path, 500)
+
+        with patch("src.services.database_backup_service.time.sleep") as sleep:
+            result = backup(db_path, tmp_path / "backups", pages=2, step_sleep=0.01)
+
+        assert result is not None
+        assert sleep.call_count >= 2
+        restored = tmp_path / "restored.db"
+        with gzip.open(result, "rb") as f_in:
+            restored.write_bytes(f_in.read())
+        assert _row_count(restored) == 501
+
+    def test_backup_leaves_no_temp_files(self, tmp_path):
+        """Only the backup, chain state and run status remain in the backup dir."""
+        db_path = tmp_path / "source.db"
+        backup_dir = tmp_path / "backups"
+        _create_test_db(db_path)
+
+        result = backup(db_path, backup_dir)
+
+        names = sorted(p.name for p in backup_dir.iterdir())
+        assert names == sorted(
+            [result.name, "backup_pages.bin", "backup_state.json", "backup_status.json"]
+        )
+
+    def test_backup_records_status(self, tmp_path):
+        """Duration, size and run counts are persisted for the bot to export."""
+        db_path = tmp_path / "source.db"
+        backup_dir = tmp_path / "backups"
+        _create_test_db(db_path)
+
+        result = backup(db_path, backup_dir)
+        last = read_backup_status(backup_dir)["last"]["full"]
+        assert last["status"] == "success"
+        assert last["size_bytes"] == result.stat().st_size
+        assert last["source_bytes"] > 0
+        assert last["duration_seconds"] >= 0
+
+        with patch(
+            "src.services.database_backup_service.sqlite3.connect",
+            side_effect=sqlite3.OperationalError("locked"),
+        ):
+            assert backup(db_path, backup_dir) is None
+
+        status = read_backup_status(backup_dir)
+        assert status["counts"] == {"full:success": 1, "full:failure": 1}
+        assert status["last"]["full"]["status"] == "failure"
+        assert status["last_success"]["full"]["size_bytes"] == result.stat().st_size
+
+    def test_status_exported_by_metrics(self, tmp_path):
+        """The bot's metrics registry exposes the persisted backup status."""
+        from prometheus_client import generate_latest
+
+        from src.api.metrics import REGISTRY
+
+        db_path = tmp_path / "source.db"
+        backup_dir = tmp_path / "backups"
+        _create_test_db(db_path)
+        result = backup(db_path, backup_dir)
+        # A later failure must not hide the last successful run's gauges
+        with patch(
+            "src.services.database_backup_service.sqlite3.connect",
+            side_effect=sqlite3.OperationalError("locked"),
+        ):
+            assert backup(db_path, backup_dir) is None
+
+        with patch(
+            "src.services.database_backup_service._project_db_path",
+            return_value=tmp_path / "source.db",
+        ):
+            body = generate_latest(REGISTRY).decode()
+
+        assert 'db_backups_total{kind="full",status="success"} 1.0' in body
+        assert 'db_backups_total{kind="full",status="failure"} 1.0' in body
+        assert (
+            f'db_backup_last_size_bytes{{kind="full"}} {float(result.stat().st_size)}'
+            in body
+        )
+        assert 'db_backup_last_success_timestamp_seconds{kind="full"}' in body
+
+
+# =============================================================================
+# TestIncrementalBackup
+# =============================================================================
+
+
+def _insert_rows(db_path: Path, n: int, value: str = "x") -> None:
+    conn = sqlite3.connect(str(db_path))
+    conn.executemany(
+        "INSERT INTO test (value) VALUES (?)", [(value * 100,) for _ in range(n)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def _row_count(db_path: Path) -> int:
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute("SELECT COUNT(*) FROM test").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class TestIncrementalBackup:
+    """Tests for page-delta incremental backups and restore."""
+
+    def test_incremental_without_chain_takes_full(self, tmp_path):
+        db_path = tmp_path / "source.db"
+        _create_test_db(db_path)
+
+        result = backup_incremental(db_path, tmp_path / "backups")
+
+        assert result is not None
+        assert result.name.endswith(".db.gz")
+
+    def test_incremental_stores_only_changed_pages(self, tmp_path):
+        db_path = tmp_path / "source.db"
+        backup_dir = tmp_path / "backups"
+        _create_test_db(db_path)
+        _insert_rows(db_path, 2000)
+        full = backup(db_path, backup_dir)
+
+        _insert_rows(db_path, 5)
+        inc = backup_incremental(db_path, backup_dir)
+
+        assert inc is not None
+        assert inc.name.endswith(".inc.gz")
+        assert inc.stat().st_size < full.stat().st_size / 4
+
+    def test_restore_rebuilds_every_point(self, tmp_path):
+        db_path = tmp_path / "source.db"
+        backup_dir = tmp_path / "backups"
+        _create_test_db(db_path)
+
+        full = backup(db_path, backup_dir)
+        _insert_rows(db_path, 300)
+        inc1 = backup_incremental(db_path, backup_dir)
+        _insert_rows(db_path, 700, value="y")
+        inc2 = backup_incremental(db_path, backup_dir)
+
+        expected = {full.name: 1, inc1.name: 301, inc2.name: 1001}
+        for name, rows in expected.items():
+            target = tmp_path / f"restored_{name}.db"
+            assert restore(backup_dir, target, point=name) == target
+            assert _row_count(target) == rows
+
+        latest = tmp_path / "latest.db"
+        assert restore(backup_dir, latest) == latest
+        assert _row_count(latest) == 1001
+
+    def test_restore_handles_shrinking_database(self, tmp_path):
+        db_path = tmp_path / "source.db"
+        backup_dir = tmp_path / "backups"
+        _create_test_db(db_path)
+        _insert_rows(db_path, 1000)
+        backup(db_path, backup_dir)
+
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("DELETE FROM test WHERE id > 10")
+        conn.commit()
+        conn.execute("VACUUM")
+        conn.close()
+        backup_incremental(db_path, backup_dir)
+
+        target = tmp_path / "restored.db"
+        assert restore(backup_dir, target) == target
+        assert _row_count(target) == 10
+
+    def test_restore_fails_on_broken_chain(self, tmp_path):
+        db_path = tmp_path / "source.db"
+        backup_dir = tmp_path / "backups"
+        _create_test_db(db_path)
+        backup(db_path, backup_dir)
+        _insert_rows(db_path, 10)
+        inc1 = backup_incremental(db_path, backup_dir)
+        _insert_rows(db_path, 10)
+        inc2 = backup_incremental(db_path, backup_dir)
+
+        inc1.unlink()
+
+        assert restore(backup_dir, tmp_path / "r.db", point=inc2.name) is None
+
+    def test_restore_returns_none_without_backups(self, tmp_path):
+        assert restore(tmp_path, tmp_path / "r.db") is None
+
+    def test_list_backup_points_ordered(self, tmp_path):
+        db_path = tmp_path / "source.db"
+        backup_dir = tmp_path / "backups"
+        _create_test_db(db_path)
+        full = backup(db_path, backup_dir)
+        inc = backup_incremental(db_path, backup_dir)
+
+        points = [p for _, p in list_backup_points(backup_dir)]
+        assert points == [full, inc]
+
 
 # =============================================================================
 # TestBackupRotation
@@ -190,6 +398,27 @@ class TestBackupRotation:
         # Only 1 backup file should remain
         assert len(list(tmp_path.glob("*.db.gz"))) == 1
 
+    def test_rotate_removes_incrementals_of_removed_base(self, tmp_path):
+        """Incrementals go with their base snapshot."""
+        import os
+
+        old = tmp_path / "telegram_agent_20250101_120000.db.gz"
+        new = tmp_path / "telegram_agent_20250102_120000.db.gz"
+        old_inc = tmp_path / (old.name[:-6] + "+20250101_130000_000001.inc.gz")
+        new_inc = tmp_path / (new.name[:-6] + "+20250102_130000_000001.inc.gz")
+        for f in [old, new, old_inc, new_inc]:
+            f.write_bytes(b"fake")
+        t = time.time()
+        os.utime(old, (t - 10, t - 10))
+
+        removed = rotate(tmp_path, keep=1)
+
+        assert removed == 2
+        assert not old.exists()
+        assert not old_inc.exists()
+        assert new.exists()
+        assert new_inc.exists()
+
 
 # =============================================================================
 # TestRunBackup
@@ -214,3 +443,20 @@ class TestRunBackup:
         assert result is not None
         assert result.exists()
         assert len(list(backup_dir.glob("*.db.gz"))) == 1
+
+    def test_run_backup_incremental_chain(self, tmp_path, monkeypatch):
+        """incremental=True builds on the chain and restarts after full_every."""
+        db_path = tmp_path / "data" / "telegram_agent.db"
+        db_path.parent.mkdir(parents=True)
+        _create_test_db(db_path)
+        backup_dir = tmp_path / "backups"
+        monkeypatch.setenv("DATABASE_URL", f"sqlite+aiosqlite:///{db_path}")
+
+        first = run_backup(backup_dir=backup_dir, incremental=True, full_every=1)
+        second = run_backup(backup_dir=backup_dir, incremental=True, full_every=1)
+
+        assert first.name.endswith(".db.gz")
+        assert second.name.endswith(".inc.gz")
+        with patch("src.services.database_backup_service.backup") as full:
+            run_backup(backup_dir=backup_dir, incremental=True, full_every=1)
+        full.assert_called_once()
@@ -0,0 +1,267 @@
+"""
+Tests for the resumable image embedding backfill.
+
+Tests cover:
+- Keyset pages are decoded in a process pool, embedded and committed in bulk
+- Missing files are skipped and undecodable images counted as failed
+- An interrupted run resumes after the last committed page
+- Scope filters (user, artistic mode) and per-scope cursors
+- Hash and other-model embeddings are redone, current ones kept
+- Nothing is written while embeddings are deterministic
+- Throughput and ETA reporting
+"""
+
+from contextlib import asynccontextmanager
+from io import BytesIO
+from unittest.mock import AsyncMock, PropertyMock, patch
+
+import pytest
+from PIL import Image as PILImage
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.models.backfill_cursor import BackfillCursor
+from src.models.base import Base
+from src.models.chat import Chat
+from src.models.image import Image
+from src.services.embedding_backfill import BackfillProgress, EmbeddingBackfill
+from src.services.embedding_runtime import EmbeddingRuntime, EmbeddingRuntimeConfig
+from src.services.embedding_service import EmbeddingService
+from src.services.similarity_service import SimilarityService
+from src.utils.vector_search import unpack_embedding
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'images.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def factory(engine):
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def fake_get_db_session():
+        async with factory() as session:
+            yield session
+
+    with patch("src.services.embedding_backfill.get_db_session", fake_get_db_session):
+        yield factory
+
+
+@pytest.fixture
+async def service():
+    runtime = EmbeddingRuntime(
+        EmbeddingRuntimeConfig(backend="hash", hash_dimension=32),
+        max_batch_size=8,
+        use_process=False,
+    )
+    service = EmbeddingService(runtime=runtime)
+    # The hash backend reports itself deterministic; treat it as a real model
+    with patch.object(
+        EmbeddingService, "is_deterministic", new_callable=PropertyMock
+    ) as deterministic:
+        deterministic.return_value = False
+        yield service
+    await runtime.close()
+
+
+@pytest.fixture
+def vector_db():
+    db = AsyncMock()
+    db.store_embeddings.side_effect = lambda items: len(items)
+    return db
+
+
+def _jpeg(path, color):
+    buffer = BytesIO()
+    PILImage.new("RGB", (320, 240), color).save(buffer, format="JPEG")
+    path.write_bytes(buffer.getvalue())
+    return str(path)
+
+
+async def _seed(factory, tmp_path, specs):
+    """specs: list of (file kind, chat user_id, mode); file kind ok/missing/bad."""
+    async with factory() as session:
+        session.add_all(
+            [Chat(id=1, chat_id=101, user_id=1), Chat(id=2, chat_id=102, user_id=2)]
+        )
+        for i, (kind, user_id, mode) in enumerate(specs, start=1):
+            path = tmp_path / f"{i}.jpg"
+            if kind == "ok":
+                _jpeg(path, (i * 20 % 256, 40, 90))
+            elif kind == "bad":
+                path.write_bytes(b"not a jpeg")
+            session.add(
+                Image(
+                    id=i,
+                    chat_id=user_id,
+                    file_id=f"f{i}",
+                    file_unique_id=f"u{i}",
+                    compressed_path=str(path),
+                    mode_used=mode,
+                    processing_status="completed",
+                )
+            )
+        await session.commit()
+
+
+async def _embedded(factory):
+    async with factory() as session:
+        rows = await session.execute(
+            select(Image.id, Image.embedding, Image.embedding_model).order_by(Image.id)
+        )
+        return {row.id: row for row in rows if row.embedding is not None}
+
+
+async def _cursors(factory):
+    async with factory() as session:
+        return (await session.execute(select(BackfillCursor))).scalars().all()
+
+
+def _backfill(service, vector_db, **kwargs):
+    kwargs.setdefault("page_size", 2)
+    return EmbeddingBackfill(
+        embedding_service=service,
+        vector_db=vector_db,
+        decode_workers=2,
+        **kwargs,
+    )
+
+
+class TestBackfillRun:
+    async def test_embeds_pages_in_bulk(self, factory, tmp_path, service, vector_db):
+        await _seed(
+            factory,
+            tmp_path,
+            [("ok", 1, "artistic"), ("missing", 1, "default"), ("ok", 2, None)]
+            + [("bad", 1, "default"), ("ok", 1, "default")],
+        )
+        progress = await _backfill(service, vector_db).run()
+
+        assert (progress.embedded, progress.skipped, progress.failed) == (3, 1, 1)
+        assert progress.total == 5 and progress.pages == 3
+        embedded = await _embedded(factory)
+        assert sorted(embedded) == [1, 3, 5]
+        assert unpack_embedding(embedded[1].embedding).shape == (32,)
+        assert embedded[1].embedding_model == service.model_name
+        # One forward pass and one vector index write per page with images
+        assert service.runtime.batch_count == 3
+        assert vector_db.store_embeddings.await_count == 3
+        assert await _cursors(factory) == []  # finished runs clear their cursor
+
+    async def test_interrupted_run_resumes(self, factory, tmp_path, service, vector_db):
+        await _seed(factory, tmp_path, [("ok", 1, None)] * 5)
+        backfill = _backfill(service, vector_db)
+
+        real_batch = service.generate_embeddings_batch
+        calls = 0
+
+        async def crash_on_second_page(images):
+            nonlocal calls
+            calls += 1
+            if calls == 2:
+                raise KeyboardInterrupt
+            return await real_batch(images)
+
+        with patch.object(service, "generate_embeddings_batch", crash_on_second_page):
+            with pytest.raises(KeyboardInterrupt):
+                await backfill.run()
+
+        [cursor] = await _cursors(factory)
+        assert (cursor.last_id, cursor.embedded) == (2, 2)
+        assert sorted(await _embedded(factory)) == [1, 2]
+
+        progress = await backfill.run()
+        assert progress.resumed_from == 2
+        assert (progress.total, progress.embedded) == (3, 3)
+        assert sorted(await _embedded(factory)) == [1, 2, 3, 4, 5]
+        assert service.runtime.item_count == 5  # nothing embedded twice
+
+    async def test_scope_filters_and_cursor_names(
+        self, factory, tmp_path, service, vector_db
+    ):
+        await _seed(
+            factory,
+            tmp_path,
+            [("ok", 1, "artistic"), ("ok", 2, "artistic"), ("ok", 1, "default")],
+        )
+        user_backfill = _backfill(service, vector_db, user_id=2)
+        artistic_backfill = _backfill(service, vector_db, all_modes=False)
+        assert user_backfill.cursor_name != artistic_backfill.cursor_name
+
+        assert (await user_backfill.run()).embedded == 1
+        assert sorted(await _embedded(factory)) == [2]
+        assert (await artistic_backfill.run()).embedded == 1
+        assert sorted(await _embedded(factory)) == [1, 2]
+
+    async def test_stale_and_hash_embeddings_redone(
+        self, factory, tmp_path, service, vector_db
+    ):
+        await _seed(factory, tmp_path, [("ok", 1, None)] * 3)
+        async with factory() as session:
+            await session.execute(
+                update(Image),
+                [
+                    {"id": 1, "embedding": b"hash", "embedding_model": None},
+                    {"id": 2, "embedding": b"old", "embedding_model": "old-model"},
+                    {
+                        "id": 3,
+                        "embedding": b"cur",
+                        "embedding_model": service.model_name,
+                    },
+                ],
+            )
+            await session.commit()
+
+        progress = await _backfill(service, vector_db).run()
+
+        assert progress.embedded == 2
+        embedded = await _embedded(factory)
+        assert embedded[3].embedding == b"cur"
+        assert {embedded[i].embedding_model for i in (1, 2)} == {service.model_name}
+
+    async def test_deterministic_embeddings_not_written(
+        self, factory, tmp_path, vector_db
+    ):
+        await _seed(factory, tmp_path, [("ok", 1, None)])
+        progress = await _backfill(EmbeddingService(), vector_db).run()
+
+        assert progress.no_model and progress.embedded == 0
+        assert await _embedded(factory) == {}
+
+    async def test_regenerate_missing_embeddings_continues_across_calls(
+        self, factory, tmp_path, service, vector_db
+    ):
+        await _seed(factory, tmp_path, [("ok", 1, "artistic")] * 3)
+        with (
+            patch("src.services.similarity_service.get_vector_db"),
+            patch(
+                "src.services.similarity_service.get_embedding_service",
+                return_value=service,
+            ),
+        ):
+            similarity = SimilarityService()
+        similarity.vector_db = vector_db
+
+        assert await similarity.regenerate_missing_embeddings(limit=2) == 2
+        assert await similarity.regenerate_missing_embeddings(limit=2) == 1
+        assert sorted(await _embedded(factory)) == [1, 2, 3]
+
+
+class TestProgress:
+    def test_rate_and_eta(self):
+        progress = BackfillProgress(total=100, embedded=30, failed=5, skipped=5)
+        progress.started_at -= 10
+
+        assert progress.processed == 40
+        assert progress.images_per_second == pytest.approx(4.0, rel=0.01)
+        assert progress.eta_seconds == pytest.approx(15.0, rel=0.01)
+        assert "40/100 images" in progress.summary()
+
+    def test_eta_unknown_before_first_page(self):
+        assert BackfillProgress(total=10).eta_seconds is None
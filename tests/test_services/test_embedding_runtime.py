@@ -0,0 +1,144 @@
+"""
+Tests for the batched embedding runtime.
+
+Tests cover:
+- Concurrent requests are encoded together, up to max_batch_size per pass
+- A lone request is flushed after max_wait
+- Undecodable images come back as None without failing their batch
+- The worker process returns the same vectors as in-process encoding
+- EmbeddingService routes through the runtime and falls back when it fails
+"""
+
+import asyncio
+from io import BytesIO
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.domain.errors import EmbeddingFailure
+from src.services.embedding_runtime import (
+    EmbeddingRuntime,
+    EmbeddingRuntimeConfig,
+    decode_image,
+)
+from src.services.embedding_service import EmbeddingService
+from src.utils.vector_search import unpack_embedding
+
+HASH_CONFIG = EmbeddingRuntimeConfig(backend="hash", hash_dimension=64)
+
+
+def _jpeg(color, size=(400, 300)):
+    buffer = BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+async def runtime():
+    runtime = EmbeddingRuntime(
+        HASH_CONFIG, max_batch_size=4, max_wait=0.05, use_process=False
+    )
+    yield runtime
+    await runtime.close()
+
+
+class TestBatching:
+    async def test_concurrent_requests_share_forward_passes(self, runtime):
+        texts = [f"text {i}" for i in range(10)]
+        vectors = await asyncio.gather(*(runtime.embed_text(t) for t in texts))
+
+        assert runtime.item_count == 10
+        assert runtime.batch_count == 3  # 4 + 4 + 2
+        assert all(v.shape == (64,) for v in vectors)
+        assert np.allclose([np.linalg.norm(v) for v in vectors], 1.0)
+        assert not np.allclose(vectors[0], vectors[1])
+
+    async def test_lone_request_flushed_after_max_wait(self, runtime):
+        vector = await asyncio.wait_for(runtime.embed_text("alone"), timeout=1)
+        assert vector is not None
+        assert runtime.batch_count == 1
+
+    async def test_same_input_same_vector(self, runtime):
+        first = await runtime.embed_image(_jpeg("red"))
+        second = await runtime.embed_image(_jpeg("red"))
+        assert np.array_equal(first, second)
+
+    async def test_undecodable_image_does_not_fail_batch(self, runtime):
+        results = await runtime.embed_images([_jpeg("red"), b"not an image"])
+        assert results[0] is not None
+        assert results[1] is None
+        assert runtime.batch_count == 1
+
+    async def test_close_cancels_pending(self):
+        runtime = EmbeddingRuntime(HASH_CONFIG, max_wait=10, use_process=False)
+        pending = asyncio.create_task(runtime.embed_text("waits"))
+        await asyncio.sleep(0.1)
+        await runtime.close()
+        with pytest.raises(asyncio.CancelledError):
+            await pending
+
+    def test_decode_image_downscales_to_rgb(self):
+        image = decode_image(_jpeg("blue", size=(1200, 800)), 224)
+        assert image.mode == "RGB"
+        assert max(image.size) <= 224
+
+    def test_unknown_quantization_rejected(self):
+        with pytest.raises(ValueError):
+            EmbeddingRuntime(EmbeddingRuntimeConfig(quantization="fp4"))
+
+
+class TestWorkerProcess:
+    async def test_worker_matches_in_process(self, runtime):
+        worker = EmbeddingRuntime(HASH_CONFIG, max_batch_size=4, max_wait=0.01)
+        try:
+            images = [_jpeg("red"), _jpeg("green")]
+            remote = await asyncio.wait_for(worker.embed_images(images), timeout=60)
+            local = await runtime.embed_images(images)
+        finally:
+            await worker.close()
+
+        assert worker.dimension is None  # closed
+        for a, b in zip(remote, local):
+            assert np.allclose(a, b)
+
+
+class TestEmbeddingServiceRouting:
+    async def test_generate_embedding_uses_runtime(self, runtime):
+        service = EmbeddingService(runtime=runtime)
+        packed = await asyncio.gather(
+            *(service.generate_embedding(_jpeg(c)) for c in ("red", "green", "blue"))
+        )
+
+        assert service.embedding_dim == 64
+        assert service.is_deterministic  # hash backend
+        assert runtime.batch_count == 1
+        assert all(unpack_embedding(p).shape == (64,) for p in packed)
+        assert await service.generate_embedding(b"junk") is None
+
+    async def test_text_batch_uses_runtime(self, runtime):
+        service = EmbeddingService(runtime=runtime)
+        packed = await service.generate_text_embeddings_batch(["a", "b"])
+        single = await service.generate_text_embedding("a")
+
+        assert np.allclose(unpack_embedding(packed[0]), single)
+        assert runtime.item_count == 3
+
+    async def test_text_batch_failure_raises(self, runtime):
+        service = EmbeddingService(runtime=runtime)
+        with patch.object(
+            runtime, "embed_texts", AsyncMock(side_effect=RuntimeError("oom"))
+        ):
+            with pytest.raises(EmbeddingFailure, match="oom"):
+                await service.generate_text_embeddings_batch(["a"])
+
+    async def test_runtime_failure_falls_back_to_deterministic(self, runtime):
+        service = EmbeddingService(runtime=runtime)
+        with patch.object(runtime, "start", AsyncMock(side_effect=OSError("no model"))):
+            await service._load_model()
+
+        assert service.model == "deterministic"
+        assert service.runtime is None
+        assert service.is_deterministic
+        assert await service.generate_embedding(_jpeg("red")) is not None
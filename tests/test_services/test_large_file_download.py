@@ -3,8 +3,13 @@
 TDD: Tests for file size detection, download routing, and Telethon service.
 """
 
+import asyncio
+import json
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 
+import pytest
+
 
 class TestFileSizeDetection:
     """Slice 1: Determine if a file exceeds the Bot API download limit."""
@@ -145,3 +150,193 @@ class TestTelethonServiceDownloadByFileId:
         assert hasattr(service, "download_by_message") or hasattr(
             service, "download_from_url"
         )
+
+
+class _FakeTelethonClient:
+    """Serves a document's bytes through iter_download/download_media."""
+
+    def __init__(self, data: bytes, delay: float = 0.001):
+        self.data = data
+        self.delay = delay
+        self.document = SimpleNamespace(id=42, size=len(data))
+        self.get_entity = AsyncMock(return_value="entity")
+        self.get_messages = AsyncMock(return_value=SimpleNamespace(video=self.document))
+        self.offsets = []
+        self.fail_offsets = set()
+        self.in_flight = 0
+        self.peak = 0
+
+    async def iter_download(self, document, *, offset, request_size, limit, file_size):
+        self.offsets.append(offset)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            for i in range(limit):
+                start = offset + i * request_size
+                if start in self.fail_offsets:
+                    self.fail_offsets.discard(start)
+                    raise ConnectionError("connection reset")
+                await asyncio.sleep(self.delay)
+                chunk = self.data[start : start + request_size]
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            self.in_flight -= 1
+
+    async def download_media(self, document, file, progress_callback=None):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            with open(file, "wb") as f:
+                f.write(self.data)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def small_parts(monkeypatch):
+    """Shrink range sizes so multi-part downloads use a few KB."""
+    import src.services.telethon_service as ts
+
+    monkeypatch.setattr(ts, "REQUEST_SIZE", 1024)
+    monkeypatch.setattr(ts, "PART_SIZE", 4096)
+    monkeypatch.setattr(ts, "PARALLEL_THRESHOLD", 8192)
+
+
+def _service(tmp_path, client, **kwargs):
+    from src.services.telethon_service import TelethonService
+
+    service = TelethonService(partial_dir=tmp_path / "partial", **kwargs)
+    service._client = client
+    return service
+
+
+class TestTelethonParallelDownload:
+    """Concurrent, ranged and resumable Telethon downloads."""
+
+    @pytest.mark.asyncio
+    async def test_ranges_reassembled_in_parallel(self, tmp_path, small_parts):
+        data = bytes(range(256)) * 100  # 25600 bytes -> 7 ranges
+        client = _FakeTelethonClient(data)
+        service = _service(tmp_path, client, parallel_parts=4)
+        progress = []
+
+        result = await service.download_from_url(
+            "https://t.me/chan/1",
+            tmp_path / "out.mp4",
+            progress_callback=lambda cur, total: progress.append((cur, total)),
+        )
+
+        assert result["success"] is True
+        assert (tmp_path / "out.mp4").read_bytes() == data
+        assert sorted(client.offsets) == list(range(0, len(data), 4096))
+        assert 1 < client.peak <= 4
+        assert progress[-1] == (len(data), len(data))
+        assert list((tmp_path / "partial").iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_connection_cap_shared_across_downloads(self, tmp_path, small_parts):
+        client = _FakeTelethonClient(b"x" * 40960)
+        service = _service(tmp_path, client, max_connections=2, parallel_parts=4)
+
+        results = await asyncio.gather(
+            service.download_from_url("https://t.me/chan/1", tmp_path / "a.mp4"),
+            service.download_from_url("https://t.me/chan/2", tmp_path / "b.mp4"),
+        )
+
+        assert [r["success"] for r in results] == [True, True]
+        assert client.peak <= 2
+
+    @pytest.mark.asyncio
+    async def test_downloads_not_serialized(self, tmp_path):
+        client = _FakeTelethonClient(b"small", delay=0.02)
+        service = _service(tmp_path, client)
+
+        await asyncio.gather(
+            service.download_from_url("https://t.me/chan/1", tmp_path / "a.mp4"),
+            service.download_from_url("https://t.me/chan/2", tmp_path / "b.mp4"),
+        )
+
+        assert client.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_entity_resolved_once_per_channel(self, tmp_path):
+        client = _FakeTelethonClient(b"small")
+        service = _service(tmp_path, client)
+
+        await service.download_from_url("https://t.me/Chan/1", tmp_path / "a.mp4")
+        await service.download_from_url("https://t.me/chan/2", tmp_path / "b.mp4")
+
+        client.get_entity.assert_awaited_once_with("Chan")
+
+    @pytest.mark.asyncio
+    async def test_interrupted_download_resumes_missing_ranges(
+        self, tmp_path, small_parts
+    ):
+        data = bytes(range(256)) * 64  # 16384 bytes -> 4 ranges
+        client = _FakeTelethonClient(data)
+        client.fail_offsets = {8192 + 1024}
+        service = _service(tmp_path, client, parallel_parts=2)
+
+        first = await service.download_from_url(
+            "https://t.me/chan/1", tmp_path / "out.mp4"
+        )
+        assert first["success"] is False
+        state = json.loads((tmp_path / "partial" / "42.json").read_text())
+        assert 2 not in state["completed"]
+
+        # A fresh service (as after a restart) only fetches what is missing
+        client.offsets.clear()
+        restarted = _service(tmp_path, client, parallel_parts=2)
+        second = await restarted.download_from_url(
+            "https://t.me/chan/1", tmp_path / "out.mp4"
+        )
+
+        assert second["success"] is True
+        assert (tmp_path / "out.mp4").read_bytes() == data
+        assert sorted(client.offsets) == sorted(
+            4096 * i for i in range(4) if i not in state["completed"]
+        )
+        assert not (tmp_path / "partial" / "42.json").exists()
+
+    @pytest.mark.asyncio
+    async def test_failed_download_discards_partial(self, tmp_path, small_parts):
+        """A non-transient error removes the partial file instead of keeping it."""
+        client = _FakeTelethonClient(bytes(range(256)) * 64)
+        service = _service(tmp_path, client, parallel_parts=2)
+        client.iter_download = MagicMock(side_effect=ValueError("bad document"))
+
+        result = await service.download_from_url(
+            "https://t.me/chan/1", tmp_path / "out.mp4"
+        )
+
+        assert result["success"] is False
+        assert list((tmp_path / "partial").iterdir()) == []
+
+
+class TestPrunePartialDownloads:
+    """Stale partial files are removed at startup."""
+
+    def test_prunes_only_stale_files(self, tmp_path):
+        import os
+        import time
+
+        from src.services.telethon_service import prune_partial_downloads
+
+        stale = [tmp_path / "1.part", tmp_path / "1.json"]
+        fresh = tmp_path / "2.part"
+        for path in [*stale, fresh]:
+            path.write_bytes(b"x")
+        old = time.time() - 72 * 3600
+        for path in stale:
+            os.utime(path, (old, old))
+
+        assert prune_partial_downloads(tmp_path, max_age_hours=48) == 2
+        assert list(tmp_path.iterdir()) == [fresh]
+
+    def test_missing_dir_is_noop(self, tmp_path):
+        from src.services.telethon_service import prune_partial_downloads
+
+        assert prune_partial_downloads(tmp_path / "missing") == 0
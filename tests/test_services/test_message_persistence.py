@@ -319,3 +319,216 @@ class TestDuplicateHandling:
 
         # Both calls should have attempted to add
         assert mock_session.add.call_count == 2
+
+
+# =============================================================================
+# Tests: Write-behind batching writer
+# =============================================================================
+
+
+@pytest.fixture
+async def sqlite_db():
+    """In-memory SQLite DB with one chat (telegram id 12345); yields a session CM."""
+    from contextlib import asynccontextmanager
+
+    from sqlalchemy.ext.asyncio import (
+        AsyncSession,
+        async_sessionmaker,
+        create_async_engine,
+    )
+
+    from src.models.base import Base
+    from src.models.chat import Chat
+    from src.models.user import User
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with factory() as session:
+        user = User(user_id=99, username="tester", first_name="Test")
+        session.add(user)
+        await session.flush()
+        session.add(Chat(chat_id=12345, user_id=user.id, chat_type="private"))
+        await session.commit()
+
+    @asynccontextmanager
+    async def fake_get_db_session():
+        async with factory() as session:
+            yield session
+
+    yield fake_get_db_session
+    await engine.dispose()
+
+
+async def _count_messages(get_session):
+    from sqlalchemy import func, select
+
+    from src.models.message import Message
+
+    async with get_session() as session:
+        return (await session.execute(select(func.count(Message.id)))).scalar()
+
+
+class TestMessagePersistenceWriter:
+    """Write-behind writer batches messages into multi-row inserts."""
+
+    @pytest.mark.asyncio
+    async def test_burst_written_as_single_batch(self, sqlite_db):
+        """20 queued messages are flushed as one transaction."""
+        from src.services.message_persistence_service import (
+            MessagePersistenceWriter,
+        )
+
+        writer = MessagePersistenceWriter(flush_interval=10.0, max_batch_size=50)
+        with patch(
+            "src.services.message_persistence_service.get_db_session", sqlite_db
+        ):
+            for i in range(20):
+                writer.enqueue(12345, 99, 100 + i, f"msg {i}", "text")
+            assert writer.pending_count == 20
+
+            await writer.stop(timeout=5.0)
+
+            assert await _count_messages(sqlite_db) == 20
+
+        stats = writer.get_stats()
+        assert stats["persisted"] == 20
+        assert stats["batches"] == 1
+        assert stats["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_full_batch_triggers_flush(self, sqlite_db):
+        """Reaching max_batch_size flushes without waiting for the interval."""
+        import asyncio
+
+        from src.services.message_persistence_service import (
+            MessagePersistenceWriter,
+        )
+
+        writer = MessagePersistenceWriter(flush_interval=60.0, max_batch_size=5)
+        with patch(
+            "src.services.message_persistence_service.get_db_session", sqlite_db
+        ):
+            for i in range(5):
+                writer.enqueue(12345, 99, 200 + i, "x", "text")
+
+            for _ in range(50):
+                if writer.persisted_count == 5:
+                    break
+                await asyncio.sleep(0.01)
+
+            assert writer.persisted_count == 5
+            await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_interval_triggers_flush(self, sqlite_db):
+        """A partial batch is flushed once the flush interval elapses."""
+        import asyncio
+
+        from src.services.message_persistence_service import (
+            MessagePersistenceWriter,
+        )
+
+        writer = MessagePersistenceWriter(flush_interval=0.05, max_batch_size=50)
+        with patch(
+            "src.services.message_persistence_service.get_db_session", sqlite_db
+        ):
+            writer.enqueue(12345, 99, 300, "hello", "text")
+            await asyncio.sleep(0.3)
+
+            assert await _count_messages(sqlite_db) == 1
+            await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_chat_id_lookup_is_cached(self, sqlite_db):
+        """Resolved chat IDs are cached across batches."""
+        from src.services.message_persistence_service import (
+            MessagePersistenceWriter,
+        )
+
+        writer = MessagePersistenceWriter(flush_interval=10.0)
+        with patch(
+            "src.services.message_persistence_service.get_db_session", sqlite_db
+        ):
+            writer.enqueue(12345, 99, 400, "a", "text")
+            await writer.flush()
+            assert writer.get_stats()["cached_chats"] == 1
+
+            with patch.object(writer, "_chat_ids", wraps=writer._chat_ids) as cache:
+                writer.enqueue(12345, 99, 401, "b", "text")
+                await writer.flush()
+                cache.set.assert_not_called()
+
+            await writer.stop()
+            assert await _count_messages(sqlite_db) == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_chat_skipped(self, sqlite_db):
+        """Messages for chats not in the DB are skipped, not errors."""
+        from src.services.message_persistence_service import (
+            MessagePersistenceWriter,
+        )
+
+        writer = MessagePersistenceWriter(flush_interval=10.0)
+        with patch(
+            "src.services.message_persistence_service.get_db_session", sqlite_db
+        ):
+            writer.enqueue(12345, 99, 500, "known", "text")
+            writer.enqueue(55555, 99, 501, "unknown", "text")
+            await writer.stop()
+
+            assert await _count_messages(sqlite_db) == 1
+        assert writer.failed_count == 0
+
+    @pytest.mark.asyncio
+    async def test_db_error_is_swallowed(self):
+        """A failing batch is counted and logged, never raised."""
+        from contextlib import asynccontextmanager
+
+        from src.services.message_persistence_service import (
+            MessagePersistenceWriter,
+        )
+
+        @asynccontextmanager
+        async def broken_session():
+            raise RuntimeError("DB is locked")
+            yield  # pragma: no cover
+
+        writer = MessagePersistenceWriter(flush_interval=10.0)
+        with patch(
+            "src.services.message_persistence_service.get_db_session", broken_session
+        ):
+            writer.enqueue(12345, 99, 600, "x", "text")
+            await writer.stop()
+
+        assert writer.failed_count == 1
+        assert writer.pending_count == 0
+
+    @pytest.mark.asyncio
+    async def test_queue_bound_drops_excess(self):
+        """Messages beyond max_queue_size are dropped rather than buffered."""
+        from src.services.message_persistence_service import (
+            MessagePersistenceWriter,
+        )
+
+        writer = MessagePersistenceWriter(
+            flush_interval=10.0, max_batch_size=100, max_queue_size=3
+        )
+        with patch.object(writer, "_write_batch", new_callable=AsyncMock):
+            results = [writer.enqueue(12345, 99, i, "x", "text") for i in range(5)]
+            assert results == [True, True, True, False, False]
+            assert writer.dropped_count == 2
+            await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_enqueue_after_stop_is_rejected(self):
+        """Once stopped, the writer refuses new messages."""
+        from src.services.message_persistence_service import (
+            MessagePersistenceWriter,
+        )
+
+        writer = MessagePersistenceWriter()
+        await writer.stop()
+        assert writer.enqueue(12345, 99, 1, "late", "text") is False
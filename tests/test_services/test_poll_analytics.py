@@ -0,0 +1,230 @@
+"""
+Tests for SQL-side poll analytics.
+
+Tests cover:
+- Hourly rollup built from existing rows on first creation
+- Rollup triggers follow inserts, updates and deletes
+- Statistics and trends for short windows (raw GROUP BY) and long
+  windows (rollup) agree
+- Scheduler's sent-today check reads the template_id column
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import delete, insert, text, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.core.database import Base
+from src.models.poll_response import PollResponse
+from src.services import poll_analytics
+from src.services.poll_analytics import (
+    get_poll_statistics,
+    get_poll_trends,
+    initialize_poll_rollup,
+)
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'polls.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    """Patch get_db_session onto the temp DB; the rollup starts disabled."""
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def fake_get_db_session():
+        async with factory() as session:
+            yield session
+
+    with (
+        patch("src.services.poll_analytics.get_db_session", fake_get_db_session),
+        patch("src.services.polling_service.get_db_session", fake_get_db_session),
+        patch.object(poll_analytics, "_rollup_ready", False),
+    ):
+        yield engine
+
+
+_next_id = iter(range(1, 10_000))
+
+
+async def _add(engine, answer, created_at, poll_type="emotion", **kw):
+    response_id = next(_next_id)
+    async with engine.begin() as conn:
+        await conn.execute(
+            insert(PollResponse).values(
+                id=response_id,
+                chat_id=kw.get("chat_id", 1),
+                poll_id=f"poll-{response_id}",
+                template_id=kw.get("template_id"),
+                question="Q?",
+                options=[answer],
+                selected_option_id=0,
+                selected_option_text=answer,
+                poll_type=poll_type,
+                poll_category=kw.get("poll_category"),
+                created_at=created_at,
+                hour_of_day=created_at.hour,
+                day_of_week=created_at.weekday(),
+            )
+        )
+    return response_id
+
+
+async def _rollup(engine):
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            text(
+                "SELECT hour_start, poll_type, poll_category, selected_option_text, "
+                "response_count FROM poll_response_hourly ORDER BY 1, 2, 4"
+            )
+        )
+        return [tuple(row) for row in result]
+
+
+# Three days ago at 10:15 UTC, inside every window below
+BASE = (datetime.utcnow() - timedelta(days=3)).replace(
+    hour=10, minute=15, second=0, microsecond=0
+)
+
+
+class TestRollup:
+    @pytest.mark.asyncio
+    async def test_built_from_existing_rows(self, db):
+        await _add(db, "Calm", BASE)
+        await _add(db, "Calm", BASE + timedelta(minutes=30))
+        await _add(db, "Tired", BASE, poll_category="health")
+
+        assert await initialize_poll_rollup(db) is True
+        assert await initialize_poll_rollup(db) is False
+
+        hour = BASE.strftime("%Y-%m-%d %H:00:00.000000")
+        assert await _rollup(db) == [
+            (hour, "emotion", "", "Calm", 2),
+            (hour, "emotion", "health", "Tired", 1),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_triggers_follow_changes(self, db):
+        await initialize_poll_rollup(db)
+        first = await _add(db, "Calm", BASE)
+        await _add(db, "Calm", BASE + timedelta(minutes=5))
+        assert [row[-1] for row in await _rollup(db)] == [2]
+
+        async with db.begin() as conn:
+            await conn.execute(
+                update(PollResponse)
+                .where(PollResponse.id == first)
+                .values(selected_option_text="Anxious")
+            )
+        assert [(row[3], row[4]) for row in await _rollup(db)] == [
+            ("Anxious", 1),
+            ("Calm", 1),
+        ]
+
+        async with db.begin() as conn:
+            await conn.execute(delete(PollResponse))
+        assert await _rollup(db) == []
+
+    @pytest.mark.asyncio
+    async def test_processed_flag_updates_do_not_touch_rollup(self, db):
+        await initialize_poll_rollup(db)
+        await _add(db, "Calm", BASE)
+        async with db.begin() as conn:
+            await conn.execute(update(PollResponse).values(processed_for_trails=1))
+        assert [row[-1] for row in await _rollup(db)] == [1]
+
+
+class TestStatistics:
+    @pytest.fixture
+    async def responses(self, db):
+        await _add(db, "Calm", BASE, poll_category="health")
+        await _add(db, "Calm", BASE + timedelta(hours=1), poll_category="health")
+        await _add(db, "Tired", BASE + timedelta(days=1), poll_category="health")
+        await _add(db, "Ship it", BASE, poll_type="decision", poll_category="work")
+        await _add(db, "Old", BASE - timedelta(days=200))
+        await _add(db, "Other chat", BASE, chat_id=2)
+        return db
+
+    @pytest.mark.asyncio
+    async def test_short_window(self, responses):
+        stats = await get_poll_statistics(1, days=7)
+
+        assert stats["total_responses"] == 4
+        assert stats["by_type"] == {"emotion": 3, "decision": 1}
+        assert stats["by_category"] == {"health": 3, "work": 1}
+        assert stats["by_hour"] == [(10, 3), (11, 1)]
+        assert sum(stats["by_day"].values()) == 4
+        assert stats["avg_per_day"] == pytest.approx(4 / 7)
+
+    @pytest.mark.asyncio
+    async def test_long_window_uses_rollup(self, responses):
+        raw = await get_poll_statistics(1, days=365)
+        await initialize_poll_rollup(responses)
+
+        # Raw rows are no longer consulted for long windows
+        async with responses.begin() as conn:
+            await conn.execute(text("DROP TRIGGER poll_response_hourly_ad"))
+            await conn.execute(delete(PollResponse).where(PollResponse.chat_id == 1))
+
+        rolled = await get_poll_statistics(1, days=365)
+        assert rolled == raw
+        assert rolled["total_responses"] == 5
+        assert (await get_poll_statistics(1, days=7))["total_responses"] == 0
+
+    @pytest.mark.asyncio
+    async def test_empty(self, db):
+        stats = await get_poll_statistics(1, days=7)
+        assert stats["total_responses"] == 0
+        assert "message" in stats
+
+    @pytest.mark.asyncio
+    async def test_trends(self, responses):
+        trends = await get_poll_trends(1, days=7)
+
+        assert trends["total_responses"] == 4
+        assert trends["type_counts"] == {"emotion": 3, "decision": 1}
+        assert trends["top_responses"]["emotion"] == [("Calm", 2), ("Tired", 1)]
+        assert trends["hour_distribution"] == {10: 3, 11: 1}
+        assert trends["date_range"]["start"] == BASE.isoformat()
+
+        await initialize_poll_rollup(responses)
+        rolled = await get_poll_trends(1, days=365)
+        assert rolled["top_responses"]["emotion"] == [
+            ("Calm", 2),
+            ("Old", 1),
+            ("Tired", 1),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_trends_empty(self, db):
+        assert await get_poll_trends(1, days=7) == {"error": "No responses found"}
+
+
+class TestSentTemplatesToday:
+    @pytest.mark.asyncio
+    async def test_reads_template_id_column(self, db):
+        from src.services.polling_service import PollingService
+
+        now = datetime.utcnow()
+        await _add(db, "a", now, template_id="emotion_current")
+        await _add(db, "b", now, template_id="emotion_current")
+        await _add(db, "c", now, template_id="focus_check")
+        await _add(db, "d", now)
+        await _add(db, "e", now - timedelta(days=2), template_id="stale")
+        await _add(db, "f", now, template_id="other_chat", chat_id=2)
+
+        service = PollingService(embedding_writer=object())
+        assert await service.get_sent_templates_today(1) == {
+            "emotion_current",
+            "focus_check",
+        }
@@ -0,0 +1,341 @@
+"""
+Tests for poll response embeddings.
+
+Tests cover:
+- Answers embedded in one batched model call and one UPDATE
+- Deterministic (hash) embeddings are never stored
+- Failed batches leave rows NULL for the startup backfill
+- Queue limits, bounded drain on stop and enqueue_missing()
+- JSON embeddings migrated to float32 blobs
+- Similar answers, free-text search and clustering over time
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.core.database import Base
+from src.domain.errors import EmbeddingFailure
+from src.models.poll_response import PollResponse
+from src.services.poll_embeddings import (
+    PollEmbeddingWriter,
+    cluster_responses,
+    find_similar_responses,
+    migrate_json_embeddings,
+    poll_embedding_text,
+    search_responses,
+)
+from src.utils.vector_search import pack_embedding, unpack_embedding
+
+VECTORS = {
+    "tired": [1.0, 0.0, 0.0],
+    "exhausted": [0.95, 0.1, 0.0],
+    "sleepy": [0.9, 0.0, 0.2],
+    "great": [0.0, 1.0, 0.0],
+    "focused": [0.0, 0.0, 1.0],
+}
+
+
+class FakeProvider:
+    """Embeds the answer word after 'A: ' using VECTORS."""
+
+    is_deterministic = False
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    async def generate_text_embeddings_batch(self, texts):
+        self.calls.append(list(texts))
+        if self.fail:
+            raise EmbeddingFailure("model crashed")
+        return [
+            (
+                pack_embedding(VECTORS[t.rsplit(" ", 1)[-1]])
+                if t.rsplit(" ", 1)[-1] in VECTORS
+                else None
+            )
+            for t in texts
+        ]
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'polls.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    """Patch the service's get_db_session onto the temp DB."""
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def fake_get_db_session():
+        async with factory() as session:
+            yield session
+
+    with patch("src.services.poll_embeddings.get_db_session", fake_get_db_session):
+        yield engine
+
+
+async def _add_response(engine, response_id, answer, chat_id=1, embedding=None, **kw):
+    async with engine.begin() as conn:
+        await conn.execute(
+            insert(PollResponse).values(
+                id=response_id,
+                chat_id=chat_id,
+                poll_id=f"poll-{response_id}",
+                question="How do you feel?",
+                options=[answer],
+                selected_option_id=0,
+                selected_option_text=answer,
+                poll_type=kw.get("poll_type", "emotion"),
+                created_at=kw.get("created_at", datetime.utcnow()),
+                sentiment_score=kw.get("sentiment_score"),
+                embedding=embedding,
+            )
+        )
+
+
+async def _embeddings(engine):
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            select(PollResponse.id, PollResponse.embedding).order_by(PollResponse.id)
+        )
+        return {
+            row_id: (None if blob is None else unpack_embedding(blob).tolist())
+            for row_id, blob in result
+        }
+
+
+class TestPollEmbeddingWriter:
+    @pytest.mark.asyncio
+    async def test_batches_answers_into_one_call(self, db):
+        for i, answer in enumerate(["tired", "great", "focused"], 1):
+            await _add_response(db, i, answer)
+        provider = FakeProvider()
+        writer = PollEmbeddingWriter(flush_interval=60, embedding_provider=provider)
+
+        for i, answer in enumerate(["tired", "great", "focused"], 1):
+            assert writer.enqueue(i, poll_embedding_text("How do you feel?", answer))
+        assert writer.pending_count == 3
+        await writer.stop(timeout=5)
+
+        assert provider.calls == [
+            [
+                "Q: How do you feel?\nA: tired",
+                "Q: How do you feel?\nA: great",
+                "Q: How do you feel?\nA: focused",
+            ]
+        ]
+        embeddings = await _embeddings(db)
+        assert embeddings[2] == pytest.approx(VECTORS["great"])
+        assert writer.get_stats()["embedded"] == 3
+        assert writer.get_stats()["batches"] == 1
+
+    @pytest.mark.asyncio
+    async def test_flushes_after_interval(self, db):
+        await _add_response(db, 1, "tired")
+        writer = PollEmbeddingWriter(
+            flush_interval=0.01, embedding_provider=FakeProvider()
+        )
+        writer.enqueue(1, "A: tired")
+        for _ in range(100):
+            if writer.embedded_count:
+                break
+            await asyncio.sleep(0.01)
+        assert (await _embeddings(db))[1] == pytest.approx(VECTORS["tired"])
+        await writer.stop(timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_full_batch_split(self, db):
+        for i in range(1, 6):
+            await _add_response(db, i, "tired")
+        provider = FakeProvider()
+        writer = PollEmbeddingWriter(
+            flush_interval=60, max_batch_size=2, embedding_provider=provider
+        )
+        for i in range(1, 6):
+            writer.enqueue(i, "A: tired")
+        await writer.stop(timeout=5)
+        assert all(len(call) <= 2 for call in provider.calls)
+        assert sum(len(call) for call in provider.calls) == 5
+        assert all(v is not None for v in (await _embeddings(db)).values())
+
+    @pytest.mark.asyncio
+    async def test_deterministic_provider_stores_nothing(self, db):
+        await _add_response(db, 1, "tired")
+        provider = FakeProvider()
+        provider.is_deterministic = True
+        writer = PollEmbeddingWriter(flush_interval=60, embedding_provider=provider)
+        writer.enqueue(1, "A: tired")
+        await writer.stop(timeout=5)
+
+        assert provider.calls == []
+        assert (await _embeddings(db))[1] is None
+        assert writer.skipped_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failures_leave_rows_null(self, db):
+        await _add_response(db, 1, "tired")
+        await _add_response(db, 2, "unknown")
+        writer = PollEmbeddingWriter(
+            flush_interval=60, embedding_provider=FakeProvider()
+        )
+        writer.enqueue(1, "A: tired")
+        writer.enqueue(2, "A: unknown")
+        await writer.stop(timeout=5)
+        assert (await _embeddings(db))[2] is None
+        assert writer.failed_count == 1
+
+        crashing = PollEmbeddingWriter(
+            flush_interval=60, embedding_provider=FakeProvider(fail=True)
+        )
+        crashing.enqueue(2, "A: unknown")
+        await crashing.stop(timeout=5)
+        assert crashing.failed_count == 1
+
+    @pytest.mark.asyncio
+    async def test_queue_limit_and_stopped_writer_drop(self, db):
+        writer = PollEmbeddingWriter(
+            flush_interval=60, max_queue_size=1, embedding_provider=FakeProvider()
+        )
+        assert writer.enqueue(1, "A: tired")
+        assert not writer.enqueue(2, "A: tired")
+        await writer.stop(timeout=5)
+        assert not writer.enqueue(3, "A: tired")
+        assert writer.dropped_count == 2
+
+    @pytest.mark.asyncio
+    async def test_enqueue_missing(self, db):
+        await _add_response(db, 1, "tired")
+        await _add_response(db, 2, "great", embedding=pack_embedding([0, 1, 0]))
+        await _add_response(db, 3, "focused")
+        writer = PollEmbeddingWriter(
+            flush_interval=60, embedding_provider=FakeProvider()
+        )
+        assert await writer.enqueue_missing() == 2
+        await writer.stop(timeout=5)
+        embeddings = await _embeddings(db)
+        assert embeddings[1] == pytest.approx(VECTORS["tired"])
+        assert embeddings[3] == pytest.approx(VECTORS["focused"])
+
+
+class TestMigration:
+    @pytest.mark.asyncio
+    async def test_json_rows_become_blobs(self, engine):
+        await _add_response(engine, 1, "a")
+        await _add_response(engine, 2, "b")
+        await _add_response(engine, 3, "c", embedding=pack_embedding([1, 2]))
+        await _add_response(engine, 4, "d")
+        async with engine.begin() as conn:
+            await conn.execute(
+                text("UPDATE poll_responses SET embedding = :v WHERE id = 1"),
+                {"v": json.dumps([0.25, -0.5, 1.0])},
+            )
+            await conn.execute(
+                text("UPDATE poll_responses SET embedding = 'null' WHERE id = 2")
+            )
+
+        with patch("src.services.poll_embeddings._MIGRATION_CHUNK", 1):
+            assert await migrate_json_embeddings(engine) == 1
+        assert await migrate_json_embeddings(engine) == 0
+
+        embeddings = await _embeddings(engine)
+        assert embeddings == {
+            1: [0.25, -0.5, 1.0],
+            2: None,
+            3: [1.0, 2.0],
+            4: None,
+        }
+
+
+class TestSearch:
+    @pytest.fixture
+    async def answers(self, db):
+        now = datetime.utcnow()
+        rows = [
+            (1, "tired", 1, now - timedelta(days=20), -0.5),
+            (2, "exhausted", 1, now - timedelta(days=10), -0.7),
+            (3, "sleepy", 1, now - timedelta(days=1), None),
+            (4, "great", 1, now - timedelta(days=2), 0.9),
+            (5, "focused", 1, now - timedelta(days=60), 0.5),
+            (6, "tired", 2, now, -0.5),
+        ]
+        for response_id, answer, chat_id, created_at, sentiment in rows:
+            await _add_response(
+                db,
+                response_id,
+                answer,
+                chat_id=chat_id,
+                created_at=created_at,
+                sentiment_score=sentiment,
+                embedding=pack_embedding(VECTORS[answer]),
+            )
+        await _add_response(db, 7, "pending", created_at=now)
+        return db
+
+    @pytest.mark.asyncio
+    async def test_find_similar_responses(self, answers):
+        similar = await find_similar_responses(1, limit=5, threshold=0.5)
+        assert [r["id"] for r in similar] == [2, 3]
+        assert similar[0]["answer"] == "exhausted"
+        assert similar[0]["similarity"] > similar[1]["similarity"]
+
+    @pytest.mark.asyncio
+    async def test_find_similar_without_embedding(self, answers):
+        assert await find_similar_responses(7) == []
+        assert await find_similar_responses(999) == []
+
+    @pytest.mark.asyncio
+    async def test_search_responses(self, answers):
+        results = await search_responses(
+            1, "A: great", threshold=0.5, embedding_provider=FakeProvider()
+        )
+        assert [r["id"] for r in results] == [4]
+
+        deterministic = FakeProvider()
+        deterministic.is_deterministic = True
+        assert (
+            await search_responses(1, "A: great", embedding_provider=deterministic)
+            == []
+        )
+        assert (
+            await search_responses(
+                1, "A: great", embedding_provider=FakeProvider(fail=True)
+            )
+            == []
+        )
+
+    @pytest.mark.asyncio
+    async def test_cluster_responses(self, answers):
+        clusters = await cluster_responses(1, days=30, threshold=0.9)
+
+        assert [c["size"] for c in clusters] == [3, 1]
+        fatigue = clusters[0]
+        assert fatigue["response_ids"] == [1, 2, 3]
+        assert fatigue["representative"]["answer"] == "tired"
+        assert fatigue["poll_types"] == {"emotion": 3}
+        assert sum(fatigue["by_period"].values()) == 3
+        assert fatigue["avg_sentiment"] == pytest.approx(-0.6)
+        assert fatigue["first_seen"] < fatigue["last_seen"]
+
+    @pytest.mark.asyncio
+    async def test_cluster_periods(self, answers):
+        [fatigue, _] = await cluster_responses(1, days=30, threshold=0.9, period="day")
+        assert len(fatigue["by_period"]) == 3
+        assert all(len(key) == 10 for key in fatigue["by_period"])
+
+
+def test_poll_embedding_text():
+    assert poll_embedding_text("Mood?", "Calm") == "Q: Mood?\nA: Calm"
@@ -3,11 +3,11 @@ Tests that poll_service raises typed domain errors
 instead of silently returning None/False.
 """
 
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from src.domain.errors import EmbeddingFailure, PollNotTracked, PollSendFailure
+from src.domain.errors import PollNotTracked, PollSendFailure
 
 # ---------------------------------------------------------------------------
 # send_poll
@@ -20,13 +20,13 @@ class TestSendPollErrors:
     @pytest.mark.asyncio
     async def test_raises_poll_send_failure_on_telegram_error(self):
         """When poll_sender.send_poll raises, wrap in PollSendFailure."""
-        mock_embedding = MagicMock()
+        mock_writer = MagicMock()
         mock_event_bus = MagicMock()
 
         from src.services.poll_service import PollService
 
         service = PollService(
-            embedding_provider=mock_embedding,
+            embedding_writer=mock_writer,
             event_bus=mock_event_bus,
         )
 
@@ -55,16 +55,19 @@ class TestHandlePollAnswerErrors:
     @pytest.mark.asyncio
     async def test_raises_poll_not_tracked(self):
         """Unknown poll_id raises PollNotTracked."""
-        mock_embedding = MagicMock()
+        mock_writer = MagicMock()
         mock_event_bus = MagicMock()
 
         from src.services.poll_service import PollService
 
+        mock_store = AsyncMock()
+        mock_store.get.return_value = None
+
         service = PollService(
-            embedding_provider=mock_embedding,
+            embedding_writer=mock_writer,
             event_bus=mock_event_bus,
+            poll_store=mock_store,
         )
-        # _poll_tracker is empty, so any poll_id is untracked
 
         with pytest.raises(PollNotTracked) as exc_info:
             await service.handle_poll_answer(
@@ -73,25 +76,19 @@ class TestHandlePollAnswerErrors:
         assert exc_info.value.poll_id == "unknown_id"
 
     @pytest.mark.asyncio
-    async def test_raises_embedding_failure(self):
-        """When embedding generation fails, raise EmbeddingFailure."""
-        mock_embedding = MagicMock()
-        mock_embedding.generate_embedding = AsyncMock(
-            side_effect=RuntimeError("model not loaded")
-        )
+    async def test_embedding_deferred_to_writer(self):
+        """The answer is stored without waiting for an embedding."""
+        mock_writer = MagicMock()
         mock_event_bus = MagicMock()
+        mock_event_bus.publish = AsyncMock()
 
         from src.services.poll_service import PollService
 
-        service = PollService(
-            embedding_provider=mock_embedding,
-            event_bus=mock_event_bus,
-        )
-        # Seed the tracker with a known poll
-        service._poll_tracker["poll_123"] = {
+        mock_store = AsyncMock()
+        mock_store.get.return_value = {
             "template_id": 1,
             "chat_id": 100,
-            "sent_at": MagicMock(),
+            "sent_at": "2026-01-15T10:00:00",
             "question": "How do you feel?",
             "options": ["Great", "OK", "Bad"],
             "poll_type": "emotion",
@@ -100,8 +97,30 @@ class TestHandlePollAnswerErrors:
             "context_data": {},
         }
 
-        with pytest.raises(EmbeddingFailure) as exc_info:
-            await service.handle_poll_answer(
+        service = PollService(
+            embedding_writer=mock_writer,
+            event_bus=mock_event_bus,
+            poll_store=mock_store,
+        )
+
+        mock_session = AsyncMock()
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.__aexit__ = AsyncMock(return_value=False)
+        mock_session.add = MagicMock()
+
+        async def assign_id():
+            mock_session.add.call_args[0][0].id = 7
+
+        mock_session.flush = AsyncMock(side_effect=assign_id)
+
+        with patch(
+            "src.services.poll_service.get_db_session", return_value=mock_session
+        ):
+            assert await service.handle_poll_answer(
                 poll_id="poll_123", user_id=1, selected_option_id=0
             )
-        assert "model not loaded" in str(exc_info.value)
+
+        stored = mock_session.add.call_args[0][0]
+        assert stored.embedding is None
+        mock_store.unregister.assert_awaited_once_with("poll_123")
+        mock_writer.enqueue.assert_called_once_with(7, "Q: How do you feel?\nA: Great")
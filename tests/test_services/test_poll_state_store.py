@@ -0,0 +1,129 @@
+"""
+Tests for the durable poll state store.
+
+Tests cover:
+- register/get/unregister round trip
+- Polls survive a new store instance (restart)
+- Kind filtering, re-register upsert and TTL expiry
+- purge_expired() removes expired rows
+- Cached lookups skip the database
+"""
+
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.core.database import Base
+from src.models.tracked_poll import TrackedPoll
+from src.services.poll_state_store import (
+    KIND_POLL,
+    KIND_SCHEDULED,
+    KIND_TRAIL,
+    PollStateStore,
+)
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'polls.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    """Patch the store's get_db_session onto the temp DB, counting sessions."""
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    sessions = []
+
+    @asynccontextmanager
+    async def fake_get_db_session():
+        sessions.append(1)
+        async with factory() as session:
+            yield session
+
+    with patch("src.services.poll_state_store.get_db_session", fake_get_db_session):
+        yield engine, sessions
+
+
+async def _row_count(engine):
+    async with engine.connect() as conn:
+        result = await conn.execute(select(func.count()).select_from(TrackedPoll))
+        return result.scalar()
+
+
+PAYLOAD = {"question": "Mood?", "options": ["Calm", "Tired"], "chat_id": 1}
+
+
+class TestPollStateStore:
+    @pytest.mark.asyncio
+    async def test_round_trip(self, db):
+        store = PollStateStore()
+        await store.register("p1", KIND_SCHEDULED, 1, PAYLOAD)
+
+        assert await store.get("p1") == PAYLOAD
+        assert await store.get("p1", KIND_SCHEDULED) == PAYLOAD
+        assert await store.get("missing") is None
+
+        assert await store.unregister("p1") is True
+        assert await store.unregister("p1") is False
+        assert await store.get("p1") is None
+
+    @pytest.mark.asyncio
+    async def test_survives_restart(self, db):
+        engine, _ = db
+        await PollStateStore().register("p1", KIND_TRAIL, 1, PAYLOAD)
+
+        restarted = PollStateStore()
+        assert await restarted.get("p1", KIND_TRAIL) == PAYLOAD
+        assert await _row_count(engine) == 1
+
+    @pytest.mark.asyncio
+    async def test_kind_filter(self, db):
+        store = PollStateStore()
+        await store.register("p1", KIND_POLL, 1, PAYLOAD)
+        assert await store.get("p1", KIND_TRAIL) is None
+        assert await PollStateStore().get("p1", KIND_TRAIL) is None
+        assert await store.get("p1", KIND_POLL) == PAYLOAD
+
+    @pytest.mark.asyncio
+    async def test_re_register_replaces(self, db):
+        engine, _ = db
+        store = PollStateStore()
+        await store.register("p1", KIND_POLL, 1, PAYLOAD)
+        await store.register("p1", KIND_TRAIL, 2, {"field": "status"})
+
+        assert await _row_count(engine) == 1
+        assert await PollStateStore().get("p1") == {"field": "status"}
+
+    @pytest.mark.asyncio
+    async def test_expired_polls_ignored_and_purged(self, db):
+        engine, _ = db
+        store = PollStateStore()
+        await store.register("old", KIND_POLL, 1, PAYLOAD, ttl=timedelta(seconds=-1))
+        await store.register("new", KIND_POLL, 1, PAYLOAD)
+
+        assert await store.get("old") is None
+        assert await PollStateStore().get("old") is None
+
+        assert await store.purge_expired() == 1
+        assert await _row_count(engine) == 1
+        assert await store.get("new") == PAYLOAD
+
+    @pytest.mark.asyncio
+    async def test_cached_reads_skip_database(self, db):
+        _, sessions = db
+        store = PollStateStore()
+        await store.register("p1", KIND_POLL, 1, PAYLOAD)
+        sessions.clear()
+
+        first = await store.get("p1")
+        first["question"] = "mutated"
+        assert (await store.get("p1"))["question"] == "Mood?"
+        assert sessions == []
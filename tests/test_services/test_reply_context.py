@@ -12,6 +12,7 @@ Tests cover:
 """
 
 from datetime import datetime, timedelta
+from unittest.mock import patch
 
 import pytest
 
@@ -1347,3 +1348,299 @@ class TestSessionMessagesCleanup:
 
         stats = service.get_stats()
         assert stats["sessions_tracked"] <= 5
+
+
+# =============================================================================
+# Secondary Index Tests
+# =============================================================================
+
+
+class TestSecondaryIndexes:
+    """Per-(chat, type), per-session and expiry indexes stay in sync."""
+
+    def test_get_session_context_returns_latest(self):
+        """Session lookup resolves to the newest message of that session."""
+        service = ReplyContextService()
+
+        for message_id in (100, 101):
+            service.track_message(
+                message_id=message_id,
+                chat_id=200,
+                user_id=300,
+                message_type=MessageType.CLAUDE_RESPONSE,
+                session_id="session_123",
+            )
+
+        context = service.get_session_context("session_123")
+        assert context is not None
+        assert context.message_id == 101
+        assert context.chat_id == 200
+
+    def test_recent_by_type_scoped_to_chat(self):
+        """Recency lookup only sees the requested chat and type."""
+        service = ReplyContextService()
+
+        service.track_message(
+            message_id=1, chat_id=200, user_id=1, message_type=MessageType.USER_TEXT
+        )
+        service.track_message(
+            message_id=2,
+            chat_id=200,
+            user_id=1,
+            message_type=MessageType.VOICE_TRANSCRIPTION,
+        )
+        service.track_message(
+            message_id=3,
+            chat_id=201,
+            user_id=1,
+            message_type=MessageType.VOICE_TRANSCRIPTION,
+        )
+
+        context = service.get_recent_context_by_type(
+            200, MessageType.VOICE_TRANSCRIPTION
+        )
+        assert context.message_id == 2
+        assert service.get_recent_context_by_type(200, MessageType.BOT_INFO) is None
+
+    def test_recent_by_type_skips_stale_contexts(self):
+        """Contexts older than the window are not returned."""
+        service = ReplyContextService()
+
+        ctx = service.track_message(
+            message_id=1,
+            chat_id=200,
+            user_id=1,
+            message_type=MessageType.VOICE_TRANSCRIPTION,
+        )
+        ctx.created_at = datetime.now() - timedelta(minutes=30)
+
+        assert (
+            service.get_recent_context_by_type(
+                200, MessageType.VOICE_TRANSCRIPTION, max_age_minutes=10
+            )
+            is None
+        )
+
+    def test_eviction_cleans_type_index(self):
+        """LRU eviction removes the entry from the (chat, type) index."""
+        service = ReplyContextService(max_cache_size=2)
+
+        for message_id in range(3):
+            service.track_message(
+                message_id=message_id,
+                chat_id=200,
+                user_id=1,
+                message_type=MessageType.USER_TEXT,
+            )
+
+        assert list(service._type_index[(200, MessageType.USER_TEXT)]) == [1, 2]
+
+    def test_retracking_replaces_index_entries(self):
+        """Re-tracking a message moves it to its new session and type."""
+        service = ReplyContextService()
+
+        service.track_message(
+            message_id=1,
+            chat_id=200,
+            user_id=1,
+            message_type=MessageType.CLAUDE_RESPONSE,
+            session_id="old",
+        )
+        service.track_message(
+            message_id=1,
+            chat_id=200,
+            user_id=1,
+            message_type=MessageType.USER_TEXT,
+        )
+
+        assert "old" not in service._session_messages
+        assert (200, MessageType.CLAUDE_RESPONSE) not in service._type_index
+        assert service.cleanup_expired() == 0
+        assert service.get_context(200, 1).message_type == MessageType.USER_TEXT
+
+    def test_expiry_heap_stays_bounded(self):
+        """Stale heap entries from evictions are compacted away."""
+        service = ReplyContextService(max_cache_size=10)
+
+        for message_id in range(200):
+            service.track_message(
+                message_id=message_id,
+                chat_id=200,
+                user_id=1,
+                message_type=MessageType.USER_TEXT,
+            )
+
+        assert len(service._expiry_heap) <= 2 * service.max_cache_size
+
+
+# =============================================================================
+# Spill Tier Tests
+# =============================================================================
+
+
+class TestSpillTier:
+    """Optional SQLite tier keeps contexts beyond the LRU and across restarts."""
+
+    def test_evicted_context_loaded_from_spill(self, tmp_path):
+        """A context evicted from memory is still found and promoted."""
+        service = ReplyContextService(
+            max_cache_size=1, spill_path=str(tmp_path / "ctx.db")
+        )
+
+        service.track_claude_response(
+            message_id=1,
+            chat_id=200,
+            user_id=300,
+            session_id="session_a",
+            prompt="hello",
+        )
+        service.track_user_message(message_id=2, chat_id=200, user_id=300, text="x")
+        assert service._cache.peek((200, 1)) is None
+
+        context = service.get_context(200, 1)
+
+        assert context is not None
+        assert context.session_id == "session_a"
+        assert context.message_type == MessageType.CLAUDE_RESPONSE
+        assert context.prompt == "hello"
+        assert service._cache.peek((200, 1)) is context
+
+    def test_contexts_survive_restart(self, tmp_path):
+        """A fresh service on the same spill file sees earlier contexts."""
+        path = str(tmp_path / "ctx.db")
+        first = ReplyContextService(spill_path=path)
+        first.track_poll_response(
+            message_id=5,
+            chat_id=200,
+            user_id=300,
+            question="Mood?",
+            selected_answer="good",
+            options=["good", "bad"],
+        )
+        first.track_message(
+            message_id=6,
+            chat_id=200,
+            user_id=300,
+            message_type=MessageType.VOICE_TRANSCRIPTION,
+            transcription="note",
+        )
+        first.track_claude_response(
+            message_id=7, chat_id=200, user_id=300, session_id="s1", prompt="p"
+        )
+        first._spill.close()
+
+        second = ReplyContextService(spill_path=path)
+
+        restored = second.get_context(200, 5)
+        assert restored.poll_options == ["good", "bad"]
+        recent = second.get_recent_context_by_type(200, MessageType.VOICE_TRANSCRIPTION)
+        assert recent.transcription == "note"
+        assert second.get_session_context("s1").message_id == 7
+
+    def test_cleanup_purges_expired_spill_rows(self, tmp_path):
+        """cleanup_expired also removes expired rows from the spill tier."""
+        service = ReplyContextService(ttl_hours=1, spill_path=str(tmp_path / "c.db"))
+        service.track_message(
+            message_id=1,
+            chat_id=200,
+            user_id=1,
+            message_type=MessageType.USER_TEXT,
+            created_at=datetime.now() - timedelta(hours=2),
+        )
+        service.track_message(
+            message_id=2, chat_id=200, user_id=1, message_type=MessageType.USER_TEXT
+        )
+
+        assert service.cleanup_expired() == 1
+        assert service.get_stats()["spill_size"] == 1
+        assert service.get_context(200, 1, check_expiry=False) is None
+
+    def test_save_is_written_by_background_batch(self, tmp_path):
+        """save() only queues; the writer thread commits queued rows in batches."""
+        service = ReplyContextService(spill_path=str(tmp_path / "ctx.db"))
+        spill = service._spill
+        with patch.object(spill, "_wake"):  # keep the writer asleep
+            for message_id in range(3):
+                service.track_user_message(
+                    message_id=message_id, chat_id=200, user_id=1, text="x"
+                )
+            assert len(spill._pending) == 3
+            assert spill.flush() == 3
+            assert spill._pending == {}
+        service.close()
+
+    def test_forget_user_removes_memory_and_spill(self, tmp_path):
+        """GDPR deletion drops the user's contexts from both tiers."""
+        service = ReplyContextService(spill_path=str(tmp_path / "ctx.db"))
+        service.track_user_message(message_id=1, chat_id=200, user_id=1, text="a")
+        service.track_user_message(message_id=2, chat_id=999, user_id=1, text="b")
+        service.track_user_message(message_id=3, chat_id=300, user_id=2, text="c")
+
+        assert service.forget_user(1, [200]) == 2
+        assert service.get_context(200, 1) is None
+        assert service.get_context(999, 2) is None
+        assert service.get_context(300, 3) is not None
+        assert service.get_stats()["spill_size"] == 1
+        service.close()
+
+    def test_retention_purge_only_touches_given_users(self, tmp_path):
+        """purge_spill_older_than deletes old rows of the listed users only."""
+        service = ReplyContextService(spill_path=str(tmp_path / "ctx.db"))
+        old = datetime.now() - timedelta(days=40)
+        for message_id, user_id in [(1, 1), (2, 2)]:
+            service.track_message(
+                message_id=message_id,
+                chat_id=200,
+                user_id=user_id,
+                message_type=MessageType.USER_TEXT,
+                created_at=old,
+            )
+        service.track_user_message(message_id=3, chat_id=200, user_id=1, text="new")
+
+        cutoff = datetime.now() - timedelta(days=30)
+        assert service.purge_spill_older_than(cutoff, [1]) == 1
+        assert service.get_stats()["spill_size"] == 2
+        service.close()
+
+    def test_lookups_see_queued_rows_without_flushing(self, tmp_path):
+        """Lookups read queued rows directly instead of committing the queue."""
+        service = ReplyContextService(
+            max_cache_size=1, spill_path=str(tmp_path / "ctx.db")
+        )
+        spill = service._spill
+        with patch.object(spill, "_wake"), patch.object(spill, "flush") as flush:
+            service.track_claude_response(
+                message_id=1, chat_id=200, user_id=1, session_id="s1", prompt="p"
+            )
+            service.track_user_message(message_id=2, chat_id=200, user_id=1, text="x")
+
+            assert service.get_context(200, 1).session_id == "s1"
+            assert service.get_session_context("s1").message_id == 1
+            flush.assert_not_called()
+        service.close()
+
+    def test_promoted_context_does_not_shadow_newer(self, tmp_path):
+        """An older context promoted from spill is not treated as the newest."""
+        service = ReplyContextService(
+            max_cache_size=2, spill_path=str(tmp_path / "ctx.db")
+        )
+        now = datetime.now()
+        for message_id, minutes_ago in [(1, 5), (2, 3), (3, 1)]:
+            service.track_message(
+                message_id=message_id,
+                chat_id=200,
+                user_id=1,
+                message_type=MessageType.CLAUDE_RESPONSE,
+                session_id="s1",
+                created_at=now - timedelta(minutes=minutes_ago),
+            )
+        assert service._cache.peek((200, 1)) is None
+
+        # Promote message 1 back (evicting 2), then ask for the newest
+        assert service.get_context(200, 1) is not None
+
+        recent = service.get_recent_context_by_type(200, MessageType.CLAUDE_RESPONSE)
+        assert recent.message_id == 3
+        assert service.get_session_context("s1").message_id == 3
+        assert list(service._type_index[(200, MessageType.CLAUDE_RESPONSE)]) == [1, 3]
+        service.close()
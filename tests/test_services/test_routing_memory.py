@@ -2,6 +2,7 @@
 
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -137,3 +138,64 @@ class TestRoutingMemory:
             url="https://new-site.com/page", content_type="links"
         )
         assert dest == "inbox"
+
+
+class TestRoutingStore:
+    """SQLite-backed store and the debounced markdown export"""
+
+    @pytest.fixture
+    def temp_vault(self, tmp_path):
+        return tmp_path / "vault"
+
+    def test_suggestion_does_not_read_markdown(self, temp_vault, tmp_path):
+        """Suggestions come from memory, not from re-parsing the file"""
+        memory = RoutingMemory(vault_path=temp_vault, db_path=tmp_path / "r.db")
+        memory.record_route(destination="research", url="https://github.com/a")
+
+        memory.memory_file.unlink()
+        assert memory.get_suggested_destination(url="https://github.com/b") == (
+            "research"
+        )
+
+    def test_routes_persist_across_instances(self, temp_vault, tmp_path):
+        db_path = tmp_path / "r.db"
+        first = RoutingMemory(vault_path=temp_vault, db_path=db_path)
+        for i in range(25):
+            first.record_route(destination="research", url=f"https://arxiv.org/{i}")
+
+        second = RoutingMemory(vault_path=tmp_path / "other", db_path=db_path)
+        snapshot = second.snapshot()
+        assert snapshot["domains"]["arxiv.org"] == {
+            "destination": "research",
+            "count": 25,
+        }
+        assert snapshot["content_types"]["links"]["count"] == 25
+        assert len(snapshot["recent"]) == 20
+        assert snapshot["recent"][-1] == first.snapshot()["recent"][-1]
+
+    def test_empty_store_seeded_from_existing_markdown(self, temp_vault, tmp_path):
+        legacy = RoutingMemory(vault_path=temp_vault)
+        legacy.record_route(destination="daily", url="https://example.com/x")
+
+        migrated = RoutingMemory(vault_path=temp_vault, db_path=tmp_path / "r.db")
+        assert migrated.get_suggested_destination(url="https://example.com/y") == (
+            "daily"
+        )
+        assert migrated.get_suggested_destination(content_type="voice") == "daily"
+
+    @pytest.mark.asyncio
+    async def test_export_debounced_inside_event_loop(self, temp_vault, tmp_path):
+        memory = RoutingMemory(
+            vault_path=temp_vault, db_path=tmp_path / "r.db", export_delay=0.05
+        )
+        with patch.object(
+            memory, "_write_markdown", wraps=memory._write_markdown
+        ) as write:
+            for i in range(10):
+                memory.record_route(destination="inbox", url=f"https://t{i}.com/")
+            assert write.call_count == 0
+
+            await memory.flush()
+
+        assert write.call_count == 1
+        assert "t9.com -> inbox (1)" in memory.memory_file.read_text()
@@ -1042,3 +1042,56 @@ class TestTimestampCorrelation:
         found = result.scalar_one_or_none()
 
         assert found is None
+
+
+# =============================================================================
+# Message -> Session Mapping
+# =============================================================================
+
+
+class TestMessageSessionMapping:
+    """Test the persistent bot message -> session mapping used on replies."""
+
+    @pytest.fixture
+    def service(self, db_session):
+        """ClaudeCodeService whose DB sessions run on the test database."""
+        from contextlib import asynccontextmanager
+        from unittest.mock import patch
+
+        from src.services.claude_code_service import ClaudeCodeService
+
+        engine = db_session.bind
+        factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        @asynccontextmanager
+        async def fake_get_db_session():
+            async with factory() as session:
+                yield session
+
+        with patch(
+            "src.services.claude_code_service.get_db_session", fake_get_db_session
+        ):
+            yield ClaudeCodeService()
+
+    @pytest.mark.asyncio
+    async def test_recorded_message_resolves_to_session(self, service):
+        """A recorded response message resolves to its session."""
+        await service.record_response_message(80001, 42, "mapped-session-001")
+
+        assert await service.find_session_by_message(80001, 42) == "mapped-session-001"
+
+    @pytest.mark.asyncio
+    async def test_lookup_scoped_to_chat(self, service):
+        """The same message ID in another chat does not match."""
+        await service.record_response_message(80001, 42, "mapped-session-001")
+
+        assert await service.find_session_by_message(80002, 42) is None
+        assert await service.find_session_by_message(80001, 43) is None
+
+    @pytest.mark.asyncio
+    async def test_rerecording_message_updates_session(self, service):
+        """Recording the same message again overwrites the mapping."""
+        await service.record_response_message(80001, 42, "mapped-session-001")
+        await service.record_response_message(80001, 42, "mapped-session-002")
+
+        assert await service.find_session_by_message(80001, 42) == "mapped-session-002"
@@ -0,0 +1,214 @@
+"""
+Tests for the streaming subprocess runner and throttled status edits.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.bot.handlers.streaming import ThrottledMessageEditor, tail_for_display
+from src.services.streaming_subprocess import (
+    StreamOutput,
+    prune_stream_logs,
+    register_stream,
+    request_stop,
+    stream_subprocess,
+    unregister_stream,
+)
+
+
+class TestStreamOutput:
+    def test_small_output_stays_in_memory(self):
+        output = StreamOutput(max_chars=100)
+        output.append("hello ")
+        output.append("world")
+
+        assert output.text() == "hello world"
+        assert output.tail() == "hello world"
+        assert not output.truncated
+        assert output.spill_path is None
+
+    def test_overflow_spills_to_file(self, tmp_path):
+        output = StreamOutput(max_chars=10, spill_dir=str(tmp_path))
+        for i in range(10):
+            output.append(f"line{i}\n")
+
+        assert output.truncated
+        assert output.total_chars == 60
+        assert output.text() == "".join(f"line{i}\n" for i in range(10))
+        assert output.tail() == "ne8\nline9\n"
+
+        path = output.spill_path
+        output.close()
+        assert not path.exists()
+
+    def test_close_can_keep_spill(self, tmp_path):
+        output = StreamOutput(max_chars=4, spill_dir=str(tmp_path))
+        output.append("0123456789")
+
+        output.close(keep_spill=True)
+
+        assert output.spill_path.read_text() == "0123456789"
+
+    def test_keep_log_moves_spill_to_log_dir(self, tmp_path):
+        output = StreamOutput(max_chars=4, spill_dir=str(tmp_path))
+        output.append("0123456789")
+
+        kept = output.keep_log(tmp_path / "logs")
+        output.close()
+
+        assert kept.parent == tmp_path / "logs"
+        assert kept.read_text() == "0123456789"
+        assert list(tmp_path.glob("stream_*.log")) == []
+
+    def test_keep_log_without_spill_is_noop(self, tmp_path):
+        output = StreamOutput(max_chars=100)
+        output.append("short")
+
+        assert output.keep_log(tmp_path) is None
+
+
+class TestPruneStreamLogs:
+    def _log(self, directory, name, size, age_hours=0.0):
+        path = directory / f"stream_{name}.log"
+        path.write_bytes(b"x" * size)
+        mtime = time.time() - age_hours * 3600
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_old_logs_pruned(self, tmp_path):
+        fresh = self._log(tmp_path, "fresh", 10)
+        self._log(tmp_path, "old", 10, age_hours=100)
+
+        assert prune_stream_logs(tmp_path, max_age_hours=72) == 1
+        assert list(tmp_path.iterdir()) == [fresh]
+
+    def test_oldest_pruned_over_size_but_newest_kept(self, tmp_path):
+        self._log(tmp_path, "a", 60, age_hours=3)
+        middle = self._log(tmp_path, "b", 30, age_hours=2)
+        newest = self._log(tmp_path, "c", 200, age_hours=1)
+
+        assert prune_stream_logs(tmp_path, max_bytes=100) == 2
+        assert sorted(tmp_path.iterdir()) == [newest]
+        assert not middle.exists()
+
+
+class TestStreamSubprocess:
+    @pytest.mark.asyncio
+    async def test_chunks_delivered_before_exit(self):
+        received = []
+
+        async def on_output(chunk):
+            received.append(chunk)
+
+        script = (
+            "import sys, time\n"
+            "print('first', flush=True)\n"
+            "time.sleep(0.2)\n"
+            "print('second', flush=True)\n"
+        )
+        result = await stream_subprocess(
+            [sys.executable, "-c", script], on_output=on_output, timeout=10
+        )
+
+        assert result.success
+        assert len(received) >= 2
+        assert "second" not in received[0]
+        assert result.output.text() == "first\nsecond\n"
+
+    @pytest.mark.asyncio
+    async def test_shell_command_and_stderr(self):
+        result = await stream_subprocess("echo out; echo err >&2; exit 3")
+
+        assert result.returncode == 3
+        assert not result.success
+        assert result.output.text() == "out\n"
+        assert result.stderr == "err\n"
+
+    @pytest.mark.asyncio
+    async def test_multibyte_split_across_reads(self):
+        text = "привет " * 2000
+        script = f"import sys; sys.stdout.write({text!r})"
+
+        result = await stream_subprocess([sys.executable, "-c", script])
+
+        assert result.output.text() == text
+
+    @pytest.mark.asyncio
+    async def test_timeout_terminates(self):
+        result = await stream_subprocess("sleep 5", timeout=0.2)
+
+        assert result.timed_out
+        assert not result.success
+
+    @pytest.mark.asyncio
+    async def test_stop_button_terminates(self):
+        stream_id = register_stream()
+
+        async def press_stop():
+            await asyncio.sleep(0.1)
+            assert request_stop(stream_id)
+
+        try:
+            stopper = asyncio.ensure_future(press_stop())
+            result = await stream_subprocess(
+                "echo started; sleep 5", stream_id=stream_id, timeout=10
+            )
+            await stopper
+        finally:
+            unregister_stream(stream_id)
+
+        assert result.stopped
+        assert result.output.text() == "started\n"
+        assert not request_stop(stream_id)
+
+    @pytest.mark.asyncio
+    async def test_failing_consumer_kills_process(self):
+        def on_output(chunk):
+            raise ValueError("consumer failed")
+
+        with pytest.raises(ValueError):
+            await stream_subprocess("echo hi; sleep 5", on_output=on_output)
+
+
+class TestThrottledMessageEditor:
+    def test_tail_for_display(self):
+        assert tail_for_display("short", limit=10) == "short"
+        assert tail_for_display("0123456789abc", limit=3) == "...\nabc"
+
+    @pytest.mark.asyncio
+    async def test_updates_throttled_and_flushed(self):
+        calls = []
+
+        def fake_edit(**kwargs):
+            calls.append(kwargs["text"])
+            return {"ok": True}
+
+        editor = ThrottledMessageEditor(1, 2, interval=60)
+        with patch("src.bot.handlers.streaming.edit_message_sync", fake_edit):
+            assert await editor.update("one")
+            assert not await editor.update("two")
+            assert not await editor.update("three")
+            assert await editor.flush()
+            assert not await editor.flush()
+
+        assert calls == ["one", "three"]
+
+    @pytest.mark.asyncio
+    async def test_identical_text_not_resent(self):
+        calls = []
+
+        def fake_edit(**kwargs):
+            calls.append(kwargs["text"])
+            return {"ok": True}
+
+        editor = ThrottledMessageEditor(1, 2, interval=0)
+        with patch("src.bot.handlers.streaming.edit_message_sync", fake_edit):
+            await editor.update("same")
+            await editor.update("same", force=True)
+
+        assert calls == ["same"]
@@ -0,0 +1,131 @@
+"""Tests for system_prompt_cache — mtime-invalidated system prompt assembly."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from src.services.design_skills_service import DesignSkillsService
+from src.services.system_prompt_cache import TELEGRAM_SYSTEM_PROMPT, SystemPromptCache
+from src.services.workspace_service import DEFAULT_TEMPLATE, update_memory
+
+
+@pytest.fixture(autouse=True)
+def _patch_workspaces_dir(tmp_path, monkeypatch):
+    """Redirect WORKSPACES_DIR to tmp_path for all tests."""
+    monkeypatch.setattr(
+        "src.services.workspace_service.WORKSPACES_DIR", tmp_path / "workspaces"
+    )
+
+
+@pytest.fixture
+def design_service(tmp_path):
+    """Design skills service backed by a temp copy of the real config."""
+    config_path = tmp_path / "design_skills.yaml"
+    config_path.write_text(
+        DesignSkillsService().config_path.read_text(encoding="utf-8"),
+        encoding="utf-8",
+    )
+    service = DesignSkillsService(config_path=str(config_path))
+    with patch(
+        "src.services.system_prompt_cache.get_design_skills_service",
+        return_value=service,
+    ):
+        yield service
+
+
+def _touch_later(path):
+    """Bump mtime explicitly; some filesystems have coarse timestamps."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class TestSystemPromptAssembly:
+    def test_contains_preamble_design_and_memory(self, design_service):
+        prompt = SystemPromptCache().get(123)
+
+        assert prompt.text.startswith(TELEGRAM_SYSTEM_PROMPT)
+        assert "# DESIGN GUIDANCE" in prompt.text
+        assert prompt.text.endswith("# User Memory\n" + DEFAULT_TEMPLATE)
+
+    def test_prefix_prepended(self, design_service):
+        prompt = SystemPromptCache().get(123, "RESEARCH MODE")
+
+        assert prompt.text.startswith("RESEARCH MODE\n\n" + TELEGRAM_SYSTEM_PROMPT)
+
+    def test_creates_workspace(self, design_service, tmp_path):
+        SystemPromptCache().get(123)
+
+        assert (tmp_path / "workspaces" / "123" / "CLAUDE.md").exists()
+
+
+class TestSystemPromptCaching:
+    def test_unchanged_inputs_hit_cache(self, design_service):
+        cache = SystemPromptCache()
+
+        first = cache.get(123)
+        with patch(
+            "src.services.system_prompt_cache.ensure_workspace"
+        ) as ensure_workspace:
+            second = cache.get(123)
+
+        assert second is first
+        assert cache.hits == 1
+        ensure_workspace.assert_not_called()
+
+    def test_memory_change_rebuilds_and_changes_hash(self, design_service):
+        cache = SystemPromptCache()
+        first = cache.get(123)
+
+        update_memory(123, "Be brief and direct")
+        second = cache.get(123)
+
+        assert second.content_hash != first.content_hash
+        assert second.text.endswith("# User Memory\nBe brief and direct")
+
+    def test_design_config_change_reloads_yaml(self, design_service):
+        cache = SystemPromptCache()
+        first = cache.get(123)
+
+        config = yaml.safe_load(design_service.config_path.read_text())
+        config["design_skills"] = {}
+        design_service.config_path.write_text(yaml.safe_dump(config))
+        _touch_later(design_service.config_path)
+        second = cache.get(123)
+
+        assert "# DESIGN GUIDANCE" in first.text
+        assert "# DESIGN GUIDANCE" not in second.text
+
+    def test_rebuild_with_same_content_keeps_hash(self, design_service, tmp_path):
+        cache = SystemPromptCache()
+        first = cache.get(123)
+
+        _touch_later(tmp_path / "workspaces" / "123" / "CLAUDE.md")
+        second = cache.get(123)
+
+        assert cache.misses == 2
+        assert second.content_hash == first.content_hash
+
+    def test_entries_keyed_by_chat_and_prefix(self, design_service):
+        cache = SystemPromptCache()
+
+        a = cache.get(1)
+        b = cache.get(2)
+        c = cache.get(1, "prefix")
+
+        assert len({a.content_hash, c.content_hash}) == 2
+        assert a.content_hash == b.content_hash  # same template memory
+        assert cache.misses == 3
+
+    def test_invalidate_chat(self, design_service):
+        cache = SystemPromptCache()
+        cache.get(1)
+        cache.get(2)
+
+        cache.invalidate(1)
+        cache.get(1)
+        cache.get(2)
+
+        assert cache.misses == 3
+        assert cache.hits == 1
@@ -259,6 +259,34 @@ async def test_log_run_timeout(service):
     assert log.status == TaskRunStatus.TIMEOUT
 
 
+@pytest.mark.asyncio
+async def test_log_run_with_timings(service):
+    """Runner-supplied timings and queue wait are stored."""
+    task = await service.create_task(chat_id=10, task_type="test")
+    started = datetime(2026, 2, 7, 10, 0, tzinfo=timezone.utc)
+    log = await service.log_run(
+        task_id=task.id,
+        status="success",
+        started_at=started,
+        completed_at=started + timedelta(seconds=90),
+        queue_wait_seconds=12.5,
+    )
+    assert log.duration_seconds == 90
+    assert log.queue_wait_seconds == 12.5
+
+
+@pytest.mark.asyncio
+async def test_ensure_task_reuses_existing(service):
+    """ensure_task creates a task once and returns it afterwards."""
+    first = await service.ensure_task(10, "proactive:daily-research")
+    second = await service.ensure_task(10, "proactive:daily-research")
+    other_chat = await service.ensure_task(11, "proactive:daily-research")
+
+    assert first.id == second.id
+    assert other_chat.id != first.id
+    assert first.next_run_at is None
+
+
 # ------------------------------------------------------------------
 # Run history
 # ------------------------------------------------------------------
@@ -305,6 +333,30 @@ async def test_get_run_history_empty(service):
     assert history == []
 
 
+@pytest.mark.asyncio
+async def test_log_runs_batch(service):
+    """log_runs writes several run logs at once and validates task ids."""
+    task = await service.create_task(
+        chat_id=10, task_type="test", schedule_cron="0 0 * * *"
+    )
+    written = await service.log_runs(
+        [
+            {"task_id": task.id, "status": "success", "result_summary": "a"},
+            {"task_id": task.id, "status": "timeout", "error_message": "slow"},
+        ]
+    )
+    assert written == 2
+    history = await service.get_run_history(task.id)
+    assert sorted(log.status for log in history) == [
+        TaskRunStatus.SUCCESS,
+        TaskRunStatus.TIMEOUT,
+    ]
+
+    assert await service.log_runs([]) == 0
+    with pytest.raises(ValueError, match="not found"):
+        await service.log_runs([{"task_id": 99999, "status": "success"}])
+
+
 # ------------------------------------------------------------------
 # Context mode field values
 # ------------------------------------------------------------------
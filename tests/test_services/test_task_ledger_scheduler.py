@@ -0,0 +1,225 @@
+"""
+Tests for the event-driven task ledger scheduler.
+
+Tests cover:
+- Tasks created while running fire at their due time without polling
+- Recurring tasks get their first next_run_at, then advance after each run
+- Disabling or deleting a task cancels its pending run
+- Two workers on one database fire each run exactly once (lease claim)
+- Failing and overrunning handlers are logged as error/timeout in one batch
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.models.base import Base
+from src.models.scheduled_task import TaskRunLog, TaskRunStatus
+from src.services.task_ledger_scheduler import TaskLedgerScheduler
+from src.services.task_ledger_service import TaskLedgerService
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ledger.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def ledger(engine):
+    """A TaskLedgerService on the temp DB, one session per call."""
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def fake_get_db_session():
+        async with factory() as session:
+            yield session
+
+    with patch("src.services.task_ledger_service.get_db_session", fake_get_db_session):
+        yield TaskLedgerService()
+
+
+class Recorder:
+    """Task handler recording the DueTasks it ran."""
+
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.runs = []
+        self.ran = asyncio.Event()
+
+    async def __call__(self, due):
+        self.runs.append(due)
+        self.ran.set()
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return f"ran {due.task_id}"
+
+
+@asynccontextmanager
+async def running(*schedulers):
+    tasks = [asyncio.create_task(s.run()) for s in schedulers]
+    await asyncio.sleep(0.05)  # let load() finish
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _logs(engine):
+    factory = async_sessionmaker(engine, class_=AsyncSession)
+    async with factory() as session:
+        result = await session.execute(select(TaskRunLog).order_by(TaskRunLog.id))
+        return list(result.scalars().all())
+
+
+def _soon(seconds=0.2):
+    return datetime.now(timezone.utc) + timedelta(seconds=seconds)
+
+
+def _scheduler(ledger, handler, **kwargs):
+    scheduler = TaskLedgerScheduler(ledger=ledger, resync_seconds=None, **kwargs)
+    scheduler.register_handler("review", handler)
+    return scheduler
+
+
+class TestScheduling:
+    async def test_created_task_fires_when_due(self, ledger, engine):
+        handler = Recorder()
+        scheduler = _scheduler(ledger, handler)
+        async with running(scheduler):
+            task = await ledger.create_task(
+                chat_id=1, task_type="review", schedule_once_at=_soon()
+            )
+            assert scheduler.next_wakeup() is not None
+            await asyncio.wait_for(handler.ran.wait(), timeout=2)
+            await asyncio.sleep(0.1)
+
+        assert [due.task_id for due in handler.runs] == [task.id]
+        logs = await _logs(engine)
+        assert [(log.status, log.result_summary) for log in logs] == [
+            (TaskRunStatus.SUCCESS, f"ran {task.id}")
+        ]
+        assert logs[0].queue_wait_seconds >= 0
+        row = await ledger.get_task(task.id)
+        assert row.next_run_at is None and row.lease_owner is None
+        assert scheduler.next_wakeup() is None
+
+    async def test_interval_task_initialized_then_advanced(self, ledger, engine):
+        handler = Recorder()
+        scheduler = _scheduler(ledger, handler)
+        task = await ledger.create_task(
+            chat_id=1, task_type="review", schedule_interval_seconds=1
+        )
+        async with running(scheduler):
+            first = (await ledger.get_task(task.id)).next_run_at
+            assert first is not None
+            await asyncio.wait_for(handler.ran.wait(), timeout=3)
+            await asyncio.sleep(0.1)
+
+        assert len(handler.runs) == 1
+        assert (await ledger.get_task(task.id)).next_run_at > first
+
+    async def test_other_task_types_not_scheduled(self, ledger):
+        scheduler = _scheduler(ledger, Recorder())
+        await ledger.create_task(chat_id=1, task_type="other", schedule_once_at=_soon())
+        assert await scheduler.load() == 0
+
+    async def test_idle_without_handlers(self, ledger):
+        await ledger.create_task(
+            chat_id=1, task_type="review", schedule_once_at=_soon()
+        )
+        with patch.object(ledger, "get_schedulable_tasks") as query:
+            scheduler = TaskLedgerScheduler(ledger=ledger, resync_seconds=None)
+            assert await scheduler.load() == 0
+        query.assert_not_called()
+        assert scheduler.next_wakeup() is None
+
+    async def test_disable_and_delete_cancel_pending_run(self, ledger, engine):
+        handler = Recorder()
+        scheduler = _scheduler(ledger, handler)
+        async with running(scheduler):
+            paused = await ledger.create_task(
+                chat_id=1, task_type="review", schedule_once_at=_soon()
+            )
+            deleted = await ledger.create_task(
+                chat_id=1, task_type="review", schedule_once_at=_soon()
+            )
+            await ledger.toggle_task(paused.id)
+            await ledger.delete_task(deleted.id)
+            assert scheduler.next_wakeup() is None
+            await asyncio.sleep(0.4)
+
+        assert handler.runs == []
+        assert await _logs(engine) == []
+
+
+class TestLeases:
+    async def test_two_workers_fire_each_run_once(self, ledger, engine):
+        handlers = [Recorder(delay=0.1), Recorder(delay=0.1)]
+        workers = [
+            _scheduler(ledger, handler, owner=f"worker-{i}")
+            for i, handler in enumerate(handlers)
+        ]
+        tasks = [
+            await ledger.create_task(
+                chat_id=1, task_type="review", schedule_once_at=_soon()
+            )
+            for _ in range(3)
+        ]
+        async with running(*workers):
+            await asyncio.sleep(0.6)
+
+        fired = sorted(due.task_id for h in handlers for due in h.runs)
+        assert fired == sorted(task.id for task in tasks)
+        assert len(await _logs(engine)) == 3
+
+    async def test_claim_fails_while_leased(self, ledger):
+        task = await ledger.create_task(
+            chat_id=1, task_type="review", schedule_once_at=_soon(-1)
+        )
+        row = await ledger.get_task(task.id)
+        until = _soon(60)
+        assert await ledger.claim_run(task.id, row.next_run_at, None, "a", until)
+        # Same due time again: next_run_at has moved on
+        assert not await ledger.claim_run(task.id, row.next_run_at, None, "b", until)
+        # Current row but leased by a
+        assert not await ledger.claim_run(task.id, None, None, "b", until)
+
+        await ledger.release_run(task.id, "a")
+        assert await ledger.claim_run(task.id, None, None, "b", until)
+
+
+class TestRunOutcomes:
+    async def test_errors_and_timeouts_logged_in_one_batch(self, ledger, engine):
+        scheduler = TaskLedgerScheduler(
+            ledger=ledger, resync_seconds=None, lease_seconds=0.2
+        )
+        scheduler.register_handler("fails", Recorder(error=RuntimeError("boom")))
+        scheduler.register_handler("slow", Recorder(delay=5))
+        for task_type in ("fails", "slow"):
+            await ledger.create_task(
+                chat_id=1, task_type=task_type, schedule_once_at=_soon(-1)
+            )
+        await scheduler.load()
+
+        with patch.object(ledger, "log_runs", wraps=ledger.log_runs) as log_runs:
+            assert await scheduler.fire(scheduler.pop_due()) == 2
+
+        assert log_runs.call_count == 1
+        logs = await _logs(engine)
+        assert sorted((log.status, log.error_message) for log in logs) == [
+            (TaskRunStatus.ERROR, "boom"),
+            (TaskRunStatus.TIMEOUT, "exceeded 0.2s lease"),
+        ]
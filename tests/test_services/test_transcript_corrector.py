@@ -247,3 +247,100 @@ class TestCorrectionsMapLoading:
         # Should not raise, just have empty corrections
         corrector = TranscriptCorrector(corrections_file=Path("/nonexistent/file.json"))
         assert corrector.corrections == {}
+
+
+class TestSinglePassMatching:
+    """Vocabulary and filler matching share one automaton scan."""
+
+    def test_word_boundaries_respected(self, tmp_path):
+        import json
+
+        from src.services.transcript_corrector import TranscriptCorrector
+
+        corrections = tmp_path / "corrections.json"
+        corrections.write_text(json.dumps({"обсидиан": "Obsidian"}))
+        corrector = TranscriptCorrector(corrections_file=corrections)
+
+        assert corrector.correct_text("в обсидиан.") == "в Obsidian."
+        assert corrector.correct_text("обсидианом") == "обсидианом"
+        assert corrector.correct_text("xобсидиан") == "xобсидиан"
+
+    def test_longest_term_wins(self, tmp_path):
+        import json
+
+        from src.services.transcript_corrector import TranscriptCorrector
+
+        corrections = tmp_path / "corrections.json"
+        corrections.write_text(
+            json.dumps({"cloud": "Cloud", "cloud code": "Claude code"})
+        )
+        corrector = TranscriptCorrector(corrections_file=corrections)
+
+        result, stats = corrector.correct_text_with_stats("open cloud code now")
+        assert result == "open Claude code now"
+        assert stats["terms_corrected"] == [
+            {"original": "cloud code", "corrected": "Claude code"}
+        ]
+
+    def test_filler_context_rules(self):
+        from src.services.transcript_corrector import TranscriptCorrector
+
+        corrector = TranscriptCorrector()
+
+        assert corrector.correct_text("ну, давай", level="full") == ", давай"
+        assert corrector.correct_text("ну давай", level="full") == "ну давай"
+        assert corrector.correct_text("ээээ да", level="full") == "да"
+        assert corrector.correct_text("like you said", level="full") == "you said"
+        assert corrector.correct_text("I like it", level="full") == "I it"
+        assert corrector.correct_text("I like cats", level="full") == "I like cats"
+
+    def test_vocabulary_and_fillers_in_one_call(self):
+        from src.services.transcript_corrector import TranscriptCorrector
+
+        corrector = TranscriptCorrector()
+
+        result, stats = corrector.correct_text_with_stats(
+            "эээ открой кладкод um пожалуйста", level="full"
+        )
+        assert result == "открой Claude code пожалуйста"
+        assert stats["corrections_count"] == 1
+
+    def test_large_vocabulary(self, tmp_path):
+        import json
+
+        from src.services.transcript_corrector import TranscriptCorrector
+
+        vocab = {f"термин{i}": f"Term{i}" for i in range(5000)}
+        corrections = tmp_path / "corrections.json"
+        corrections.write_text(json.dumps(vocab, ensure_ascii=False))
+        corrector = TranscriptCorrector(corrections_file=corrections)
+
+        text = " ".join(f"термин{i}" for i in range(0, 5000, 7))
+        result = corrector.correct_text(text)
+        assert result == " ".join(f"Term{i}" for i in range(0, 5000, 7))
+
+
+class TestCorrectionsHotReload:
+    def test_reloads_changed_file(self, tmp_path):
+        import json
+        import os
+
+        from src.services.transcript_corrector import TranscriptCorrector
+
+        corrections = tmp_path / "corrections.json"
+        corrections.write_text(json.dumps({"вискер": "Whisper"}))
+        corrector = TranscriptCorrector(corrections_file=corrections)
+        assert not corrector.reload_if_changed()
+
+        corrections.write_text(json.dumps({"вискер": "Whisper", "опсидиан": "Obs"}))
+        stat = corrections.stat()
+        os.utime(corrections, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert corrector.reload_if_changed()
+        assert corrector.correct_text("опсидиан вискер") == "Obs Whisper"
+
+    def test_missing_file_not_reloaded(self):
+        from src.services.transcript_corrector import TranscriptCorrector
+
+        corrector = TranscriptCorrector(corrections_file=Path("/nonexistent/x.json"))
+        assert not corrector.reload_if_changed()
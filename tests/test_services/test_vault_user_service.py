@@ -8,6 +8,7 @@ Tests cover:
 - User lookup in vault (lookup_telegram_user)
 - Forward context building (build_forward_context)
 - Caching behavior
+- Incremental, persisted People index (PeopleIndex)
 - Edge cases and error handling
 """
 
@@ -58,6 +59,16 @@ def clear_cache():
     _user_cache.clear()
 
 
+@pytest.fixture(autouse=True)
+def isolated_people_index(tmp_path, monkeypatch):
+    """Keep the persisted People index out of the repo's data/ dir."""
+    import src.services.vault_user_service as vus
+
+    monkeypatch.setattr(vus, "PEOPLE_INDEX_PATH", tmp_path / "people_index.json")
+    monkeypatch.setattr(vus, "_people_index", None)
+    return tmp_path / "people_index.json"
+
+
 # =============================================================================
 # _normalize_handle Tests
 # =============================================================================
@@ -947,3 +958,99 @@ social:
 
         # Empty username will trigger lookup but return None, falling through to next option
         assert result is None
+
+
+# =============================================================================
+# PeopleIndex Tests
+# =============================================================================
+
+
+def _write_person(people_dir, name, handle):
+    path = people_dir / f"@{name}.md"
+    path.write_text(f'---\ntelegram: "@{handle}"\n---\n', encoding="utf-8")
+    return path
+
+
+class TestPeopleIndex:
+    """Tests for the incremental People index."""
+
+    def test_lookup_is_dict_hit_after_build(self, temp_vault_dir):
+        from src.services.vault_user_service import PeopleIndex
+
+        _write_person(temp_vault_dir, "Ann", "ann")
+        _write_person(temp_vault_dir, "Bob", "bob")
+        index = PeopleIndex(temp_vault_dir)
+
+        assert index.lookup("ann") == "Ann"
+        with patch("src.services.vault_user_service._note_handle") as parse:
+            assert index.lookup("bob") == "Bob"
+            assert index.lookup("nobody") is None
+        parse.assert_not_called()
+
+    def test_only_changed_notes_reparsed(self, temp_vault_dir):
+        from src.services import vault_user_service as vus
+
+        _write_person(temp_vault_dir, "Ann", "ann")
+        _write_person(temp_vault_dir, "Bob", "bob")
+        index = vus.PeopleIndex(temp_vault_dir)
+        index.refresh()
+
+        _write_person(temp_vault_dir, "Cat", "cat")
+        with patch.object(vus, "_note_handle", wraps=vus._note_handle) as parse:
+            assert index.refresh() is True
+        assert [c.args[0].name for c in parse.call_args_list] == ["@Cat.md"]
+        assert index.lookup("cat") == "Cat"
+
+    def test_removed_note_dropped(self, temp_vault_dir):
+        from src.services.vault_user_service import PeopleIndex
+
+        path = _write_person(temp_vault_dir, "Ann", "ann")
+        index = PeopleIndex(temp_vault_dir)
+        assert index.lookup("ann") == "Ann"
+
+        path.unlink()
+        assert index.lookup("ann") is None
+
+    def test_in_place_edit_picked_up_by_rescan(self, temp_vault_dir):
+        from src.services.vault_user_service import PeopleIndex
+
+        path = _write_person(temp_vault_dir, "Ann", "ann")
+        index = PeopleIndex(temp_vault_dir, rescan_seconds=0)
+        assert index.lookup("ann") == "Ann"
+
+        path.write_text('---\ntelegram: "@ann_new"\n---\n', encoding="utf-8")
+        assert index.lookup("ann_new") == "Ann"
+        assert index.lookup("ann") is None
+
+    def test_persisted_index_skips_reparse(self, temp_vault_dir, tmp_path):
+        from src.services import vault_user_service as vus
+
+        index_path = tmp_path / "index.json"
+        _write_person(temp_vault_dir, "Ann", "ann")
+        vus.PeopleIndex(temp_vault_dir, index_path=index_path).refresh()
+        assert index_path.exists()
+
+        restarted = vus.PeopleIndex(temp_vault_dir, index_path=index_path)
+        with patch.object(vus, "_note_handle") as parse:
+            assert restarted.lookup("ann") == "Ann"
+        parse.assert_not_called()
+
+    def test_persisted_index_for_other_folder_ignored(self, temp_vault_dir, tmp_path):
+        from src.services.vault_user_service import PeopleIndex
+
+        index_path = tmp_path / "index.json"
+        _write_person(temp_vault_dir, "Ann", "ann")
+        PeopleIndex(temp_vault_dir, index_path=index_path).refresh()
+
+        other = tmp_path / "OtherPeople"
+        other.mkdir()
+        assert len(PeopleIndex(other, index_path=index_path)) == 0
+
+    def test_corrupt_persisted_index_ignored(self, temp_vault_dir, tmp_path):
+        from src.services.vault_user_service import PeopleIndex
+
+        index_path = tmp_path / "index.json"
+        index_path.write_text("{not json")
+        _write_person(temp_vault_dir, "Ann", "ann")
+
+        assert PeopleIndex(temp_vault_dir, index_path=index_path).lookup("ann") == "Ann"
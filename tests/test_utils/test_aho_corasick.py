@@ -0,0 +1,66 @@
+"""
+Tests for the Aho–Corasick multi-pattern matcher.
+
+Tests cover:
+- Single and overlapping pattern matches
+- Patterns that are suffixes of others (failure-link outputs)
+- Unicode (Cyrillic) patterns
+- Agreement with a naive substring search
+"""
+
+import random
+
+from src.utils.aho_corasick import AhoCorasick
+
+
+def _naive(patterns, text):
+    return sorted(
+        (i, i + len(p), v)
+        for p, v in patterns
+        for i in range(len(text) - len(p) + 1)
+        if text.startswith(p, i)
+    )
+
+
+class TestAhoCorasick:
+    def test_empty_automaton(self):
+        matcher = AhoCorasick([])
+        assert len(matcher) == 0
+        assert list(matcher.iter_matches("anything")) == []
+
+    def test_single_pattern(self):
+        matcher = AhoCorasick([("code", 1)])
+        assert list(matcher.iter_matches("my code, your code")) == [
+            (3, 7, 1),
+            (14, 18, 1),
+        ]
+
+    def test_suffix_patterns_reported(self):
+        matcher = AhoCorasick([("he", "he"), ("she", "she"), ("hers", "hers")])
+        matches = list(matcher.iter_matches("ushers"))
+        assert (1, 4, "she") in matches
+        assert (2, 4, "he") in matches
+        assert (2, 6, "hers") in matches
+
+    def test_longest_first_at_same_end(self):
+        matcher = AhoCorasick([("код", "short"), ("кладкод", "long")])
+        assert list(matcher.iter_matches("кладкод")) == [
+            (0, 7, "long"),
+            (4, 7, "short"),
+        ]
+
+    def test_empty_pattern_ignored(self):
+        matcher = AhoCorasick([("", 0), ("a", 1)])
+        assert len(matcher) == 1
+
+    def test_matches_naive_search(self):
+        random.seed(7)
+        alphabet = "abкл "
+        patterns = [
+            ("".join(random.choice(alphabet) for _ in range(random.randint(1, 4))), i)
+            for i in range(30)
+        ]
+        matcher = AhoCorasick(patterns)
+        for _ in range(50):
+            text = "".join(random.choice(alphabet) for _ in range(60))
+            assert sorted(matcher.iter_matches(text)) == _naive(patterns, text)
@@ -0,0 +1,82 @@
+"""
+Tests for the minimal cron expression parser.
+
+Tests cover:
+- Next match for fixed times, steps, ranges and lists
+- Month and year rollover
+- Day-of-month / weekday OR semantics
+- Invalid expressions
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from src.utils.cron import CronSchedule, next_cron_time
+
+UTC = timezone.utc
+
+
+def _at(*args):
+    return datetime(*args, tzinfo=UTC)
+
+
+class TestNextCronTime:
+    def test_daily_time(self):
+        assert next_cron_time("30 9 * * *", _at(2026, 3, 1, 8, 0)) == _at(
+            2026, 3, 1, 9, 30
+        )
+        # Strictly after: the matching minute itself rolls to the next day
+        assert next_cron_time("30 9 * * *", _at(2026, 3, 1, 9, 30)) == _at(
+            2026, 3, 2, 9, 30
+        )
+
+    def test_steps_ranges_and_lists(self):
+        assert next_cron_time("*/15 * * * *", _at(2026, 3, 1, 8, 16)) == _at(
+            2026, 3, 1, 8, 30
+        )
+        assert next_cron_time("0 9-17/4 * * *", _at(2026, 3, 1, 14, 0)) == _at(
+            2026, 3, 1, 17, 0
+        )
+        assert next_cron_time("5,50 * * * *", _at(2026, 3, 1, 8, 6)) == _at(
+            2026, 3, 1, 8, 50
+        )
+
+    def test_month_and_year_rollover(self):
+        assert next_cron_time("0 0 1 1 *", _at(2026, 3, 1, 0, 0)) == _at(
+            2027, 1, 1, 0, 0
+        )
+        assert next_cron_time("0 12 31 * *", _at(2026, 4, 1, 0, 0)) == _at(
+            2026, 5, 31, 12, 0
+        )
+
+    def test_weekdays(self):
+        # 2026-03-01 is a Sunday
+        assert next_cron_time("0 8 * * 1-5", _at(2026, 2, 28, 9, 0)) == _at(
+            2026, 3, 2, 8, 0
+        )
+        assert next_cron_time("0 8 * * 7", _at(2026, 2, 28, 9, 0)) == _at(
+            2026, 3, 1, 8, 0
+        )
+
+    def test_day_of_month_or_weekday(self):
+        # The 15th or any Monday, whichever comes first
+        assert next_cron_time("0 0 15 * 1", _at(2026, 3, 3, 0, 0)) == _at(
+            2026, 3, 9, 0, 0
+        )
+        assert next_cron_time("0 0 15 * 1", _at(2026, 3, 10, 0, 0)) == _at(
+            2026, 3, 15, 0, 0
+        )
+
+
+class TestInvalid:
+    @pytest.mark.parametrize(
+        "expression", ["* * * *", "60 * * * *", "*/0 * * * *", "a * * * *"]
+    )
+    def test_rejected(self, expression):
+        with pytest.raises(ValueError):
+            CronSchedule.parse(expression)
+
+    def test_never_matching(self):
+        with pytest.raises(ValueError, match="no upcoming match"):
+            next_cron_time("0 0 30 2 *", _at(2026, 3, 1, 0, 0))
@@ -0,0 +1,119 @@
+"""
+Tests for lazy imports of heavy optional dependencies.
+
+Tests cover:
+- is_available() checks without importing
+- LazyModule imports on first attribute access, once
+- Attribute assignment and patch() reach the real module
+- Introspection probes and patch() of the stand-in itself do not import
+- lazy_attribute() resolves on call
+- The webhook server entry point imports no deferred dependency
+"""
+
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from scripts.benchmark_import_time import (
+    DEFERRED_MODULES,
+    measure,
+    parse_importtime,
+)
+from src.utils.lazy_import import is_available, lazy_attribute, lazy_module
+
+
+@pytest.fixture
+def fake_module(tmp_path, monkeypatch):
+    """An importable module that counts how often it is executed."""
+    (tmp_path / "lazy_probe.py").write_text(
+        "import builtins\n"
+        "builtins.lazy_probe_loads = getattr(builtins, 'lazy_probe_loads', 0) + 1\n"
+        "VALUE = 42\n"
+        "def double(x):\n"
+        "    return 2 * x\n"
+        "class Thing:\n"
+        "    def __init__(self, name):\n"
+        "        self.name = name\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "lazy_probe"
+    sys.modules.pop("lazy_probe", None)
+    import builtins
+
+    if hasattr(builtins, "lazy_probe_loads"):
+        del builtins.lazy_probe_loads
+
+
+def _loads():
+    import builtins
+
+    return getattr(builtins, "lazy_probe_loads", 0)
+
+
+class TestLazyModule:
+    def test_is_available(self, fake_module):
+        assert is_available(fake_module)
+        assert fake_module not in sys.modules
+        assert not is_available("definitely_not_installed_pkg")
+        assert not is_available("definitely_not_installed_pkg.sub")
+
+    def test_imports_on_first_access_once(self, fake_module):
+        module = lazy_module(fake_module)
+        assert _loads() == 0 and not module.is_loaded
+
+        assert module.VALUE == 42
+        assert module.double(4) == 8
+        assert _loads() == 1 and module.is_loaded
+
+    def test_assignment_and_patch_reach_real_module(self, fake_module):
+        module = lazy_module(fake_module)
+        module.VALUE = 7
+        assert sys.modules[fake_module].VALUE == 7
+
+        with patch.object(module, "double", return_value="patched"):
+            assert sys.modules[fake_module].double(1) == "patched"
+        assert module.double(1) == 2
+
+    def test_patching_stand_in_does_not_import(self, fake_module):
+        holder = type(sys)("lazy_holder")
+        holder.probe = lazy_module(fake_module)
+        holder.thing = lazy_attribute(fake_module, "Thing")
+        with patch.dict(sys.modules, {"lazy_holder": holder}):
+            with patch("lazy_holder.probe"), patch("lazy_holder.thing"):
+                assert not hasattr(holder.probe, "__func__")
+            assert not hasattr(holder.probe, "__wrapped__")
+        assert _loads() == 0
+        assert holder.probe.VALUE == 42
+
+    def test_missing_module_fails_on_use(self):
+        module = lazy_module("definitely_not_installed_pkg")
+        with pytest.raises(ImportError):
+            module.anything
+
+    def test_lazy_attribute(self, fake_module):
+        thing = lazy_attribute(fake_module, "Thing")
+        assert _loads() == 0
+        assert thing("a").name == "a"
+        assert thing.__name__ == "Thing"
+
+
+class TestImportBudget:
+    def test_parse_importtime(self):
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 |     litellm.types\n"
+            "import time:       400 |        500 |   litellm\n"
+            "import time:        50 |        550 | app\n"
+        )
+        profile = parse_importtime("app", output)
+        assert profile.total_ms == 0.55
+        assert profile.by_package() == {"litellm": 500, "app": 50}
+        assert profile.deferred_loaded() == ["litellm"]
+
+    def test_webhook_server_defers_heavy_imports(self):
+        profile = measure("src.main")
+        assert profile.total_us > 0
+        loaded = profile.deferred_loaded()
+        assert loaded == [], f"src.main imported {loaded} eagerly"
+        assert "litellm" in DEFERRED_MODULES
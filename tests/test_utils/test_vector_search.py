@@ -0,0 +1,110 @@
+"""Tests for packed float32 embeddings and vectorized cosine search."""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.utils.vector_search import (
+    cosine_top_k,
+    greedy_clusters,
+    normalize_rows,
+    pack_embedding,
+    stack_embeddings,
+    unpack_embedding,
+)
+
+
+class TestPacking:
+    def test_roundtrip(self):
+        blob = pack_embedding([0.5, -1.0, 2.25])
+        assert len(blob) == 4 + 3 * 4
+        np.testing.assert_array_equal(unpack_embedding(blob), [0.5, -1.0, 2.25])
+
+    def test_smaller_than_json(self):
+        vector = np.random.default_rng(0).standard_normal(384).tolist()
+        assert len(pack_embedding(vector)) < len(json.dumps(vector)) / 4
+
+    @pytest.mark.parametrize("blob", [None, b"", b"\x03\x00\x00\x00\x00"])
+    def test_malformed(self, blob):
+        assert unpack_embedding(blob) is None
+
+    def test_accepts_memoryview_and_latin1_str(self):
+        blob = pack_embedding([1.0, 2.0])
+        np.testing.assert_array_equal(unpack_embedding(memoryview(blob)), [1, 2])
+        np.testing.assert_array_equal(unpack_embedding(blob.decode("latin-1")), [1, 2])
+
+
+class TestStackEmbeddings:
+    def test_skips_missing_and_mismatched_rows(self):
+        blobs = [
+            pack_embedding([1, 0]),
+            None,
+            pack_embedding([1, 0, 0]),
+            b"junk",
+            pack_embedding([0, 1]),
+        ]
+        matrix, kept = stack_embeddings(blobs)
+        assert matrix.shape == (2, 2)
+        assert kept == [0, 4]
+
+    def test_explicit_dimension(self):
+        blobs = [pack_embedding([1, 0]), pack_embedding([1, 0, 0])]
+        matrix, kept = stack_embeddings(blobs, dimension=3)
+        assert matrix.shape == (1, 3)
+        assert kept == [1]
+
+    def test_empty(self):
+        matrix, kept = stack_embeddings([])
+        assert matrix.shape == (0, 0)
+        assert kept == []
+
+
+class TestCosineTopK:
+    MATRIX = np.array([[1, 0], [0, 1], [1, 1], [-1, 0], [0, 0]], dtype=np.float32)
+
+    def test_best_first_with_limit(self):
+        top = cosine_top_k([1, 0], self.MATRIX, 2)
+        assert [index for index, _ in top] == [0, 2]
+        assert top[0][1] == pytest.approx(1.0)
+        assert top[1][1] == pytest.approx(np.sqrt(0.5))
+
+    def test_threshold(self):
+        top = cosine_top_k([1, 0], self.MATRIX, 10, threshold=0.0)
+        assert [index for index, _ in top] == [0, 2, 1, 4]
+
+    def test_degenerate_inputs(self):
+        assert cosine_top_k([1, 0], self.MATRIX, 0) == []
+        assert cosine_top_k([1, 0, 0], self.MATRIX, 3) == []
+        assert cosine_top_k([1, 0], np.empty((0, 2), dtype=np.float32), 3) == []
+
+    def test_matches_pairwise_loop(self):
+        rng = np.random.default_rng(1)
+        matrix = rng.standard_normal((200, 16)).astype(np.float32)
+        query = rng.standard_normal(16).astype(np.float32)
+        expected = sorted(
+            (
+                float(
+                    np.dot(query, row) / (np.linalg.norm(query) * np.linalg.norm(row))
+                ),
+                index,
+            )
+            for index, row in enumerate(matrix)
+        )[::-1][:10]
+        top = cosine_top_k(query, matrix, 10)
+        assert [index for index, _ in top] == [index for _, index in expected]
+
+
+class TestGreedyClusters:
+    def test_groups_by_seed_similarity(self):
+        matrix = np.array(
+            [[1, 0], [0, 1], [0.99, 0.05], [0.05, 0.99], [-1, 0]], dtype=np.float32
+        )
+        assert greedy_clusters(matrix, 0.9) == [[0, 2], [1, 3], [4]]
+
+    def test_empty(self):
+        assert greedy_clusters(np.empty((0, 3)), 0.5) == []
+
+    def test_zero_rows_stay_zero(self):
+        normalized = normalize_rows(np.array([[3, 4], [0, 0]], dtype=np.float32))
+        np.testing.assert_allclose(normalized, [[0.6, 0.8], [0, 0]])